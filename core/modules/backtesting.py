@@ -3,17 +3,22 @@
 
 과거 데이터 기반 투자 전략 검증:
 - 팩터 기반 스크리닝 전략
-- 포트폴리오 최적화 전략 (동일가중, 시총가중, 리스크패리티)
-- 월간 리밸런싱 시뮬레이션
+- 포트폴리오 최적화 전략 (동일가중, 시총가중, 리스크패리티, 최소분산, 최대 Sharpe)
+- 워크포워드 리밸런싱 시뮬레이션 (시점별 재스크리닝, 비중 drift 반영)
 - 성과 지표 계산 (수익률, MDD, Sharpe Ratio 등)
 - 벤치마크 비교 (KOSPI)
 """
 
+import os
+import warnings
 import numpy as np
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import product
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
-from core.utils.db_utils import get_db_connection
+from core.utils.price_store import load_panel
 from core.modules.risk_analysis import (
     calculate_volatility,
     calculate_max_drawdown,
@@ -21,12 +26,14 @@ from core.modules.risk_analysis import (
     calculate_sortino_ratio,
     calculate_beta
 )
-from core.modules.portfolio_optimization import (
-    create_equal_weight_portfolio,
-    create_market_cap_weight_portfolio,
-    create_risk_parity_portfolio
+from core.modules.walk_forward import (
+    STRATEGIES,
+    WalkForwardData,
+    load_walk_forward_data,
+    price_returns,
+    run_walk_forward,
+    simulate_rebalanced_portfolio
 )
-from core.modules.factor_scoring import screen_stocks
 
 
 def load_historical_data(
@@ -43,35 +50,13 @@ def load_historical_data(
         end_date: 종료일 (YYYY-MM-DD)
 
     Returns:
-        가격 데이터 DataFrame (multi-index: date, code)
+        가격 데이터 DataFrame (index: date, columns: code)
     """
     if len(stock_codes) == 0:
         return pd.DataFrame()
 
-    conn = get_db_connection()
-
-    try:
-        placeholders = ','.join(['%s'] * len(stock_codes))
-        query = f"""
-            SELECT code, date, close
-            FROM prices
-            WHERE code IN ({placeholders})
-              AND date BETWEEN %s AND %s
-            ORDER BY date, code
-        """
-        params = stock_codes + [start_date, end_date]
-        df = pd.read_sql(query, conn, params=params)
-
-        if len(df) == 0:
-            return pd.DataFrame()
-
-        # Pivot: 날짜별로 종목 가격을 컬럼으로
-        df_pivot = df.pivot(index='date', columns='code', values='close')
-
-        return df_pivot
-
-    finally:
-        conn.close()
+    # 로컬 가격 저장소 (없으면 PostgreSQL) 에서 날짜 x 종목 행렬로 로드
+    return load_panel(stock_codes, start_date, end_date, "close")
 
 
 def get_benchmark_data(start_date: str, end_date: str, benchmark: str = "KS11") -> pd.Series:
@@ -86,33 +71,20 @@ def get_benchmark_data(start_date: str, end_date: str, benchmark: str = "KS11")
     Returns:
         벤치마크 가격 시계열
     """
-    conn = get_db_connection()
+    panel = load_panel([benchmark], start_date, end_date, "close")
 
-    try:
-        query = """
-            SELECT date, close
-            FROM prices
-            WHERE code = %s
-              AND date BETWEEN %s AND %s
-            ORDER BY date
-        """
-        df = pd.read_sql(query, conn, params=(benchmark, start_date, end_date))
-
-        if len(df) == 0:
-            # 벤치마크 데이터 없으면 빈 Series 반환
-            return pd.Series(dtype=float)
-
-        df = df.set_index('date')
-        return df['close']
+    if benchmark not in panel.columns:
+        # 벤치마크 데이터 없으면 빈 Series 반환
+        return pd.Series(dtype=float)
 
-    finally:
-        conn.close()
+    return panel[benchmark].dropna().rename('close')
 
 
 def calculate_portfolio_returns(
     prices: pd.DataFrame,
     weights: Dict[str, float],
-    rebalance_freq: str = "M"
+    rebalance_freq: str = "M",
+    cost_model: Optional["TransactionCostModel"] = None
 ) -> pd.Series:
     """
     포트폴리오 수익률 계산
@@ -121,6 +93,7 @@ def calculate_portfolio_returns(
         prices: 가격 데이터 (날짜 x 종목)
         weights: 종목별 비중 {종목코드: 비중}
         rebalance_freq: 리밸런싱 주기 ('M'=월간, 'Q'=분기, 'Y'=연간)
+        cost_model: 거래 비용 모델 (None이면 비용 미반영, 거래대금 정보 없이 스프레드만 적용)
 
     Returns:
         포트폴리오 누적 수익률 시계열
@@ -128,130 +101,37 @@ def calculate_portfolio_returns(
     if len(prices) == 0 or len(weights) == 0:
         return pd.Series(dtype=float)
 
-    # 수익률 계산
-    returns = prices.pct_change()
-
-    # 포트폴리오 수익률 = 가중 평균
-    portfolio_returns = pd.Series(0, index=returns.index)
-
-    for code, weight in weights.items():
-        if code in returns.columns:
-            portfolio_returns += returns[code] * weight
-
-    # 리밸런싱 주기별로 재조정 (간소화: 동일 비중 유지)
-    # 실제로는 리밸런싱 시점마다 weights를 재계산해야 함
+    # 주기 시작 첫 거래일마다 목표 비중으로 되돌림 (사이 구간은 비중 drift)
+    period = {'M': 'M', 'Q': 'Q', 'Y': 'Y'}.get(rebalance_freq, 'M')
+    periods = prices.index.to_period(period)
+    first_days = prices.index[~periods.duplicated()]
+    target = pd.Series(weights, dtype=float)
+    schedule = {date: target for date in first_days}
 
-    # 누적 수익률 계산
-    cumulative_returns = (1 + portfolio_returns).cumprod()
+    simulated = simulate_rebalanced_portfolio(price_returns(prices), schedule)
+    if cost_model is None:
+        return simulated['nav']
+    return apply_transaction_costs(simulated['nav'], simulated['trades'], cost_model)['nav']
 
-    return cumulative_returns
 
-
-def run_backtest(
+def summarize_performance(
+    cumulative_returns: pd.Series,
+    benchmark_returns: pd.Series,
     start_date: str,
-    end_date: str,
-    strategy: str = "equal_weight",
-    top_n: int = 10,
-    rebalance_months: int = 1,
-    min_roe: float = 10.0,
-    max_debt_ratio: float = 150.0
+    end_date: str
 ) -> Dict:
     """
-    백테스트 실행
+    누적 수익률 시계열의 성과 지표
 
     Args:
-        start_date: 시작일 (YYYY-MM-DD)
-        end_date: 종료일 (YYYY-MM-DD)
-        strategy: 포트폴리오 전략 (equal_weight, market_cap, risk_parity)
-        top_n: 선정 종목 수
-        rebalance_months: 리밸런싱 주기 (개월)
-        min_roe: 최소 ROE (%)
-        max_debt_ratio: 최대 부채비율 (%)
+        cumulative_returns: 포트폴리오 누적 수익률 (시작 = 1.0)
+        benchmark_returns: 벤치마크 누적 수익률 (없으면 빈 Series)
+        start_date: 시작일
+        end_date: 종료일
 
     Returns:
-        백테스트 결과 딕셔너리
+        {'period': {...}, 'returns': {...}, 'benchmark': {...}}
     """
-    print(f"\n{'='*60}")
-    print(f"백테스트 시작")
-    print(f"기간: {start_date} ~ {end_date}")
-    print(f"전략: {strategy}, 종목수: {top_n}, 리밸런싱: {rebalance_months}개월")
-    print(f"{'='*60}\n")
-
-    # 1. 스크리닝 실행 (백테스트 시작 시점)
-    print("1단계: 종목 스크리닝...")
-    screening_result = screen_stocks(
-        top_n=top_n,
-        min_roe=min_roe,
-        max_debt_ratio=max_debt_ratio
-    )
-
-    if screening_result['status'] != 'success' or len(screening_result['top_stocks']) == 0:
-        return {
-            'status': 'error',
-            'message': '스크리닝 실패 또는 종목 없음'
-        }
-
-    selected_stocks = [s['code'] for s in screening_result['top_stocks']]
-    print(f"   선정 종목: {len(selected_stocks)}개")
-
-    # 2. 포트폴리오 구성
-    print(f"2단계: 포트폴리오 구성 ({strategy})...")
-    if strategy == "equal_weight":
-        portfolio = create_equal_weight_portfolio(selected_stocks)
-    elif strategy == "market_cap":
-        portfolio = create_market_cap_weight_portfolio(selected_stocks)
-    elif strategy == "risk_parity":
-        # 과거 60일 데이터 기반으로 변동성 계산
-        lookback_start = (datetime.strptime(start_date, '%Y-%m-%d') - timedelta(days=90)).strftime('%Y-%m-%d')
-        historical_prices = load_historical_data(selected_stocks, lookback_start, start_date)
-        portfolio = create_risk_parity_portfolio(selected_stocks, historical_prices)
-    else:
-        return {
-            'status': 'error',
-            'message': f'알 수 없는 전략: {strategy}'
-        }
-
-    if portfolio['status'] != 'success':
-        return portfolio
-
-    weights = portfolio['weights']
-    print(f"   비중 설정 완료: {len(weights)}개 종목")
-
-    # 3. 과거 가격 데이터 로드
-    print("3단계: 과거 데이터 로드...")
-    prices = load_historical_data(selected_stocks, start_date, end_date)
-
-    if len(prices) == 0:
-        return {
-            'status': 'error',
-            'message': f'기간 내 가격 데이터 없음 ({start_date} ~ {end_date})'
-        }
-
-    print(f"   데이터 로드 완료: {len(prices)} 거래일")
-
-    # 4. 포트폴리오 수익률 계산
-    print("4단계: 수익률 계산...")
-    cumulative_returns = calculate_portfolio_returns(prices, weights)
-
-    if len(cumulative_returns) == 0:
-        return {
-            'status': 'error',
-            'message': '수익률 계산 실패'
-        }
-
-    # 5. 벤치마크 로드 (KOSPI)
-    print("5단계: 벤치마크 비교...")
-    benchmark_prices = get_benchmark_data(start_date, end_date)
-
-    if len(benchmark_prices) > 0:
-        benchmark_returns = (benchmark_prices / benchmark_prices.iloc[0])
-    else:
-        benchmark_returns = pd.Series(dtype=float)
-        print("   경고: 벤치마크 데이터 없음")
-
-    # 6. 성과 지표 계산
-    print("6단계: 성과 지표 계산...")
-
     # 일간 수익률
     daily_returns = cumulative_returns.pct_change().dropna()
 
@@ -295,26 +175,13 @@ def run_backtest(
         alpha = 0
         beta = 1.0
 
-    print(f"\n{'='*60}")
-    print(f"백테스트 완료!")
-    print(f"{'='*60}\n")
-
-    # 결과 반환
     return {
-        'status': 'success',
         'period': {
             'start_date': start_date,
             'end_date': end_date,
             'days': days,
             'years': round(years, 2)
         },
-        'strategy': {
-            'name': strategy,
-            'top_n': top_n,
-            'rebalance_months': rebalance_months,
-            'selected_stocks': selected_stocks,
-            'weights': weights
-        },
         'returns': {
             'total_return': round(total_return, 2),
             'cagr': round(cagr, 2),
@@ -331,12 +198,420 @@ def run_backtest(
             'total_return': round(benchmark_total_return, 2),
             'alpha': round(alpha, 2),
             'beta': round(beta, 2)
+        }
+    }
+
+
+# 거래 비용 기본값 (체결 금액 대비 비율)
+COMMISSION_RATE = 0.00015       # 증권사 수수료 (매수/매도 각각, paper_trading과 동일)
+SELL_TAX_RATE = 0.0018          # 증권거래세 + 농어촌특별세 (매도 시)
+HALF_SPREAD_RATE = 0.0005       # 호가 스프레드의 절반
+IMPACT_COEFFICIENT = 0.02       # 시장 충격 = 계수(일간 변동성 수준) x sqrt(주문금액 / 일평균 거래대금)
+MAX_SLIPPAGE_RATE = 0.02
+TRADING_AMOUNT_DAYS = 20        # 일평균 거래대금 계산 구간 (거래일)
+DEFAULT_CAPITAL = 100_000_000   # 슬리피지 계산용 운용 금액 (원)
+
+
+@dataclass
+class TransactionCostModel:
+    """
+    백테스트 거래 비용 모델
+
+    - 수수료: 매수/매도 체결 금액 x commission_rate
+    - 거래세: 매도 체결 금액 x sell_tax_rate
+    - 슬리피지: 스프레드 절반 + 주문금액이 일평균 거래대금에서 차지하는 비중의 제곱근에 비례하는 시장 충격
+      (거래대금 정보가 없으면 스프레드만)
+
+    모든 비용은 리밸런싱일 x 종목 비중 변화 행렬에서 한 번에 계산합니다.
+    """
+    commission_rate: float = COMMISSION_RATE
+    sell_tax_rate: float = SELL_TAX_RATE
+    half_spread_rate: float = HALF_SPREAD_RATE
+    impact_coefficient: float = IMPACT_COEFFICIENT
+    max_slippage_rate: float = MAX_SLIPPAGE_RATE
+    capital: float = DEFAULT_CAPITAL
+
+    def slippage_rates(self, order_amount: np.ndarray, trading_amount: Optional[np.ndarray] = None) -> np.ndarray:
+        """주문별 슬리피지 비율 (order_amount와 같은 shape)"""
+        rates = np.full(order_amount.shape, self.half_spread_rate)
+        if trading_amount is not None:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                impact = self.impact_coefficient * np.sqrt(order_amount / trading_amount)
+            rates = rates + np.nan_to_num(impact, nan=0.0, posinf=self.max_slippage_rate)
+        return np.minimum(rates, self.max_slippage_rate)
+
+    def rebalance_costs(
+        self,
+        trades: pd.DataFrame,
+        nav: pd.Series,
+        trading_amount: Optional[pd.DataFrame] = None
+    ) -> pd.DataFrame:
+        """
+        리밸런싱별 거래 비용
+
+        Args:
+            trades: 리밸런싱일 x 종목 비중 변화 (+매수, -매도)
+            nav: 포트폴리오 가치 시계열 (시작 = 1.0, 리밸런싱일 값으로 주문금액 환산)
+            trading_amount: 리밸런싱일 x 종목 일평균 거래대금 (원)
+
+        Returns:
+            DataFrame (index: 리밸런싱일, columns: commission, tax, slippage, total)
+            - 리밸런싱 직전 포트폴리오 가치 대비 비율
+        """
+        if trades.empty:
+            return pd.DataFrame(columns=['commission', 'tax', 'slippage', 'total'], dtype=float)
+
+        changes = trades.to_numpy()
+        sells = np.clip(-changes, 0, None)
+        traded = np.abs(changes)
+
+        order_amount = traded * nav.reindex(trades.index).ffill().fillna(1.0).to_numpy()[:, None] * self.capital
+        amount = None
+        if trading_amount is not None:
+            amount = trading_amount.reindex(index=trades.index, columns=trades.columns).to_numpy()
+
+        costs = pd.DataFrame({
+            'commission': traded.sum(axis=1) * self.commission_rate,
+            'tax': sells.sum(axis=1) * self.sell_tax_rate,
+            'slippage': (traded * self.slippage_rates(order_amount, amount)).sum(axis=1),
+        }, index=trades.index)
+        costs['total'] = costs.sum(axis=1)
+        return costs
+
+
+def average_trading_amount(
+    close: pd.DataFrame,
+    volume: pd.DataFrame,
+    dates: pd.DatetimeIndex,
+    window: int = TRADING_AMOUNT_DAYS
+) -> pd.DataFrame:
+    """
+    날짜별 최근 window 거래일 일평균 거래대금 (종가 x 거래량, 해당일 포함)
+
+    Returns:
+        DataFrame (index: dates, columns: close.columns)
+    """
+    volume = volume.reindex(index=close.index, columns=close.columns)
+    # 리밸런싱일별 window 구간 행만 모아서 계산 (rebalance x window x 종목)
+    upper = close.index.get_indexer(dates)
+    rows = upper[:, None] - np.arange(window)[::-1]
+    valid_rows = rows >= 0
+    rows = np.where(valid_rows, rows, 0)
+
+    amount = close.to_numpy()[rows] * volume.to_numpy()[rows]
+    amount[~valid_rows] = np.nan
+    with np.errstate(invalid='ignore'), warnings.catch_warnings():
+        warnings.simplefilter('ignore', category=RuntimeWarning)  # 구간 전체가 NaN인 종목
+        average = np.nanmean(amount, axis=1)
+    return pd.DataFrame(average, index=dates, columns=close.columns)
+
+
+def apply_transaction_costs(
+    nav: pd.Series,
+    trades: pd.DataFrame,
+    cost_model: TransactionCostModel,
+    trading_amount: Optional[pd.DataFrame] = None
+) -> Dict:
+    """
+    총(gross) 가치 시계열에 거래 비용 반영
+
+    비용은 리밸런싱일 종가에 포트폴리오 전체에서 비례 차감되므로,
+    순(net) 가치 = 총 가치 x 누적(1 - 리밸런싱별 비용률) 입니다.
+
+    Returns:
+        {'nav': 순 가치 시계열, 'costs': rebalance_costs 결과}
+    """
+    costs = cost_model.rebalance_costs(trades, nav, trading_amount)
+    if costs.empty:
+        return {'nav': nav, 'costs': costs}
+
+    factor = (1 - costs['total']).reindex(nav.index).fillna(1.0).cumprod()
+    return {'nav': nav * factor, 'costs': costs}
+
+
+def summarize_costs(costs: pd.DataFrame, turnover: pd.Series, gross_nav: pd.Series, net_nav: pd.Series,
+                    years: float) -> Dict:
+    """거래 비용/회전율 요약 (% 단위)"""
+    total_turnover = float(turnover.sum())
+    return {
+        'commission': round(float(costs['commission'].sum()) * 100, 4),
+        'tax': round(float(costs['tax'].sum()) * 100, 4),
+        'slippage': round(float(costs['slippage'].sum()) * 100, 4),
+        'total_cost': round(float(costs['total'].sum()) * 100, 4),
+        'cost_drag': round(float(gross_nav.iloc[-1] - net_nav.iloc[-1]) * 100, 2),
+        'avg_turnover': round(float(turnover.mean()) * 100, 2) if len(turnover) > 0 else 0,
+        'annual_turnover': round(total_turnover / years * 100, 2) if years > 0 else 0
+    }
+
+
+def evaluate_walk_forward(
+    walk: Dict,
+    data: WalkForwardData,
+    benchmark_returns: pd.Series,
+    start_date: str,
+    end_date: str,
+    cost_model: Optional[TransactionCostModel] = None
+) -> Dict:
+    """
+    워크포워드 결과에 거래 비용을 반영하고 총/순 성과 지표 계산
+
+    Returns:
+        {'nav': 순 가치, 'gross_nav': 총 가치, 'net': summarize_performance(순),
+         'gross': summarize_performance(총), 'costs': summarize_costs 결과}
+    """
+    cost_model = cost_model or TransactionCostModel()
+    trading_amount = None
+    if data.volume is not None and not walk['trades'].empty:
+        trading_amount = average_trading_amount(data.close, data.volume, walk['trades'].index)
+
+    gross_nav = walk['nav']
+    applied = apply_transaction_costs(gross_nav, walk['trades'], cost_model, trading_amount)
+    net = summarize_performance(applied['nav'], benchmark_returns, start_date, end_date)
+    gross = summarize_performance(gross_nav, benchmark_returns, start_date, end_date)
+    return {
+        'nav': applied['nav'],
+        'gross_nav': gross_nav,
+        'net': net,
+        'gross': gross,
+        'costs': summarize_costs(applied['costs'], walk['turnover'], gross_nav, applied['nav'],
+                                 net['period']['years'])
+    }
+
+
+def run_backtest(
+    start_date: str,
+    end_date: str,
+    strategy: str = "equal_weight",
+    top_n: int = 10,
+    rebalance_months: int = 1,
+    min_roe: float = 10.0,
+    max_debt_ratio: float = 150.0,
+    data: Optional[WalkForwardData] = None,
+    cost_model: Optional[TransactionCostModel] = None
+) -> Dict:
+    """
+    백테스트 실행 (워크포워드)
+
+    리밸런싱 시점마다 그때 공시된 재무 데이터와 그때까지의 가격만으로
+    종목을 다시 선정하고 비중을 재설정합니다.
+
+    Args:
+        start_date: 시작일 (YYYY-MM-DD)
+        end_date: 종료일 (YYYY-MM-DD)
+        strategy: 포트폴리오 전략 (equal_weight, market_cap, risk_parity, min_variance, max_sharpe)
+        top_n: 선정 종목 수
+        rebalance_months: 리밸런싱 주기 (개월)
+        min_roe: 최소 ROE (%)
+        max_debt_ratio: 최대 부채비율 (%)
+        data: 미리 로드한 데이터 (여러 번 실행할 때 재사용)
+        cost_model: 거래 비용 모델 (None이면 기본 TransactionCostModel)
+
+    Returns:
+        백테스트 결과 딕셔너리 (returns/cumulative_returns는 거래 비용 차감 후 기준,
+        비용 전 성과는 gross_returns, 비용/회전율은 costs,
+        strategy의 selected_stocks/weights는 마지막 리밸런싱 기준, 리밸런싱 이력은 rebalances)
+    """
+    print(f"\n{'='*60}")
+    print(f"백테스트 시작")
+    print(f"기간: {start_date} ~ {end_date}")
+    print(f"전략: {strategy}, 종목수: {top_n}, 리밸런싱: {rebalance_months}개월")
+    print(f"{'='*60}\n")
+
+    if strategy not in STRATEGIES:
+        return {
+            'status': 'error',
+            'message': f'알 수 없는 전략: {strategy}'
+        }
+
+    # 1. 재무/가격 데이터 일괄 로드
+    if data is None:
+        print("1단계: 재무/가격 데이터 로드...")
+        data = load_walk_forward_data(start_date, end_date)
+        print(f"   재무 {len(data.financials)}건, 가격 {data.close.shape}")
+
+    # 2. 리밸런싱 시뮬레이션
+    print("2단계: 워크포워드 리밸런싱...")
+    walk = run_walk_forward(
+        start_date, end_date,
+        strategy=strategy,
+        top_n=top_n,
+        rebalance_months=rebalance_months,
+        min_roe=min_roe,
+        max_debt_ratio=max_debt_ratio,
+        data=data
+    )
+
+    if walk['status'] != 'success':
+        return walk
+
+    if len(walk['nav']) == 0 or not any(r['stocks'] for r in walk['rebalances']):
+        return {
+            'status': 'error',
+            'message': '스크리닝 실패 또는 종목 없음'
+        }
+
+    print(f"   리밸런싱 {len(walk['rebalances'])}회, {len(walk['nav'])} 거래일")
+
+    # 3. 벤치마크 로드 (KOSPI)
+    print("3단계: 벤치마크 비교...")
+    benchmark_prices = get_benchmark_data(start_date, end_date)
+
+    if len(benchmark_prices) > 0:
+        benchmark_returns = (benchmark_prices / benchmark_prices.iloc[0])
+    else:
+        benchmark_returns = pd.Series(dtype=float)
+        print("   경고: 벤치마크 데이터 없음")
+
+    # 4. 거래 비용 반영 및 성과 지표 계산
+    print("4단계: 거래 비용 / 성과 지표 계산...")
+    evaluation = evaluate_walk_forward(walk, data, benchmark_returns, start_date, end_date, cost_model)
+    summary = evaluation['net']
+    last = walk['rebalances'][-1]
+    print(f"   거래 비용 {evaluation['costs']['total_cost']:.2f}%, "
+          f"연 회전율 {evaluation['costs']['annual_turnover']:.0f}%")
+
+    print(f"\n{'='*60}")
+    print(f"백테스트 완료!")
+    print(f"{'='*60}\n")
+
+    # 결과 반환
+    return {
+        'status': 'success',
+        'period': summary['period'],
+        'strategy': {
+            'name': strategy,
+            'top_n': top_n,
+            'rebalance_months': rebalance_months,
+            'selected_stocks': last['stocks'],
+            'weights': last['weights']
         },
-        'cumulative_returns': cumulative_returns,
+        'returns': summary['returns'],
+        'gross_returns': evaluation['gross']['returns'],
+        'costs': evaluation['costs'],
+        'benchmark': summary['benchmark'],
+        'rebalances': walk['rebalances'],
+        'cumulative_returns': evaluation['nav'],
+        'gross_cumulative_returns': evaluation['gross_nav'],
         'benchmark_returns': benchmark_returns
     }
 
 
+# 파라미터 스윕 기본 그리드 (run_backtest 기본값)
+SWEEP_DEFAULTS = {
+    'strategy': ["equal_weight"],
+    'top_n': [10],
+    'min_roe': [10.0],
+    'max_debt_ratio': [150.0],
+    'rebalance_months': [1],
+}
+
+# 워커 프로세스 공용 데이터 (initializer에서 한 번 설정)
+_sweep_context: Dict = {}
+
+
+def _init_sweep_worker(data: WalkForwardData, benchmark_returns: pd.Series, start_date: str, end_date: str,
+                       cost_model: Optional[TransactionCostModel] = None):
+    """스윕 워커 초기화 - fork 환경에서는 부모 메모리를 복사 없이(copy-on-write) 공유"""
+    _sweep_context.update(
+        data=data, benchmark_returns=benchmark_returns,
+        start_date=start_date, end_date=end_date, cost_model=cost_model
+    )
+
+
+def _run_sweep_config(config: Dict) -> Dict:
+    """스윕 설정 하나 실행 → 결과 행"""
+    ctx = _sweep_context
+    row = dict(config)
+    try:
+        walk = run_walk_forward(ctx['start_date'], ctx['end_date'], data=ctx['data'], **config)
+        if walk['status'] != 'success':
+            return {**row, 'status': 'error', 'message': walk['message']}
+        if len(walk['nav']) == 0 or not any(r['stocks'] for r in walk['rebalances']):
+            return {**row, 'status': 'error', 'message': '스크리닝 실패 또는 종목 없음'}
+
+        evaluation = evaluate_walk_forward(
+            walk, ctx['data'], ctx['benchmark_returns'], ctx['start_date'], ctx['end_date'], ctx['cost_model']
+        )
+        summary = evaluation['net']
+        row.update(status='success', message='')
+        row.update(summary['returns'])
+        row.update(
+            gross_total_return=evaluation['gross']['returns']['total_return'],
+            gross_cagr=evaluation['gross']['returns']['cagr'],
+            gross_sharpe_ratio=evaluation['gross']['returns']['sharpe_ratio'],
+            benchmark_return=summary['benchmark']['total_return'],
+            alpha=summary['benchmark']['alpha'],
+            beta=summary['benchmark']['beta'],
+            rebalance_count=len(walk['rebalances']),
+            total_cost=evaluation['costs']['total_cost'],
+            avg_turnover=evaluation['costs']['avg_turnover'],
+            annual_turnover=evaluation['costs']['annual_turnover']
+        )
+        return row
+    except Exception as e:
+        return {**row, 'status': 'error', 'message': str(e)}
+
+
+def run_parameter_sweep(
+    start_date: str,
+    end_date: str,
+    grid: Optional[Dict[str, List]] = None,
+    max_workers: Optional[int] = None,
+    data: Optional[WalkForwardData] = None,
+    benchmark_returns: Optional[pd.Series] = None,
+    cost_model: Optional[TransactionCostModel] = None
+) -> pd.DataFrame:
+    """
+    파라미터 그리드 백테스트 (병렬)
+
+    재무/가격 데이터와 벤치마크를 한 번만 로드해 워커 프로세스에 공유하고,
+    그리드의 모든 조합을 ProcessPoolExecutor로 나눠 실행합니다.
+
+    Args:
+        start_date: 시작일 (YYYY-MM-DD)
+        end_date: 종료일 (YYYY-MM-DD)
+        grid: {파라미터: 값 리스트} - strategy, top_n, min_roe, max_debt_ratio, rebalance_months
+              (빠진 파라미터는 run_backtest 기본값)
+        max_workers: 워커 수 (None이면 CPU 수, 1이면 현재 프로세스에서 순차 실행)
+        data: 미리 로드한 데이터
+        benchmark_returns: 벤치마크 누적 수익률 (None이면 KOSPI 로드)
+        cost_model: 거래 비용 모델 (None이면 기본 TransactionCostModel)
+
+    Returns:
+        조합별 한 행 DataFrame (파라미터, status, message, run_backtest 성과 지표(비용 차감 후),
+        gross_total_return, gross_cagr, gross_sharpe_ratio, benchmark_return, alpha, beta,
+        rebalance_count, total_cost, avg_turnover, annual_turnover)
+    """
+    grid = {**SWEEP_DEFAULTS, **(grid or {})}
+    unknown = set(grid) - set(SWEEP_DEFAULTS)
+    if unknown:
+        raise ValueError(f"알 수 없는 스윕 파라미터: {sorted(unknown)}")
+
+    keys = list(SWEEP_DEFAULTS)
+    configs = [dict(zip(keys, values)) for values in product(*(grid[k] for k in keys))]
+
+    if data is None:
+        data = load_walk_forward_data(start_date, end_date)
+    if benchmark_returns is None:
+        benchmark_prices = get_benchmark_data(start_date, end_date)
+        benchmark_returns = benchmark_prices / benchmark_prices.iloc[0] if len(benchmark_prices) > 0 \
+            else pd.Series(dtype=float)
+
+    init_args = (data, benchmark_returns, start_date, end_date, cost_model)
+    workers = min(max_workers or os.cpu_count() or 1, len(configs))
+    print(f"파라미터 스윕: {len(configs)}개 조합, 워커 {workers}개")
+
+    if workers <= 1:
+        _init_sweep_worker(*init_args)
+        rows = [_run_sweep_config(config) for config in configs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_sweep_worker,
+                                 initargs=init_args) as executor:
+            rows = list(executor.map(_run_sweep_config, configs))
+
+    return pd.DataFrame(rows)
+
+
 def compare_strategies(
     start_date: str,
     end_date: str,
@@ -360,19 +635,12 @@ def compare_strategies(
     print(f"비교 전략: {', '.join(strategies)}")
     print(f"{'='*60}\n")
 
-    results = {}
-
-    for strategy in strategies:
-        print(f"\n--- {strategy} 전략 백테스트 ---")
-        result = run_backtest(
-            start_date=start_date,
-            end_date=end_date,
-            strategy=strategy,
-            top_n=top_n
-        )
-
-        if result['status'] == 'success':
-            results[strategy] = result
+    # 데이터/벤치마크는 한 번만 로드하고 전략별 백테스트는 병렬 실행
+    sweep = run_parameter_sweep(
+        start_date, end_date,
+        grid={'strategy': list(strategies), 'top_n': [top_n]}
+    )
+    succeeded = sweep[sweep['status'] == 'success']
 
     # 비교 테이블 생성
     comparison = {
@@ -381,25 +649,45 @@ def compare_strategies(
         'best_sharpe': -999
     }
 
-    for strategy, result in results.items():
-        comparison['strategies'][strategy] = {
-            'total_return': result['returns']['total_return'],
-            'cagr': result['returns']['cagr'],
-            'volatility': result['returns']['volatility'],
-            'sharpe_ratio': result['returns']['sharpe_ratio'],
-            'max_drawdown': result['returns']['max_drawdown'],
-            'alpha': result['benchmark']['alpha']
+    for row in succeeded.itertuples(index=False):
+        comparison['strategies'][row.strategy] = {
+            'total_return': row.total_return,
+            'cagr': row.cagr,
+            'volatility': row.volatility,
+            'sharpe_ratio': row.sharpe_ratio,
+            'max_drawdown': row.max_drawdown,
+            'alpha': row.alpha
         }
 
         # 최고 성과 전략 (Sharpe Ratio 기준)
-        if result['returns']['sharpe_ratio'] > comparison['best_sharpe']:
-            comparison['best_sharpe'] = result['returns']['sharpe_ratio']
-            comparison['best_strategy'] = strategy
+        if row.sharpe_ratio > comparison['best_sharpe']:
+            comparison['best_sharpe'] = row.sharpe_ratio
+            comparison['best_strategy'] = row.strategy
 
     comparison['status'] = 'success'
     return comparison
 
 
+def _format_cost_section(result: Dict) -> str:
+    """리포트 거래 비용 섹션 (비용 정보가 없으면 빈 문자열)"""
+    if 'costs' not in result:
+        return ""
+
+    costs = result['costs']
+    gross = result['gross_returns']
+    return f"""
+### 거래 비용 (수익률은 비용 차감 후 기준)
+| 지표 | 값 |
+|------|------|
+| **비용 전 총 수익률** | {gross['total_return']:+.2f}% |
+| **비용 전 CAGR** | {gross['cagr']:+.2f}% |
+| **수수료** | {costs['commission']:.2f}% |
+| **거래세** | {costs['tax']:.2f}% |
+| **슬리피지** | {costs['slippage']:.2f}% |
+| **연 회전율** | {costs['annual_turnover']:.0f}% |
+"""
+
+
 def generate_backtest_report(result: Dict, output_file: Optional[str] = None) -> str:
     """
     백테스트 리포트 생성 (Markdown)
@@ -457,7 +745,7 @@ def generate_backtest_report(result: Dict, output_file: Optional[str] = None) ->
 | **승률** | {result['returns']['win_rate']:.2f}% |
 | **평균 수익** | {result['returns']['avg_gain']:.4f}% |
 | **평균 손실** | {result['returns']['avg_loss']:.4f}% |
-
+{_format_cost_section(result)}
 ---
 
 ## 3. 벤치마크 비교 (KOSPI)
@@ -529,7 +817,7 @@ def generate_backtest_report(result: Dict, output_file: Optional[str] = None) ->
 본 백테스트 결과는 과거 데이터를 기반으로 한 시뮬레이션이며,
 **미래 수익을 보장하지 않습니다.**
 
-- 실제 투자 시 거래 비용, 슬리피지, 세금 등이 발생합니다
+- 거래 비용(수수료, 거래세, 슬리피지)은 추정치이며 실제 체결 비용과 다를 수 있습니다
 - 과거 성과가 미래 성과를 보장하지 않습니다
 - 투자 판단과 그에 따른 손실은 투자자 본인의 책임입니다
 - 본 리포트는 참고 정보이며, 투자 권유가 아닙니다
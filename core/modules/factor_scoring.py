@@ -11,17 +11,13 @@
 - 안정성 (Stability): 부채비율, 변동성
 """
 
+import time
+
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Optional, Tuple
-from core.modules.financial_metrics import (
-    get_financial_data_from_db,
-    get_latest_prices_from_db,
-    calculate_basic_ratios,
-    calculate_profitability_metrics,
-    calculate_growth_rates
-)
-from core.utils.db_utils import get_db_connection
+from core.modules.financials_index import get_financials_index
+from core.utils.price_store import load_panel, recent_window_start
 
 
 class FactorScorer:
@@ -144,15 +140,27 @@ class FactorScorer:
         """
         result = df.copy()
 
-        scores = []
         for period in periods:
-            col_name = f'return_{period}d'
             # 기간별 수익률 계산
-            result[col_name] = result.groupby('code')['close'].pct_change(period) * 100
+            result[f'return_{period}d'] = result.groupby('code')['close'].pct_change(period) * 100
+
+        return self.calculate_return_momentum_score(result, periods)
+
+    def calculate_return_momentum_score(self, df: pd.DataFrame, periods: List[int] = [20, 60, 120]) -> pd.DataFrame:
+        """
+        계산된 기간 수익률로 모멘텀 점수 계산 (0-100점)
 
+        Args:
+            df: return_{기간}d 컬럼(%)이 있는 DataFrame
+            periods: 기간 리스트 (일수)
+        """
+        result = df.copy()
+
+        scores = []
+        for period in periods:
             # 수익률을 점수로 변환 (0-33점)
             score_col = f'momentum_{period}d_score'
-            result[score_col] = result[col_name].clip(lower=-50, upper=50)  # -50% ~ +50%
+            result[score_col] = result[f'return_{period}d'].clip(lower=-50, upper=50)  # -50% ~ +50%
             result[score_col] = (result[score_col] + 50) / 3  # 0-33점으로 정규화
             scores.append(score_col)
 
@@ -205,25 +213,13 @@ class FactorScorer:
         Returns:
             leadership_score 컬럼이 추가된 DataFrame
         """
-        from core.modules.sector_leader_detector import SectorLeaderDetector
+        from core.modules.sector_leader_detector import get_leadership_scores
 
         result = df.copy()
 
-        # 리더십 감지기 초기화
-        detector = SectorLeaderDetector()
-
         try:
-            # 모든 종목의 리더십 점수 계산
-            leaders_by_sector = detector.detect_leaders()
-
-            # 각 종목에 대한 리더십 점수 매핑
-            leadership_scores = {}
-
-            for sector, leader_list in leaders_by_sector.items():
-                for leader_info in leader_list:
-                    code = leader_info['code']
-                    # 종합 리더십 점수 (0-100)
-                    leadership_scores[code] = leader_info['overall_score']
+            # 모든 종목의 리더십 점수 (같은 가격 데이터 버전이면 캐시 재사용)
+            leadership_scores = get_leadership_scores()
 
             # DataFrame에 리더십 점수 추가
             result['leadership_score'] = result['code'].map(leadership_scores).fillna(0)
@@ -292,24 +288,11 @@ def calculate_price_volatility(stock_codes: List[str], days: int = 60) -> pd.Dat
     Returns:
         변동성 DataFrame (code, volatility)
     """
-    conn = get_db_connection()
-
-    query = """
-    SELECT code, date, close
-    FROM prices
-    WHERE code = ANY(%s)
-        AND date >= CURRENT_DATE - INTERVAL '%s days'
-    ORDER BY code, date
-    """
+    # 로컬 가격 저장소 (없으면 PostgreSQL) 에서 날짜 x 종목 종가 행렬 로드
+    prices = load_panel(stock_codes, recent_window_start(days), None, "close")
 
-    df = pd.read_sql_query(query, conn, params=(stock_codes, days))
-    conn.close()
-
-    # 일별 수익률 계산
-    df['return'] = df.groupby('code')['close'].pct_change()
-
-    # 변동성 (표준편차)
-    volatility = df.groupby('code')['return'].std() * np.sqrt(252) * 100  # 연율화
+    # 일별 수익률 → 변동성 (표준편차, 연율화)
+    volatility = prices.pct_change(fill_method=None).std() * np.sqrt(252) * 100
 
     result = pd.DataFrame({
         'code': volatility.index,
@@ -319,116 +302,197 @@ def calculate_price_volatility(stock_codes: List[str], days: int = 60) -> pd.Dat
     return result
 
 
+# 스크리닝 가격 구간: 120거래일 모멘텀에 필요한 달력일 (한 번만 조회)
+SCREENING_PRICE_DAYS = 200
+# 변동성 계산 구간 (달력일)
+SCREENING_VOLATILITY_DAYS = 60
+MOMENTUM_PERIODS = [20, 60, 120]
+
+
+def price_snapshot_factors(
+    close: pd.DataFrame,
+    periods: List[int] = MOMENTUM_PERIODS,
+    volatility_start=None
+) -> pd.DataFrame:
+    """
+    날짜 x 종목 종가 행렬에서 최신 시점 가격 팩터 계산
+
+    Args:
+        close: 종가 행렬 (index: date, columns: code)
+        periods: 모멘텀 기간 (거래일)
+        volatility_start: 변동성 계산 시작일 (None이면 전체 구간)
+
+    Returns:
+        code 인덱스 DataFrame (close, return_{기간}d, volatility)
+    """
+    filled = close.ffill()
+    values = filled.to_numpy(dtype=float)
+    factors = pd.DataFrame(index=close.columns)
+    factors.index.name = 'code'
+    factors['close'] = values[-1] if len(values) else np.nan
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        for period in periods:
+            # 거래일 기준 기간 수익률 (이력이 부족하면 NaN → 모멘텀 점수에서 제외)
+            factors[f'return_{period}d'] = (values[-1] / values[-1 - period] - 1) * 100 if len(values) > period else np.nan
+
+    window = close if volatility_start is None else close[close.index >= pd.Timestamp(volatility_start)]
+    factors['volatility'] = window.pct_change(fill_method=None).std() * np.sqrt(252) * 100
+    return factors
+
+
+def score_snapshot(
+    metrics: pd.DataFrame,
+    factors: Optional[pd.DataFrame],
+    scorer: 'FactorScorer',
+    min_roe: float = 0,
+    max_debt_ratio: float = 200,
+    periods: List[int] = MOMENTUM_PERIODS,
+    leadership: bool = True
+) -> pd.DataFrame:
+    """
+    재무 지표와 가격 팩터를 한 번 병합해 팩터 점수 계산
+
+    Args:
+        metrics: 종목당 1행 재무 지표 (FinancialsIndex.latest / asof 결과)
+        factors: price_snapshot_factors 결과 (None이면 metrics에 이미 병합된 것으로 간주 - 팩터 저장소 스냅샷)
+        scorer: FactorScorer
+        min_roe: 최소 ROE (%)
+        max_debt_ratio: 최대 부채비율 (%)
+        periods: 모멘텀 기간 (factors의 return_{기간}d 컬럼)
+        leadership: False면 주도주 점수를 계산하지 않음 (기존 leadership_score 컬럼 사용, 없으면 0점)
+
+    Returns:
+        점수가 계산된 DataFrame (종목당 1행)
+    """
+    filtered = metrics[
+        (metrics['roe'] >= min_roe) &
+        (metrics['debt_ratio'] <= max_debt_ratio)
+    ]
+    if filtered.empty:
+        return filtered.copy()
+
+    if factors is not None:
+        scored = filtered.merge(factors, left_on='code', right_index=True, how='left')
+    else:
+        scored = filtered
+    scored = scorer.calculate_value_score(scored)
+    scored = scorer.calculate_growth_score(scored)
+    scored = scorer.calculate_profitability_score(scored)
+    scored = scorer.calculate_stability_score(scored)
+    scored = scorer.calculate_return_momentum_score(scored, periods)
+    if leadership:
+        scored = scorer.calculate_leadership_score(scored)
+    elif 'leadership_score' not in scored.columns:
+        scored['leadership_score'] = 0.0
+
+    return scorer.calculate_composite_score(scored)
+
+
 def screen_stocks(
     top_n: int = 20,
     weights: Optional[Dict[str, float]] = None,
     min_roe: float = 0,
-    max_debt_ratio: float = 200
+    max_debt_ratio: float = 200,
+    as_of=None,
+    use_store: bool = True
 ) -> pd.DataFrame:
     """
     종목 스크리닝 메인 함수
 
+    재무 데이터(시점 기준 인덱스)와 가격 행렬을 각각 한 번만 조회하고, 가격 팩터는
+    날짜 x 종목 행렬에서 한 번에 계산해 재무 지표와 한 번 병합합니다.
+    단계별 소요 시간은 result.attrs['timings'].
+
     Args:
         top_n: 상위 N개 종목
         weights: 팩터별 가중치
         min_roe: 최소 ROE (%)
         max_debt_ratio: 최대 부채비율 (%)
+        as_of: 기준일 (None이면 현재 - 종목별 최신 분기. 지정하면 그날까지 공시된
+               보고서와 가격만 사용하며, 과거 시점을 재현할 수 없는 주도주 점수는 0점)
+        use_store: 현재 시점 스크리닝에서 팩터 저장소(factor_store)의 최신 스냅샷이
+                   현재 가격/재무 데이터 버전과 같으면 조회 없이 점수만 다시 계산
 
     Returns:
         스크리닝 결과 DataFrame
     """
     print("📊 종목 스크리닝 시작...")
-
-    # 1. 재무 데이터 조회
+    scorer = FactorScorer(weights)
+    timings = {}
+    started = time.perf_counter()
+
+    def lap(stage: str):
+        nonlocal started
+        now = time.perf_counter()
+        timings[stage] = round((now - started) * 1000, 1)
+        started = now
+
+    if as_of is None and use_store:
+        from core.modules.factor_store import current_factor_snapshot
+
+        snapshot = current_factor_snapshot()
+        if snapshot is not None:
+            # 저장된 팩터 입력값으로 필터/점수만 다시 계산 (단면 정규화가 필터 결과에 따라 달라지므로)
+            print("1. 팩터 저장소 스냅샷 사용 ({})".format(snapshot['date'].iloc[0].date()))
+            scored = score_snapshot(snapshot, None, scorer, min_roe, max_debt_ratio, leadership=False)
+            result = scorer.rank_stocks(scored, top_n=top_n) if not scored.empty else pd.DataFrame()
+            lap('factor_store')
+            result.attrs['timings'] = timings
+            print(f"✅ 스크리닝 완료! 상위 {len(result)}개 종목 선정")
+            return result
+
+    # 1. 재무 데이터 (비율/성장률 사전 계산된 인덱스, 재무 데이터 버전별 캐시)
     print("1. 재무 데이터 조회 중...")
-    financial_df = get_financial_data_from_db()
+    financials = get_financials_index()
+    lap('financials_load')
 
-    if financial_df.empty:
+    if financials.empty:
         print("❌ 재무 데이터가 없습니다.")
         return pd.DataFrame()
 
-    # 최신 데이터만 (종목별 최신 분기)
-    latest_financial = financial_df.groupby('code').tail(1).reset_index(drop=True)
-
-    # 2. 재무 지표 계산
+    # 2. 종목별 재무 지표 (기준일 시점)
     print("2. 재무 지표 계산 중...")
-    metrics = calculate_basic_ratios(latest_financial)
-    metrics = calculate_profitability_metrics(metrics)
-
-    # 3. 필터링
-    print(f"3. 필터링 중 (ROE >= {min_roe}%, 부채비율 <= {max_debt_ratio}%)...")
-    filtered = metrics[
-        (metrics['roe'] >= min_roe) &
-        (metrics['debt_ratio'] <= max_debt_ratio)
-    ].copy()
-
-    print(f"   필터링 후 종목 수: {len(filtered)}")
-
-    if filtered.empty:
+    metrics = financials.latest() if as_of is None else financials.asof(as_of)
+    candidates = metrics.loc[
+        (metrics['roe'] >= min_roe) & (metrics['debt_ratio'] <= max_debt_ratio), 'code'
+    ].tolist()
+    lap('financial_metrics')
+    print(f"   필터링 후 종목 수 (ROE >= {min_roe}%, 부채비율 <= {max_debt_ratio}%): {len(candidates)}")
+
+    if not candidates:
         print("❌ 필터링 후 종목이 없습니다.")
         return pd.DataFrame()
 
-    # 4. 성장률 계산 (전체 데이터 필요)
-    print("4. 성장률 계산 중...")
-    growth_df = calculate_growth_rates(financial_df, periods=4)
-    latest_growth = growth_df.groupby('code').tail(1).reset_index(drop=True)
-
-    # filtered와 병합
-    filtered = filtered.merge(
-        latest_growth[['code', 'revenue_growth', 'operating_profit_growth', 'net_profit_growth']],
-        on='code',
-        how='left',
-        suffixes=('', '_y')
-    )
-
-    # 5. 가격 데이터 및 변동성
-    print("5. 가격 데이터 및 변동성 계산 중...")
-    stock_codes = filtered['code'].tolist()
-
-    # 최근 120일 가격 데이터 조회
-    conn = get_db_connection()
-    price_query = """
-    SELECT code, date, close
-    FROM prices
-    WHERE code = ANY(%s)
-        AND date >= CURRENT_DATE - INTERVAL '120 days'
-    ORDER BY code, date
-    """
-    price_df = pd.read_sql_query(price_query, conn, params=(stock_codes,))
-    conn.close()
-
-    if not price_df.empty:
-        # 변동성 계산
-        volatility = calculate_price_volatility(stock_codes, days=60)
-        filtered = filtered.merge(volatility, on='code', how='left')
+    # 3. 가격 행렬 (모멘텀/변동성 공용, 1회 조회)
+    print("3. 가격 데이터 조회 중...")
+    if as_of is None:
+        price_start, price_end = recent_window_start(SCREENING_PRICE_DAYS), None
+        volatility_start = recent_window_start(SCREENING_VOLATILITY_DAYS)
     else:
-        filtered['volatility'] = np.nan
-
-    # 6. 팩터 점수 계산
-    print("6. 팩터 점수 계산 중...")
-    scorer = FactorScorer(weights)
-
-    scored = scorer.calculate_value_score(filtered)
-    scored = scorer.calculate_growth_score(scored)
-    scored = scorer.calculate_profitability_score(scored)
-    scored = scorer.calculate_stability_score(scored)
-    scored = scorer.calculate_leadership_score(scored)  # 주도주 점수 추가
-
-    # 모멘텀은 가격 데이터가 있을 때만
-    if not price_df.empty:
-        # 최신 가격만
-        latest_prices = price_df.groupby('code').tail(1).reset_index(drop=True)
-        scored = scored.merge(latest_prices[['code', 'close']], on='code', how='left')
-        scored = scorer.calculate_momentum_score(price_df)
-        scored = scored.groupby('code').tail(1).reset_index(drop=True)
-    else:
-        scored['momentum_score'] = 0
-
-    # 7. 종합 점수 및 순위
-    print("7. 종합 점수 계산 및 순위 매기기...")
-    scored = scorer.calculate_composite_score(scored)
+        price_end = pd.Timestamp(as_of)
+        price_start = price_end - pd.Timedelta(days=SCREENING_PRICE_DAYS)
+        volatility_start = price_end - pd.Timedelta(days=SCREENING_VOLATILITY_DAYS)
+    close = load_panel(candidates, price_start, price_end, "close")
+    lap('price_load')
+
+    # 4. 가격 팩터
+    print("4. 모멘텀/변동성 계산 중...")
+    factors = price_snapshot_factors(close, MOMENTUM_PERIODS, volatility_start)
+    lap('price_factors')
+
+    # 5. 팩터 점수 계산
+    print("5. 팩터 점수 계산 중...")
+    scored = score_snapshot(metrics, factors, scorer, min_roe, max_debt_ratio, leadership=as_of is None)
+    lap('scoring')
+
+    # 6. 순위
+    print("6. 순위 매기기...")
     result = scorer.rank_stocks(scored, top_n=top_n)
+    lap('ranking')
 
+    result.attrs['timings'] = timings
+    print("   단계별 소요 시간(ms): " + ", ".join(f"{k} {v}" for k, v in timings.items()))
     print(f"✅ 스크리닝 완료! 상위 {len(result)}개 종목 선정")
 
     return result
@@ -0,0 +1,369 @@
+"""
+팩터 점수 저장소 (factor_scores)
+
+screen_stocks가 매번 새로 계산하던 팩터 입력값(재무 비율, 성장률, 모멘텀, 변동성)과
+팩터 점수를 (date, code) 키로 연도별 Parquet 파일에 보관한다.
+
+- 파일 구성: {root}/year={YYYY}.parquet, 파일 내부는 (date, code) 정렬
+- manifest.json: 날짜별 행 수와 계산 당시 가격/재무 데이터 버전
+- 일간 작업(update_factor_scores): 저장되지 않은 최신 거래일만 계산 (backfill_start로 과거 구간 채움)
+- 점수는 필터 없이 전 종목 기준으로 계산한다. screen_stocks는 저장된 입력값으로
+  필터 후 점수를 다시 매기므로(수 ms) 실시간 계산과 같은 순위를 얻는다.
+
+최신 거래일은 그 시점 DB에 있는 종목별 최신 분기를, 과거 날짜(backfill)는
+공시일 기준 as-of 재무 데이터를 사용한다. 과거 시점의 주도주 점수는 재현할 수 없어 0점이다.
+
+pyarrow가 없거나 FACTOR_STORE_ENABLED=0이면 저장소를 사용하지 않습니다.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+import logging
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401 - pandas Parquet 엔진
+except ImportError:  # pragma: no cover - runtime 설치 안 된 경우 대비
+    pyarrow = None
+
+from core.modules.factor_scoring import (
+    MOMENTUM_PERIODS,
+    SCREENING_PRICE_DAYS,
+    SCREENING_VOLATILITY_DAYS,
+    FactorScorer,
+    price_snapshot_factors,
+    score_snapshot
+)
+from core.modules.financials_index import FinancialsIndex, get_financials_index
+from core.utils.atomic_file import atomic_write, file_lock
+from core.utils.db_utils import get_financials_version, get_price_version
+from core.utils.price_store import load_panel
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+DEFAULT_STORE_DIR = Path(os.getenv("FACTOR_STORE_DIR", PROJECT_ROOT / "data" / "factor_scores"))
+STORE_ENABLED = os.getenv("FACTOR_STORE_ENABLED", "1") != "0"
+MANIFEST_FILE = "manifest.json"
+
+SCORE_COLUMNS = [
+    'value_score', 'growth_score', 'profitability_score',
+    'momentum_score', 'stability_score', 'leadership_score'
+]
+STORE_COLUMNS = [
+    'date', 'code', 'name', 'sector', 'year', 'quarter',
+    'roe', 'roa', 'debt_ratio', 'operating_margin', 'net_margin',
+    'revenue_growth', 'operating_profit_growth', 'net_profit_growth',
+    'close', 'volatility'
+] + [f'return_{period}d' for period in MOMENTUM_PERIODS] + SCORE_COLUMNS
+
+
+def current_versions() -> Dict:
+    """현재 가격/재무 데이터 버전 (manifest 비교용 JSON 값)"""
+    price_date, price_rows = get_price_version()
+    quarter, financial_rows = get_financials_version()
+    return {
+        'price_version': [price_date.isoformat() if price_date else None, int(price_rows)],
+        'financials_version': [int(quarter) if quarter is not None else None, int(financial_rows)],
+    }
+
+
+class FactorStore:
+    """
+    연도별 Parquet 팩터 점수 저장소
+
+    Example:
+        store = get_factor_store()
+        history = store.history('momentum_score', start="2024-01-01")   # 날짜 x 종목
+        snapshot = store.snapshot(store.dates()[-1])
+    """
+
+    def __init__(self, root: Union[str, Path] = DEFAULT_STORE_DIR, enabled: bool = STORE_ENABLED):
+        self.root = Path(root)
+        self.enabled = enabled and pyarrow is not None
+        self._lock = threading.RLock()
+        self._manifest = self._read_manifest() if self.enabled else {}
+        # 최근 스냅샷 (날짜, 계산 시각, frame) - 장중 반복 조회는 파일을 다시 읽지 않음
+        self._snapshot: Optional[tuple] = None
+
+    def _manifest_path(self) -> Path:
+        return self.root / MANIFEST_FILE
+
+    def _year_path(self, year: int) -> Path:
+        return self.root / f"year={year}.parquet"
+
+    def _read_manifest(self) -> Dict[str, Dict]:
+        path = self._manifest_path()
+        if not path.exists():
+            return {}
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_manifest(self):
+        with atomic_write(self._manifest_path()) as f:
+            json.dump(dict(sorted(self._manifest.items())), f, indent=2)
+
+    def _read_year(self, year: int, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        path = self._year_path(year)
+        if not path.exists():
+            return pd.DataFrame(columns=columns or STORE_COLUMNS)
+        return pd.read_parquet(path, columns=columns)
+
+    def dates(self) -> pd.DatetimeIndex:
+        """저장된 날짜 (오름차순)"""
+        return pd.DatetimeIndex(sorted(self._manifest), name='date')
+
+    def info(self, date) -> Optional[Dict]:
+        """날짜별 manifest 항목 (rows, computed_at, price_version, financials_version)"""
+        return self._manifest.get(pd.Timestamp(date).date().isoformat())
+
+    def write(self, scores: pd.DataFrame, versions: Optional[Dict] = None):
+        """
+        날짜 단위 upsert (같은 날짜의 기존 행은 교체)
+
+        다른 프로세스의 쓰기와 겹치지 않도록 파일 잠금 안에서 디스크의 manifest를
+        다시 읽고 연도 파일을 병합합니다.
+
+        Args:
+            scores: STORE_COLUMNS 형식 DataFrame (여러 날짜 가능)
+            versions: 계산에 사용한 데이터 버전 (current_versions 결과)
+        """
+        if not self.enabled or scores.empty:
+            return
+
+        frame = scores.reindex(columns=STORE_COLUMNS)
+        frame['date'] = pd.to_datetime(frame['date']).dt.normalize()
+        computed_at = datetime.now().isoformat(timespec='seconds')
+
+        with self._lock, file_lock(self._manifest_path()):
+            self._manifest = self._read_manifest()
+            for year, new_rows in frame.groupby(frame['date'].dt.year):
+                existing = self._read_year(int(year))
+                existing = existing[~existing['date'].isin(new_rows['date'].unique())]
+                merged = pd.concat([existing, new_rows], ignore_index=True) if not existing.empty else new_rows
+                merged = merged.sort_values(['date', 'code']).reset_index(drop=True)
+
+                with atomic_write(self._year_path(int(year)), "wb") as f:
+                    merged.to_parquet(f, index=False)
+
+            for date, rows in frame.groupby('date').size().items():
+                self._manifest[date.date().isoformat()] = {
+                    'rows': int(rows), 'computed_at': computed_at, **(versions or {})
+                }
+            self._write_manifest()
+            self._snapshot = None
+
+    def load(self, start=None, end=None, codes: Optional[Sequence[str]] = None,
+             columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        기간 조회 (tidy)
+
+        Args:
+            start: 시작일 (None이면 처음부터)
+            end: 종료일 (None이면 끝까지)
+            codes: 대상 종목 (None이면 전체)
+            columns: 읽을 컬럼 (date, code는 항상 포함)
+
+        Returns:
+            DataFrame (date, code, ...) - (date, code) 정렬
+        """
+        dates = self.dates()
+        if not self.enabled or dates.empty:
+            return pd.DataFrame(columns=['date', 'code'] + list(columns or STORE_COLUMNS[2:]))
+
+        start = pd.Timestamp(start) if start is not None else dates[0]
+        end = pd.Timestamp(end) if end is not None else dates[-1]
+        names = None if columns is None else ['date', 'code'] + [c for c in columns if c not in ('date', 'code')]
+
+        frames = []
+        for year in range(start.year, end.year + 1):
+            if not self._year_path(year).exists():
+                continue
+            frame = self._read_year(year, names)
+            frame = frame[(frame['date'] >= start) & (frame['date'] <= end)]
+            if codes is not None:
+                frame = frame[frame['code'].isin(list(codes))]
+            frames.append(frame)
+
+        if not frames:
+            return pd.DataFrame(columns=names or STORE_COLUMNS)
+        return pd.concat(frames, ignore_index=True)
+
+    def history(self, column: str, start=None, end=None, codes: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        팩터 점수/값 이력 (IC/감쇠 분석용)
+
+        Returns:
+            DataFrame (index: date, columns: code)
+        """
+        tidy = self.load(start, end, codes, [column])
+        if tidy.empty:
+            return pd.DataFrame()
+        return tidy.pivot(index='date', columns='code', values=column)
+
+    def snapshot(self, date) -> pd.DataFrame:
+        """한 날짜의 전 종목 행 (프로세스 내 캐시)"""
+        date = pd.Timestamp(date).normalize()
+        info = self.info(date) or {}
+        with self._lock:
+            cached = self._snapshot
+            if cached is not None and cached[:2] == (date, info.get('computed_at')):
+                return cached[2]
+            frame = self.load(date, date).reset_index(drop=True)
+            self._snapshot = (date, info.get('computed_at'), frame)
+            return frame
+
+
+_store: Optional[FactorStore] = None
+_store_lock = threading.Lock()
+
+
+def get_factor_store() -> FactorStore:
+    """프로세스 공용 FactorStore"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = FactorStore()
+        return _store
+
+
+def compute_factor_scores(
+    financials: FinancialsIndex,
+    close: pd.DataFrame,
+    dates,
+    latest_date=None
+) -> pd.DataFrame:
+    """
+    날짜별 전 종목 팩터 입력값과 점수 (필터 없음)
+
+    가격 구간/변동성 구간은 screen_stocks와 같다 (기준일 이전 SCREENING_*_DAYS 달력일).
+
+    Args:
+        financials: 재무 인덱스
+        close: 종가 행렬 (index: date, columns: code) - 가장 이른 날짜의 가격 구간 포함
+        dates: 계산할 날짜
+        latest_date: 이 날짜는 최신 분기 재무와 주도주 점수 사용, 나머지는 as-of 재무
+
+    Returns:
+        STORE_COLUMNS 형식 DataFrame
+    """
+    scorer = FactorScorer()
+    latest_date = pd.Timestamp(latest_date) if latest_date is not None else None
+    frames = []
+
+    for date in pd.DatetimeIndex(dates):
+        window = close.loc[date - pd.Timedelta(days=SCREENING_PRICE_DAYS):date]
+        if window.empty:
+            continue
+        factors = price_snapshot_factors(
+            window, MOMENTUM_PERIODS, date - pd.Timedelta(days=SCREENING_VOLATILITY_DAYS)
+        )
+        is_latest = date == latest_date
+        metrics = financials.latest() if is_latest else financials.asof(date)
+        scored = score_snapshot(metrics, factors, scorer, -np.inf, np.inf, leadership=is_latest)
+        if scored.empty:
+            continue
+        scored.insert(0, 'date', date)
+        frames.append(scored.reindex(columns=STORE_COLUMNS))
+
+    if not frames:
+        return pd.DataFrame(columns=STORE_COLUMNS)
+    return pd.concat(frames, ignore_index=True)
+
+
+def update_factor_scores(backfill_start=None, store: Optional[FactorStore] = None) -> Dict:
+    """
+    일간 팩터 점수 갱신 (저장되지 않은 거래일만 계산)
+
+    최신 거래일이 이미 있어도 가격/재무 데이터 버전이 바뀌었으면 다시 계산합니다.
+
+    Args:
+        backfill_start: 이 날짜 이후 비어 있는 거래일도 채움 (None이면 최신 거래일만)
+        store: 저장소 (None이면 공용 저장소)
+
+    Returns:
+        {'status', 'dates', 'rows'}
+    """
+    store = store or get_factor_store()
+    if not store.enabled:
+        return {'status': 'error', 'message': 'pyarrow 미설치 또는 FACTOR_STORE_ENABLED=0'}
+
+    try:
+        versions = current_versions()
+        if versions['price_version'][0] is None:
+            return {'status': 'error', 'message': '가격 데이터 없음'}
+
+        latest = pd.Timestamp(versions['price_version'][0])
+        start = min(pd.Timestamp(backfill_start), latest) if backfill_start else latest
+        info = store.info(latest) or {}
+        up_to_date = all(info.get(key) == value for key, value in versions.items())
+        if up_to_date and start == latest:
+            return {'status': 'success', 'dates': [], 'rows': 0}
+
+        financials = get_financials_index()
+        close = load_panel(list(financials.codes), start - pd.Timedelta(days=SCREENING_PRICE_DAYS), latest, "close")
+        if close.empty:
+            return {'status': 'error', 'message': '가격 데이터 없음'}
+
+        stored = set(store.dates())
+        trading_days = close.index[close.index >= start]
+        targets = [
+            date for date in trading_days
+            if date not in stored or (date == latest and not up_to_date)
+        ]
+        scores = compute_factor_scores(financials, close, targets, latest_date=latest)
+        store.write(scores, versions)
+
+        return {
+            'status': 'success',
+            'dates': [date.date().isoformat() for date in targets],
+            'rows': len(scores),
+        }
+
+    except Exception as e:
+        return {'status': 'error', 'message': str(e)}
+
+
+def current_factor_snapshot() -> Optional[pd.DataFrame]:
+    """
+    현재 데이터 버전으로 계산된 최신 스냅샷 (없거나 오래됐으면 None)
+
+    screen_stocks가 장중 반복 호출을 조회로 처리할 때 사용합니다.
+    버전은 마지막 완성 거래일 기준이므로 장중 현재가 저장으로는 다시 계산하지 않습니다.
+    """
+    store = get_factor_store()
+    dates = store.dates()
+    if not store.enabled or dates.empty:
+        return None
+
+    try:
+        versions = current_versions()
+        latest = versions['price_version'][0]
+        info = store.info(latest) if latest else None
+        if not info or any(info.get(key) != value for key, value in versions.items()):
+            return None
+        return store.snapshot(latest)
+
+    except Exception as e:
+        logger.warning(f"팩터 저장소 조회 실패: {e}. 직접 계산합니다.")
+        return None
+
+
+if __name__ == "__main__":
+    """스크립트 직접 실행 시 최신 거래일 팩터 점수 저장"""
+    import sys
+
+    result = update_factor_scores(backfill_start=sys.argv[1] if len(sys.argv) > 1 else None)
+    if result['status'] == 'success':
+        print(f"✓ 팩터 점수 저장: {len(result['dates'])}일, {result['rows']:,} rows")
+    else:
+        print(f"✗ 팩터 점수 저장 실패: {result['message']}")
+        sys.exit(1)
@@ -111,10 +111,15 @@ def calculate_growth_rates(df: pd.DataFrame, periods: int = 4) -> pd.DataFrame:
     """
     result = df.copy()
 
-    # 종목별로 그룹화하여 성장률 계산
-    for col in ['revenue', 'operating_profit', 'net_profit']:
-        if col in result.columns:
-            result[f'{col}_growth'] = result.groupby('code')[col].pct_change(periods) * 100
+    # 종목별로 그룹화하여 성장률 계산 (groupby.pct_change와 같은 결과 - 결측은 직전 값으로 채움)
+    # 그룹별 반복 없이 ffill/shift만 사용해 전 종목을 한 번에 계산
+    columns = [col for col in ['revenue', 'operating_profit', 'net_profit'] if col in result.columns]
+    if columns:
+        grouped = result.groupby('code')
+        filled = grouped[columns].ffill()
+        previous = filled.groupby(result['code']).shift(periods)
+        for col in columns:
+            result[f'{col}_growth'] = (filled[col] / previous[col] - 1) * 100
 
     return result
 
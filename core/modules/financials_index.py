@@ -0,0 +1,164 @@
+"""
+시점 기준(as-of) 재무 데이터 인덱스
+
+분기 재무 데이터를 (종목, 공시일) 순으로 정렬해 두고, 임의의 날짜(또는 날짜 벡터)에
+그 시점까지 공시된 종목별 최신 보고서를 merge_asof와 같은 규칙으로 찾습니다.
+재무 비율과 YoY/QoQ 성장률은 인덱스를 만들 때 한 번만 계산합니다.
+
+- 공시일(available_date): 분기 종료일 + 공시 기한(REPORT_LAG_DAYS)
+- 조회: (종목 번호, 공시일) 정수 키에 대한 searchsorted 한 번 (날짜 x 종목 격자 전체)
+
+전체 재무 테이블 인덱스는 get_financials_index()로 재무 데이터 버전별로 재사용합니다.
+"""
+
+import threading
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from core.modules.financial_metrics import (
+    calculate_basic_ratios,
+    calculate_growth_rates,
+    calculate_profitability_metrics,
+    get_financial_data_from_db
+)
+from core.utils.db_utils import get_financials_version
+
+# 분기 보고서 공시 기한 (분기 종료일 기준 일수, 4분기는 사업보고서)
+REPORT_LAG_DAYS = {1: 45, 2: 45, 3: 45, 4: 90}
+GROWTH_COLUMNS = ['revenue', 'operating_profit', 'net_profit']
+# 조회 키 = 종목 번호 x _KEY_STRIDE + 1970-01-01 이후 일수
+_KEY_STRIDE = 1 << 20
+
+
+def financials_available_date(financials: pd.DataFrame) -> pd.Series:
+    """분기 보고서가 공시되어 사용 가능해지는 날짜 (분기 종료일 + 공시 기한)"""
+    quarter_end = pd.PeriodIndex.from_fields(
+        year=financials['year'].astype(int), quarter=financials['quarter'].astype(int), freq='Q'
+    ).end_time.normalize()
+    lag = pd.to_timedelta(financials['quarter'].map(REPORT_LAG_DAYS).fillna(90), unit='D')
+    return pd.Series(quarter_end + lag.to_numpy(), index=financials.index)
+
+
+def _days(dates) -> np.ndarray:
+    """날짜 → 1970-01-01 이후 일수 (시각은 버림)"""
+    return np.asarray(pd.DatetimeIndex(dates).values.astype('datetime64[D]').astype(np.int64))
+
+
+class FinancialsIndex:
+    """
+    (종목, 공시일) 정렬 재무 데이터
+
+    Example:
+        index = get_financials_index()
+        snapshot = index.asof("2023-06-30")                  # 종목당 1행
+        panel = index.asof_many(rebalance_dates, codes)      # (asof_date, code) 행
+    """
+
+    def __init__(self, financials: pd.DataFrame, prepared: bool = False):
+        """
+        Args:
+            financials: get_financial_data_from_db 형식의 분기 재무 데이터
+            prepared: True면 이미 비율/성장률/공시일이 계산된 frame (select 등 내부용)
+        """
+        frame = financials if prepared else self._prepare(financials)
+        self.frame = frame.reset_index(drop=True)
+        self.codes = pd.Index(self.frame['code'].unique()) if not frame.empty else pd.Index([])
+        self._code_idx = self.codes.get_indexer(self.frame['code']) if not frame.empty else np.array([], dtype=int)
+        days = _days(self.frame['available_date']) if not frame.empty else np.array([], dtype=np.int64)
+        self._keys = self._code_idx.astype(np.int64) * _KEY_STRIDE + days
+
+    @staticmethod
+    def _prepare(financials: pd.DataFrame) -> pd.DataFrame:
+        """재무 비율, YoY(*_growth)/QoQ(*_qoq_growth) 성장률, 공시일 계산 후 (code, available_date) 정렬"""
+        if financials.empty:
+            return financials.assign(available_date=pd.Series(dtype='datetime64[ns]'))
+
+        df = financials.sort_values(['code', 'year', 'quarter']).reset_index(drop=True)
+        df = calculate_profitability_metrics(calculate_basic_ratios(df))
+        # 성장률은 과거 분기만 참조하므로 공시일 기준으로도 미래 정보가 섞이지 않음
+        qoq = calculate_growth_rates(df[['code'] + GROWTH_COLUMNS], periods=1)
+        df = calculate_growth_rates(df, periods=4)
+        for col in GROWTH_COLUMNS:
+            df[f'{col}_qoq_growth'] = qoq[f'{col}_growth']
+        df['available_date'] = financials_available_date(df)
+        return df.sort_values(['code', 'available_date'], kind='stable')
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    @property
+    def empty(self) -> bool:
+        return self.frame.empty
+
+    def select(self, codes: Sequence[str]) -> 'FinancialsIndex':
+        """일부 종목만 담은 인덱스 (재계산 없음)"""
+        return FinancialsIndex(self.frame[self.frame['code'].isin(list(codes))], prepared=True)
+
+    def asof_many(self, dates, codes: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        날짜별로 그 시점에 공시되어 있던 종목별 최신 재무 데이터
+
+        Args:
+            dates: 기준일 목록 (당일 공시분 포함)
+            codes: 대상 종목 (None이면 전체)
+
+        Returns:
+            DataFrame (asof_date, code, 재무 컬럼...) - asof_date, 종목 순. 공시 전 종목은 제외
+        """
+        dates = pd.DatetimeIndex(dates)
+        codes = self.codes if codes is None else pd.Index(codes)
+        code_idx = self.codes.get_indexer(codes)
+        code_idx = code_idx[code_idx >= 0].astype(np.int64)
+        if self.empty or len(dates) == 0 or len(code_idx) == 0:
+            return pd.DataFrame(columns=['asof_date'] + list(self.frame.columns))
+
+        query_codes = np.tile(code_idx, len(dates))
+        queries = query_codes * _KEY_STRIDE + np.repeat(_days(dates), len(code_idx))
+        positions = np.searchsorted(self._keys, queries, side='right') - 1
+        found = positions >= 0
+        found[found] = self._code_idx[positions[found]] == query_codes[found]
+
+        result = self.frame.iloc[positions[found]].reset_index(drop=True)
+        result.insert(0, 'asof_date', np.repeat(dates.values, len(code_idx))[found])
+        return result
+
+    def asof(self, date, codes: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """기준일에 공시되어 있던 종목별 최신 재무 데이터 (종목당 1행)"""
+        return self.asof_many([pd.Timestamp(date)], codes).drop(columns='asof_date')
+
+    def latest(self, codes: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """공시일과 관계없이 종목별 마지막 분기 (실시간 스크리닝용, 종목당 1행)"""
+        if self.empty:
+            return self.frame.copy()
+
+        last = np.r_[self._code_idx[1:] != self._code_idx[:-1], True]
+        result = self.frame[last]
+        if codes is not None:
+            result = result[result['code'].isin(list(codes))]
+        return result.reset_index(drop=True)
+
+
+_index_lock = threading.Lock()
+_index_cache = {}
+
+
+def get_financials_index(refresh: bool = False) -> FinancialsIndex:
+    """
+    전체 재무 테이블 인덱스 (재무 데이터 버전이 같으면 재사용)
+
+    Args:
+        refresh: True면 캐시를 무시하고 다시 조회
+
+    Returns:
+        FinancialsIndex
+    """
+    version = get_financials_version()
+    with _index_lock:
+        index = _index_cache.get(version)
+        if index is None or refresh:
+            index = FinancialsIndex(get_financial_data_from_db())
+            _index_cache.clear()
+            _index_cache[version] = index
+    return index
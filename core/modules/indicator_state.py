@@ -0,0 +1,590 @@
+"""
+증분(스트리밍) 기술적 지표 상태
+
+technical_indicators의 지표를 전체 이력 재계산 없이 봉 하나씩 갱신한다.
+모든 상태 객체는 __slots__ 기반이며 update/preview가 O(1)이고,
+to_dict/from_dict로 JSON 직렬화하여 디스크(또는 DB JSON 컬럼)에 보관할 수 있다.
+
+- update(close): 완성된 봉을 반영하고 지표 값 반환
+- preview(close): 형성 중인 봉(장중 현재가)을 반영했을 때의 값만 계산 (상태 변경 없음)
+
+값은 technical_indicators의 배치 함수(calculate_sma, calculate_rsi 등)와 같다.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+from collections import deque
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import logging
+import pandas as pd
+
+from core.modules.technical_indicators import INDICATOR_COLUMNS
+from core.utils.atomic_file import atomic_write, file_lock
+from core.utils.price_store import load_panel
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+DEFAULT_STATE_PATH = Path(os.getenv("INDICATOR_STATE_PATH", PROJECT_ROOT / "data" / "indicator_state" / "states.json"))
+# 초기 상태를 만들 때 읽는 이력 기간 (analyze_technical_indicators 기본값과 동일)
+DEFAULT_HISTORY_DAYS = 120
+# 누적합 오차를 막기 위해 period * RESUM_FACTOR 회마다 창 합계를 다시 계산
+RESUM_FACTOR = 4
+# 분산 / 평균^2 이 이보다 작으면 누적합 대신 창 전체로 다시 계산 (O(period), 횡보 구간에서만 발생)
+CANCELLATION_EPS = 1e-10
+
+NAN = float("nan")
+_STATE_TYPES: Dict[str, type] = {}
+
+
+def _encode(value):
+    if isinstance(value, _State):
+        return {"__state__": type(value).__name__, **value.to_dict()}
+    if isinstance(value, deque):
+        return {"__deque__": list(value), "maxlen": value.maxlen}
+    if isinstance(value, date):
+        return {"__date__": value.isoformat()}
+    return value
+
+
+def _decode(value):
+    if isinstance(value, dict):
+        if "__state__" in value:
+            return _STATE_TYPES[value["__state__"]].from_dict(value)
+        if "__deque__" in value:
+            return deque(value["__deque__"], maxlen=value["maxlen"])
+        if "__date__" in value:
+            return date.fromisoformat(value["__date__"])
+    return value
+
+
+class _State:
+    """__slots__ 상태 객체 공통 직렬화"""
+
+    __slots__ = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        _STATE_TYPES[cls.__name__] = cls
+
+    def to_dict(self) -> Dict:
+        return {name: _encode(getattr(self, name)) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: Dict):
+        obj = cls.__new__(cls)
+        for name in cls.__slots__:
+            setattr(obj, name, _decode(data[name]))
+        return obj
+
+
+class RollingWindow(_State):
+    """
+    고정 길이 이동 창 (평균/표준편차)
+
+    합계는 기준값(shift)을 뺀 값으로 유지하여 가격처럼 큰 값에서도
+    분산 계산의 자릿수 손실을 줄인다.
+    """
+
+    __slots__ = ("period", "values", "shift", "total", "total_sq", "nonzero", "pushes")
+
+    def __init__(self, period: int):
+        self.period = period
+        self.values = deque(maxlen=period)
+        self.shift = 0.0
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.nonzero = 0
+        self.pushes = 0
+
+    def _stats_with(self, x: float) -> Tuple[int, float, float, int]:
+        """x를 추가했을 때의 (개수, 합, 제곱합, 0 아닌 값 개수)"""
+        d = x - self.shift
+        n = len(self.values) + 1
+        total = self.total + d
+        total_sq = self.total_sq + d * d
+        nonzero = self.nonzero + int(x != 0)
+        if n > self.period:
+            old = self.values[0]
+            od = old - self.shift
+            n, total, total_sq = self.period, total - od, total_sq - od * od
+            nonzero -= int(old != 0)
+        return n, total, total_sq, nonzero
+
+    def _resum(self):
+        self.shift = math.fsum(self.values) / len(self.values)
+        deltas = [v - self.shift for v in self.values]
+        self.total = math.fsum(deltas)
+        self.total_sq = math.fsum(d * d for d in deltas)
+
+    def push(self, x: float):
+        """값 추가 (창이 차면 가장 오래된 값 제거)"""
+        self.total, self.total_sq, self.nonzero = self._stats_with(x)[1:]
+        self.values.append(x)
+        self.pushes += 1
+        if self.pushes % (self.period * RESUM_FACTOR) == 0:
+            self._resum()
+
+    def _mean(self, n: int, total: float, nonzero: int) -> float:
+        if n < self.period:
+            return NAN
+        if nonzero == 0:
+            return 0.0
+        return self.shift + total / n
+
+    def _std(self, window_values, n: int, total: float, total_sq: float, ddof: int = 1) -> float:
+        if n < self.period or n <= ddof:
+            return NAN
+        var = (total_sq - total * total / n) / (n - ddof)
+        mean = self.shift + total / n
+        if var <= CANCELLATION_EPS * max(mean * mean, 1.0):
+            # 분산이 값 크기에 비해 매우 작으면 누적합 오차가 지배하므로 창을 다시 계산
+            values = window_values()
+            mean = math.fsum(values) / n
+            var = math.fsum((v - mean) ** 2 for v in values) / (n - ddof)
+        return math.sqrt(max(var, 0.0))
+
+    def mean(self) -> float:
+        return self._mean(len(self.values), self.total, self.nonzero)
+
+    def std(self, ddof: int = 1) -> float:
+        return self._std(lambda: self.values, len(self.values), self.total, self.total_sq, ddof)
+
+    def preview_mean(self, x: float) -> float:
+        n, total, _, nonzero = self._stats_with(x)
+        return self._mean(n, total, nonzero)
+
+    def preview_std(self, x: float, ddof: int = 1) -> float:
+        n, total, total_sq, _ = self._stats_with(x)
+        return self._std(lambda: list(self.values)[len(self.values) + 1 - n:] + [x], n, total, total_sq, ddof)
+
+
+class SMAState(_State):
+    """단순 이동평균 (calculate_sma)"""
+
+    __slots__ = ("window",)
+
+    def __init__(self, period: int = 20):
+        self.window = RollingWindow(period)
+
+    def update(self, close: float) -> float:
+        self.window.push(close)
+        return self.window.mean()
+
+    def preview(self, close: float) -> float:
+        return self.window.preview_mean(close)
+
+
+class EMAState(_State):
+    """지수 이동평균, adjust=False (calculate_ema)"""
+
+    __slots__ = ("alpha", "value")
+
+    def __init__(self, period: int = 20):
+        self.alpha = 2.0 / (period + 1.0)
+        self.value = None
+
+    def preview(self, x: float) -> float:
+        if self.value is None:
+            return x
+        return (1 - self.alpha) * self.value + self.alpha * x
+
+    def update(self, x: float) -> float:
+        self.value = self.preview(x)
+        return self.value
+
+
+class RSIState(_State):
+    """
+    RSI
+
+    method='sma': 상승/하락폭의 단순 이동평균 (calculate_rsi와 동일, 첫 봉 변화량 0)
+    method='wilder': Wilder 평활 (첫 period개 변화량 평균으로 시작)
+    """
+
+    __slots__ = ("period", "method", "prev_close", "gains", "losses", "avg_gain", "avg_loss", "count")
+
+    def __init__(self, period: int = 14, method: str = "sma"):
+        if method not in ("sma", "wilder"):
+            raise ValueError(f"알 수 없는 RSI 방식: {method}")
+        self.period = period
+        self.method = method
+        self.prev_close = None
+        self.gains = RollingWindow(period)
+        self.losses = RollingWindow(period)
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+        self.count = 0
+
+    @staticmethod
+    def _rsi(avg_gain: float, avg_loss: float) -> float:
+        if avg_loss == 0:
+            return 100.0 if avg_gain > 0 else NAN
+        return 100 - (100 / (1 + avg_gain / avg_loss))
+
+    def _step(self, close: float):
+        """(gain, loss, 다음 평균 상승, 다음 평균 하락, 다음 개수)"""
+        if self.prev_close is None:
+            return 0.0, 0.0, self.avg_gain, self.avg_loss, self.count
+        delta = close - self.prev_close
+        gain, loss = max(delta, 0.0), max(-delta, 0.0)
+        count = self.count + 1
+        p = self.period
+        if count <= p:
+            avg_gain = self.avg_gain + (gain - self.avg_gain) / count
+            avg_loss = self.avg_loss + (loss - self.avg_loss) / count
+        else:
+            avg_gain = (self.avg_gain * (p - 1) + gain) / p
+            avg_loss = (self.avg_loss * (p - 1) + loss) / p
+        return gain, loss, avg_gain, avg_loss, count
+
+    def preview(self, close: float) -> float:
+        gain, loss, avg_gain, avg_loss, count = self._step(close)
+        if self.method == "sma":
+            mean_gain = self.gains.preview_mean(gain)
+            mean_loss = self.losses.preview_mean(loss)
+            return NAN if math.isnan(mean_gain) else self._rsi(mean_gain, mean_loss)
+        return self._rsi(avg_gain, avg_loss) if count >= self.period else NAN
+
+    def update(self, close: float) -> float:
+        value = self.preview(close)
+        gain, loss, self.avg_gain, self.avg_loss, self.count = self._step(close)
+        self.gains.push(gain)
+        self.losses.push(loss)
+        self.prev_close = close
+        return value
+
+
+class MACDState(_State):
+    """MACD (calculate_macd) - (macd, signal, histogram)"""
+
+    __slots__ = ("fast", "slow", "signal")
+
+    def __init__(self, fast_period: int = 12, slow_period: int = 26, signal_period: int = 9):
+        self.fast = EMAState(fast_period)
+        self.slow = EMAState(slow_period)
+        self.signal = EMAState(signal_period)
+
+    def preview(self, close: float) -> Tuple[float, float, float]:
+        macd = self.fast.preview(close) - self.slow.preview(close)
+        signal = self.signal.preview(macd)
+        return macd, signal, macd - signal
+
+    def update(self, close: float) -> Tuple[float, float, float]:
+        macd = self.fast.update(close) - self.slow.update(close)
+        signal = self.signal.update(macd)
+        return macd, signal, macd - signal
+
+
+class BollingerState(_State):
+    """볼린저 밴드 (calculate_bollinger_bands) - (upper, middle, lower)"""
+
+    __slots__ = ("window", "std_dev")
+
+    def __init__(self, period: int = 20, std_dev: float = 2.0):
+        self.window = RollingWindow(period)
+        self.std_dev = std_dev
+
+    def _bands(self, middle: float, std: float) -> Tuple[float, float, float]:
+        return middle + std * self.std_dev, middle, middle - std * self.std_dev
+
+    def preview(self, close: float) -> Tuple[float, float, float]:
+        return self._bands(self.window.preview_mean(close), self.window.preview_std(close))
+
+    def update(self, close: float) -> Tuple[float, float, float]:
+        self.window.push(close)
+        return self._bands(self.window.mean(), self.window.std())
+
+
+class VolatilityState(_State):
+    """수익률 이동 표준편차, 연율화 % (calculate_volatility)"""
+
+    __slots__ = ("window", "prev_close")
+
+    def __init__(self, period: int = 20):
+        self.window = RollingWindow(period)
+        self.prev_close = None
+
+    def preview(self, close: float) -> float:
+        if self.prev_close is None:
+            return NAN
+        return self.window.preview_std(close / self.prev_close - 1) * math.sqrt(252) * 100
+
+    def update(self, close: float) -> float:
+        value = self.preview(close)
+        if self.prev_close is not None:
+            self.window.push(close / self.prev_close - 1)
+        self.prev_close = close
+        return value
+
+
+class MomentumState(_State):
+    """모멘텀/변화율 (calculate_momentum, calculate_rate_of_change) - (momentum, roc)"""
+
+    __slots__ = ("closes",)
+
+    def __init__(self, period: int = 10):
+        self.closes = deque(maxlen=period)
+
+    def preview(self, close: float) -> Tuple[float, float]:
+        if len(self.closes) < self.closes.maxlen:
+            return NAN, NAN
+        previous = self.closes[0]
+        return close - previous, (close - previous) / previous * 100
+
+    def update(self, close: float) -> Tuple[float, float]:
+        value = self.preview(close)
+        self.closes.append(close)
+        return value
+
+
+class IndicatorSet(_State):
+    """
+    종목 1개의 전체 지표 상태 (technical_indicators.INDICATOR_COLUMNS)
+
+    observe(날짜, 가격)로 장중 가격을 계속 넣으면, 같은 날짜의 가격은
+    형성 중인 봉으로 미리보기만 하고 날짜가 바뀌면 직전 봉을 잠정 확정한다.
+    잠정 봉(마지막 장중 가격)은 settle(DB 확정 종가)로 교체하며,
+    교체할 수 없으면 DB 이력으로 다시 만든다 (confirmed_date 이후 봉이 잠정 봉).
+
+    Example:
+        state = IndicatorSet.from_closes(history['close'], history['date'])
+        values = state.observe(date.today(), 71200)   # 장중 현재가
+    """
+
+    __slots__ = ("sma_20", "sma_60", "ema_20", "rsi", "macd", "bollinger", "momentum", "volatility",
+                 "last_date", "confirmed_date", "pending_date", "pending_close")
+
+    def __init__(self):
+        self.sma_20 = SMAState(20)
+        self.sma_60 = SMAState(60)
+        self.ema_20 = EMAState(20)
+        self.rsi = RSIState(14)
+        self.macd = MACDState()
+        self.bollinger = BollingerState(20)
+        self.momentum = MomentumState(10)
+        self.volatility = VolatilityState(20)
+        self.last_date = None
+        self.confirmed_date = None
+        self.pending_date = None
+        self.pending_close = None
+
+    @classmethod
+    def from_closes(cls, closes: Iterable[float], dates: Optional[Iterable] = None) -> "IndicatorSet":
+        """과거 종가로 초기 상태 생성 (모든 봉 확정)"""
+        state = cls()
+        dates = list(dates) if dates is not None else None
+        for i, close in enumerate(closes):
+            state.update(float(close), dates[i] if dates is not None else None)
+        return state
+
+    def _collect(self, close: float, step: str) -> Dict[str, float]:
+        macd, signal, histogram = getattr(self.macd, step)(close)
+        upper, middle, lower = getattr(self.bollinger, step)(close)
+        momentum, roc = getattr(self.momentum, step)(close)
+        values = {
+            'sma_20': getattr(self.sma_20, step)(close),
+            'sma_60': getattr(self.sma_60, step)(close),
+            'ema_20': getattr(self.ema_20, step)(close),
+            'rsi': getattr(self.rsi, step)(close),
+            'macd': macd,
+            'macd_signal': signal,
+            'macd_histogram': histogram,
+            'bb_upper': upper,
+            'bb_middle': middle,
+            'bb_lower': lower,
+            'momentum': momentum,
+            'roc': roc,
+            'volatility': getattr(self.volatility, step)(close),
+        }
+        return {'close': close, **{name: values[name] for name in INDICATOR_COLUMNS}}
+
+    def update(self, close: float, bar_date=None, confirmed: bool = True) -> Dict[str, float]:
+        """완성된 봉 반영 (confirmed=False면 장중 가격으로 잠정 확정)"""
+        values = self._collect(float(close), "update")
+        if bar_date is not None:
+            self.last_date = pd.Timestamp(bar_date).date()
+            if confirmed:
+                self.confirmed_date = self.last_date
+        return values
+
+    def settle(self, closes: pd.Series) -> bool:
+        """
+        DB 확정 종가 반영
+
+        확정 종가가 1개이고 잠정 봉이 없으면 그 봉을 확정하고
+        (같은 날짜의 형성 중인 봉은 버림), 그 외에는 상태를 바꾸지 않는다.
+
+        Args:
+            closes: 확정 종가 (index: 거래일) - confirmed_date 이전 날짜는 무시
+
+        Returns:
+            bool: False면 잠정 봉이 있거나 여러 봉이 밀려 있어 이력으로 다시 만들어야 함
+        """
+        closes = closes.dropna()
+        dates = [pd.Timestamp(d).date() for d in closes.index]
+        new = [i for i, d in enumerate(dates) if self.confirmed_date is None or d > self.confirmed_date]
+        if not new:
+            return True
+        if len(new) > 1 or self.last_date != self.confirmed_date:
+            return False
+
+        bar_date = dates[new[0]]
+        self.update(closes.iloc[new[0]], bar_date)
+        if self.pending_date is not None and self.pending_date <= bar_date:
+            self.pending_date, self.pending_close = None, None
+        return True
+
+    def preview(self, close: float) -> Dict[str, float]:
+        """형성 중인 봉을 반영한 값 (상태 변경 없음)"""
+        return self._collect(float(close), "preview")
+
+    def observe(self, bar_date, close: float) -> Dict[str, float]:
+        """
+        장중 가격 반영
+
+        Args:
+            bar_date: 가격의 거래일
+            close: 현재가 (형성 중인 봉의 종가)
+
+        Returns:
+            현재가 기준 지표 값 (확정 봉 + 형성 중인 봉)
+        """
+        bar_date = pd.Timestamp(bar_date).date()
+        if self.last_date is not None and bar_date <= self.last_date:
+            # 이미 확정된 날짜의 가격 (재수집 등) - 확정 상태 그대로 미리보기
+            return self.preview(close)
+
+        if self.pending_date is not None and bar_date > self.pending_date:
+            # 마지막 장중 가격으로 잠정 확정 (DB 확정 종가가 들어오면 settle에서 교체)
+            self.update(self.pending_close, self.pending_date, confirmed=False)
+
+        self.pending_date, self.pending_close = bar_date, float(close)
+        return self.preview(close)
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict())
+
+    @classmethod
+    def from_json(cls, payload: str) -> "IndicatorSet":
+        return cls.from_dict(json.loads(payload))
+
+
+class IndicatorStateStore:
+    """종목별 IndicatorSet 파일 저장소 ({code: state} 하나의 JSON 파일)"""
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_STATE_PATH):
+        self.path = Path(path)
+
+    def load(self) -> Dict[str, IndicatorSet]:
+        if not self.path.exists():
+            return {}
+        try:
+            payload = json.loads(self.path.read_text(encoding="utf-8"))
+            return {code: IndicatorSet.from_dict(data) for code, data in payload.items()}
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"지표 상태 파일 읽기 실패 ({self.path}): {e}")
+            return {}
+
+    def save(self, states: Dict[str, IndicatorSet]):
+        with atomic_write(self.path) as f:
+            json.dump({code: state.to_dict() for code, state in states.items()}, f)
+
+    def lock(self):
+        """load → save 사이 다른 프로세스의 갱신을 막는 파일 잠금"""
+        return file_lock(self.path)
+
+
+def _complete_closes(codes: List[str], start, end) -> pd.DataFrame:
+    """완성 일봉 종가 패널 (장중 저장된 open 없는 행 제외)"""
+    panel = load_panel(codes, start, end, ["open", "close"])
+    if panel.empty:
+        return pd.DataFrame(index=pd.DatetimeIndex([], name='date'), dtype=float)
+    return panel['close'].where(panel['open'].notna())
+
+
+def bootstrap_states(codes: List[str], as_of=None, history_days: int = DEFAULT_HISTORY_DAYS) -> Dict[str, IndicatorSet]:
+    """
+    과거 종가 패널로 종목별 초기 상태 생성 (as_of 전일까지 확정)
+
+    Args:
+        codes: 종목 코드 리스트
+        as_of: 기준일 (None이면 오늘) - 이 날짜의 봉은 형성 중으로 보고 제외
+        history_days: 이력 기간 (일수)
+    """
+    as_of = pd.Timestamp(as_of or date.today()).date()
+    end = as_of - timedelta(days=1)
+    close = _complete_closes(codes, end - timedelta(days=history_days), end)
+
+    states = {}
+    for code in codes:
+        if code not in close.columns:
+            states[code] = IndicatorSet()
+            continue
+        series = close[code].dropna()
+        states[code] = IndicatorSet.from_closes(series.to_numpy(), series.index)
+    return states
+
+
+def update_intraday_indicators(
+    price_data: Dict[str, Dict],
+    store: Optional[IndicatorStateStore] = None,
+) -> Dict[str, Dict[str, float]]:
+    """
+    장중 가격으로 보유 종목 지표 갱신
+
+    저장된 상태가 없는 종목만 이력을 읽어 초기화하고,
+    나머지는 가격 1건씩 O(1)로 갱신한 뒤 상태를 다시 저장합니다.
+    날짜가 바뀐 종목은 직전 봉을 DB 확정 종가로 교체하고, 잠정 봉이 남아 있거나
+    DB가 여러 봉 앞서 있으면 DB 이력으로 다시 만듭니다.
+
+    Args:
+        price_data: {code: {'date': date, 'close': float, ...}} (price_updater.fetch_price_data 결과)
+        store: 상태 저장소 (None이면 기본 경로)
+
+    Returns:
+        {code: {'close': ..., 'sma_20': ..., ...}}
+    """
+    store = store or IndicatorStateStore()
+    with store.lock():
+        return _update_states(store, price_data)
+
+
+def _update_states(store: IndicatorStateStore, price_data: Dict[str, Dict]) -> Dict[str, Dict[str, float]]:
+    states = store.load()
+
+    bar_dates = {code: pd.Timestamp(data['date']).date() for code, data in price_data.items()}
+    missing = [code for code in price_data if code not in states]
+
+    # 마지막 확정일 이후 DB 확정 종가 (전 종목 1회 조회)
+    stale = [
+        code for code in price_data
+        if code not in missing and (states[code].confirmed_date is None
+                                    or states[code].confirmed_date < bar_dates[code] - timedelta(days=1))
+    ]
+    if stale:
+        since = min(states[code].confirmed_date or bar_dates[code] - timedelta(days=DEFAULT_HISTORY_DAYS)
+                    for code in stale)
+        closes = _complete_closes(stale, since + timedelta(days=1), max(bar_dates.values()) - timedelta(days=1))
+        for code in stale:
+            series = closes[code] if code in closes.columns else pd.Series(index=closes.index[:0], dtype=float)
+            series = series[series.index < pd.Timestamp(bar_dates[code])]
+            if not states[code].settle(series):
+                missing.append(code)
+
+    if missing:
+        as_of = min(bar_dates[code] for code in missing)
+        states.update(bootstrap_states(missing, as_of=as_of))
+
+    indicators = {
+        code: states[code].observe(bar_dates[code], data['close'])
+        for code, data in price_data.items()
+    }
+    store.save(states)
+    return indicators
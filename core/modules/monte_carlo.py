@@ -0,0 +1,249 @@
+"""
+몬테카를로 포트폴리오 리스크 시뮬레이션
+
+과거 수익률 패널(날짜 x 종목)에서 미래 수익률 경로를 대량으로 생성해
+역사적 점추정(calculate_var, simulate_portfolio_performance)을 분포로 확장합니다.
+
+- bootstrap: 블록 부트스트랩 (종목 간 상관과 단기 자기상관 보존)
+- normal: 로그수익률 다변량 정규분포 적합 후 표본 추출
+
+경로는 memory_budget 이하의 청크 단위로 생성/집계하므로 경로 수와 관계없이
+메모리 사용량이 일정합니다. 보유 비중은 시뮬레이션 시작 시점 기준 매수 후 보유입니다.
+"""
+
+from typing import Dict, Iterator, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from core.utils.price_repository import get_price_repository
+
+METHODS = ("bootstrap", "normal")
+DEFAULT_PATHS = 10_000
+HORIZON_DAYS = 252
+BLOCK_SIZE = 20
+# 청크당 메모리 상한 (수익률/누적/비교 배열 합계)
+MEMORY_BUDGET_BYTES = 64 * 1024 * 1024
+# 경로 x 일 x 종목 원소당 사용 바이트 (float64 2개 + bool 2개)
+_BYTES_PER_ELEMENT = 18
+
+
+def _chunk_sizes(n_paths: int, horizon: int, n_assets: int, memory_budget: int) -> Iterator[int]:
+    """메모리 상한을 넘지 않는 청크 크기 목록"""
+    per_path = horizon * max(n_assets, 1) * _BYTES_PER_ELEMENT
+    size = max(1, min(n_paths, memory_budget // per_path))
+    for start in range(0, n_paths, size):
+        yield min(size, n_paths - start)
+
+
+def _bootstrap_chunk(returns: np.ndarray, size: int, horizon: int, block_size: int,
+                     rng: np.random.Generator) -> np.ndarray:
+    """원형 블록 부트스트랩 (size, horizon, 종목)"""
+    n_blocks = -(-horizon // block_size)
+    starts = rng.integers(0, len(returns), size=(size, n_blocks))
+    rows = (starts[:, :, None] + np.arange(block_size)) % len(returns)
+    return returns[rows.reshape(size, -1)[:, :horizon]]
+
+
+def _fit_normal(returns: np.ndarray):
+    """로그수익률 평균과 공분산 Cholesky 인자 (양의 정부호가 아니면 고유값 보정)"""
+    log_returns = np.log1p(returns)
+    mean = log_returns.mean(axis=0)
+    cov = np.atleast_2d(np.cov(log_returns, rowvar=False))
+    try:
+        chol = np.linalg.cholesky(cov)
+    except np.linalg.LinAlgError:
+        values, vectors = np.linalg.eigh(cov)
+        chol = vectors * np.sqrt(np.clip(values, 1e-12, None))
+    return mean, chol
+
+
+def _normal_chunk(mean: np.ndarray, chol: np.ndarray, size: int, horizon: int,
+                  rng: np.random.Generator) -> np.ndarray:
+    """다변량 정규 로그수익률 → 누적 성장 배수 (size, horizon, 종목)"""
+    log_returns = rng.standard_normal((size, horizon, len(mean))) @ chol.T
+    log_returns += mean
+    np.cumsum(log_returns, axis=1, out=log_returns)
+    return np.exp(log_returns, out=log_returns)
+
+
+def _first_hit(mask: np.ndarray) -> np.ndarray:
+    """경로별 최초 도달일 (axis=1, 도달 안 하면 horizon)"""
+    horizon = mask.shape[1]
+    return np.where(mask.any(axis=1), mask.argmax(axis=1), horizon)
+
+
+def _tail_stats(values: np.ndarray, confidence_levels: Sequence[float]) -> Dict:
+    """VaR/CVaR (%, 손실은 음수 - calculate_var와 같은 부호)"""
+    stats = {}
+    for level in confidence_levels:
+        var = np.percentile(values, (1 - level) * 100)
+        tail = values[values <= var]
+        stats[f"{int(round(level * 100))}"] = {
+            'var': round(float(var) * 100, 2),
+            'cvar': round(float(tail.mean() if len(tail) else var) * 100, 2),
+        }
+    return stats
+
+
+def run_monte_carlo(
+    returns: pd.DataFrame,
+    weights: Dict[str, float],
+    n_paths: int = DEFAULT_PATHS,
+    horizon: int = HORIZON_DAYS,
+    method: str = "bootstrap",
+    block_size: int = BLOCK_SIZE,
+    stop_loss_pct: float = -10.0,
+    take_profit_pct: float = 20.0,
+    current_pnl_pct: Optional[Dict[str, float]] = None,
+    confidence_levels: Sequence[float] = (0.95, 0.99),
+    seed: Optional[int] = None,
+    memory_budget: int = MEMORY_BUDGET_BYTES
+) -> Dict:
+    """
+    포트폴리오 수익률 경로 시뮬레이션
+
+    Args:
+        returns: 일간 수익률 패널 (index: date, columns: code)
+        weights: 종목별 비중 {종목코드: 비중} (합이 1보다 작으면 나머지는 현금)
+        n_paths: 경로 수
+        horizon: 시뮬레이션 기간 (거래일)
+        method: 'bootstrap' 또는 'normal'
+        block_size: 부트스트랩 블록 길이 (거래일)
+        stop_loss_pct: 손절 기준 (%, check_stop_loss_take_profit 기본값과 동일)
+        take_profit_pct: 익절 기준 (%)
+        current_pnl_pct: 종목별 현재 평가손익률 (%) - 손절/익절 판정은 평균 매입가 기준
+        confidence_levels: VaR/CVaR 신뢰수준
+        seed: 난수 시드
+        memory_budget: 청크당 메모리 상한 (bytes)
+
+    Returns:
+        {'status', 'horizon_return', 'var', 'drawdown', 'portfolio_thresholds', 'stocks', ...}
+    """
+    if method not in METHODS:
+        return {'status': 'error', 'message': f'알 수 없는 시뮬레이션 방식: {method}'}
+
+    codes = [code for code in returns.columns if weights.get(code, 0) > 0]
+    panel = returns[codes].dropna()
+    if len(codes) == 0 or len(panel) < max(2 * block_size, 20):
+        return {'status': 'error', 'message': f'수익률 데이터 부족 ({len(panel)}일)'}
+
+    values = panel.to_numpy(dtype=float)
+    w = np.array([weights[code] for code in codes], dtype=float)
+    cash = 1.0 - w.sum()
+    pnl = np.array([(current_pnl_pct or {}).get(code, 0.0) for code in codes]) / 100
+    stop, take = stop_loss_pct / 100, take_profit_pct / 100
+    # 평균 매입가 기준 손익률 = (1 + 현재 손익률) x 누적 성장 - 1 → 누적 성장 기준 임계값
+    stop_growth, take_growth = (1 + stop) / (1 + pnl), (1 + take) / (1 + pnl)
+
+    rng = np.random.default_rng(seed)
+    if method == "normal":
+        mean, chol = _fit_normal(values)
+
+    final_returns, daily_returns, drawdowns = [], [], []
+    portfolio_hits = np.zeros(2)
+    stock_hits = np.zeros((2, len(codes)))
+    stock_hit_days = np.zeros((2, len(codes)))
+
+    for size in _chunk_sizes(n_paths, horizon, len(codes), memory_budget):
+        if method == "bootstrap":
+            growth = _bootstrap_chunk(values, size, horizon, block_size, rng)
+            growth += 1.0
+            np.cumprod(growth, axis=1, out=growth)
+        else:
+            growth = _normal_chunk(mean, chol, size, horizon, rng)
+
+        # 포트폴리오 가치 (매수 후 보유)
+        value = growth @ w + cash
+        peak = np.maximum(np.maximum.accumulate(value, axis=1), 1.0)
+        final_returns.append(value[:, -1] - 1)
+        daily_returns.append(value[:, 0] - 1)
+        drawdowns.append((value / peak - 1).min(axis=1))
+
+        portfolio_stop = _first_hit(value - 1 <= stop)
+        portfolio_take = _first_hit(value - 1 >= take)
+        portfolio_hits += [(portfolio_stop < portfolio_take).sum(), (portfolio_take < portfolio_stop).sum()]
+
+        # 종목별 최초 도달 (먼저 도달한 쪽으로 매도된다고 보고 이후 경로는 무시)
+        first_stop = _first_hit(growth <= stop_growth)
+        first_take = _first_hit(growth >= take_growth)
+        stopped, taken = first_stop < first_take, first_take < first_stop
+        stock_hits += [stopped.sum(axis=0), taken.sum(axis=0)]
+        stock_hit_days += [np.where(stopped, first_stop + 1, 0).sum(axis=0),
+                           np.where(taken, first_take + 1, 0).sum(axis=0)]
+
+    final_returns = np.concatenate(final_returns)
+    daily_returns = np.concatenate(daily_returns)
+    drawdowns = np.concatenate(drawdowns)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        avg_days = stock_hit_days / stock_hits
+
+    stocks = {}
+    for i, code in enumerate(codes):
+        stocks[code] = {
+            'weight': round(float(w[i]), 4),
+            'stop_loss_prob': round(float(stock_hits[0, i] / n_paths) * 100, 2),
+            'take_profit_prob': round(float(stock_hits[1, i] / n_paths) * 100, 2),
+            'avg_days_to_stop_loss': None if np.isnan(avg_days[0, i]) else round(float(avg_days[0, i]), 1),
+            'avg_days_to_take_profit': None if np.isnan(avg_days[1, i]) else round(float(avg_days[1, i]), 1),
+        }
+
+    return {
+        'status': 'success',
+        'method': method,
+        'n_paths': n_paths,
+        'horizon_days': horizon,
+        'history_days': len(panel),
+        'horizon_return': {
+            'mean': round(float(final_returns.mean()) * 100, 2),
+            'median': round(float(np.median(final_returns)) * 100, 2),
+            'p5': round(float(np.percentile(final_returns, 5)) * 100, 2),
+            'p95': round(float(np.percentile(final_returns, 95)) * 100, 2),
+            'loss_prob': round(float((final_returns < 0).mean()) * 100, 2),
+        },
+        'var': {
+            'daily': _tail_stats(daily_returns, confidence_levels),
+            'horizon': _tail_stats(final_returns, confidence_levels),
+        },
+        'drawdown': {
+            'mean': round(float(drawdowns.mean()) * 100, 2),
+            'median': round(float(np.median(drawdowns)) * 100, 2),
+            'p95': round(float(np.percentile(drawdowns, 5)) * 100, 2),
+            'prob_over_10': round(float((drawdowns <= -0.10).mean()) * 100, 2),
+            'prob_over_20': round(float((drawdowns <= -0.20).mean()) * 100, 2),
+        },
+        'portfolio_thresholds': {
+            'stop_loss_prob': round(float(portfolio_hits[0] / n_paths) * 100, 2),
+            'take_profit_prob': round(float(portfolio_hits[1] / n_paths) * 100, 2),
+        },
+        'stocks': stocks,
+    }
+
+
+def simulate_portfolio_risk(
+    stock_codes: Sequence[str],
+    weights: Dict[str, float],
+    lookback_days: int = 756,
+    **kwargs
+) -> Dict:
+    """
+    DB 가격 이력 기반 몬테카를로 시뮬레이션
+
+    Args:
+        stock_codes: 종목 코드 리스트
+        weights: 비중 {종목코드: 비중}
+        lookback_days: 적합/부트스트랩에 사용할 과거 거래일 수
+        **kwargs: run_monte_carlo 옵션
+
+    Returns:
+        run_monte_carlo 결과
+    """
+    try:
+        returns = get_price_repository().returns(list(stock_codes), lookback=lookback_days, min_periods=60)
+        if returns.shape[1] == 0:
+            return {'status': 'error', 'message': '수익률 데이터 없음'}
+        return run_monte_carlo(returns, weights, **kwargs)
+
+    except Exception as e:
+        return {'status': 'error', 'message': str(e)}
@@ -0,0 +1,394 @@
+"""
+공분산 기반 포트폴리오 최적화
+
+미리 계산한 수익률 패널(날짜 x 종목)만으로 동작하는 순수 NumPy 최적화기입니다.
+DB 조회가 없으므로 워크포워드 백테스트의 리밸런싱마다 호출할 수 있습니다.
+
+- 공분산: Ledoit-Wolf 축소 추정 (표본 공분산 → 평균 분산 x 단위행렬)
+- 최소분산 / 평균-분산 / 최대 Sharpe: 제약 2차계획(QP)을 ADMM으로 풀이
+- 위험 균형(ERC): 로그 장벽 문제를 뉴턴법으로 풀이
+- 제약: 롱온리, 종목 비중 상하한, 섹터 비중 상한 (stocks.sector)
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+TRADING_DAYS = 252
+METHODS = ("min_variance", "mean_variance", "max_sharpe", "erc")
+
+# ADMM 기본 설정
+_RHO = 0.1
+_RHO_EQ_SCALE = 1e3
+_SIGMA = 1e-6
+_ALPHA = 1.6
+_RHO_ADAPT = 5.0
+_CHECK_EVERY = 25
+_MAX_ITER = 4000
+_EPS = 1e-7
+
+
+@dataclass
+class PortfolioConstraints:
+    """
+    비중 제약
+
+    Attributes:
+        min_weight: 종목별 최소 비중
+        max_weight: 종목별 최대 비중
+        max_sector_weight: 모든 섹터에 공통 적용할 최대 비중
+        sector_limits: 섹터별 최대 비중 {섹터: 비중} (max_sector_weight보다 우선)
+    """
+    min_weight: float = 0.0
+    max_weight: float = 1.0
+    max_sector_weight: Optional[float] = None
+    sector_limits: Dict[str, float] = field(default_factory=dict)
+
+    def sector_caps(self, sectors: Optional[Mapping[str, str]], codes) -> Dict[str, Tuple[np.ndarray, float]]:
+        """섹터별 (소속 종목 마스크, 상한) - 상한이 없는 섹터는 제외"""
+        if sectors is None or (self.max_sector_weight is None and not self.sector_limits):
+            return {}
+
+        labels = np.array([sectors.get(code) or "기타" for code in codes], dtype=object)
+        caps = {}
+        for sector in pd.unique(labels):
+            cap = self.sector_limits.get(sector, self.max_sector_weight)
+            if cap is not None and cap < 1.0:
+                caps[sector] = (labels == sector, float(cap))
+        return caps
+
+
+def ledoit_wolf_covariance(returns, annualize: bool = True) -> Tuple[np.ndarray, float]:
+    """
+    Ledoit-Wolf 축소 공분산 (목표: 평균 분산 x 단위행렬)
+
+    결측치는 종목별 평균으로 채운 것과 같게(편차 0) 처리합니다.
+
+    Args:
+        returns: 일간 수익률 (DataFrame 또는 (T, N) 배열)
+        annualize: 연율화 여부 (x 252)
+
+    Returns:
+        (공분산 행렬, 축소 강도 0~1)
+    """
+    values = np.asarray(returns, dtype=float)
+    if values.ndim != 2 or len(values) < 2:
+        raise ValueError("수익률 패널은 2행 이상의 (T, N) 배열이어야 합니다")
+
+    centered = values - np.nanmean(values, axis=0)
+    centered = np.nan_to_num(centered, nan=0.0)
+    n_obs, n_assets = centered.shape
+
+    sample = centered.T @ centered / n_obs
+    mu = np.trace(sample) / n_assets
+    target = mu * np.eye(n_assets)
+
+    delta = np.sum((sample - target) ** 2) / n_assets
+    squared = centered ** 2
+    beta = np.sum(squared.T @ squared / n_obs - sample ** 2) / (n_assets * n_obs)
+    shrinkage = float(np.clip(beta / delta, 0.0, 1.0)) if delta > 0 else 1.0
+
+    cov = shrinkage * target + (1 - shrinkage) * sample
+    return (cov * TRADING_DAYS if annualize else cov), shrinkage
+
+
+def solve_qp(P: np.ndarray, q: np.ndarray, A: np.ndarray, lower: np.ndarray, upper: np.ndarray,
+             max_iter: int = _MAX_ITER, eps: float = _EPS, return_info: bool = False):
+    """
+    min ½x'Px + q'x  s.t.  lower ≤ Ax ≤ upper  (ADMM, OSQP 방식)
+
+    KKT 행렬은 역행렬로 만들어 두고 반복마다 행렬-벡터 곱만 수행합니다.
+    lower == upper인 행(등식)은 더 큰 페널티(ρ)를 사용하고, ρ는 잔차 비율에 따라
+    조정합니다 (조정할 때만 역행렬 재계산).
+    max_iter 안에 잔차가 허용오차 이하로 내려가지 않으면 경고를 남깁니다.
+
+    Args:
+        return_info: True면 (x, 수렴 정보) 반환
+
+    Returns:
+        해 x (return_info=True면 (x, {'converged', 'iterations', 'primal_residual', 'dual_residual'}))
+    """
+    n = P.shape[0]
+    equality = np.isclose(lower, upper)
+    base_rho = _RHO
+
+    def factorize(rho_value):
+        rho_vec = np.where(equality, rho_value * _RHO_EQ_SCALE, rho_value)
+        return rho_vec, np.linalg.inv(P + _SIGMA * np.eye(n) + A.T @ (rho_vec[:, None] * A))
+
+    rho, kkt_inv = factorize(base_rho)
+    x = np.zeros(n)
+    z = np.clip(np.zeros(len(lower)), lower, upper)
+    y = np.zeros(len(lower))
+
+    def residuals():
+        Ax, Px, Aty = A @ x, P @ x, A.T @ y
+        primal = np.max(np.abs(Ax - z))
+        dual = np.max(np.abs(Px + q + Aty))
+        primal_scale = max(np.max(np.abs(Ax)), np.max(np.abs(z)), 1e-12)
+        dual_scale = max(np.max(np.abs(Px)), np.max(np.abs(Aty)), np.max(np.abs(q)), 1e-12)
+        converged = primal <= eps * max(1.0, primal_scale) and dual <= eps * max(1.0, dual_scale)
+        return primal, dual, primal_scale, dual_scale, converged
+
+    converged = False
+    iteration = 0
+    for iteration in range(1, max_iter + 1):
+        x_tilde = kkt_inv @ (_SIGMA * x - q + A.T @ (rho * z - y))
+        z_tilde = A @ x_tilde
+        x = _ALPHA * x_tilde + (1 - _ALPHA) * x
+        z_relaxed = _ALPHA * z_tilde + (1 - _ALPHA) * z
+        z_next = np.clip(z_relaxed + y / rho, lower, upper)
+        y = y + rho * (z_relaxed - z_next)
+        z = z_next
+
+        if iteration % _CHECK_EVERY:
+            continue
+        primal, dual, primal_scale, dual_scale, converged = residuals()
+        if converged:
+            break
+
+        # 잔차 균형에 맞춰 ρ 조정 (변화가 클 때만 역행렬 재계산)
+        ratio = np.sqrt((primal / primal_scale) / max(dual / dual_scale, 1e-16))
+        if ratio > _RHO_ADAPT or ratio < 1 / _RHO_ADAPT:
+            base_rho = float(np.clip(base_rho * ratio, 1e-6, 1e6))
+            rho, kkt_inv = factorize(base_rho)
+
+    if not converged:
+        primal, dual, _, _, converged = residuals()
+    if not converged:
+        logger.warning(f"QP 미수렴: {iteration}회 반복 후 primal 잔차 {primal:.2e}, dual 잔차 {dual:.2e} (허용오차 {eps:.0e})")
+
+    if return_info:
+        return x, {'converged': bool(converged), 'iterations': iteration,
+                   'primal_residual': float(primal), 'dual_residual': float(dual)}
+    return x
+
+
+def _weight_rows(n: int, constraints: PortfolioConstraints, caps: Dict) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """합계 = 1, 종목 상하한, 섹터 상한 제약 행렬"""
+    rows = [np.ones((1, n)), np.eye(n)]
+    lower = [np.ones(1), np.full(n, constraints.min_weight)]
+    upper = [np.ones(1), np.full(n, constraints.max_weight)]
+    for mask, cap in caps.values():
+        rows.append(mask.astype(float)[None, :])
+        lower.append(np.zeros(1))
+        upper.append(np.array([cap]))
+    return np.vstack(rows), np.concatenate(lower), np.concatenate(upper)
+
+
+def _check_feasible(n: int, constraints: PortfolioConstraints, caps: Dict):
+    """비중 제약이 실현 가능한지 확인 (불가능하면 ValueError)"""
+    if constraints.min_weight * n > 1 + 1e-9 or constraints.max_weight * n < 1 - 1e-9:
+        raise ValueError(
+            f"종목 비중 제약 불가능: {n}종목, 최소 {constraints.min_weight}, 최대 {constraints.max_weight}"
+        )
+    capped = sum(min(cap, mask.sum() * constraints.max_weight) for mask, cap in caps.values())
+    uncapped = n - sum(mask.sum() for mask, _ in caps.values())
+    if capped + uncapped * constraints.max_weight < 1 - 1e-9:
+        raise ValueError("섹터 비중 상한의 합이 100% 미만입니다")
+
+
+def _project_capped_simplex(values: np.ndarray, lower: float, upper: float, total: float = 1.0) -> np.ndarray:
+    """
+    {w : Σw = total, lower ≤ w ≤ upper} 위로의 유클리드 사영
+
+    w = clip(v - τ, lower, upper)에서 합계가 τ에 대해 단조 감소하므로 τ를 이분 탐색합니다.
+    """
+    lo, hi = float(np.min(values)) - upper, float(np.max(values)) - lower
+    for _ in range(100):
+        tau = (lo + hi) / 2
+        if np.clip(values - tau, lower, upper).sum() > total:
+            lo = tau
+        else:
+            hi = tau
+    return np.clip(values - (lo + hi) / 2, lower, upper)
+
+
+def _clean(weights: np.ndarray, constraints: PortfolioConstraints) -> np.ndarray:
+    """수치 오차 정리 (합계 1, 종목 상하한 집합으로 사영 - 상한을 넘는 재정규화 없음)"""
+    lower, upper = constraints.min_weight, constraints.max_weight
+    weights = _project_capped_simplex(np.asarray(weights, dtype=float), lower, upper)
+
+    # 0 근처 잔여 비중은 0으로 고정하고 나머지를 다시 사영
+    dust = (np.abs(weights) < 1e-8) & (lower <= 0)
+    if dust.any() and upper * (~dust).sum() >= 1:
+        weights[~dust] = _project_capped_simplex(weights[~dust], lower, upper)
+        weights[dust] = 0.0
+    return weights
+
+
+def _solve_weights(P: np.ndarray, q: np.ndarray, constraints: Optional[PortfolioConstraints],
+                   caps: Optional[Dict]) -> np.ndarray:
+    """비중 제약(합계/상하한/섹터) 하의 QP"""
+    constraints = constraints or PortfolioConstraints()
+    caps = caps or {}
+    _check_feasible(len(P), constraints, caps)
+    A, lower, upper = _weight_rows(len(P), constraints, caps)
+    return _clean(solve_qp(P, q, A, lower, upper), constraints)
+
+
+def min_variance_weights(cov: np.ndarray, constraints: Optional[PortfolioConstraints] = None,
+                         caps: Optional[Dict] = None) -> np.ndarray:
+    """최소분산 포트폴리오"""
+    return _solve_weights(cov, np.zeros(len(cov)), constraints, caps)
+
+
+def mean_variance_weights(cov: np.ndarray, expected_returns: np.ndarray, risk_aversion: float = 5.0,
+                          constraints: Optional[PortfolioConstraints] = None,
+                          caps: Optional[Dict] = None) -> np.ndarray:
+    """평균-분산 효용 최대화: max μ'w - (λ/2) w'Σw  (λ = risk_aversion > 0)"""
+    if risk_aversion <= 0:
+        raise ValueError(f"위험회피 계수는 양수여야 합니다: {risk_aversion}")
+    return _solve_weights(risk_aversion * cov, -np.asarray(expected_returns, dtype=float), constraints, caps)
+
+
+def max_sharpe_weights(cov: np.ndarray, expected_returns: np.ndarray, risk_free_rate: float = 0.02,
+                       constraints: Optional[PortfolioConstraints] = None,
+                       caps: Optional[Dict] = None) -> np.ndarray:
+    """
+    최대 Sharpe 포트폴리오
+
+    w = y / 1'y 치환으로 min y'Σy s.t. (μ - rf)'y = 1 의 QP로 풀고,
+    비중/섹터 제약도 1'y를 곱한 동차 형태로 변환합니다.
+    초과수익이 양수인 종목이 없으면 최소분산으로 대체합니다.
+    """
+    constraints = constraints or PortfolioConstraints()
+    caps = caps or {}
+    n = len(cov)
+    _check_feasible(n, constraints, caps)
+
+    excess = np.asarray(expected_returns, dtype=float) - risk_free_rate
+    if np.max(excess) <= 0:
+        return min_variance_weights(cov, constraints, caps)
+    excess = excess / np.max(excess)  # 규모 정규화 (해의 비율에는 영향 없음)
+
+    ones = np.ones((1, n))
+    rows = [excess[None, :], np.eye(n) - constraints.max_weight * ones]
+    lower = [np.ones(1), np.full(n, -np.inf)]
+    upper = [np.ones(1), np.zeros(n)]
+    rows.append(np.eye(n) - constraints.min_weight * ones)
+    lower.append(np.zeros(n))
+    upper.append(np.full(n, np.inf))
+    for mask, cap in caps.values():
+        rows.append(mask.astype(float)[None, :] - cap * ones)
+        lower.append(np.full(1, -np.inf))
+        upper.append(np.zeros(1))
+
+    y = solve_qp(cov, np.zeros(n), np.vstack(rows), np.concatenate(lower), np.concatenate(upper))
+    return _clean(np.clip(y, 0, None) / np.clip(y, 0, None).sum(), constraints)
+
+
+def equal_risk_contribution_weights(cov: np.ndarray, budgets: Optional[np.ndarray] = None,
+                                    max_iter: int = 100, tol: float = 1e-10) -> np.ndarray:
+    """
+    위험 균형(ERC) 포트폴리오 - 종목별 위험 기여도 = 위험 예산 비율
+
+    min ½y'Σy - b'ln(y) 를 뉴턴법(백트래킹 포함)으로 풀고 w = y / 1'y.
+    롱온리 외의 비중/섹터 제약은 적용하지 않습니다.
+
+    Args:
+        cov: 공분산 행렬
+        budgets: 위험 예산 (None이면 동일)
+    """
+    n = len(cov)
+    b = np.full(n, 1.0 / n) if budgets is None else np.asarray(budgets, dtype=float) / np.sum(budgets)
+
+    def objective(v):
+        return 0.5 * v @ cov @ v - b @ np.log(v)
+
+    y = 1.0 / np.sqrt(np.diag(cov))
+    y *= np.sqrt(b.sum() / (y @ cov @ y))
+    for _ in range(max_iter):
+        gradient = cov @ y - b / y
+        hessian = cov + np.diag(b / y ** 2)
+        step = np.linalg.solve(hessian, gradient)
+        decrement = gradient @ step
+        if decrement / 2 <= tol:
+            break
+
+        t, current = 1.0, objective(y)
+        while np.any(y - t * step <= 0) or objective(y - t * step) > current - 0.25 * t * decrement:
+            t *= 0.5
+            if t < 1e-12:
+                break
+        y = y - t * step
+    return y / y.sum()
+
+
+def risk_contributions(weights: np.ndarray, cov: np.ndarray) -> np.ndarray:
+    """종목별 위험 기여도 비율 (합계 1)"""
+    marginal = weights * (cov @ weights)
+    total = weights @ cov @ weights
+    return marginal / total if total > 0 else np.zeros_like(weights)
+
+
+def optimize_portfolio(
+    returns: pd.DataFrame,
+    method: str = "min_variance",
+    constraints: Optional[PortfolioConstraints] = None,
+    sectors: Optional[Mapping[str, str]] = None,
+    expected_returns: Optional[pd.Series] = None,
+    risk_free_rate: float = 0.02,
+    risk_aversion: float = 5.0
+) -> Dict:
+    """
+    수익률 패널로 포트폴리오 최적화
+
+    Args:
+        returns: 일간 수익률 (index: date, columns: code)
+        method: min_variance, mean_variance, max_sharpe, erc
+        constraints: 비중 제약 (ERC에는 적용하지 않음)
+        sectors: 종목별 섹터 {code: sector}
+        expected_returns: 연 기대수익률 (None이면 과거 평균 x 252)
+        risk_free_rate: 무위험 수익률 (연)
+        risk_aversion: 평균-분산 위험회피 계수
+
+    Returns:
+        {'status', 'method', 'weights', 'expected_return', 'volatility', 'sharpe_ratio',
+         'risk_contributions', 'shrinkage'} (수익률/변동성은 %)
+    """
+    if method not in METHODS:
+        return {'status': 'error', 'message': f'알 수 없는 최적화 방식: {method}'}
+
+    returns = returns.loc[:, returns.count() >= 2]
+    if returns.shape[1] == 0:
+        return {'status': 'error', 'message': '수익률 데이터 없음'}
+
+    codes = list(returns.columns)
+    constraints = constraints or PortfolioConstraints()
+    try:
+        cov, shrinkage = ledoit_wolf_covariance(returns)
+        if expected_returns is None:
+            mu = returns.mean().to_numpy() * TRADING_DAYS
+        else:
+            mu = expected_returns.reindex(codes).fillna(0).to_numpy(dtype=float)
+        caps = constraints.sector_caps(sectors, codes)
+
+        if method == "erc":
+            weights = equal_risk_contribution_weights(cov)
+        elif method == "min_variance":
+            weights = min_variance_weights(cov, constraints, caps)
+        elif method == "mean_variance":
+            weights = mean_variance_weights(cov, mu, risk_aversion, constraints, caps)
+        else:
+            weights = max_sharpe_weights(cov, mu, risk_free_rate, constraints, caps)
+    except (ValueError, np.linalg.LinAlgError) as e:
+        return {'status': 'error', 'message': str(e)}
+
+    expected = float(weights @ mu)
+    volatility = float(np.sqrt(weights @ cov @ weights))
+    return {
+        'status': 'success',
+        'method': method,
+        'weights': {code: float(w) for code, w in zip(codes, weights) if w > 0},
+        'expected_return': round(expected * 100, 2),
+        'volatility': round(volatility * 100, 2),
+        'sharpe_ratio': round((expected - risk_free_rate) / volatility, 3) if volatility > 0 else 0.0,
+        'risk_contributions': {code: round(float(rc), 4) for code, rc in zip(codes, risk_contributions(weights, cov))},
+        'shrinkage': round(shrinkage, 4),
+    }
@@ -5,6 +5,7 @@
 - 동일가중 포트폴리오 생성
 - 시가총액 가중 포트폴리오 생성
 - 리스크 패리티 (Risk Parity) 포트폴리오
+- 최소분산 / 평균-분산 / 최대 Sharpe 포트폴리오 (축소 공분산, 섹터 제약)
 - 섹터 분산 체크
 - 리밸런싱 제안
 """
@@ -13,7 +14,9 @@ import numpy as np
 import pandas as pd
 from typing import Dict, List, Optional, Tuple
 from core.utils.db_utils import get_db_connection
+from core.utils.price_repository import get_price_repository
 from core.modules.risk_analysis import calculate_volatility, calculate_max_drawdown, calculate_sharpe_ratio
+from core.modules.optimizers import PortfolioConstraints, optimize_portfolio
 
 
 def get_stock_info(stock_codes: List[str]) -> pd.DataFrame:
@@ -52,28 +55,8 @@ def get_latest_prices(stock_codes: List[str]) -> Dict[str, float]:
     Returns:
         {종목코드: 가격} 딕셔너리
     """
-    conn = get_db_connection()
-
-    try:
-        prices = {}
-
-        for code in stock_codes:
-            query = """
-                SELECT close
-                FROM prices
-                WHERE code = %s
-                ORDER BY date DESC
-                LIMIT 1
-            """
-            result = pd.read_sql(query, conn, params=(code,))
-
-            if len(result) > 0:
-                prices[code] = float(result['close'].iloc[0])
-
-        return prices
-
-    finally:
-        conn.close()
+    # 종목별 최신 종가를 한 번의 쿼리로 조회
+    return get_price_repository().latest_close(stock_codes).to_dict()
 
 
 def create_equal_weight_portfolio(stock_codes: List[str]) -> Dict:
@@ -161,14 +144,17 @@ def create_market_cap_weight_portfolio(stock_codes: List[str],
     }
 
 
-def create_risk_parity_portfolio(stock_codes: List[str], days: int = 252) -> Dict:
+def create_risk_parity_portfolio(stock_codes: List[str], days: int = 252,
+                                 prices: Optional[pd.DataFrame] = None) -> Dict:
     """
     리스크 패리티 포트폴리오 생성
     각 종목이 포트폴리오 전체 리스크에 동일하게 기여하도록 비중 조정
+    (Ledoit-Wolf 축소 공분산 기반 ERC - 종목 간 상관관계 반영)
 
     Args:
         stock_codes: 종목 코드 리스트
         days: 변동성 계산 기간
+        prices: 이미 로드한 종가 (index: date, columns: code), None이면 최근 days 거래일 조회
 
     Returns:
         포트폴리오 정보
@@ -179,30 +165,19 @@ def create_risk_parity_portfolio(stock_codes: List[str], days: int = 252) -> Dic
             'message': '종목이 없습니다'
         }
 
-    conn = get_db_connection()
-
     try:
-        # 각 종목의 변동성 계산
-        volatilities = {}
-
-        for code in stock_codes:
-            query = """
-                SELECT date, close
-                FROM prices
-                WHERE code = %s
-                ORDER BY date DESC
-                LIMIT %s
-            """
-            df = pd.read_sql(query, conn, params=(code, days))
-
-            if len(df) < 10:
-                continue
-
-            df = df.sort_values('date')
-            returns = df['close'].pct_change().dropna()
-            vol = calculate_volatility(returns, annualize=True)
+        # 각 종목의 변동성 계산 (날짜 x 종목 종가를 한 번에 조회)
+        if prices is None:
+            closes = get_price_repository().closes(stock_codes, lookback=days, min_periods=10)
+        else:
+            closes = prices.reindex(columns=[c for c in stock_codes if c in prices.columns])
+            closes = closes.loc[:, closes.count() >= 10]
 
-            volatilities[code] = vol
+        returns_df = closes.pct_change(fill_method=None).iloc[1:]
+        volatilities = {
+            code: calculate_volatility(returns_df[code].dropna(), annualize=True)
+            for code in returns_df.columns
+        }
 
         if len(volatilities) == 0:
             return {
@@ -210,11 +185,11 @@ def create_risk_parity_portfolio(stock_codes: List[str], days: int = 252) -> Dic
                 'message': '변동성 계산 실패'
             }
 
-        # 변동성의 역수로 가중치 계산 (낮은 변동성 -> 높은 비중)
-        inv_vols = {code: 1.0 / vol if vol > 0 else 0 for code, vol in volatilities.items()}
-        total_inv_vol = sum(inv_vols.values())
-
-        weights = {code: inv_vol / total_inv_vol for code, inv_vol in inv_vols.items()}
+        # 축소 공분산 기반 위험 균형 (종목별 위험 기여도 동일)
+        result = optimize_portfolio(returns_df, method="erc")
+        if result['status'] != 'success':
+            return result
+        weights = result['weights']
 
         # 종목 정보 조회
         stock_info = get_stock_info(stock_codes)
@@ -227,11 +202,102 @@ def create_risk_parity_portfolio(stock_codes: List[str], days: int = 252) -> Dic
             'weights': weights,
             'num_stocks': len(weights),
             'sector_distribution': sector_distribution,
-            'volatilities': {k: round(v, 2) for k, v in volatilities.items()}
+            'volatilities': {k: round(v, 2) for k, v in volatilities.items()},
+            'risk_contributions': result['risk_contributions']
         }
 
-    finally:
-        conn.close()
+    except Exception as e:
+        return {
+            'status': 'error',
+            'message': str(e)
+        }
+
+
+OPTIMIZATION_LABELS = {
+    'min_variance': '최소분산 (Minimum Variance)',
+    'mean_variance': '평균-분산 (Mean-Variance)',
+    'max_sharpe': '최대 샤프 (Max Sharpe)',
+    'erc': '리스크 패리티 (Risk Parity)',
+}
+
+
+def create_optimized_portfolio(stock_codes: List[str],
+                               method: str = "min_variance",
+                               days: int = 252,
+                               prices: Optional[pd.DataFrame] = None,
+                               max_weight: float = 1.0,
+                               min_weight: float = 0.0,
+                               max_sector_weight: Optional[float] = None,
+                               sector_limits: Optional[Dict[str, float]] = None,
+                               risk_free_rate: float = 0.02) -> Dict:
+    """
+    공분산 기반 최적화 포트폴리오 생성
+
+    Args:
+        stock_codes: 종목 코드 리스트
+        method: min_variance, mean_variance, max_sharpe, erc
+        days: 공분산/기대수익률 계산 기간 (거래일)
+        prices: 이미 로드한 종가 (index: date, columns: code), None이면 최근 days 거래일 조회
+        max_weight: 종목별 최대 비중
+        min_weight: 종목별 최소 비중
+        max_sector_weight: 섹터별 최대 비중 (stocks.sector 기준)
+        sector_limits: 섹터별 개별 최대 비중 {섹터: 비중}
+        risk_free_rate: 무위험 수익률 (연)
+
+    Returns:
+        포트폴리오 정보
+    """
+    if len(stock_codes) == 0:
+        return {
+            'status': 'error',
+            'message': '종목이 없습니다'
+        }
+
+    try:
+        if prices is None:
+            closes = get_price_repository().closes(stock_codes, lookback=days, min_periods=10)
+        else:
+            closes = prices.reindex(columns=[c for c in stock_codes if c in prices.columns])
+            closes = closes.loc[:, closes.count() >= 10]
+
+        stock_info = get_stock_info(stock_codes)
+        sectors = dict(zip(stock_info['code'], stock_info['sector'])) if len(stock_info) > 0 else {}
+
+        constraints = PortfolioConstraints(
+            min_weight=min_weight,
+            max_weight=max_weight,
+            max_sector_weight=max_sector_weight,
+            sector_limits=sector_limits or {}
+        )
+        result = optimize_portfolio(
+            closes.pct_change(fill_method=None).iloc[1:], method, constraints, sectors,
+            risk_free_rate=risk_free_rate
+        )
+        if result['status'] != 'success':
+            return result
+
+        weights = result['weights']
+        sector_weights = pd.Series(weights).groupby(pd.Series(sectors).reindex(list(weights)).fillna('기타')).sum()
+
+        return {
+            'status': 'success',
+            'method': OPTIMIZATION_LABELS[method],
+            'stocks': list(weights.keys()),
+            'weights': weights,
+            'num_stocks': len(weights),
+            'sector_distribution': {k: round(float(v), 4) for k, v in sector_weights.items()},
+            'expected_return': result['expected_return'],
+            'volatility': result['volatility'],
+            'sharpe_ratio': result['sharpe_ratio'],
+            'risk_contributions': result['risk_contributions'],
+            'shrinkage': result['shrinkage']
+        }
+
+    except Exception as e:
+        return {
+            'status': 'error',
+            'message': str(e)
+        }
 
 
 def check_sector_diversification(stock_codes: List[str]) -> Dict:
@@ -338,36 +404,17 @@ def simulate_portfolio_performance(stock_codes: List[str],
     Returns:
         성과 분석 결과
     """
-    conn = get_db_connection()
-
     try:
-        # 각 종목의 수익률 데이터 수집
-        returns_dict = {}
-
-        for code in stock_codes:
-            query = """
-                SELECT date, close
-                FROM prices
-                WHERE code = %s
-                ORDER BY date DESC
-                LIMIT %s
-            """
-            df = pd.read_sql(query, conn, params=(code, days))
-
-            if len(df) < 10:
-                continue
-
-            df = df.sort_values('date').set_index('date')
-            returns_dict[code] = df['close'].pct_change().dropna()
-
-        if len(returns_dict) == 0:
+        # 전체 종목 수익률을 한 번에 조회 (날짜 x 종목)
+        returns_df = get_price_repository().returns(stock_codes, lookback=days, min_periods=10)
+
+        if returns_df.shape[1] == 0:
             return {
                 'status': 'error',
                 'message': '수익률 데이터 없음'
             }
 
-        # 수익률 DataFrame 생성
-        returns_df = pd.DataFrame(returns_dict).dropna()
+        returns_df = returns_df.dropna()
 
         # 포트폴리오 수익률 계산
         weight_list = [weights.get(code, 0) for code in returns_df.columns]
@@ -398,8 +445,11 @@ def simulate_portfolio_performance(stock_codes: List[str],
             'worst_day': round(portfolio_returns.min() * 100, 2)
         }
 
-    finally:
-        conn.close()
+    except Exception as e:
+        return {
+            'status': 'error',
+            'message': str(e)
+        }
 
 
 # 테스트 코드
@@ -7,12 +7,20 @@
 - VaR (Value at Risk) 계산
 - Sharpe Ratio 계산
 - 종목별 리스크 점수 산출
+- 전 종목 리스크 지표 일괄 계산 (risk_metrics 테이블 야간 갱신)
 """
 
+from datetime import date, timedelta
+
 import numpy as np
 import pandas as pd
-from typing import Dict, Optional, Tuple
-from core.utils.db_utils import get_db_connection
+from typing import Dict, List, Optional, Tuple
+from core.utils.price_store import load_panel
+from core.utils.price_repository import get_price_repository
+
+# risk_metrics 테이블 기준 분석 기간 (거래일) 및 베타 벤치마크
+RISK_TABLE_DAYS = 252
+BENCHMARK_CODE = "KS11"
 
 
 def calculate_volatility(returns: pd.Series, annualize: bool = True) -> float:
@@ -241,91 +249,275 @@ def calculate_win_rate(returns: pd.Series) -> float:
     return win_rate * 100
 
 
-def calculate_risk_score(stock_code: str, days: int = 252) -> Dict:
+def risk_score_and_grade(volatility, max_drawdown, var_95) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    종합 리스크 점수 (0-10, 높을수록 위험) 및 등급 (배열 단위)
+
+    변동성 50%, MDD -50%, VaR -30%에서 각 항목이 10점이 되며 3:4:3으로 가중평균합니다.
+    """
+    vol_score = np.minimum(np.asarray(volatility, dtype=float) / 5, 10)
+    mdd_score = np.minimum(np.abs(np.asarray(max_drawdown, dtype=float)) / 5, 10)
+    var_score = np.minimum(np.abs(np.asarray(var_95, dtype=float)) / 3, 10)
+    score = vol_score * 0.3 + mdd_score * 0.4 + var_score * 0.3
+    grade = np.select([score < 3, score < 6, score < 8], ['낮음', '보통', '높음'], '매우 높음')
+    return score, grade
+
+
+def _window_returns(close: pd.DataFrame, days: int) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    종목별 마지막 days개 가격(거래정지일 NaN 제외)과 그 구간의 수익률
+
+    각 종목 가격을 압축한 뒤 pct_change한 것과 같은 값입니다 (거래정지 구간은 건너뜀).
+    """
+    valid = close.notna()
+    rows_from_end = valid[::-1].cumsum()[::-1]
+    prices = close.where(valid & (rows_from_end <= days))
+    returns = (prices / prices.ffill().shift(1) - 1).where(prices.notna())
+    return prices, returns
+
+
+def risk_metrics_table(
+    close: pd.DataFrame,
+    benchmark: Optional[pd.Series] = None,
+    days: int = RISK_TABLE_DAYS,
+    risk_free_rate: float = 0.02,
+    min_periods: int = 10
+) -> pd.DataFrame:
+    """
+    전 종목 리스크 지표 (날짜 x 종목 종가 패널 기준, 1회 계산)
+
+    종목별로 자신의 마지막 days개 가격을 사용하므로 calculate_risk_score(종목별 최근
+    days거래일 조회)와 같은 값입니다. MDD와 베타는 종목 축 NumPy 누적/합 연산으로 계산합니다.
+
+    Args:
+        close: 날짜 x 종목 종가
+        benchmark: 벤치마크 종가 (None이면 beta NaN)
+        days: 분석 기간 (종목별 거래일 수)
+        risk_free_rate: 무위험 수익률 (연율)
+        min_periods: 최소 가격 수 (미만 종목 제외)
+
+    Returns:
+        DataFrame (code, period_days, 지표 컬럼, risk_score, risk_grade, peak_date, trough_date)
+    """
+    columns = ['code', 'period_days', 'volatility', 'max_drawdown', 'var_95', 'sharpe_ratio',
+               'downside_deviation', 'sortino_ratio', 'win_rate', 'beta', 'risk_score',
+               'risk_grade', 'peak_date', 'trough_date']
+    if close.empty:
+        return pd.DataFrame(columns=columns)
+
+    prices, returns = _window_returns(close.astype(float), days)
+    period_days = prices.notna().sum()
+    keep = (period_days >= min_periods).to_numpy()
+    prices, returns = prices.loc[:, keep], returns.loc[:, keep]
+    if prices.shape[1] == 0:
+        return pd.DataFrame(columns=columns)
+
+    p = prices.to_numpy()
+    r = returns.to_numpy()
+    has_r = ~np.isnan(r)
+    n = has_r.sum(axis=0)
+    r0 = np.where(has_r, r, 0.0)
+
+    # 변동성 / Sharpe (표본 표준편차, 연율화)
+    mean = r0.sum(axis=0) / np.maximum(n, 1)
+    std = np.sqrt((np.where(has_r, r - mean, 0.0) ** 2).sum(axis=0) / np.maximum(n - 1, 1))
+    std = np.where(n >= 2, std, 0.0)
+    volatility = std * np.sqrt(252) * 100
+    excess = mean * 252 - risk_free_rate
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sharpe = np.where(std > 0, excess / (std * np.sqrt(252)), 0.0)
+
+    # VaR (역사적 5% 분위수)
+    var_95 = np.where(n >= 10, np.nanpercentile(r, 5, axis=0) * 100, 0.0)
+
+    # 하방 편차 / Sortino
+    negative = has_r & (r < 0)
+    n_negative = negative.sum(axis=0)
+    downside = np.sqrt((np.where(negative, r, 0.0) ** 2).sum(axis=0) / np.maximum(n_negative, 1))
+    downside = np.where(n_negative > 0, downside * np.sqrt(252) * 100, 0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sortino = np.where(downside > 0, excess / (downside / 100), 0.0)
+
+    win_rate = (r0 > 0).sum(axis=0) / np.maximum(n, 1) * 100
+
+    # MDD (누적 최대값 대비 낙폭, 고점은 저점 이전 첫 최고가)
+    running_max = np.fmax.accumulate(p, axis=0)
+    drawdown = p / running_max - 1
+    trough = np.nanargmin(drawdown, axis=0)
+    cols = np.arange(p.shape[1])
+    max_drawdown = drawdown[trough, cols] * 100
+    before_trough = np.arange(len(p))[:, None] <= trough
+    peak = np.nanargmax(np.where(before_trough & ~np.isnan(p), p, -np.inf), axis=0)
+
+    # 베타 (종목/벤치마크 수익률이 모두 있는 날짜만, 표본 공분산 / 표본 분산)
+    beta = np.full(p.shape[1], np.nan)
+    if benchmark is not None and benchmark.notna().any():
+        _, market = _window_returns(benchmark.reindex(close.index).astype(float).to_frame(), days)
+        m = market.to_numpy()
+        pair = has_r & ~np.isnan(m)
+        k = pair.sum(axis=0)
+        m_pair = np.where(pair, m, 0.0)
+        r_pair = np.where(pair, r, 0.0)
+        denom = np.maximum(k, 1)
+        m_dev = np.where(pair, m - m_pair.sum(axis=0) / denom, 0.0)
+        r_dev = np.where(pair, r - r_pair.sum(axis=0) / denom, 0.0)
+        covariance = (r_dev * m_dev).sum(axis=0)
+        market_variance = (m_dev ** 2).sum(axis=0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            beta = np.where((k >= 2) & (market_variance > 0), covariance / market_variance, 1.0)
+
+    # 점수는 반올림 전 값으로 계산 (calculate_risk_score와 동일)
+    risk_score, risk_grade = risk_score_and_grade(volatility, max_drawdown, var_95)
+    dates = pd.Index(close.index)
+
+    return pd.DataFrame({
+        'code': prices.columns,
+        'period_days': period_days[keep].to_numpy().astype(int),
+        'volatility': np.round(volatility, 2),
+        'max_drawdown': np.round(max_drawdown, 2),
+        'var_95': np.round(var_95, 2),
+        'sharpe_ratio': np.round(sharpe, 3),
+        'downside_deviation': np.round(downside, 2),
+        'sortino_ratio': np.round(sortino, 3),
+        'win_rate': np.round(win_rate, 2),
+        'beta': np.round(beta, 3),
+        'risk_score': np.round(risk_score, 2),
+        'risk_grade': risk_grade,
+        'peak_date': [_to_date(d) for d in dates[peak]],
+        'trough_date': [_to_date(d) for d in dates[trough]],
+    }, columns=columns)
+
+
+def _to_date(value) -> date:
+    """Timestamp/date → date"""
+    return value.date() if isinstance(value, pd.Timestamp) else value
+
+
+def calculate_risk_metrics(
+    stock_codes: List[str],
+    days: int = RISK_TABLE_DAYS,
+    benchmark: Optional[str] = BENCHMARK_CODE,
+    end=None
+) -> pd.DataFrame:
+    """
+    여러 종목 리스크 지표 일괄 계산 (가격 구간 1회 조회)
+
+    Args:
+        stock_codes: 종목 코드 리스트
+        days: 분석 기간 (종목별 거래일 수)
+        benchmark: 베타 계산용 벤치마크 코드 (None이면 beta 생략)
+        end: 기준일 (None이면 오늘)
+
+    Returns:
+        risk_metrics_table 결과 (데이터 부족 종목 제외)
+    """
+    codes = list(dict.fromkeys(stock_codes))
+    if not codes:
+        return risk_metrics_table(pd.DataFrame(), days=days)
+
+    end_d = pd.Timestamp(end).date() if end is not None else date.today()
+    # 영업일 days개를 덮는 달력 기간 (주말/공휴일 여유 포함)
+    start_d = end_d - timedelta(days=int(days * 1.6) + 10)
+    panel = load_panel(codes + ([benchmark] if benchmark else []), start_d, end_d, "close")
+    if panel.empty:
+        return risk_metrics_table(pd.DataFrame(), days=days)
+
+    market = panel[benchmark] if benchmark and benchmark in panel.columns else None
+    close = panel.reindex(columns=codes)
+    return risk_metrics_table(close.loc[:, close.notna().any()], market, days)
+
+
+def _stored_risk_metrics(stock_code: str) -> Optional[pd.Series]:
+    """마지막 완성 거래일 기준 risk_metrics 테이블 행 (테이블/행이 없으면 None)"""
+    try:
+        from core.utils.db_utils import get_risk_metrics
+        stored = get_risk_metrics([stock_code])
+    except Exception:
+        return None
+    return stored.iloc[0] if len(stored) else None
+
+
+def refresh_risk_metrics(days: int = RISK_TABLE_DAYS, benchmark: str = BENCHMARK_CODE) -> Dict:
+    """
+    전 종목 리스크 지표를 다시 계산해 risk_metrics 테이블 교체 (야간 배치)
+
+    Args:
+        days: 분석 기간 (거래일)
+        benchmark: 베타 벤치마크 코드
+
+    Returns:
+        {'status', 'as_of', 'rows'} 또는 오류 딕셔너리
+    """
+    from core.utils.db_utils import get_price_version, get_stock_list, replace_risk_metrics
+
+    try:
+        as_of, _ = get_price_version()
+        if as_of is None:
+            return {'status': 'error', 'message': '가격 데이터가 없습니다'}
+
+        codes = [code for code, _, _ in get_stock_list() if code != benchmark]
+        table = calculate_risk_metrics(codes, days, benchmark, end=as_of)
+        rows = replace_risk_metrics(table, as_of)
+        return {'status': 'success', 'as_of': as_of, 'rows': rows}
+
+    except Exception as e:
+        return {
+            'status': 'error',
+            'message': str(e)
+        }
+
+
+def _risk_result(stock_code: str, row) -> Dict:
+    """risk_metrics 행 → calculate_risk_score 결과 딕셔너리"""
+    beta = row['beta']
+    return {
+        'status': 'success',
+        'stock_code': stock_code,
+        'period_days': int(row['period_days']),
+        'volatility': float(row['volatility']),
+        'max_drawdown': float(row['max_drawdown']),
+        'var_95': float(row['var_95']),
+        'sharpe_ratio': float(row['sharpe_ratio']),
+        'downside_deviation': float(row['downside_deviation']),
+        'sortino_ratio': float(row['sortino_ratio']),
+        'win_rate': float(row['win_rate']),
+        'beta': None if beta is None or pd.isna(beta) else float(beta),
+        'risk_score': float(row['risk_score']),
+        'risk_grade': row['risk_grade'],
+        'peak_date': str(row['peak_date']) if row['peak_date'] else None,
+        'trough_date': str(row['trough_date']) if row['trough_date'] else None
+    }
+
+
+def calculate_risk_score(stock_code: str, days: int = 252, use_table: bool = True) -> Dict:
     """
     종목별 종합 리스크 점수 계산
 
+    기본 기간(252일)은 야간에 계산된 risk_metrics 테이블에서 먼저 조회하고,
+    최신 거래일 기준 행이 없으면 직접 계산합니다.
+
     Args:
         stock_code: 종목 코드
         days: 분석 기간 (일)
+        use_table: risk_metrics 테이블 조회 여부
 
     Returns:
         리스크 분석 결과 딕셔너리
     """
-    conn = get_db_connection()
-
     try:
-        # 가격 데이터 조회
-        query = """
-            SELECT date, close
-            FROM prices
-            WHERE code = %s
-            ORDER BY date DESC
-            LIMIT %s
-        """
-        df = pd.read_sql(query, conn, params=(stock_code, days))
-
-        if len(df) < 10:
-            return {
-                'status': 'error',
-                'message': '데이터 부족 (최소 10일 필요)'
-            }
+        row = _stored_risk_metrics(stock_code) if use_table and days == RISK_TABLE_DAYS else None
 
-        # 날짜 순 정렬
-        df = df.sort_values('date')
-        df = df.set_index('date')
-
-        # 수익률 계산
-        returns = df['close'].pct_change().dropna()
-
-        # 각종 리스크 지표 계산
-        volatility = calculate_volatility(returns)
-        mdd_result = calculate_max_drawdown(df['close'])
-        var_95 = calculate_var(returns, 0.95)
-        sharpe = calculate_sharpe_ratio(returns)
-        downside_dev = calculate_downside_deviation(returns)
-        sortino = calculate_sortino_ratio(returns)
-        win_rate = calculate_win_rate(returns)
-
-        # 종합 리스크 점수 (0-10, 높을수록 위험)
-        # 변동성 기준 점수
-        vol_score = min(volatility / 5, 10)  # 50% 변동성 = 10점
-
-        # MDD 기준 점수
-        mdd_score = min(abs(mdd_result['max_drawdown']) / 5, 10)  # -50% MDD = 10점
-
-        # VaR 기준 점수
-        var_score = min(abs(var_95) / 3, 10)  # -30% VaR = 10점
-
-        # 종합 점수 (가중평균)
-        risk_score = (vol_score * 0.3 + mdd_score * 0.4 + var_score * 0.3)
-
-        # 리스크 등급
-        if risk_score < 3:
-            risk_grade = '낮음'
-        elif risk_score < 6:
-            risk_grade = '보통'
-        elif risk_score < 8:
-            risk_grade = '높음'
-        else:
-            risk_grade = '매우 높음'
+        if row is None:
+            # 가격 데이터 조회 (로컬 가격 저장소, 없으면 PostgreSQL)
+            table = calculate_risk_metrics([stock_code], days)
+            if table.empty:
+                return {
+                    'status': 'error',
+                    'message': '데이터 부족 (최소 10일 필요)'
+                }
+            row = table.iloc[0]
 
-        return {
-            'status': 'success',
-            'stock_code': stock_code,
-            'period_days': len(df),
-            'volatility': round(volatility, 2),
-            'max_drawdown': round(mdd_result['max_drawdown'], 2),
-            'var_95': round(var_95, 2),
-            'sharpe_ratio': round(sharpe, 3),
-            'downside_deviation': round(downside_dev, 2),
-            'sortino_ratio': round(sortino, 3),
-            'win_rate': round(win_rate, 2),
-            'risk_score': round(risk_score, 2),
-            'risk_grade': risk_grade,
-            'peak_date': str(mdd_result['peak_date']) if mdd_result['peak_date'] else None,
-            'trough_date': str(mdd_result['trough_date']) if mdd_result['trough_date'] else None
-        }
+        return _risk_result(stock_code, row)
 
     except Exception as e:
         return {
@@ -333,9 +525,6 @@ def calculate_risk_score(stock_code: str, days: int = 252) -> Dict:
             'message': str(e)
         }
 
-    finally:
-        conn.close()
-
 
 def analyze_portfolio_risk(stock_codes: list, weights: Optional[list] = None, days: int = 252) -> Dict:
     """
@@ -346,6 +535,9 @@ def analyze_portfolio_risk(stock_codes: list, weights: Optional[list] = None, da
         weights: 비중 리스트 (합계 1.0, None이면 동일가중)
         days: 분석 기간
 
+    같은 종목이 여러 번 있으면 비중을 합치고, 가격 데이터가 없는 종목을 제외한 뒤
+    남은 비중을 합계 1.0으로 다시 맞춥니다.
+
     Returns:
         포트폴리오 리스크 분석 결과
     """
@@ -364,39 +556,31 @@ def analyze_portfolio_risk(stock_codes: list, weights: Optional[list] = None, da
             'message': '비중 합계가 1.0이 아닙니다'
         }
 
-    conn = get_db_connection()
-
     try:
-        # 각 종목의 수익률 데이터 수집
-        returns_dict = {}
-
-        for code in stock_codes:
-            query = """
-                SELECT date, close
-                FROM prices
-                WHERE code = %s
-                ORDER BY date DESC
-                LIMIT %s
-            """
-            df = pd.read_sql(query, conn, params=(code, days))
-
-            if len(df) < 10:
-                continue
-
-            df = df.sort_values('date').set_index('date')
-            returns_dict[code] = df['close'].pct_change().dropna()
-
-        if len(returns_dict) == 0:
+        # 중복 종목은 비중 합산
+        weight_by_code = pd.Series(weights, index=[str(code) for code in stock_codes], dtype=float)
+        weight_by_code = weight_by_code.groupby(level=0, sort=False).sum()
+
+        # 전체 종목 수익률을 한 번에 조회 (날짜 x 종목)
+        returns_df = get_price_repository().returns(
+            list(weight_by_code.index), lookback=days, min_periods=10
+        ).dropna()
+
+        if returns_df.empty:
             return {
                 'status': 'error',
                 'message': '유효한 데이터가 없습니다'
             }
 
-        # 수익률 DataFrame 생성
-        returns_df = pd.DataFrame(returns_dict).dropna()
-
-        # 포트폴리오 수익률 계산
-        portfolio_returns = (returns_df * weights).sum(axis=1)
+        # 데이터 있는 종목의 비중만 사용하고 합계 1.0으로 재조정
+        weight_by_code = weight_by_code.reindex(returns_df.columns)
+        if weight_by_code.sum() <= 0:
+            return {
+                'status': 'error',
+                'message': '유효한 비중이 없습니다'
+            }
+        weight_by_code = weight_by_code / weight_by_code.sum()
+        portfolio_returns = returns_df.mul(weight_by_code, axis=1).sum(axis=1)
 
         # 포트폴리오 리스크 지표
         portfolio_volatility = calculate_volatility(portfolio_returns)
@@ -414,7 +598,7 @@ def analyze_portfolio_risk(stock_codes: list, weights: Optional[list] = None, da
 
         return {
             'status': 'success',
-            'portfolio_size': len(stock_codes),
+            'portfolio_size': len(weight_by_code),
             'period_days': len(portfolio_returns),
             'portfolio_volatility': round(portfolio_volatility, 2),
             'portfolio_max_drawdown': round(portfolio_mdd['max_drawdown'], 2),
@@ -422,8 +606,8 @@ def analyze_portfolio_risk(stock_codes: list, weights: Optional[list] = None, da
             'portfolio_var_95': round(portfolio_var, 2),
             'average_correlation': round(avg_correlation, 3),
             'diversification_ratio': round(diversification_ratio, 3),
-            'stocks': stock_codes,
-            'weights': [round(w, 4) for w in weights]
+            'stocks': list(weight_by_code.index),
+            'weights': [round(float(w), 4) for w in weight_by_code]
         }
 
     except Exception as e:
@@ -432,12 +616,21 @@ def analyze_portfolio_risk(stock_codes: list, weights: Optional[list] = None, da
             'message': str(e)
         }
 
-    finally:
-        conn.close()
-
 
 # 테스트 코드
 if __name__ == "__main__":
+    import sys
+
+    if "--refresh" in sys.argv:
+        # 야간 배치: 전 종목 risk_metrics 테이블 갱신
+        result = refresh_risk_metrics()
+        if result['status'] == 'success':
+            print(f"✓ 리스크 지표 갱신: {result['as_of']} 기준 {result['rows']:,}개 종목")
+        else:
+            print(f"✗ 리스크 지표 갱신 실패: {result['message']}")
+            sys.exit(1)
+        sys.exit(0)
+
     print("=== 리스크 분석 모듈 테스트 ===\n")
 
     # 1. 단일 종목 리스크 분석
@@ -453,6 +646,7 @@ if __name__ == "__main__":
         print(f"  Sortino Ratio: {result['sortino_ratio']}")
         print(f"  하방 편차: {result['downside_deviation']}%")
         print(f"  승률: {result['win_rate']}%")
+        print(f"  베타: {result['beta']}")
         print(f"  리스크 점수: {result['risk_score']}/10")
         print(f"  리스크 등급: {result['risk_grade']}")
     else:
@@ -6,10 +6,11 @@
 """
 
 import sys
+import time
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import logging
 import pandas as pd
 import numpy as np
@@ -18,8 +19,19 @@ import numpy as np
 project_root = Path(__file__).parent.parent.parent
 sys.path.append(str(project_root))
 
-from core.utils.db_utils import get_db_connection
-from core.modules.financial_metrics import calculate_basic_ratios
+from core.utils.db_utils import (
+    get_db_connection,
+    get_financials_version,
+    get_price_checksum,
+    get_price_version
+)
+from core.utils.price_store import load_panel
+from core.utils.score_cache import ScoreCache, config_fingerprint
+from core.modules.financial_metrics import (
+    calculate_basic_ratios,
+    calculate_profitability_metrics,
+    get_financial_data_from_db
+)
 
 # 로깅 설정
 logging.basicConfig(
@@ -29,6 +41,130 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# 모멘텀 평가 기간 (일)
+MOMENTUM_DAYS = 30
+# 시가총액 점수 정규화 범위: 1조 ~ 100조
+MIN_SCORE_MARKET_CAP = 1_000_000_000_000
+MAX_SCORE_MARKET_CAP = 100_000_000_000_000
+# detect_leaders 결과 항목 (종목별 계산 경로와 동일한 키)
+LEADER_RESULT_COLUMNS = [
+    'code', 'name', 'sector', 'total_score', 'market_cap_score', 'trading_amount_score',
+    'momentum_score', 'financial_score', 'stability_score', 'market_cap', 'avg_trading_amount'
+]
+
+
+def _last_valid_mean(close: pd.DataFrame, n: int) -> pd.Series:
+    """종목별 마지막 n개 유효값 평균 (거래정지일 NaN 제외)"""
+    valid = close.notna()
+    rows_from_end = valid[::-1].cumsum()[::-1]
+    return close.where(valid & (rows_from_end <= n)).mean()
+
+
+def market_cap_scores(market_cap: pd.Series) -> pd.Series:
+    """시가총액 점수 (0-100, 로그 스케일)"""
+    cap = market_cap.astype(float)
+    normalized = (np.log(cap.where(cap > 0)) - np.log(MIN_SCORE_MARKET_CAP)) / (
+        np.log(MAX_SCORE_MARKET_CAP) - np.log(MIN_SCORE_MARKET_CAP)
+    )
+    score = (normalized * 100).clip(0, 100)
+    return score.where(cap >= MIN_SCORE_MARKET_CAP, 0.0).fillna(0.0)
+
+
+def trading_amount_scores(close: pd.DataFrame, volume: pd.DataFrame) -> pd.DataFrame:
+    """
+    거래대금 점수 (날짜 x 종목 패널 기준)
+
+    Returns:
+        DataFrame (index: code, columns: trading_amount_score, avg_trading_amount)
+    """
+    amount = close * volume
+    amount = amount.where(amount > 0)
+    avg_amount = amount.mean()
+    cv = (amount.std(ddof=0) / avg_amount).where(avg_amount > 0, 0.0)
+
+    # 기본 점수(100억 기준)에서 CV 기반 안정성 감점 (최대 20점)
+    amount_score = (avg_amount / 100_000_000_000 * 100).clip(upper=100)
+    penalty = (cv * 10).clip(upper=20)
+    score = (amount_score - penalty).clip(lower=0)
+
+    return pd.DataFrame({
+        'trading_amount_score': score.fillna(0.0),
+        'avg_trading_amount': avg_amount.fillna(0.0),
+    })
+
+
+def momentum_scores(close: pd.DataFrame) -> pd.Series:
+    """모멘텀 점수 (SMA5 vs 기간 평균, 데이터 10일 미만이면 중립 50)"""
+    sma_5 = _last_valid_mean(close, 5)
+    sma_all = close.mean()
+
+    score = pd.Series(
+        np.select(
+            [sma_5 > sma_all * 1.02, sma_5 > sma_all, sma_5 < sma_all * 0.98],
+            [80.0, 65.0, 30.0],
+            default=50.0
+        ),
+        index=close.columns
+    )
+    return score.where(close.count() >= 10, 50.0)
+
+
+def stability_scores(close: pd.DataFrame) -> pd.Series:
+    """안정성 점수 (연환산 변동성 + 최대낙폭, 데이터 10일 미만이면 중립 50)"""
+    # 직전 유효 종가 대비 수익률 (거래정지 구간은 건너뜀)
+    returns = (close / close.ffill().shift(1) - 1).where(close.notna())
+    volatility = returns.std(ddof=0) * np.sqrt(252) * 100
+    max_drawdown = ((close / close.cummax() - 1) * 100).min()
+
+    score = 50.0 + np.select(
+        [volatility < 15, volatility < 25, volatility < 35],
+        [20.0, 10.0, 0.0],
+        default=-10.0
+    ) + np.select(
+        [max_drawdown > -10, max_drawdown > -15, max_drawdown > -25],
+        [15.0, 10.0, 5.0],
+        default=0.0
+    )
+    score = pd.Series(np.clip(score, 0, 100), index=close.columns)
+    return score.where(close.count() >= 10, 50.0)
+
+
+def financial_health_scores(financials: pd.DataFrame) -> pd.Series:
+    """
+    재무 건전성 점수 (ROE, 부채비율, 영업이익률)
+
+    Args:
+        financials: 종목별 최신 재무 데이터 (code, revenue, operating_profit, net_profit,
+                    total_assets, total_equity, total_debt)
+
+    Returns:
+        Series (index: code) - 재무 데이터 없는 종목은 포함되지 않음
+    """
+    if financials.empty:
+        return pd.Series(dtype=float)
+
+    ratios = calculate_profitability_metrics(calculate_basic_ratios(financials))
+    roe = ratios['roe'].fillna(0)
+    debt_ratio = ratios['debt_ratio'].fillna(100)
+    operating_margin = ratios['operating_margin'].fillna(0)
+
+    score = 50.0 + np.select(
+        [roe >= 15, roe >= 10, roe >= 5], [20.0, 15.0, 10.0], default=0.0
+    ) + np.select(
+        [debt_ratio < 50, debt_ratio < 100, debt_ratio < 150], [15.0, 10.0, 5.0], default=0.0
+    ) + np.select(
+        [operating_margin >= 15, operating_margin >= 10, operating_margin >= 5], [15.0, 10.0, 5.0], default=0.0
+    )
+    return pd.Series(np.minimum(score, 100), index=ratios['code'].values)
+
+
+def latest_financials(financials: pd.DataFrame) -> pd.DataFrame:
+    """종목별 가장 최근 분기 재무 데이터"""
+    if financials.empty:
+        return financials
+    return financials.sort_values(['code', 'year', 'quarter']).groupby('code', sort=False).tail(1)
+
+
 @dataclass
 class SectorLeaderConfig:
     """섹터 주도주 탐지 설정"""
@@ -59,12 +195,14 @@ class SectorLeaderDetector:
         self.config = config or SectorLeaderConfig()
         self.conn = None
 
-    def detect_leaders(self, market: str = "KOSPI") -> Dict[str, List[Dict]]:
+    def detect_leaders(self, market: str = "KOSPI", batch: bool = True) -> Dict[str, List[Dict]]:
         """
         섹터별 주도주 탐지
 
         Args:
             market: 시장 (KOSPI 또는 KOSDAQ)
+            batch: True면 시장 전체를 한 번에 로드해 벡터 연산으로 계산 (score_market),
+                   False면 종목별로 조회하여 계산
 
         Returns:
             Dict: 섹터별 주도주 목록
@@ -76,6 +214,9 @@ class SectorLeaderDetector:
                     ...
                 }
         """
+        if batch:
+            return self._detect_leaders_batch(market)
+
         try:
             logger.info("=" * 60)
             logger.info(f"섹터별 주도주 탐지 시작 ({market})")
@@ -121,6 +262,104 @@ class SectorLeaderDetector:
             logger.error(f"주도주 탐지 실패: {e}", exc_info=True)
             return {}
 
+    def _detect_leaders_batch(self, market: str) -> Dict[str, List[Dict]]:
+        """score_market 결과에서 섹터별 상위 종목 선택"""
+        try:
+            scored = self.score_market(market)
+            if scored.empty:
+                return {}
+
+            leaders = scored[scored['is_leader']]
+            results = {}
+            for sector, group in leaders.groupby('sector', sort=False):
+                results[sector] = group.sort_values('sector_rank')[LEADER_RESULT_COLUMNS].to_dict('records')
+
+            logger.info(f"주도주 탐지 완료 ({market}): {len(leaders)}개 종목 / {len(results)}개 섹터")
+            return results
+
+        except Exception as e:
+            logger.error(f"주도주 탐지 실패: {e}", exc_info=True)
+            return {}
+
+    def score_market(self, market: str = "KOSPI", as_of: Optional[date] = None) -> pd.DataFrame:
+        """
+        시장 전체 주도주 점수 일괄 계산
+
+        가격 구간과 재무 데이터를 한 번씩만 로드한 뒤 종목 단위 계산을
+        날짜 x 종목 패널 연산으로, 섹터 내 순위를 groupby().rank로 처리합니다.
+
+        Args:
+            market: 시장 (KOSPI 또는 KOSDAQ)
+            as_of: 기준일 (None이면 오늘)
+
+        Returns:
+            DataFrame: 종목별 점수 (code, name, sector, *_score, total_score,
+                       eligible, sector_rank, is_leader)
+        """
+        started = time.perf_counter()
+        stocks_df = self._get_market_stocks(market)
+        if stocks_df.empty:
+            logger.warning(f"시장 {market}의 종목 데이터를 찾을 수 없습니다")
+            return pd.DataFrame()
+
+        stocks_df = stocks_df[stocks_df['sector'].notna()].reset_index(drop=True)
+        codes = stocks_df['code'].tolist()
+
+        # 1. 가격 구간 / 재무 데이터 일괄 로드
+        end = as_of or date.today()
+        start = end - timedelta(days=max(self.config.analysis_days, MOMENTUM_DAYS))
+        panel = load_panel(codes, start, end, ["close", "volume"])
+        financials = latest_financials(get_financial_data_from_db(codes))
+        loaded = time.perf_counter()
+
+        close = panel['close'].reindex(columns=codes).astype(float) if not panel.empty else \
+            pd.DataFrame(columns=codes, dtype=float)
+        volume = panel['volume'].reindex(columns=codes).astype(float) if not panel.empty else \
+            pd.DataFrame(columns=codes, dtype=float)
+        analysis_mask = close.index >= pd.Timestamp(end - timedelta(days=self.config.analysis_days))
+        momentum_mask = close.index >= pd.Timestamp(end - timedelta(days=MOMENTUM_DAYS))
+
+        # 2. 구성 점수 (벡터 연산)
+        scored = stocks_df.set_index('code')
+        scored['market_cap'] = scored['market_cap'].astype(float)
+        scored['market_cap_score'] = market_cap_scores(scored['market_cap'])
+        scored = scored.join(trading_amount_scores(close[analysis_mask], volume[analysis_mask]))
+        scored['momentum_score'] = momentum_scores(close[momentum_mask])
+        scored['financial_score'] = financial_health_scores(financials).reindex(scored.index).fillna(50.0)
+        scored['stability_score'] = stability_scores(close[analysis_mask])
+
+        cfg = self.config
+        scored['total_score'] = (
+            scored['market_cap_score'] * cfg.market_cap_weight +
+            scored['trading_amount_score'] * cfg.trading_amount_weight +
+            scored['momentum_score'] * cfg.momentum_weight +
+            scored['financial_score'] * cfg.financial_weight +
+            scored['stability_score'] * cfg.stability_weight
+        )
+
+        score_columns = ['total_score', 'market_cap_score', 'trading_amount_score',
+                         'momentum_score', 'financial_score', 'stability_score']
+        scored[score_columns] = scored[score_columns].round(2)
+        scored['avg_trading_amount'] = scored['avg_trading_amount'].round(0)
+
+        # 3. 필터 + 섹터 내 순위
+        scored['eligible'] = (
+            (scored['market_cap'] >= cfg.min_market_cap) &
+            (scored['avg_trading_amount'] >= cfg.min_trading_amount) &
+            (scored['total_score'] > 0)
+        )
+        scored['sector_rank'] = (
+            scored['total_score'].where(scored['eligible'])
+            .groupby(scored['sector']).rank(method='first', ascending=False)
+        )
+        scored['is_leader'] = scored['sector_rank'] <= cfg.leaders_per_sector
+
+        logger.info(
+            f"주도주 점수 계산 ({market}, {len(scored)}개 종목): "
+            f"로드 {loaded - started:.2f}s, 계산 {time.perf_counter() - loaded:.2f}s"
+        )
+        return scored.reset_index()
+
     def _detect_sector_leaders(self, sector_stocks: pd.DataFrame) -> List[Dict]:
         """
         특정 섹터의 주도주 탐지
@@ -352,41 +591,8 @@ class SectorLeaderDetector:
         ROE, 부채비율, 이익 마진을 평가
         """
         try:
-            result = calculate_basic_ratios(code)
-
-            if not result or result.get('status') != 'success':
-                return 50.0
-
-            score = 50  # 기본값
-
-            # ROE 평가 (20점)
-            roe = result.get('roe', 0)
-            if roe >= 15:
-                score += 20
-            elif roe >= 10:
-                score += 15
-            elif roe >= 5:
-                score += 10
-
-            # 부채비율 평가 (15점)
-            debt_ratio = result.get('debt_ratio', 100)
-            if debt_ratio < 50:
-                score += 15
-            elif debt_ratio < 100:
-                score += 10
-            elif debt_ratio < 150:
-                score += 5
-
-            # 영업이익률 평가 (15점)
-            operating_margin = result.get('operating_margin', 0)
-            if operating_margin >= 15:
-                score += 15
-            elif operating_margin >= 10:
-                score += 10
-            elif operating_margin >= 5:
-                score += 5
-
-            return min(score, 100)
+            financials = latest_financials(get_financial_data_from_db([code]))
+            return float(financial_health_scores(financials).get(code, 50.0))
 
         except Exception as e:
             logger.debug(f"재무 점수 계산 실패 ({code}): {e}")
@@ -520,6 +726,58 @@ def get_sector_leaders(
     return detector.detect_leaders(market)
 
 
+_leadership_cache = ScoreCache("leadership")
+
+
+def get_leadership_scores(
+    market: str = "KOSPI",
+    config: Optional[SectorLeaderConfig] = None,
+    refresh: bool = False
+) -> Dict[str, float]:
+    """
+    섹터 주도주 점수 (캐시 사용)
+
+    (시장, 설정 해시, 데이터 버전) 키로 결과를 재사용하므로
+    같은 거래일 안의 반복 스크리닝은 시장 전체 탐지를 다시 실행하지 않습니다.
+    데이터 버전은 마지막 완성 거래일, 분석 기간 가격 지문(과거 날짜 백필/보정),
+    재무 데이터 버전으로 구성되어 이 중 하나라도 바뀌면 다시 계산됩니다.
+
+    Args:
+        market: 시장 (KOSPI 또는 KOSDAQ)
+        config: 탐지 설정 (None이면 기본값)
+        refresh: True면 캐시를 무시하고 다시 계산
+
+    Returns:
+        Dict: {종목코드: 주도주 종합점수} (주도주로 선정된 종목만)
+    """
+    config = config or SectorLeaderConfig()
+    latest_date, row_count = get_price_version()
+    window_start = date.today() - timedelta(days=max(config.analysis_days, MOMENTUM_DAYS))
+    data_version = config_fingerprint({
+        'price': [latest_date, row_count],
+        'window': [window_start, *get_price_checksum(window_start)],
+        'financials': list(get_financials_version()),
+    })
+    key = (f"{market}-{config_fingerprint(config)}", f"{latest_date}-{data_version}")
+
+    if not refresh:
+        scores = _leadership_cache.get(key)
+        if scores is not None:
+            return scores
+
+    leaders = SectorLeaderDetector(config).detect_leaders(market)
+    scores = {
+        leader['code']: leader['total_score']
+        for sector_leaders in leaders.values()
+        for leader in sector_leaders
+    }
+
+    # 탐지 실패(빈 결과)는 캐시하지 않음
+    if scores:
+        _leadership_cache.put(key, scores)
+    return scores
+
+
 if __name__ == "__main__":
     # 테스트
     print("섹터별 주도주 탐지 테스트\n")
@@ -15,7 +15,18 @@ TA-Lib 설치가 어려운 경우를 대비해 pandas로 직접 구현합니다.
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Optional, Tuple
-from core.utils.db_utils import get_db_connection
+from core.utils.price_store import get_price_store, load_panel, recent_window_start
+
+# 일괄 계산 엔진이 만드는 지표 (analyze_technical_indicators와 동일한 기간)
+INDICATOR_COLUMNS = [
+    'sma_20', 'sma_60', 'ema_20', 'rsi',
+    'macd', 'macd_signal', 'macd_histogram',
+    'bb_upper', 'bb_middle', 'bb_lower',
+    'momentum', 'roc', 'volatility'
+]
+# 스냅샷 반올림 자릿수 (analyze_technical_indicators 결과와 동일)
+SNAPSHOT_DECIMALS = {column: 2 for column in INDICATOR_COLUMNS}
+SNAPSHOT_DECIMALS.update({'macd': 4, 'macd_signal': 4, 'macd_histogram': 4})
 
 
 def calculate_sma(df: pd.DataFrame, column: str = 'close', period: int = 20) -> pd.Series:
@@ -195,7 +206,7 @@ def calculate_volatility(df: pd.DataFrame, column: str = 'close', period: int =
     Returns:
         Volatility Series (연율화)
     """
-    returns = df[column].pct_change()
+    returns = df[column].pct_change(fill_method=None)
     volatility = returns.rolling(window=period).std() * np.sqrt(252) * 100
 
     return volatility
@@ -212,20 +223,185 @@ def get_price_data_from_db(stock_code: str, days: int = 120) -> pd.DataFrame:
     Returns:
         가격 데이터 DataFrame
     """
-    conn = get_db_connection()
-
-    query = """
-    SELECT date, open, high, low, close, volume
-    FROM prices
-    WHERE code = %s
-        AND date >= CURRENT_DATE - INTERVAL '%s days'
-    ORDER BY date ASC
+    # 로컬 가격 저장소 (없으면 PostgreSQL) 에서 조회
+    df = get_price_store().load_history(stock_code, start=recent_window_start(days))
+    df['date'] = df['date'].dt.date
+
+    return df
+
+
+def _align_to_end(close: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
     """
+    종목별 유효 가격을 끝 행 기준으로 정렬
 
-    df = pd.read_sql_query(query, conn, params=(stock_code, days))
-    conn.close()
+    거래정지 등으로 빠진 날짜를 건너뛰어, 각 열이 그 종목의 가격만 연속으로
+    담도록 재배치한다. 이 행렬에서 행 방향으로 지표를 계산하면 종목별로
+    따로 계산한 결과와 같다.
 
-    return df
+    Returns:
+        (정렬된 값 행렬, 원래 위치 mask, 정렬 행렬에서의 행 번호)
+    """
+    values = close.to_numpy(dtype=float)
+    valid = ~np.isnan(values)
+    rows_from_end = valid[::-1].cumsum(axis=0)[::-1]
+    target_rows = len(values) - rows_from_end
+
+    aligned = np.full(values.shape, np.nan)
+    cols = np.broadcast_to(np.arange(values.shape[1]), values.shape)
+    aligned[target_rows[valid], cols[valid]] = values[valid]
+    return aligned, valid, target_rows
+
+
+def _shift(values: np.ndarray, periods: int) -> np.ndarray:
+    shifted = np.full(values.shape, np.nan)
+    shifted[periods:] = values[:-periods]
+    return shifted
+
+
+def _rolling(values: np.ndarray, window: int, func, **kwargs) -> np.ndarray:
+    """행 방향 rolling 집계 (window 안에 NaN이 있으면 NaN, pandas rolling과 동일)"""
+    result = np.full(values.shape, np.nan)
+    if len(values) >= window:
+        windows = np.lib.stride_tricks.sliding_window_view(values, window, axis=0)
+        result[window - 1:] = func(windows, axis=-1, **kwargs)
+    return result
+
+
+def _ewm(values: np.ndarray, span: int) -> np.ndarray:
+    """지수 이동평균 (adjust=False, 열마다 첫 유효값부터 시작)"""
+    alpha = 2.0 / (span + 1.0)
+    result = np.empty(values.shape)
+    prev = np.full(values.shape[1:], np.nan)
+    for i, row in enumerate(values):
+        prev = np.where(np.isnan(prev), row, (1 - alpha) * prev + alpha * row)
+        result[i] = prev
+    return result
+
+
+def calculate_indicator_panel(close: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    """
+    전 종목 기술적 지표 일괄 계산
+
+    날짜 x 종목 종가 패널에서 이 모듈의 모든 지표를 종목 축으로 벡터화하여 계산합니다.
+    종목별로 빠진 날짜는 건너뛰고 계산하므로 analyze_technical_indicators와 값이 같습니다.
+
+    Args:
+        close: 종가 패널 (index: date, columns: code)
+
+    Returns:
+        {'close': 종가, 'sma_20': ..., ...} - 각 값은 close와 같은 모양의 DataFrame
+        (가격이 없는 날짜는 NaN)
+    """
+    x, valid, target_rows = _align_to_end(close)
+    started = ~np.isnan(x)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        indicators = {
+            'sma_20': _rolling(x, 20, np.mean),
+            'sma_60': _rolling(x, 60, np.mean),
+            'ema_20': _ewm(x, 20),
+        }
+
+        # RSI: 첫 거래일의 변화량은 0으로 취급 (calculate_rsi와 동일)
+        delta = x - _shift(x, 1)
+        gain = np.where(started, np.where(delta > 0, delta, 0.0), np.nan)
+        loss = np.where(started, np.where(delta < 0, -delta, 0.0), np.nan)
+        rs = _rolling(gain, 14, np.mean) / _rolling(loss, 14, np.mean)
+        indicators['rsi'] = 100 - (100 / (1 + rs))
+
+        macd = _ewm(x, 12) - _ewm(x, 26)
+        signal = _ewm(macd, 9)
+        indicators.update(macd=macd, macd_signal=signal, macd_histogram=macd - signal)
+
+        middle = indicators['sma_20']
+        std = _rolling(x, 20, np.std, ddof=1)
+        indicators.update(bb_upper=middle + std * 2.0, bb_middle=middle, bb_lower=middle - std * 2.0)
+
+        previous = _shift(x, 10)
+        indicators['momentum'] = x - previous
+        indicators['roc'] = (x - previous) / previous * 100
+
+        returns = x / _shift(x, 1) - 1
+        indicators['volatility'] = _rolling(returns, 20, np.std, ddof=1) * np.sqrt(252) * 100
+
+    # 원래 날짜 위치로 되돌림
+    cols = np.broadcast_to(np.arange(close.shape[1]), close.shape)
+    panel = {'close': close}
+    for name in INDICATOR_COLUMNS:
+        restored = np.full(close.shape, np.nan)
+        restored[valid] = indicators[name][target_rows[valid], cols[valid]]
+        panel[name] = pd.DataFrame(restored, index=close.index, columns=close.columns)
+
+    return panel
+
+
+def _snapshot_signals(snapshot: pd.DataFrame) -> pd.Series:
+    """스냅샷 행별 시그널 목록 (analyze_technical_indicators 판단 기준과 동일)"""
+    close = snapshot['close']
+    rules = [
+        ((snapshot['rsi'] < 30), "RSI 과매도 (< 30)"),
+        ((snapshot['rsi'] > 70), "RSI 과매수 (> 70)"),
+        ((close > snapshot['sma_20']) & (snapshot['sma_20'] > snapshot['sma_60']), "골든크로스 (상승 추세)"),
+        ((close < snapshot['sma_20']) & (snapshot['sma_20'] < snapshot['sma_60']), "데드크로스 (하락 추세)"),
+        ((snapshot['macd'] > snapshot['macd_signal']) & (snapshot['macd_histogram'] > 0), "MACD 매수 신호"),
+        ((snapshot['macd'] < snapshot['macd_signal']) & (snapshot['macd_histogram'] < 0), "MACD 매도 신호"),
+        ((close > snapshot['bb_upper']), "볼린저 밴드 상단 돌파"),
+        ((close < snapshot['bb_lower']), "볼린저 밴드 하단 이탈"),
+    ]
+    flags = np.column_stack([mask.to_numpy(dtype=bool) for mask, _ in rules])
+    labels = [label for _, label in rules]
+    return pd.Series(
+        [[labels[i] for i in np.flatnonzero(row)] for row in flags],
+        index=snapshot.index
+    )
+
+
+def latest_indicator_snapshot(panel: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """
+    종목별 최신 지표 스냅샷
+
+    Args:
+        panel: calculate_indicator_panel 결과
+
+    Returns:
+        DataFrame (code, date, close, 지표..., signals) - 가격 없는 종목 제외
+    """
+    close = panel['close']
+    last_valid = close.notna()[::-1].idxmax().where(close.notna().any())
+    codes = last_valid.dropna().index
+
+    rows = close.index.get_indexer(last_valid[codes])
+    cols = close.columns.get_indexer(codes)
+
+    snapshot = pd.DataFrame({'code': codes, 'date': close.index[rows]})
+    snapshot['close'] = close.to_numpy()[rows, cols]
+    for name in INDICATOR_COLUMNS:
+        snapshot[name] = panel[name].to_numpy()[rows, cols].round(SNAPSHOT_DECIMALS[name])
+
+    snapshot['signals'] = _snapshot_signals(snapshot)
+    return snapshot
+
+
+def analyze_technical_universe(
+    stock_codes: Optional[List[str]] = None,
+    days: int = 120
+) -> Tuple[pd.DataFrame, Dict[str, pd.DataFrame]]:
+    """
+    여러 종목(또는 전 종목) 기술적 지표 일괄 분석
+
+    Args:
+        stock_codes: 종목 코드 리스트 (None이면 저장된 전 종목)
+        days: 분석 기간 (일수)
+
+    Returns:
+        (최신 스냅샷 DataFrame, 지표 패널 딕셔너리)
+    """
+    close = load_panel(stock_codes, recent_window_start(days), None, "close")
+    if stock_codes is not None:
+        close = close.reindex(columns=[code for code in stock_codes if code in close.columns])
+
+    panel = calculate_indicator_panel(close.astype(float))
+    return latest_indicator_snapshot(panel), panel
 
 
 def analyze_technical_indicators(stock_code: str, days: int = 120) -> Dict:
@@ -334,21 +510,21 @@ def get_technical_signals(stock_codes: List[str], days: int = 120) -> pd.DataFra
     Returns:
         시그널 DataFrame
     """
-    results = []
-
-    for code in stock_codes:
-        analysis = analyze_technical_indicators(code, days)
-        if analysis['status'] == 'success':
-            results.append({
-                'code': code,
-                'rsi': analysis['rsi'],
-                'macd_signal': 'buy' if analysis['macd'] and analysis['macd'] > analysis['macd_signal'] else 'sell',
-                'trend': 'up' if analysis['close'] > analysis['sma_20'] else 'down',
-                'volatility': analysis['volatility'],
-                'signals': ', '.join(analysis['signals']) if analysis['signals'] else 'None'
-            })
-
-    return pd.DataFrame(results)
+    # 전 종목을 한 번에 로드해 열 단위로 계산
+    snapshot, _ = analyze_technical_universe(stock_codes, days)
+    if snapshot.empty:
+        return pd.DataFrame()
+
+    return pd.DataFrame({
+        'code': snapshot['code'],
+        'rsi': snapshot['rsi'].astype(object).where(snapshot['rsi'].notna(), None),
+        'macd_signal': np.where(
+            snapshot['macd'].fillna(0).ne(0) & (snapshot['macd'] > snapshot['macd_signal']), 'buy', 'sell'
+        ),
+        'trend': np.where(snapshot['close'] > snapshot['sma_20'], 'up', 'down'),
+        'volatility': snapshot['volatility'].astype(object).where(snapshot['volatility'].notna(), None),
+        'signals': snapshot['signals'].map(lambda signals: ', '.join(signals) if signals else 'None')
+    })
 
 
 if __name__ == '__main__':
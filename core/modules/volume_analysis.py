@@ -5,13 +5,102 @@
 대장주 선정에 필요한 거래량 점수를 계산합니다.
 """
 
-import os
-import psycopg2
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 
+from core.utils.db_utils import get_db_connection
+from core.utils.price_store import load_panel
+
+# 배치 분석에서 종목별 최근 days 거래일을 덮는 달력 기간 배수 (주말/공휴일 여유)
+CALENDAR_DAYS_FACTOR = 1.6
+
+
+def volume_scores(avg_amount, change_pct, cv, surge) -> np.ndarray:
+    """
+    거래량 종합 점수 (0-100, 배열 단위)
+
+    VolumeAnalyzer.calculate_volume_score와 같은 구간 점수를 np.select로 계산합니다.
+    """
+    avg_amount, change_pct, cv = (np.asarray(v, dtype=float) for v in (avg_amount, change_pct, cv))
+
+    # 1. 거래대금 점수 (0-50점) - 2,000억/1,000억/500억/200억/100억 기준
+    amount_score = np.select(
+        [avg_amount >= 200_000_000_000, avg_amount >= 100_000_000_000, avg_amount >= 50_000_000_000,
+         avg_amount >= 20_000_000_000, avg_amount >= 10_000_000_000],
+        [50, 45, 40, 30, 20], 10
+    )
+    # 2. 거래량 추세 점수 (0-30점)
+    trend_score = np.select(
+        [change_pct > 30, change_pct > 20, change_pct > 10, change_pct > 0, change_pct > -10],
+        [30, 25, 20, 15, 10], 5
+    )
+    # 3. 안정성 점수 (0-10점)
+    stability_score = np.select([cv < 0.3, cv < 0.5, cv < 0.8, cv < 1.0], [10, 8, 5, 3], 0)
+    # 4. 최근 급증 보너스 (0-10점)
+    surge_score = np.where(np.asarray(surge, dtype=bool), 10, 0)
+
+    return np.minimum(amount_score + trend_score + stability_score + surge_score, 100).astype(float)
+
+
+def volume_rank_labels(scores) -> np.ndarray:
+    """점수 배열 → 등급 (VolumeAnalyzer.get_volume_rank와 같은 기준)"""
+    scores = np.asarray(scores, dtype=float)
+    return np.select(
+        [scores >= 80, scores >= 65, scores >= 50, scores >= 35],
+        ["매우높음", "높음", "보통", "낮음"], "매우낮음"
+    )
+
+
+def volume_metrics(close: pd.DataFrame, volume: pd.DataFrame, days: int = 60) -> pd.DataFrame:
+    """
+    거래량 지표 (날짜 x 종목 패널 기준)
+
+    종목별로 자신의 마지막 days개 거래일(거래정지일 NaN 제외)을 사용하므로
+    analyze_volume(종목별 LIMIT days 조회)과 같은 값입니다. 20거래일 미만 종목은 제외합니다.
+
+    Returns:
+        DataFrame (analyze_volume 결과와 같은 컬럼, 입력 종목 순서)
+    """
+    valid = close.notna() & volume.notna()
+    rows_from_end = valid[::-1].cumsum()[::-1]
+    amount = close * volume
+
+    def last_n(frame: pd.DataFrame, n: int) -> pd.DataFrame:
+        return frame.where(valid & (rows_from_end <= n))
+
+    count = valid.sum().clip(upper=days)
+    avg_volume_20 = last_n(volume, 20).mean()
+    avg_amount_20 = last_n(amount, 20).mean()
+    avg_volume_60 = last_n(volume, days).mean().where(count >= 60, avg_volume_20)
+    avg_amount_60 = last_n(amount, days).mean().where(count >= 60, avg_amount_20)
+
+    change_pct = ((avg_volume_20 / avg_volume_60 - 1) * 100).where(avg_volume_60 > 0, 0.0)
+    volume_cv = (last_n(volume, 20).std() / avg_volume_20).where(avg_volume_20 > 0, 0.0)
+    surge = last_n(volume, 5).mean() > avg_volume_20 * 1.5
+
+    result = pd.DataFrame({
+        'code': close.columns,
+        'avg_volume_20d': avg_volume_20.to_numpy(),
+        'avg_volume_60d': avg_volume_60.to_numpy(),
+        'avg_amount_20d': avg_amount_20.to_numpy(),
+        'avg_amount_60d': avg_amount_60.to_numpy(),
+        'volume_trend': np.select(
+            [change_pct > 20, change_pct > 10, change_pct > -10], ["급증", "증가", "유지"], "감소"
+        ),
+        'volume_change_pct': change_pct.round(2).to_numpy(),
+        'volume_cv': volume_cv.round(3).to_numpy(),
+        'recent_volume_surge': surge.to_numpy(),
+        # 점수는 반올림 전 값으로 계산 (analyze_volume과 동일)
+        'volume_score': np.round(volume_scores(avg_amount_20, change_pct, volume_cv, surge), 1),
+    })
+    result = result[(count >= 20).to_numpy()].reset_index(drop=True)
+    result['volume_rank'] = volume_rank_labels(result['volume_score'])
+    result['avg_volume_20d'] = result['avg_volume_20d'].astype(np.int64)
+    result['avg_volume_60d'] = result['avg_volume_60d'].astype(np.int64)
+    return result
+
 
 class VolumeAnalyzer:
     """거래량 및 유동성 분석"""
@@ -20,15 +109,9 @@ class VolumeAnalyzer:
         self.conn = None
 
     def get_db_connection(self):
-        """PostgreSQL 연결 생성"""
+        """풀에서 PostgreSQL 연결 대여 (인스턴스 수명 동안 재사용)"""
         if self.conn is None or self.conn.closed:
-            self.conn = psycopg2.connect(
-                host=os.getenv("DB_HOST", "localhost"),
-                port=os.getenv("DB_PORT", "5432"),
-                database=os.getenv("DB_NAME", "investment_db"),
-                user=os.getenv("DB_USER", "invest_user"),
-                password=os.getenv("DB_PASSWORD")
-            )
+            self.conn = get_db_connection()
         return self.conn
 
     def get_price_data(self, stock_code: str, days: int = 60) -> pd.DataFrame:
@@ -174,53 +257,7 @@ class VolumeAnalyzer:
         Returns:
             종합 점수 (0-100)
         """
-        score = 0
-
-        # 1. 거래대금 점수 (0-50점) - 가장 중요
-        if avg_amount >= 200_000_000_000:  # 2,000억 이상
-            score += 50
-        elif avg_amount >= 100_000_000_000:  # 1,000억 이상
-            score += 45
-        elif avg_amount >= 50_000_000_000:  # 500억 이상
-            score += 40
-        elif avg_amount >= 20_000_000_000:  # 200억 이상
-            score += 30
-        elif avg_amount >= 10_000_000_000:  # 100억 이상
-            score += 20
-        else:
-            score += 10
-
-        # 2. 거래량 추세 점수 (0-30점)
-        if change_pct > 30:
-            score += 30
-        elif change_pct > 20:
-            score += 25
-        elif change_pct > 10:
-            score += 20
-        elif change_pct > 0:
-            score += 15
-        elif change_pct > -10:
-            score += 10
-        else:
-            score += 5
-
-        # 3. 안정성 점수 (0-10점)
-        if cv < 0.3:
-            score += 10
-        elif cv < 0.5:
-            score += 8
-        elif cv < 0.8:
-            score += 5
-        elif cv < 1.0:
-            score += 3
-        else:
-            score += 0
-
-        # 4. 최근 급증 보너스 (0-10점)
-        if surge:
-            score += 10
-
-        return min(score, 100)
+        return float(volume_scores([avg_amount], [change_pct], [cv], [surge])[0])
 
     def get_volume_rank(self, score: float) -> str:
         """점수에 따른 등급 반환"""
@@ -235,11 +272,35 @@ class VolumeAnalyzer:
         else:
             return "매우낮음"
 
+    def analyze_volume_batch(self, stock_codes: List[str], days: int = 60) -> pd.DataFrame:
+        """
+        여러 종목의 거래량 지표 일괄 분석 (가격 구간 1회 조회)
+
+        Args:
+            stock_codes: 종목 코드 리스트
+            days: 분석 기간 (종목별 거래일 수)
+
+        Returns:
+            DataFrame (analyze_volume 결과와 같은 컬럼, 데이터 부족 종목 제외)
+        """
+        codes = list(dict.fromkeys(stock_codes))
+        if not codes:
+            return volume_metrics(pd.DataFrame(), pd.DataFrame(), days)
+
+        start = datetime.now().date() - timedelta(days=int(days * CALENDAR_DAYS_FACTOR) + 10)
+        panel = load_panel(codes, start, None, ["close", "volume"])
+        if panel.empty:
+            return volume_metrics(pd.DataFrame(), pd.DataFrame(), days)
+
+        close = panel['close'].reindex(columns=codes).astype(float)
+        volume = panel['volume'].reindex(columns=codes).astype(float)
+        return volume_metrics(close, volume, days)
+
     def rank_stocks_by_volume(
         self,
         stock_codes: List[str],
         min_amount: float = 50_000_000_000
-    ) -> List[Dict]:
+    ) -> pd.DataFrame:
         """
         종목들을 거래량 기준으로 순위화
 
@@ -248,55 +309,32 @@ class VolumeAnalyzer:
             min_amount: 최소 거래대금 필터 (기본 500억원)
 
         Returns:
-            거래량 순위 리스트 (높은 순)
+            거래량 점수 순 DataFrame (analyze_volume 컬럼 + rank)
         """
-        results = []
-
         print(f"\n{'='*80}")
         print(f"거래량 분석 중... (총 {len(stock_codes)}개 종목)")
         print(f"최소 거래대금 기준: {min_amount/1e8:.0f}억원")
         print(f"{'='*80}\n")
 
-        for code in stock_codes:
-            try:
-                volume_info = self.analyze_volume(code)
-
-                # 에러 체크
-                if 'error' in volume_info:
-                    print(f"  ⚠️  {code}: {volume_info['error']}")
-                    continue
+        metrics = self.analyze_volume_batch(stock_codes)
+        passed = metrics[metrics['avg_amount_20d'] >= min_amount]
 
-                # 최소 거래대금 필터
-                if volume_info['avg_amount_20d'] < min_amount:
-                    print(f"  ❌ {code}: 거래대금 부족 ({volume_info['avg_amount_20d']/1e8:.0f}억원)")
-                    continue
+        # 거래량 점수로 정렬 (동점은 입력 순서 유지)
+        ranked = passed.sort_values('volume_score', ascending=False, kind='stable').reset_index(drop=True)
+        ranked['rank'] = np.arange(1, len(ranked) + 1)
 
-                results.append(volume_info)
+        print(f"  데이터 부족: {len(set(stock_codes)) - len(metrics)}개, "
+              f"거래대금 부족: {len(metrics) - len(passed)}개")
+        print(f"\n총 {len(ranked)}개 종목이 기준을 통과했습니다.\n")
 
-                print(f"  ✓ {code}: {volume_info['avg_amount_20d']/1e8:.0f}억원 "
-                      f"({volume_info['volume_rank']}, 점수: {volume_info['volume_score']:.1f})")
-
-            except Exception as e:
-                print(f"  ❌ {code}: 분석 실패 - {str(e)}")
-                continue
-
-        # 거래량 점수로 정렬
-        results.sort(key=lambda x: x['volume_score'], reverse=True)
-
-        # 순위 부여
-        for i, item in enumerate(results):
-            item['rank'] = i + 1
-
-        print(f"\n총 {len(results)}개 종목이 기준을 통과했습니다.\n")
-
-        return results
+        return ranked
 
     def get_top_volume_stocks(
         self,
         market: str = "KOSPI",
         limit: int = 20,
         min_amount: float = 50_000_000_000
-    ) -> List[Dict]:
+    ) -> pd.DataFrame:
         """
         시장에서 거래량 상위 종목 조회
 
@@ -306,26 +344,25 @@ class VolumeAnalyzer:
             min_amount: 최소 거래대금
 
         Returns:
-            거래량 상위 종목 리스트
+            거래량 점수 상위 limit개 DataFrame
         """
         conn = self.get_db_connection()
 
-        # 시장별 종목 코드 조회
+        # 시장 전체 종목 (배치 분석이므로 종목 수를 미리 줄이지 않음)
         query = """
             SELECT DISTINCT code
             FROM stocks
             WHERE market = %s
-            LIMIT %s
         """
 
-        df = pd.read_sql_query(query, conn, params=(market, limit * 2))
+        df = pd.read_sql_query(query, conn, params=(market,))
         stock_codes = df['code'].tolist()
 
         # 거래량 분석 및 순위화
-        return self.rank_stocks_by_volume(stock_codes, min_amount)
+        return self.rank_stocks_by_volume(stock_codes, min_amount).head(limit)
 
     def __del__(self):
-        """연결 종료"""
+        """연결 반납"""
         if self.conn and not self.conn.closed:
             self.conn.close()
 
@@ -0,0 +1,383 @@
+"""
+워크포워드(walk-forward) 백테스트 엔진
+
+리밸런싱 시점마다 그 시점에 알 수 있었던 재무/가격 데이터만으로 다시 스크리닝하고
+비중을 새로 정한 뒤, 다음 리밸런싱까지는 날짜 x 종목 수익률 패널 위에서
+비중 drift를 행렬 연산으로 반영합니다.
+
+- 재무 데이터: 분기 종료일 + 공시 기한(REPORT_LAG_DAYS)이 지난 보고서만 사용
+- 가격 팩터: 리밸런싱일 종가까지의 모멘텀/변동성
+- 매매 시점: 리밸런싱일 종가 (수익률은 다음 거래일부터 반영)
+
+데이터는 load_walk_forward_data로 한 번만 읽고, 같은 데이터로 전략/파라미터를
+바꿔 가며 run_walk_forward를 여러 번 실행할 수 있습니다.
+"""
+
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from core.modules.factor_scoring import FactorScorer
+from core.modules.financials_index import (
+    REPORT_LAG_DAYS,
+    FinancialsIndex,
+    financials_available_date,
+    get_financials_index
+)
+from core.modules.optimizers import PortfolioConstraints, optimize_portfolio
+from core.utils.price_store import load_panel
+
+MOMENTUM_PERIODS = (20, 60, 120)
+# 변동성 계산 구간 (거래일) - screen_stocks의 최근 60일과 같은 수준
+VOLATILITY_DAYS = 40
+# 리스크 패리티 공분산 계산 구간 (거래일)
+RISK_PARITY_DAYS = 60
+# 최소분산/최대 Sharpe 공분산·기대수익률 계산 구간 (거래일)
+OPTIMIZER_DAYS = 252
+# 공분산 기반 전략의 종목당 최대 비중 (종목 수가 적으면 1/종목 수까지 완화)
+OPTIMIZED_MAX_WEIGHT = 0.2
+# 리밸런싱 이전에 필요한 가격 이력 (모멘텀 120거래일 + 여유)
+PRICE_LOOKBACK_DAYS = 200
+
+# 공분산 기반 전략: {전략: (optimize_portfolio method, 계산 구간)}
+OPTIMIZED_STRATEGIES = {
+    "risk_parity": ("erc", RISK_PARITY_DAYS),
+    "min_variance": ("min_variance", OPTIMIZER_DAYS),
+    "max_sharpe": ("max_sharpe", OPTIMIZER_DAYS),
+}
+STRATEGIES = ("equal_weight", "market_cap") + tuple(OPTIMIZED_STRATEGIES)
+
+
+@dataclass
+class WalkForwardData:
+    """워크포워드 입력 데이터 (시점 기준 재무 인덱스 + 종가/거래량 패널)"""
+    financials: FinancialsIndex
+    close: pd.DataFrame
+    volume: Optional[pd.DataFrame] = None
+
+
+def prepare_financials(financials: pd.DataFrame) -> FinancialsIndex:
+    """재무 비율/성장률과 공시일(available_date)을 미리 계산한 시점 기준 인덱스"""
+    return FinancialsIndex(financials)
+
+
+def load_walk_forward_data(start_date, end_date, stock_codes: Optional[List[str]] = None) -> WalkForwardData:
+    """
+    워크포워드 백테스트 데이터 일괄 로드
+
+    Args:
+        start_date: 백테스트 시작일
+        end_date: 백테스트 종료일
+        stock_codes: 대상 종목 (None이면 재무 데이터가 있는 전 종목)
+    """
+    financials = get_financials_index()
+    if stock_codes:
+        financials = financials.select(stock_codes)
+        codes = list(stock_codes)
+    else:
+        codes = list(financials.codes)
+
+    price_start = pd.Timestamp(start_date) - timedelta(days=int(PRICE_LOOKBACK_DAYS * 1.6))
+    panel = load_panel(codes, price_start, end_date, ["close", "volume"]) if codes else pd.DataFrame()
+    if panel.empty:
+        return WalkForwardData(financials=financials, close=pd.DataFrame())
+
+    return WalkForwardData(
+        financials=financials,
+        close=panel["close"].astype(float),
+        volume=panel["volume"].astype(float)
+    )
+
+
+def rebalance_dates(trading_days: pd.DatetimeIndex, start_date, end_date, months: int = 1) -> pd.DatetimeIndex:
+    """구간 시작일 이후 첫 거래일들 (months개월 간격)"""
+    start, end = pd.Timestamp(start_date), pd.Timestamp(end_date)
+    days = trading_days[(trading_days >= start) & (trading_days <= end)]
+    if days.empty:
+        return days
+
+    anchors = pd.date_range(start.to_period('M').to_timestamp(), end, freq=f'{max(1, months)}MS')
+    anchors = anchors.where(anchors >= start, start)
+    positions = np.unique(days.searchsorted(anchors))
+    return days[positions[positions < len(days)]]
+
+
+def point_in_time_financials(financials: FinancialsIndex, dates: pd.DatetimeIndex) -> pd.DataFrame:
+    """
+    각 날짜에 공시되어 있던 종목별 최신 재무 데이터
+
+    Returns:
+        DataFrame (asof_date, code, 재무 컬럼...)
+    """
+    if financials.empty or len(dates) == 0:
+        return pd.DataFrame()
+    return financials.asof_many(dates)
+
+
+def price_returns(close: pd.DataFrame) -> pd.DataFrame:
+    """
+    일간 수익률 (가격이 없는 날은 NaN, 재개일 수익률은 직전 유효 종가 대비)
+
+    거래정지/데이터 누락 구간의 가격 변동을 재개일에 반영합니다
+    (risk_analysis._window_returns와 같은 방식).
+    """
+    return (close / close.ffill().shift(1) - 1).where(close.notna())
+
+
+def price_factors(close: pd.DataFrame, dates: pd.DatetimeIndex) -> Dict[str, pd.DataFrame]:
+    """
+    리밸런싱일 기준 가격 팩터 (각 값: 날짜 x 종목)
+
+    Returns:
+        {'close', 'return_20d', 'return_60d', 'return_120d', 'volatility'}
+    """
+    filled = close.ffill()
+    rows = close.index.get_indexer(dates)
+    values = filled.to_numpy()
+
+    factors = {'close': pd.DataFrame(values[rows], index=dates, columns=close.columns)}
+    for period in MOMENTUM_PERIODS:
+        past = np.full(values[rows].shape, np.nan)
+        ok = rows >= period
+        past[ok] = values[rows[ok] - period]
+        factors[f'return_{period}d'] = pd.DataFrame((values[rows] / past - 1) * 100, index=dates, columns=close.columns)
+
+    returns = price_returns(close).to_numpy()
+    volatility = np.full(values[rows].shape, np.nan)
+    with np.errstate(invalid='ignore'):
+        for i, row in enumerate(rows):
+            window = returns[max(row - VOLATILITY_DAYS + 1, 1):row + 1]
+            if len(window) >= 2:
+                volatility[i] = np.nanstd(window, axis=0, ddof=1) * np.sqrt(252) * 100
+    factors['volatility'] = pd.DataFrame(volatility, index=dates, columns=close.columns)
+    return factors
+
+
+def score_universe(
+    pit: pd.DataFrame,
+    factors: Dict[str, pd.DataFrame],
+    scorer: FactorScorer,
+    min_roe: float,
+    max_debt_ratio: float
+) -> pd.DataFrame:
+    """
+    전체 리밸런싱 시점의 스크리닝을 한 번에 계산
+
+    screen_stocks와 같은 필터/점수를 쓰되 (asof_date, code) 행을 쌓아 한 번에 계산합니다.
+    단면 정규화가 필요한 안정성 점수만 시점별로 계산하고, 과거 시점의 주도주 점수는
+    재현할 수 없으므로 제외합니다 (모든 종목 0점 → 순위 영향 없음).
+
+    Args:
+        pit: point_in_time_financials 결과
+        factors: price_factors 결과
+
+    Returns:
+        (asof_date, composite_score 내림차순) 정렬 DataFrame
+    """
+    if pit.empty:
+        return pit
+
+    filtered = pit[(pit['roe'] >= min_roe) & (pit['debt_ratio'] <= max_debt_ratio)]
+    template = factors['close']
+    rows = template.index.get_indexer(filtered['asof_date'])
+    cols = template.columns.get_indexer(filtered['code'])
+    known = cols >= 0
+    filtered, rows, cols = filtered[known].copy(), rows[known], cols[known]
+
+    for name, frame in factors.items():
+        filtered[name] = frame.to_numpy()[rows, cols]
+    filtered = filtered[filtered['close'].notna()]
+    if filtered.empty:
+        return filtered
+
+    scored = scorer.calculate_value_score(filtered)
+    scored = scorer.calculate_growth_score(scored)
+    scored = scorer.calculate_profitability_score(scored)
+    scored = pd.concat([
+        scorer.calculate_stability_score(group)
+        for _, group in scored.groupby('asof_date', sort=False)
+    ])
+
+    scored = scorer.calculate_return_momentum_score(scored, list(MOMENTUM_PERIODS))
+
+    scored['leadership_score'] = 0.0
+    scored = scorer.calculate_composite_score(scored)
+    return scored.sort_values(['asof_date', 'composite_score'], ascending=[True, False])
+
+
+def allocate(strategy: str, selected: List[str], close: pd.DataFrame, as_of: pd.Timestamp) -> pd.Series:
+    """
+    선정 종목 비중
+
+    Args:
+        strategy: equal_weight, market_cap(종가 비례, create_market_cap_weight_portfolio와 동일한 근사),
+                  risk_parity(위험 균형, ERC), min_variance, max_sharpe
+                  (공분산 기반 전략은 as_of 이전 수익률의 Ledoit-Wolf 공분산 사용, 실패 시 동일가중)
+        close: 종가 패널 (as_of까지 사용)
+    """
+    if not selected:
+        return pd.Series(dtype=float)
+
+    if strategy == "equal_weight":
+        raw = pd.Series(1.0, index=selected)
+    elif strategy == "market_cap":
+        raw = close.loc[:as_of, selected].ffill().iloc[-1]
+    elif strategy in OPTIMIZED_STRATEGIES:
+        method, days = OPTIMIZED_STRATEGIES[strategy]
+        returns = price_returns(close.loc[:as_of, selected].iloc[-(days + 1):]).iloc[1:]
+        constraints = PortfolioConstraints(max_weight=max(OPTIMIZED_MAX_WEIGHT, 1 / len(selected)))
+        result = optimize_portfolio(returns, method, constraints)
+        raw = pd.Series(result['weights'] if result['status'] == 'success' else 1.0, index=selected, dtype=float)
+    else:
+        raise ValueError(f"알 수 없는 전략: {strategy}")
+
+    raw = raw.fillna(0).clip(lower=0)
+    if raw.sum() <= 0:
+        raw = pd.Series(1.0, index=selected)
+    return raw / raw.sum()
+
+
+def simulate_rebalanced_portfolio(
+    returns: pd.DataFrame,
+    schedule: Dict[pd.Timestamp, pd.Series]
+) -> Dict[str, pd.Series]:
+    """
+    리밸런싱 일정에 따른 포트폴리오 가치 (비중 drift 반영)
+
+    리밸런싱일 종가에 목표 비중으로 맞추고, 다음 리밸런싱일까지는
+    종목별 누적 수익률 행렬과 비중 벡터의 곱으로 가치를 계산합니다.
+    수익률이 없는 날(거래정지)은 0%로 봅니다 (재개일 수익률은 price_returns로 직전 종가 대비 계산).
+    비중 합이 1보다 작으면 나머지는 현금입니다.
+
+    Args:
+        returns: 일간 수익률 패널 (index: date, columns: code)
+        schedule: {리밸런싱일: 목표 비중 Series(index=code)}
+
+    Returns:
+        {'nav': 포트폴리오 가치 (첫 리밸런싱일 = 1.0),
+         'turnover': 리밸런싱별 매수 비중 합 (최초 매수 포함),
+         'trades': 리밸런싱일 x 종목 비중 변화 (+매수, -매도, 리밸런싱 직전 가치 대비)}
+    """
+    dates = sorted(pd.Timestamp(d) for d in schedule)
+    if not dates or returns.empty:
+        return {'nav': pd.Series(dtype=float), 'turnover': pd.Series(dtype=float), 'trades': pd.DataFrame()}
+
+    index = returns.index
+    positions = index.searchsorted(dates)
+    values = returns.fillna(0.0).to_numpy()
+    column_of = {code: i for i, code in enumerate(returns.columns)}
+
+    nav = np.full(len(index), np.nan)
+    nav[positions[0]] = 1.0
+    trades = np.zeros((len(dates), len(returns.columns)))
+    current = np.zeros(len(returns.columns))  # 직전 구간 종료 시점의 실제 비중
+    value = 1.0
+
+    for k, (rebalance_date, start) in enumerate(zip(dates, positions)):
+        target = schedule[rebalance_date]
+        target = target[target.index.isin(column_of)]
+        cols = np.array([column_of[code] for code in target.index], dtype=int)
+        weights = target.to_numpy(dtype=float)
+
+        target_full = np.zeros(len(returns.columns))
+        target_full[cols] = weights
+        trades[k] = target_full - current
+
+        end = positions[k + 1] if k + 1 < len(positions) else len(index) - 1
+        if end <= start:
+            current = target_full
+            continue
+
+        cash = 1.0 - weights.sum()
+        growth = np.cumprod(1.0 + values[start + 1:end + 1][:, cols], axis=0)
+        path = growth @ weights + cash
+        nav[start + 1:end + 1] = value * path
+
+        # 구간 끝의 drift된 비중
+        current = np.zeros(len(returns.columns))
+        current[cols] = growth[-1] * weights / path[-1]
+        value *= path[-1]
+
+    rebalance_index = pd.DatetimeIndex(dates)
+    nav_series = pd.Series(nav, index=index).iloc[positions[0]:].ffill()
+    return {
+        'nav': nav_series,
+        'turnover': pd.Series(np.clip(trades, 0, None).sum(axis=1), index=rebalance_index),
+        'trades': pd.DataFrame(trades, index=rebalance_index, columns=returns.columns),
+    }
+
+
+def run_walk_forward(
+    start_date,
+    end_date,
+    strategy: str = "equal_weight",
+    top_n: int = 10,
+    rebalance_months: int = 1,
+    min_roe: float = 10.0,
+    max_debt_ratio: float = 150.0,
+    weights: Optional[Dict[str, float]] = None,
+    data: Optional[WalkForwardData] = None
+) -> Dict:
+    """
+    워크포워드 백테스트 실행
+
+    Args:
+        start_date: 시작일
+        end_date: 종료일
+        strategy: 비중 전략 (STRATEGIES)
+        top_n: 리밸런싱마다 선정할 종목 수
+        rebalance_months: 리밸런싱 주기 (개월)
+        min_roe: 최소 ROE (%)
+        max_debt_ratio: 최대 부채비율 (%)
+        weights: 팩터 가중치 (FactorScorer)
+        data: 미리 로드한 데이터 (None이면 load_walk_forward_data)
+
+    Returns:
+        {'status', 'nav', 'turnover', 'trades',
+         'rebalances': [{'date', 'stocks', 'weights', 'turnover'}, ...]}
+    """
+    if strategy not in STRATEGIES:
+        return {'status': 'error', 'message': f'알 수 없는 전략: {strategy}'}
+
+    data = data or load_walk_forward_data(start_date, end_date)
+    close = data.close.loc[:pd.Timestamp(end_date)]
+    if close.empty or data.financials.empty:
+        return {'status': 'error', 'message': '가격 또는 재무 데이터 없음'}
+
+    dates = rebalance_dates(close.index, start_date, end_date, rebalance_months)
+    if len(dates) == 0:
+        return {'status': 'error', 'message': f'기간 내 거래일 없음 ({start_date} ~ {end_date})'}
+
+    scorer = FactorScorer(weights)
+    pit = point_in_time_financials(data.financials, dates)
+    factors = price_factors(close, dates)
+    ranked = score_universe(pit, factors, scorer, min_roe, max_debt_ratio)
+    picks = ranked.groupby('asof_date')['code'].apply(lambda codes: codes.head(top_n).tolist()) \
+        if not ranked.empty else pd.Series(dtype=object)
+
+    schedule = {}
+    for rebalance_date in dates:
+        selected = picks.get(rebalance_date, [])
+        schedule[rebalance_date] = allocate(strategy, selected, close, rebalance_date)
+
+    returns = price_returns(close)
+    simulated = simulate_rebalanced_portfolio(returns, schedule)
+
+    return {
+        'status': 'success',
+        'nav': simulated['nav'],
+        'turnover': simulated['turnover'],
+        'trades': simulated['trades'],
+        'rebalances': [
+            {
+                'date': rebalance_date.strftime('%Y-%m-%d'),
+                'stocks': list(target.index),
+                'weights': {code: round(float(w), 4) for code, w in target.items()},
+                'turnover': round(float(simulated['turnover'].loc[rebalance_date]), 4),
+            }
+            for rebalance_date, target in schedule.items()
+        ],
+    }
@@ -3,12 +3,19 @@
 from typing import Any
 from crewai.tools import BaseTool
 import FinanceDataReader as fdr
+import pandas as pd
 from datetime import datetime, timedelta
 from core.utils.db_utils import (
-    insert_stocks_batch,
-    insert_prices_batch,
-    get_stock_list
+    get_stock_list,
+    get_latest_price_dates,
+    find_price_gaps,
+    find_partial_prices,
+    bulk_upsert_stocks,
+    bulk_upsert_prices,
+    prices_frame_from_fdr,
+    stocks_frame_from_listing
 )
+from core.utils.price_fetcher import PriceFetcher, plan_sync_requests
 
 
 class DataCollectionTool(BaseTool):
@@ -24,6 +31,7 @@ class DataCollectionTool(BaseTool):
     - "collect_stocks {market} {limit}" - 시장(KOSPI/KOSDAQ)과 종목 수
     - "collect_prices {code} {days}" - 종목코드와 수집 일수
     - "collect_all {market} {limit} {days}" - 전체 수집
+    - "sync_prices {limit} {days}" - 증분 수집 (누락 구간만, 이력 없는 종목은 최근 {days}일)
     """
 
     def _run(self, command: str) -> str:
@@ -53,8 +61,13 @@ class DataCollectionTool(BaseTool):
                 days = int(parts[3]) if len(parts) > 3 else 30
                 return self._collect_all(market, limit, days)
 
+            elif action == "sync_prices":
+                limit = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() and int(parts[1]) > 0 else None
+                days = int(parts[2]) if len(parts) > 2 else 365
+                return self._sync_prices(limit, days)
+
             else:
-                return f"알 수 없는 명령: {action}. collect_stocks, collect_prices, collect_all 중 하나를 사용하세요."
+                return f"알 수 없는 명령: {action}. collect_stocks, collect_prices, collect_all, sync_prices 중 하나를 사용하세요."
 
         except Exception as e:
             return f"데이터 수집 중 오류 발생: {str(e)}"
@@ -74,15 +87,7 @@ class DataCollectionTool(BaseTool):
             if limit:
                 stocks = stocks.head(limit)
 
-            stocks_data = []
-            for _, row in stocks.iterrows():
-                code = row['Code']
-                name = row['Name']
-                market_val = row.get('Market', 'UNKNOWN')
-                sector = row.get('Sector', row.get('Industry', 'N/A'))
-                stocks_data.append((code, name, market_val, sector))
-
-            affected_rows = insert_stocks_batch(stocks_data)
+            affected_rows = bulk_upsert_stocks(stocks_frame_from_listing(stocks))
 
             return f"✓ 종목 리스트 수집 완료: {affected_rows}개 종목 저장 (시장: {market})"
 
@@ -100,19 +105,7 @@ class DataCollectionTool(BaseTool):
             if len(df) == 0:
                 return f"⚠ 종목 {code}: 데이터 없음"
 
-            prices_data = []
-            for date, row in df.iterrows():
-                prices_data.append((
-                    code,
-                    date.date(),
-                    float(row['Open']),
-                    float(row['High']),
-                    float(row['Low']),
-                    float(row['Close']),
-                    int(row['Volume'])
-                ))
-
-            insert_prices_batch(prices_data)
+            bulk_upsert_prices(prices_frame_from_fdr(code, df))
 
             return f"✓ 종목 {code}: {len(df)}개 데이터 수집 완료"
 
@@ -132,6 +125,7 @@ class DataCollectionTool(BaseTool):
             stocks = get_stock_list(limit=limit)
             success_count = 0
             fail_count = 0
+            frames = []
 
             for code, name, sector in stocks:
                 try:
@@ -140,27 +134,54 @@ class DataCollectionTool(BaseTool):
                     df = fdr.DataReader(code, start_date, end_date)
 
                     if len(df) > 0:
-                        prices_data = []
-                        for date, row in df.iterrows():
-                            prices_data.append((
-                                code,
-                                date.date(),
-                                float(row['Open']),
-                                float(row['High']),
-                                float(row['Low']),
-                                float(row['Close']),
-                                int(row['Volume'])
-                            ))
-                        insert_prices_batch(prices_data)
+                        frames.append(prices_frame_from_fdr(code, df))
                         success_count += 1
                     else:
                         fail_count += 1
                 except:
                     fail_count += 1
 
+            # 수집된 전체 가격을 한 번에 적재 (COPY) - 결과는 커밋 후 집계
+            skipped = set()
+            if frames:
+                try:
+                    bulk_upsert_prices(pd.concat(frames, ignore_index=True), skipped=skipped)
+                except Exception as e:
+                    result.append(f"✗ 가격 데이터 저장 실패: {str(e)} (수집된 {success_count}개 종목 미저장)")
+                    return "\n".join(result)
+
+            success_count -= len(skipped)
+            fail_count += len(skipped)
             result.append(f"✓ 가격 데이터 수집 완료: 성공 {success_count}개, 실패 {fail_count}개 (기간: 최근 {days}일)")
+            if skipped:
+                result.append(f"⚠ stocks에 없는 종목 {len(skipped)}개 건너뜀: {', '.join(sorted(skipped)[:10])}")
 
         except Exception as e:
             result.append(f"✗ 가격 데이터 수집 실패: {str(e)}")
 
         return "\n".join(result)
+
+    def _sync_prices(self, limit, days: int) -> str:
+        """종목별 누락 구간만 증분 수집"""
+        try:
+            codes = [code for code, name, sector in get_stock_list(limit=limit)]
+            end_date = datetime.now()
+
+            last_dates = get_latest_price_dates(codes)
+            gaps = find_price_gaps(end_date.date() - timedelta(days=60))
+            partial = find_partial_prices(end_date.date() - timedelta(days=60))
+            requests = plan_sync_requests(codes, end_date, last_dates, gaps, initial_days=days, partial=partial)
+
+            if not requests:
+                return f"✓ 모든 종목이 최신 상태입니다 ({len(codes)}개 종목)"
+
+            metrics = PriceFetcher().run(requests, writer=bulk_upsert_prices)
+            skipped = len(codes) - len({code for code, start, end in requests})
+
+            return (
+                f"✓ 증분 수집 완료: 성공 {metrics.succeeded}개, 실패 {metrics.failed + metrics.empty}개, "
+                f"{metrics.rows:,} rows (최신 상태 {skipped}개 건너뜀, 누락 구간 {len(gaps)}개)"
+            )
+
+        except Exception as e:
+            return f"✗ 증분 수집 실패: {str(e)}"
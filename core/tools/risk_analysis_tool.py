@@ -7,7 +7,7 @@
 from crewai.tools import BaseTool
 from typing import Any
 import json
-from core.modules.risk_analysis import calculate_risk_score, analyze_portfolio_risk
+from core.modules.risk_analysis import calculate_risk_score, calculate_risk_metrics, analyze_portfolio_risk
 
 
 class RiskAnalysisTool(BaseTool):
@@ -19,13 +19,16 @@ class RiskAnalysisTool(BaseTool):
     - 단일 종목 분석: risk <종목코드>
       예: risk 005930
 
+    - 여러 종목 일괄 분석: risks <종목코드1>,<종목코드2>,... [기간]
+      예: risks 005930,000660,035720
+
     - 포트폴리오 분석: portfolio <종목코드1>,<종목코드2>,... [비중1,비중2,...]
       예: portfolio 005930,000660,035720 0.4,0.3,0.3
       (비중 생략 시 동일가중)
 
     출력:
     - 변동성, MDD, VaR, Sharpe Ratio 등 리스크 지표
-    - 리스크 점수 (0-10) 및 등급
+    - 리스크 점수 (0-10) 및 등급, 시장(KOSPI) 대비 베타
     - 포트폴리오의 경우 분산 효과 분석
     """
 
@@ -82,6 +85,7 @@ class RiskAnalysisTool(BaseTool):
 - Sharpe Ratio: {result['sharpe_ratio']} (높을수록 좋음)
 - Sortino Ratio: {result['sortino_ratio']} (하방 리스크 고려)
 - 승률: {result['win_rate']}%
+- 베타(KOSPI 대비): {result['beta']}
 
 ⚠️ 종합 리스크 평가:
 - 리스크 점수: {result['risk_score']}/10
@@ -91,6 +95,34 @@ class RiskAnalysisTool(BaseTool):
 
                 return json.dumps(result, ensure_ascii=False, indent=2)
 
+            # 여러 종목 리스크 일괄 분석 (가격 1회 조회)
+            elif command == 'risks':
+                if len(parts) < 2:
+                    return json.dumps({
+                        'status': 'error',
+                        'message': '종목 코드를 입력하세요. 예: risks 005930,000660,035720'
+                    }, ensure_ascii=False, indent=2)
+
+                stock_codes = parts[1].split(',')
+                days = int(parts[2]) if len(parts) > 2 else 252
+
+                table = calculate_risk_metrics(stock_codes, days)
+                if table.empty:
+                    return json.dumps({
+                        'status': 'error',
+                        'message': '데이터 부족 (최소 10일 필요)'
+                    }, ensure_ascii=False, indent=2)
+
+                table = table.sort_values('risk_score')
+                table['beta'] = table['beta'].astype(object).where(table['beta'].notna(), None)
+                table[['peak_date', 'trough_date']] = table[['peak_date', 'trough_date']].astype(str)
+                return json.dumps({
+                    'status': 'success',
+                    'count': len(table),
+                    'missing': [code for code in stock_codes if code not in set(table['code'])],
+                    'stocks': table.to_dict('records')
+                }, ensure_ascii=False, indent=2, default=str)
+
             # 포트폴리오 리스크 분석
             elif command == 'portfolio':
                 if len(parts) < 2:
@@ -148,7 +180,7 @@ class RiskAnalysisTool(BaseTool):
             else:
                 return json.dumps({
                     'status': 'error',
-                    'message': f'알 수 없는 명령어: {command}. risk 또는 portfolio를 사용하세요.'
+                    'message': f'알 수 없는 명령어: {command}. risk, risks 또는 portfolio를 사용하세요.'
                 }, ensure_ascii=False, indent=2)
 
         except Exception as e:
@@ -0,0 +1,69 @@
+"""
+여러 프로세스가 함께 쓰는 로컬 캐시 파일의 원자적 쓰기 / 프로세스 간 잠금
+
+가격 저장소, 팩터 저장소, 점수 캐시, 지표 상태 파일은 일일 수집 작업, 장중 스케줄러,
+크루, 스윕 워커가 동시에 갱신할 수 있습니다.
+
+- atomic_write: 같은 디렉터리의 고유한 임시 파일에 쓴 뒤 os.replace (쓰기 도중 실패 시 임시 파일 삭제)
+- file_lock: {경로}.lock 파일에 대한 배타적 flock (fcntl이 없는 환경에서는 잠금 없이 진행)
+"""
+
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Union
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+
+@contextmanager
+def atomic_write(path: Union[str, Path], mode: str = "w", encoding: str = "utf-8"):
+    """
+    임시 파일에 쓰고 완료되면 path로 교체
+
+    Args:
+        path: 최종 파일 경로
+        mode: 'w'(텍스트) 또는 'wb'(바이너리)
+
+    Yields:
+        쓰기용 파일 객체 (바이너리 모드에서는 .name으로 경로 사용 가능)
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = tempfile.NamedTemporaryFile(
+        mode=mode, dir=path.parent, prefix=f".{path.name}.", suffix=".tmp", delete=False,
+        **({} if "b" in mode else {"encoding": encoding})
+    )
+    try:
+        with tmp:
+            yield tmp
+            tmp.flush()
+            os.fsync(tmp.fileno())
+        os.replace(tmp.name, path)
+    except BaseException:
+        Path(tmp.name).unlink(missing_ok=True)
+        raise
+
+
+@contextmanager
+def file_lock(path: Union[str, Path]):
+    """
+    프로세스 간 배타적 잠금 ({path}.lock)
+
+    Args:
+        path: 보호할 파일/디렉터리 경로
+    """
+    lock_path = Path(f"{path}.lock")
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, "a") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
@@ -1,14 +1,21 @@
 """한국 주식 데이터 수집 스크립트"""
 
 import FinanceDataReader as fdr
-import pandas as pd
 from datetime import datetime, timedelta
 from db_utils import (
     get_db_connection,
-    insert_stocks_batch,
-    insert_prices_batch,
-    get_stock_list
+    get_stock_list,
+    get_latest_price_dates,
+    find_price_gaps,
+    find_partial_prices,
+    bulk_upsert_stocks,
+    bulk_upsert_prices,
+    stocks_frame_from_listing
 )
+from price_fetcher import PriceFetcher, plan_sync_requests
+
+# 가격 데이터를 모아서 한 번에 적재할 행 수
+PRICE_FLUSH_ROWS = 50_000
 
 
 def collect_stock_list(market='KOSPI', limit=None):
@@ -44,25 +51,17 @@ def collect_stock_list(market='KOSPI', limit=None):
 
         print(f"✓ 조회된 종목 수: {len(stocks)}")
 
-        # 데이터베이스에 저장할 형식으로 변환
-        # Sector 컬럼이 없는 경우를 대비해 처리
-        stocks_data = []
-        for _, row in stocks.iterrows():
-            code = row['Code']
-            name = row['Name']
-            market_val = row.get('Market', 'UNKNOWN')
-            sector = row.get('Sector', row.get('Industry', 'N/A'))  # Sector 또는 Industry 사용
-
-            stocks_data.append((code, name, market_val, sector))
+        # 데이터베이스에 저장할 형식으로 변환 (Sector 없으면 Industry 사용)
+        stocks_df = stocks_frame_from_listing(stocks)
 
-        # 일괄 삽입
-        affected_rows = insert_stocks_batch(stocks_data)
+        # 일괄 삽입 (COPY)
+        affected_rows = bulk_upsert_stocks(stocks_df)
         print(f"✓ 데이터베이스 저장 완료: {affected_rows}개 종목")
 
         # 샘플 출력
         print("\n저장된 종목 샘플 (상위 10개):")
-        for i, (code, name, market_val, sector) in enumerate(stocks_data[:10], 1):
-            print(f"  {i:2d}. {name:15s} ({code}) - {sector}")
+        for i, row in enumerate(stocks_df.head(10).itertuples(index=False), 1):
+            print(f"  {i:2d}. {row.name or '-':15s} ({row.code}) - {row.sector}")
 
         return affected_rows
 
@@ -73,19 +72,24 @@ def collect_stock_list(market='KOSPI', limit=None):
         return 0
 
 
-def collect_price_data(days=30, limit_stocks=None):
+def collect_price_data(days=30, limit_stocks=None, max_workers=8,
+                       incremental=False, gap_lookback_days=60):
     """
     주식 가격 데이터 수집
 
     Args:
-        days: 최근 N일간 데이터 수집
+        days: 최근 N일간 데이터 수집 (증분 모드에서는 이력 없는 종목의 초기 수집 기간)
         limit_stocks: 상위 N개 종목만 수집 (None이면 전체)
+        max_workers: 동시 수집 스레드 수
+        incremental: True면 종목별 마지막 저장일 이후와 중간 누락 구간만 수집
+        gap_lookback_days: 증분 모드에서 중간 누락을 탐지할 기간
 
     Returns:
         tuple: (성공 수, 실패 수)
     """
+    mode = "증분" if incremental else f"최근 {days}일"
     print("\n" + "=" * 60)
-    print(f"가격 데이터 수집 시작 (최근 {days}일)")
+    print(f"가격 데이터 수집 시작 ({mode})")
     print("=" * 60)
 
     # 데이터베이스에서 종목 리스트 가져오기
@@ -93,50 +97,52 @@ def collect_price_data(days=30, limit_stocks=None):
     print(f"수집 대상 종목: {len(stocks)}개")
 
     end_date = datetime.now()
-    start_date = end_date - timedelta(days=days)
-    print(f"기간: {start_date.date()} ~ {end_date.date()}\n")
-
-    success_count = 0
-    fail_count = 0
-    total_rows = 0
-
-    for idx, (code, name, sector) in enumerate(stocks, 1):
-        try:
-            # FinanceDataReader로 가격 데이터 가져오기
-            df = fdr.DataReader(code, start_date, end_date)
-
-            if len(df) == 0:
-                print(f"[{idx:3d}/{len(stocks)}] ⚠ {name:15s} ({code}) - 데이터 없음")
-                fail_count += 1
-                continue
-
-            # 데이터베이스 저장 형식으로 변환
-            prices_data = []
-            for date, row in df.iterrows():
-                prices_data.append((
-                    code,
-                    date.date(),
-                    float(row['Open']),
-                    float(row['High']),
-                    float(row['Low']),
-                    float(row['Close']),
-                    int(row['Volume'])
-                ))
-
-            # 일괄 삽입
-            insert_prices_batch(prices_data)
-            total_rows += len(prices_data)
-            success_count += 1
-
-            print(f"[{idx:3d}/{len(stocks)}] ✓ {name:15s} ({code}) - {len(df):3d} rows")
-
-        except Exception as e:
-            print(f"[{idx:3d}/{len(stocks)}] ✗ {name:15s} ({code}) - 에러: {e}")
-            fail_count += 1
+    codes = [code for code, name, sector in stocks]
+
+    if incremental:
+        # 종목별 MAX(date)와 중간 누락 구간을 각각 한 번의 쿼리로 조회
+        last_dates = get_latest_price_dates(codes)
+        gaps = find_price_gaps(end_date.date() - timedelta(days=gap_lookback_days))
+        # 장중 업데이트로 저장된 미완성 행(open NULL)도 확정 시세로 다시 수집
+        partial = find_partial_prices(end_date.date() - timedelta(days=gap_lookback_days))
+        requests = plan_sync_requests(codes, end_date, last_dates, gaps, initial_days=days, partial=partial)
+        pending_codes = {code for code, start, end in requests}
+        print(f"수집 필요 종목: {len(pending_codes)}개 "
+              f"(최신 상태 {len(codes) - len(pending_codes)}개 건너뜀, 누락 구간 {len(gaps)}개, 미완성 {len(partial)}개)\n")
+    else:
+        start_date = end_date - timedelta(days=days)
+        print(f"기간: {start_date.date()} ~ {end_date.date()}\n")
+        requests = [(code, start_date, end_date) for code in codes]
+
+    names = {code: name for code, name, sector in stocks}
+
+    def report_progress(result, metrics):
+        name = names.get(result.code) or ''
+        prefix = f"[{metrics.completed:3d}/{metrics.total}]"
+        if result.error is not None:
+            print(f"{prefix} ✗ {name:15s} ({result.code}) - 에러: {result.error}")
+        elif not result.ok:
+            print(f"{prefix} ⚠ {name:15s} ({result.code}) - 데이터 없음")
+        else:
+            print(f"{prefix} ✓ {name:15s} ({result.code}) - {len(result.data):3d} rows")
+
+    # 동시 수집 후 배치 단위로 COPY 적재 (stocks에 없어 건너뛴 종목은 실패로 집계)
+    skipped = set()
+    fetcher = PriceFetcher(max_workers=max_workers, progress_callback=report_progress)
+    metrics = fetcher.run(
+        requests,
+        writer=lambda batch: bulk_upsert_prices(batch, skipped=skipped),
+        batch_rows=PRICE_FLUSH_ROWS
+    )
+
+    success_count = metrics.succeeded - len(skipped)
+    fail_count = metrics.failed + metrics.empty + len(skipped)
+    total_rows = metrics.rows
 
     print("\n" + "-" * 60)
     print(f"수집 완료: 성공 {success_count}, 실패 {fail_count}")
     print(f"총 저장된 데이터: {total_rows:,} rows")
+    print(f"소요 시간: {metrics.elapsed:.1f}초 (재시도 {metrics.retries}회)")
     print("=" * 60)
 
     return success_count, fail_count
@@ -212,8 +218,8 @@ def main():
         print("\n종목 리스트 수집 실패. 프로그램을 종료합니다.")
         return
 
-    # 2. 가격 데이터 수집 (최근 30일)
-    success, fail = collect_price_data(days=30, limit_stocks=50)
+    # 2. 가격 데이터 수집 (누락분만 증분 수집, 신규 종목은 최근 30일)
+    success, fail = collect_price_data(days=30, limit_stocks=50, incremental=True)
 
     # 3. 데이터 검증
     verify_data()
@@ -1,17 +1,41 @@
 """PostgreSQL 데이터베이스 연결 유틸리티"""
 
+import io
 import os
+import threading
+import time
+from contextlib import contextmanager
+
+import pandas as pd
 import psycopg2
+from psycopg2 import pool as pg_pool
 from psycopg2.extras import execute_batch
 from dotenv import load_dotenv
 
+try:
+    import asyncpg
+except ImportError:  # pragma: no cover - asyncpg 미설치 환경 대비
+    asyncpg = None
+
 # 환경 변수 로드
 load_dotenv()
 
+# 커넥션 풀 설정 (환경 변수로 조정 가능)
+POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN", "1"))
+POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX", "10"))
+POOL_ACQUIRE_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+# 이 시간(초) 이상 유휴 상태였던 연결은 대여 전에 SELECT 1로 점검
+POOL_HEALTHCHECK_IDLE = float(os.getenv("DB_POOL_HEALTHCHECK_IDLE", "60"))
 
-def get_db_connection():
-    """PostgreSQL 연결 생성"""
-    return psycopg2.connect(
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+_async_pool = None
+
+
+def _connection_kwargs():
+    """환경 변수 기반 접속 정보"""
+    return dict(
         host=os.getenv("DB_HOST", "localhost"),
         port=os.getenv("DB_PORT", "5432"),
         database=os.getenv("DB_NAME", "investment_db"),
@@ -20,6 +44,244 @@ def get_db_connection():
     )
 
 
+class ConnectionPool:
+    """
+    스레드 안전 PostgreSQL 커넥션 풀
+
+    psycopg2 ThreadedConnectionPool을 감싸서
+    - 최대 크기에 도달하면 예외 대신 timeout까지 대기하고
+    - 오래 유휴 상태였던 연결은 대여 전에 상태를 점검(health check)하며
+    - 반납 시 트랜잭션/autocommit 상태를 초기화합니다.
+    """
+
+    def __init__(self, minconn=POOL_MIN_SIZE, maxconn=POOL_MAX_SIZE,
+                 timeout=POOL_ACQUIRE_TIMEOUT, healthcheck_idle=POOL_HEALTHCHECK_IDLE):
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.timeout = timeout
+        self.healthcheck_idle = healthcheck_idle
+        self._pool = pg_pool.ThreadedConnectionPool(minconn, maxconn, **_connection_kwargs())
+        self._slots = threading.BoundedSemaphore(maxconn)
+        self._last_used = {}
+
+    def getconn(self):
+        """연결 대여 (풀이 가득 차면 timeout까지 대기)"""
+        if not self._slots.acquire(timeout=self.timeout):
+            raise pg_pool.PoolError(
+                f"connection pool exhausted (max={self.maxconn}, timeout={self.timeout}s)"
+            )
+        try:
+            conn = self._pool.getconn()
+            if not self._is_healthy(conn):
+                self._pool.putconn(conn, close=True)
+                conn = self._pool.getconn()
+            return conn
+        except Exception:
+            self._slots.release()
+            raise
+
+    def putconn(self, conn, close=False):
+        """연결 반납"""
+        try:
+            self._last_used[id(conn)] = time.monotonic()
+            if not close and not conn.closed:
+                try:
+                    if conn.autocommit:
+                        conn.autocommit = False
+                    else:
+                        conn.rollback()
+                except psycopg2.Error:
+                    close = True
+            if close or conn.closed:
+                self._last_used.pop(id(conn), None)
+            self._pool.putconn(conn, close=close or bool(conn.closed))
+        finally:
+            self._slots.release()
+
+    def _is_healthy(self, conn):
+        """닫혔거나 오래 유휴 상태였던 연결을 점검"""
+        if conn.closed:
+            return False
+
+        last_used = self._last_used.get(id(conn))
+        if last_used is not None and time.monotonic() - last_used < self.healthcheck_idle:
+            return True
+
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def closeall(self):
+        """모든 연결 종료"""
+        self._pool.closeall()
+        self._last_used.clear()
+
+
+class PooledConnection:
+    """
+    풀에서 빌린 psycopg2 연결 프록시
+
+    기존 코드처럼 conn.cursor()/commit()/close()를 그대로 쓸 수 있으며,
+    close()는 실제로 연결을 끊지 않고 풀에 반납합니다.
+    """
+
+    __slots__ = ("_conn", "_pool")
+
+    def __init__(self, conn, pool):
+        object.__setattr__(self, "_conn", conn)
+        object.__setattr__(self, "_pool", pool)
+
+    def __getattr__(self, name):
+        conn = object.__getattribute__(self, "_conn")
+        if conn is None:
+            raise psycopg2.InterfaceError("connection already returned to pool")
+        return getattr(conn, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._conn, name, value)
+
+    @property
+    def closed(self):
+        return 1 if self._conn is None else self._conn.closed
+
+    def close(self):
+        """연결을 풀에 반납"""
+        conn = self._conn
+        if conn is None:
+            return
+        object.__setattr__(self, "_conn", None)
+        self._pool.putconn(conn)
+
+    def __enter__(self):
+        # psycopg2와 동일: with 블록은 트랜잭션 단위 (연결은 유지)
+        self._conn.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return self._conn.__exit__(exc_type, exc_value, traceback)
+
+    def __del__(self):
+        # close() 없이 버려진 연결도 풀로 돌려보냄
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+def get_pool():
+    """프로세스 단위 커넥션 풀 (fork된 자식 프로세스는 새 풀 생성)"""
+    global _pool, _pool_pid
+
+    pid = os.getpid()
+    if _pool is not None and _pool_pid == pid:
+        return _pool
+
+    with _pool_lock:
+        if _pool is None or _pool_pid != pid:
+            _pool = ConnectionPool()
+            _pool_pid = pid
+    return _pool
+
+
+def close_pool():
+    """커넥션 풀 종료 (프로세스 종료 시 등)"""
+    global _pool, _pool_pid
+
+    with _pool_lock:
+        if _pool is not None and _pool_pid == os.getpid():
+            _pool.closeall()
+        _pool = None
+        _pool_pid = None
+
+
+def get_db_connection():
+    """
+    PostgreSQL 연결 대여
+
+    풀에서 연결을 빌려 반환합니다. 사용 후 conn.close()를 호출하면
+    연결이 끊기지 않고 풀로 반납됩니다.
+    """
+    pool = get_pool()
+    return PooledConnection(pool.getconn(), pool)
+
+
+@contextmanager
+def db_connection():
+    """
+    풀 연결 컨텍스트 매니저
+
+    정상 종료 시 commit, 예외 발생 시 rollback 후 연결을 반납합니다.
+
+    Example:
+        with db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+    """
+    conn = get_db_connection()
+    try:
+        yield conn
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+async def get_async_pool():
+    """asyncio용 커넥션 풀 (asyncpg 필요)"""
+    global _async_pool
+
+    if asyncpg is None:
+        raise RuntimeError("asyncpg가 설치되어 있지 않습니다: pip install asyncpg")
+
+    if _async_pool is None:
+        kwargs = _connection_kwargs()
+        _async_pool = await asyncpg.create_pool(
+            host=kwargs["host"],
+            port=int(kwargs["port"]),
+            database=kwargs["database"],
+            user=kwargs["user"],
+            password=kwargs["password"],
+            min_size=POOL_MIN_SIZE,
+            max_size=POOL_MAX_SIZE,
+            timeout=POOL_ACQUIRE_TIMEOUT,
+        )
+    return _async_pool
+
+
+class async_db_connection:
+    """
+    asyncio 커넥션 컨텍스트 매니저
+
+    Example:
+        async with async_db_connection() as conn:
+            rows = await conn.fetch("SELECT code FROM stocks")
+    """
+
+    async def __aenter__(self):
+        self._pool = await get_async_pool()
+        self._conn = await self._pool.acquire()
+        return self._conn
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self._pool.release(self._conn)
+        return False
+
+
+async def close_async_pool():
+    """asyncio 커넥션 풀 종료"""
+    global _async_pool
+
+    if _async_pool is not None:
+        await _async_pool.close()
+        _async_pool = None
+
+
 def test_connection():
     """데이터베이스 연결 테스트"""
     try:
@@ -59,20 +321,14 @@ def test_connection():
 
 def get_stock_list(limit=None):
     """데이터베이스에서 종목 리스트 조회"""
-    conn = get_db_connection()
-    cur = conn.cursor()
-
     query = "SELECT code, name, sector FROM stocks ORDER BY code"
     if limit:
         query += f" LIMIT {limit}"
 
-    cur.execute(query)
-    stocks = cur.fetchall()
-
-    cur.close()
-    conn.close()
-
-    return stocks
+    with db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(query)
+            return cur.fetchall()
 
 
 def insert_stocks_batch(stocks_data):
@@ -85,9 +341,6 @@ def insert_stocks_batch(stocks_data):
     Returns:
         int: 삽입/업데이트된 행 수
     """
-    conn = get_db_connection()
-    cur = conn.cursor()
-
     query = """
         INSERT INTO stocks (code, name, market, sector, updated_at)
         VALUES (%s, %s, %s, %s, CURRENT_TIMESTAMP)
@@ -98,14 +351,10 @@ def insert_stocks_batch(stocks_data):
             updated_at = EXCLUDED.updated_at
     """
 
-    execute_batch(cur, query, stocks_data)
-    conn.commit()
-
-    affected_rows = cur.rowcount
-    cur.close()
-    conn.close()
-
-    return affected_rows
+    with db_connection() as conn:
+        with conn.cursor() as cur:
+            execute_batch(cur, query, stocks_data)
+            return cur.rowcount
 
 
 def insert_prices_batch(prices_data):
@@ -118,9 +367,6 @@ def insert_prices_batch(prices_data):
     Returns:
         int: 삽입/업데이트된 행 수
     """
-    conn = get_db_connection()
-    cur = conn.cursor()
-
     query = """
         INSERT INTO prices (code, date, open, high, low, close, volume)
         VALUES (%s, %s, %s, %s, %s, %s, %s)
@@ -132,16 +378,457 @@ def insert_prices_batch(prices_data):
             volume = EXCLUDED.volume
     """
 
-    execute_batch(cur, query, prices_data, page_size=1000)
-    conn.commit()
+    with db_connection() as conn:
+        with conn.cursor() as cur:
+            execute_batch(cur, query, prices_data, page_size=1000)
+            return cur.rowcount
+
+
+def get_latest_price_dates(codes=None):
+    """
+    종목별 마지막 가격 저장일 조회 (GROUP BY 한 번)
+
+    Args:
+        codes: 대상 종목 코드 리스트 (None이면 전체)
+
+    Returns:
+        dict: {code: MAX(date)}
+    """
+    query = "SELECT code, MAX(date) FROM prices"
+    params = None
+    if codes is not None:
+        query += " WHERE code = ANY(%s)"
+        params = (list(codes),)
+    query += " GROUP BY code"
+
+    with db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(query, params)
+            return dict(cur.fetchall())
+
+
+# 완성된 일봉 조건 - 장중 현재가 저장(price_updater)은 open 없이 미확정 종가만 기록
+COMPLETE_BAR_CONDITION = "open IS NOT NULL"
+
+
+def get_price_version():
+    """
+    가격 데이터 버전 (마지막 완성 거래일, 해당일 행 수)
+
+    새 가격이 적재되면 값이 바뀌므로 가격 기반 계산 결과의 캐시 키로 사용합니다.
+    장중 미완성 행(open NULL)은 제외하므로 장중 현재가 저장으로는 바뀌지 않습니다.
+
+    Returns:
+        tuple: (마지막 완성 거래일, 해당일 종목 수) - 데이터 없으면 (None, 0)
+    """
+    query = f"""
+        SELECT date, COUNT(*)
+        FROM prices
+        WHERE date = (SELECT MAX(date) FROM prices WHERE {COMPLETE_BAR_CONDITION})
+          AND {COMPLETE_BAR_CONDITION}
+        GROUP BY date
+    """
+    with db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(query)
+            row = cur.fetchone()
+    return (row[0], row[1]) if row else (None, 0)
+
+
+def get_price_checksum(since):
+    """
+    기간 내 완성 일봉 지문 (행 수, 종가 합계, 거래량 합계)
+
+    마지막 거래일만 보는 get_price_version으로는 알 수 없는
+    과거 날짜 백필/보정을 감지하기 위해 계산에 쓰이는 기간만 집계합니다 (date 인덱스 사용).
+
+    Args:
+        since: 집계 시작일
+
+    Returns:
+        tuple: (행 수, 종가 합계, 거래량 합계)
+    """
+    query = f"""
+        SELECT COUNT(*), COALESCE(SUM(close), 0), COALESCE(SUM(volume), 0)
+        FROM prices
+        WHERE date >= %s AND {COMPLETE_BAR_CONDITION}
+    """
+    with db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(query, (since,))
+            return tuple(cur.fetchone())
+
+
+def get_financials_version():
+    """
+    재무 데이터 버전 (최신 분기, 전체 행 수)
+
+    새 분기 보고서가 적재되면 값이 바뀌므로 재무 기반 계산 결과의 캐시 키로 사용합니다.
+
+    Returns:
+        tuple: (MAX(year * 10 + quarter), 행 수) - 데이터 없으면 (None, 0)
+    """
+    query = "SELECT MAX(year * 10 + quarter), COUNT(*) FROM financials"
+    with db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(query)
+            row = cur.fetchone()
+    return (row[0], row[1]) if row else (None, 0)
+
+
+def find_price_gaps(since, min_coverage=0.5):
+    """
+    종목별 중간 누락 구간 탐지
+
+    since 이후 전체 종목의 min_coverage 비율 이상이 거래된 날짜를 거래일로 보고,
+    종목의 첫/마지막 저장일 사이에서 빠진 거래일의 범위를 반환합니다.
+
+    Args:
+        since: 탐지 시작일
+        min_coverage: 거래일로 인정할 최소 종목 비율 (최다 종목 수 대비)
+
+    Returns:
+        dict: {code: (누락 시작일, 누락 종료일)}
+    """
+    query = """
+        WITH daily AS (
+            SELECT date, COUNT(*) AS cnt
+            FROM prices
+            WHERE date >= %s
+            GROUP BY date
+        ),
+        calendar AS (
+            SELECT date FROM daily
+            WHERE cnt >= (SELECT MAX(cnt) FROM daily) * %s
+        ),
+        coverage AS (
+            SELECT code, MIN(date) AS first_date, MAX(date) AS last_date
+            FROM prices
+            WHERE date >= %s
+            GROUP BY code
+        )
+        SELECT cv.code, MIN(c.date), MAX(c.date)
+        FROM coverage cv
+        JOIN calendar c ON c.date BETWEEN cv.first_date AND cv.last_date
+        LEFT JOIN prices p ON p.code = cv.code AND p.date = c.date
+        WHERE p.code IS NULL
+        GROUP BY cv.code
+    """
+
+    with db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(query, (since, min_coverage, since))
+            return {code: (gap_start, gap_end) for code, gap_start, gap_end in cur.fetchall()}
 
-    affected_rows = cur.rowcount
-    cur.close()
-    conn.close()
+
+def find_partial_prices(since):
+    """
+    장중 업데이트로 저장된 미완성 가격 행 탐지
+
+    price_updater의 장중 현재가 저장은 open 없이 종가만 기록하므로
+    open이 NULL인 행은 확정 시세로 다시 수집해야 합니다.
+
+    Args:
+        since: 탐지 시작일
+
+    Returns:
+        dict: {code: (미완성 행 시작일, 종료일)}
+    """
+    query = """
+        SELECT code, MIN(date), MAX(date)
+        FROM prices
+        WHERE date >= %s AND open IS NULL
+        GROUP BY code
+    """
+
+    with db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(query, (since,))
+            return {code: (start, end) for code, start, end in cur.fetchall()}
+
+
+PRICE_COLUMNS = ["code", "date", "open", "high", "low", "close", "volume"]
+STOCK_COLUMNS = ["code", "name", "market", "sector"]
+RISK_METRIC_COLUMNS = [
+    "code", "as_of", "period_days", "volatility", "max_drawdown", "var_95",
+    "sharpe_ratio", "downside_deviation", "sortino_ratio", "win_rate", "beta",
+    "risk_score", "risk_grade", "peak_date", "trough_date"
+]
+
+# COPY 한 번에 보낼 최대 행 수 (메모리 사용량 제한)
+COPY_CHUNK_ROWS = 200_000
+
+
+def prices_frame_from_fdr(code, df):
+    """
+    FinanceDataReader DataReader 결과를 prices 테이블 형식으로 변환
+
+    Args:
+        code: 종목코드
+        df: DatetimeIndex + Open/High/Low/Close/Volume 컬럼 DataFrame
+
+    Returns:
+        DataFrame: code, date, open, high, low, close, volume 컬럼
+    """
+    if df is None or len(df) == 0:
+        return pd.DataFrame(columns=PRICE_COLUMNS)
+
+    frame = pd.DataFrame({
+        "code": code,
+        "date": pd.to_datetime(df.index).date,
+        "open": df["Open"].to_numpy(dtype=float),
+        "high": df["High"].to_numpy(dtype=float),
+        "low": df["Low"].to_numpy(dtype=float),
+        "close": df["Close"].to_numpy(dtype=float),
+        "volume": df["Volume"].to_numpy(dtype=float),
+    })
+    return frame
+
+
+def stocks_frame_from_listing(listing):
+    """
+    fdr.StockListing 결과를 stocks 테이블 형식으로 변환
+
+    Sector 컬럼이 없거나 비어 있으면 Industry, 그마저 없으면 'N/A'를 사용합니다.
+    종목명이 비어 있으면 'nan' 문자열 대신 None으로 둡니다 (bulk_upsert_stocks에서 제외).
+    """
+    sector = pd.Series("N/A", index=listing.index, dtype=object)
+    if "Industry" in listing.columns:
+        sector = listing["Industry"].where(listing["Industry"].notna(), sector)
+    if "Sector" in listing.columns:
+        sector = listing["Sector"].where(listing["Sector"].notna(), sector)
+
+    market = listing["Market"] if "Market" in listing.columns else "UNKNOWN"
+
+    return pd.DataFrame({
+        "code": listing["Code"].astype(str),
+        "name": listing["Name"].map(lambda name: None if pd.isna(name) else str(name)),
+        "market": market,
+        "sector": sector,
+    }).reset_index(drop=True)
+
+
+def _copy_frame(cur, table, frame, columns):
+    """DataFrame을 CSV 스트림으로 COPY"""
+    buffer = io.StringIO()
+    frame.to_csv(buffer, columns=columns, index=False, header=False)
+    buffer.seek(0)
+    cur.copy_expert(
+        f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+        buffer
+    )
+
+
+def bulk_upsert_prices(prices_df, chunk_rows=COPY_CHUNK_ROWS, skipped=None):
+    """
+    가격 데이터 대량 적재 (COPY + 집합 기반 upsert)
+
+    DataFrame을 세션 전용 임시(staging) 테이블로 COPY한 뒤,
+    청크마다 한 번의 INSERT ... ON CONFLICT로 prices에 병합합니다.
+    값이 바뀌지 않은 행은 다시 쓰지 않으며, stocks에 없는 종목은 건너뜁니다.
+
+    Args:
+        prices_df: code, date, open, high, low, close, volume 컬럼 DataFrame
+        chunk_rows: COPY/병합 단위 행 수
+        skipped: stocks에 없어 건너뛴 종목 코드를 추가할 set (선택)
+
+    Returns:
+        int: 삽입/업데이트된 행 수
+    """
+    if prices_df is None or len(prices_df) == 0:
+        return 0
+
+    frame = prices_df[PRICE_COLUMNS].copy()
+    frame["date"] = pd.to_datetime(frame["date"]).dt.date
+    frame["volume"] = pd.to_numeric(frame["volume"]).round().astype("Int64")
+
+    affected_rows = 0
+    missing_codes = set()
+    with db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("""
+                CREATE TEMP TABLE IF NOT EXISTS prices_staging
+                (LIKE prices INCLUDING DEFAULTS) ON COMMIT DELETE ROWS
+            """)
+
+            for start in range(0, len(frame), chunk_rows):
+                _copy_frame(cur, "prices_staging", frame.iloc[start:start + chunk_rows], PRICE_COLUMNS)
+                cur.execute("""
+                    SELECT DISTINCT st.code
+                    FROM prices_staging st
+                    WHERE NOT EXISTS (SELECT 1 FROM stocks s WHERE s.code = st.code)
+                """)
+                missing_codes.update(code for (code,) in cur.fetchall())
+                cur.execute("""
+                    INSERT INTO prices (code, date, open, high, low, close, volume)
+                    SELECT DISTINCT ON (st.code, st.date)
+                        st.code, st.date, st.open, st.high, st.low, st.close, st.volume
+                    FROM prices_staging st
+                    JOIN stocks s ON s.code = st.code
+                    ORDER BY st.code, st.date
+                    ON CONFLICT (code, date) DO UPDATE
+                    SET open = EXCLUDED.open,
+                        high = EXCLUDED.high,
+                        low = EXCLUDED.low,
+                        close = EXCLUDED.close,
+                        volume = EXCLUDED.volume
+                    WHERE (prices.open, prices.high, prices.low, prices.close, prices.volume)
+                        IS DISTINCT FROM
+                        (EXCLUDED.open, EXCLUDED.high, EXCLUDED.low, EXCLUDED.close, EXCLUDED.volume)
+                """)
+                affected_rows += cur.rowcount
+                cur.execute("TRUNCATE prices_staging")
+
+    # 커밋 후 보고
+    if missing_codes:
+        preview = ", ".join(sorted(missing_codes)[:10])
+        print(f"⚠ stocks에 없는 종목 {len(missing_codes)}개 가격 건너뜀: {preview}"
+              f"{' ...' if len(missing_codes) > 10 else ''}")
+        if skipped is not None:
+            skipped.update(missing_codes)
 
     return affected_rows
 
 
+def bulk_upsert_stocks(stocks_df):
+    """
+    종목 데이터 대량 적재 (COPY + 집합 기반 upsert)
+
+    Args:
+        stocks_df: code, name, market, sector 컬럼 DataFrame
+            (fdr.StockListing 결과는 stocks_frame_from_listing으로 변환)
+
+    Returns:
+        int: 삽입/업데이트된 행 수
+    """
+    if stocks_df is None or len(stocks_df) == 0:
+        return 0
+
+    # 이름 없는 종목은 적재 불가 (name NOT NULL)
+    unnamed = stocks_df["name"].isna()
+    if unnamed.any():
+        print(f"⚠ 종목명 없는 종목 {int(unnamed.sum())}개 건너뜀: "
+              f"{', '.join(stocks_df.loc[unnamed, 'code'].astype(str).head(10))}")
+        stocks_df = stocks_df[~unnamed]
+        if len(stocks_df) == 0:
+            return 0
+
+    with db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("""
+                CREATE TEMP TABLE IF NOT EXISTS stocks_staging
+                (LIKE stocks INCLUDING DEFAULTS) ON COMMIT DELETE ROWS
+            """)
+            _copy_frame(cur, "stocks_staging", stocks_df, STOCK_COLUMNS)
+            cur.execute("""
+                INSERT INTO stocks (code, name, market, sector, updated_at)
+                SELECT DISTINCT ON (code) code, name, market, sector, CURRENT_TIMESTAMP
+                FROM stocks_staging
+                ORDER BY code
+                ON CONFLICT (code) DO UPDATE
+                SET name = EXCLUDED.name,
+                    sector = EXCLUDED.sector,
+                    market = EXCLUDED.market,
+                    updated_at = EXCLUDED.updated_at
+            """)
+            return cur.rowcount
+
+
+RISK_METRICS_DDL = """
+    CREATE TABLE IF NOT EXISTS risk_metrics (
+        code VARCHAR(10) PRIMARY KEY REFERENCES stocks(code) ON DELETE CASCADE,
+        as_of DATE NOT NULL,
+        period_days INT,
+        volatility FLOAT,
+        max_drawdown FLOAT,
+        var_95 FLOAT,
+        sharpe_ratio FLOAT,
+        downside_deviation FLOAT,
+        sortino_ratio FLOAT,
+        win_rate FLOAT,
+        beta FLOAT,
+        risk_score FLOAT,
+        risk_grade VARCHAR(20),
+        peak_date DATE,
+        trough_date DATE,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+
+def replace_risk_metrics(metrics_df, as_of):
+    """
+    risk_metrics 테이블 일괄 교체 (COPY + 집합 기반 upsert)
+
+    이번에 계산되지 않은 종목(상장폐지, 데이터 부족)의 이전 행은 삭제하여
+    테이블 전체가 항상 같은 기준일(as_of)의 결과가 되도록 합니다.
+
+    Args:
+        metrics_df: code 및 RISK_METRIC_COLUMNS(as_of 제외) 컬럼 DataFrame
+        as_of: 기준일 (계산에 사용한 마지막 거래일)
+
+    Returns:
+        int: 삽입/업데이트된 행 수
+    """
+    if metrics_df is None or len(metrics_df) == 0:
+        return 0
+
+    frame = metrics_df.reset_index() if "code" not in metrics_df.columns else metrics_df.copy()
+    frame["as_of"] = as_of
+    updates = ",\n                        ".join(
+        f"{col} = EXCLUDED.{col}" for col in RISK_METRIC_COLUMNS if col != "code"
+    )
+    columns = ", ".join(RISK_METRIC_COLUMNS)
+
+    with db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(RISK_METRICS_DDL)
+            cur.execute("""
+                CREATE TEMP TABLE IF NOT EXISTS risk_metrics_staging
+                (LIKE risk_metrics INCLUDING DEFAULTS) ON COMMIT DELETE ROWS
+            """)
+            _copy_frame(cur, "risk_metrics_staging", frame, RISK_METRIC_COLUMNS)
+            cur.execute(f"""
+                INSERT INTO risk_metrics ({columns}, updated_at)
+                SELECT {", ".join("st." + col for col in RISK_METRIC_COLUMNS)}, CURRENT_TIMESTAMP
+                FROM risk_metrics_staging st
+                JOIN stocks s ON s.code = st.code
+                ON CONFLICT (code) DO UPDATE
+                SET {updates},
+                    updated_at = CURRENT_TIMESTAMP
+            """)
+            affected_rows = cur.rowcount
+            cur.execute("DELETE FROM risk_metrics WHERE as_of <> %s", (as_of,))
+
+    return affected_rows
+
+
+def get_risk_metrics(codes=None, min_as_of=None):
+    """
+    risk_metrics 테이블 조회
+
+    Args:
+        codes: 대상 종목 코드 리스트 (None이면 전체)
+        min_as_of: 이 날짜 이전 기준일의 행은 제외 (None이면 마지막 완성 거래일)
+
+    Returns:
+        DataFrame (RISK_METRIC_COLUMNS)
+    """
+    query = f"SELECT {', '.join(RISK_METRIC_COLUMNS)} FROM risk_metrics WHERE as_of >= "
+    query += "%s" if min_as_of is not None else f"(SELECT MAX(date) FROM prices WHERE {COMPLETE_BAR_CONDITION})"
+    params = [min_as_of] if min_as_of is not None else []
+    if codes is not None:
+        query += " AND code = ANY(%s)"
+        params.append(list(codes))
+
+    with db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(query, params)
+            rows = cur.fetchall()
+
+    return pd.DataFrame(rows, columns=RISK_METRIC_COLUMNS)
+
+
 if __name__ == "__main__":
     """스크립트 직접 실행 시 연결 테스트"""
     print("=" * 60)
@@ -149,3 +836,4 @@ if __name__ == "__main__":
     print("=" * 60)
     test_connection()
     print("=" * 60)
+
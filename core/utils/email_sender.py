@@ -92,7 +92,7 @@ def format_trading_result_email(result_data: Dict) -> str:
     Returns:
         HTML 이메일 본문
     """
-    import psycopg2
+    from core.utils.db_utils import get_db_connection
 
     timestamp = result_data.get('timestamp', 'N/A')
     steps = result_data.get('steps', {})
@@ -121,13 +121,7 @@ def format_trading_result_email(result_data: Dict) -> str:
     # 데이터베이스에서 종목명 조회
     stock_names = {}
     try:
-        conn = psycopg2.connect(
-            host=os.getenv("DB_HOST", "localhost"),
-            port=os.getenv("DB_PORT", "5432"),
-            database=os.getenv("DB_NAME", "investment_db"),
-            user=os.getenv("DB_USER", "invest_user"),
-            password=os.getenv("DB_PASSWORD")
-        )
+        conn = get_db_connection()
         cur = conn.cursor()
         cur.execute("SELECT code, name FROM stocks")
         for code, name in cur.fetchall():
@@ -3,21 +3,10 @@
 - 포트폴리오에서 제외할 종목 관리
 - 데이터베이스 기반 제외 목록
 """
-import os
-import psycopg2
 from typing import List, Dict, Optional
 from datetime import datetime
 
-
-def get_db_connection():
-    """PostgreSQL 연결 생성"""
-    return psycopg2.connect(
-        host=os.getenv("DB_HOST", "localhost"),
-        port=os.getenv("DB_PORT", "5432"),
-        database=os.getenv("DB_NAME", "investment_db"),
-        user=os.getenv("DB_USER", "invest_user"),
-        password=os.getenv("DB_PASSWORD")
-    )
+from core.utils.db_utils import get_db_connection
 
 
 def add_excluded_stock(code: str, reason: str, excluded_by: str = "user", notes: Optional[str] = None) -> bool:
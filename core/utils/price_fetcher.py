@@ -0,0 +1,349 @@
+"""
+다종목 가격 동시 수집 엔진
+
+FinanceDataReader 같은 데이터 소스 호출은 대부분 네트워크 대기 시간이므로
+제한된 스레드 풀로 여러 종목을 동시에 요청한다.
+
+- 소스별 초당 요청 수 제한 (token bucket)
+- 실패 시 지수 백오프 재시도
+- 진행 상황/지표 콜백
+- 수집 결과를 일정 행 수 단위 배치로 DB writer에 전달
+
+데이터 소스는 reader(code, start, end) -> DataFrame 형태의 callable이면 되므로
+테스트에서는 로컬 stub 함수로 대체할 수 있다.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+try:
+    import FinanceDataReader as fdr
+except ImportError:  # pragma: no cover - runtime 설치 안 된 경우 대비
+    fdr = None
+
+try:
+    from core.utils.db_utils import prices_frame_from_fdr
+except ImportError:  # core/utils 디렉토리에서 스크립트로 실행하는 경우
+    from db_utils import prices_frame_from_fdr
+
+
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_RATE_PER_SEC = 10.0
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_SEC = 0.5
+DEFAULT_BATCH_ROWS = 50_000
+DEFAULT_INITIAL_DAYS = 365
+# 중간 누락 구간과 tail 사이가 이 일수 이내면 요청 하나로 합침
+MERGE_GAP_DAYS = 7
+
+
+class RateLimiter:
+    """스레드 안전 token bucket 요청 제한기"""
+
+    def __init__(self, rate_per_sec: float, burst: Optional[int] = None):
+        self.rate = float(rate_per_sec)
+        self.capacity = float(burst or max(1, int(rate_per_sec)))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """토큰 1개를 얻을 때까지 대기"""
+        if self.rate <= 0:
+            return
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+_rate_limiters: Dict[str, RateLimiter] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(source: str, rate_per_sec: float) -> RateLimiter:
+    """데이터 소스별로 공유되는 요청 제한기"""
+    with _rate_limiters_lock:
+        limiter = _rate_limiters.get(source)
+        if limiter is None or limiter.rate != rate_per_sec:
+            limiter = RateLimiter(rate_per_sec)
+            _rate_limiters[source] = limiter
+        return limiter
+
+
+@dataclass
+class FetchResult:
+    """종목 1개 수집 결과"""
+    code: str
+    data: Optional[pd.DataFrame]
+    error: Optional[str] = None
+    attempts: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.data is not None and not self.data.empty
+
+
+@dataclass
+class FetchMetrics:
+    """전체 수집 지표"""
+    total: int = 0
+    completed: int = 0
+    succeeded: int = 0
+    empty: int = 0
+    failed: int = 0
+    retries: int = 0
+    rows: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    def to_dict(self) -> Dict:
+        return {
+            'total': self.total,
+            'completed': self.completed,
+            'succeeded': self.succeeded,
+            'empty': self.empty,
+            'failed': self.failed,
+            'retries': self.retries,
+            'rows': self.rows,
+            'elapsed_sec': round(self.elapsed, 2),
+        }
+
+
+def _default_reader(code, start, end):
+    return fdr.DataReader(code, start, end)
+
+
+class PriceFetcher:
+    """
+    다종목 가격 동시 수집기
+
+    Example:
+        fetcher = PriceFetcher(max_workers=8, rate_per_sec=10)
+        requests = [(code, start, end) for code in codes]
+        metrics = fetcher.run(requests, writer=bulk_upsert_prices)
+    """
+
+    def __init__(
+        self,
+        reader: Optional[Callable] = None,
+        source: str = "fdr",
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        rate_per_sec: float = DEFAULT_RATE_PER_SEC,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff_sec: float = DEFAULT_BACKOFF_SEC,
+        progress_callback: Optional[Callable[[FetchResult, FetchMetrics], None]] = None,
+    ):
+        """
+        Args:
+            reader: reader(code, start, end) -> DataFrame (기본: fdr.DataReader)
+            source: 요청 제한을 공유할 데이터 소스 이름
+            max_workers: 동시 요청 스레드 수
+            rate_per_sec: 소스별 초당 최대 요청 수 (0 이하면 제한 없음)
+            max_retries: 실패 시 재시도 횟수
+            backoff_sec: 재시도 대기 시간 기준값 (시도마다 2배)
+            progress_callback: 종목 1개 완료 시마다 (result, metrics)로 호출
+        """
+        if reader is None and fdr is None:
+            raise RuntimeError("FinanceDataReader 설치 필요: pip install finance-datareader")
+
+        self.reader = reader or _default_reader
+        self.max_workers = max(1, max_workers)
+        self.limiter = get_rate_limiter(source, rate_per_sec)
+        self.max_retries = max(0, max_retries)
+        self.backoff_sec = backoff_sec
+        self.progress_callback = progress_callback
+        self.metrics = FetchMetrics()
+
+    def _fetch_one(self, code: str, start, end) -> FetchResult:
+        """재시도/백오프를 포함한 단일 종목 수집"""
+        started = time.monotonic()
+        last_error = None
+
+        for attempt in range(1, self.max_retries + 2):
+            self.limiter.acquire()
+            try:
+                df = self.reader(code, start, end)
+                return FetchResult(code, df, attempts=attempt, elapsed=time.monotonic() - started)
+            except Exception as e:
+                last_error = str(e)[:200]
+                if attempt <= self.max_retries:
+                    time.sleep(self.backoff_sec * (2 ** (attempt - 1)))
+
+        return FetchResult(code, None, error=last_error,
+                           attempts=self.max_retries + 1, elapsed=time.monotonic() - started)
+
+    def _record(self, result: FetchResult):
+        metrics = self.metrics
+        metrics.completed += 1
+        metrics.retries += max(result.attempts - 1, 0)
+        if result.error is not None:
+            metrics.failed += 1
+        elif result.ok:
+            metrics.succeeded += 1
+            metrics.rows += len(result.data)
+        else:
+            metrics.empty += 1
+
+        if self.progress_callback is not None:
+            self.progress_callback(result, metrics)
+
+    def fetch(self, requests: Iterable[Tuple[str, object, object]]) -> Iterator[FetchResult]:
+        """
+        (code, start, end) 요청들을 동시에 수집하여 완료 순서대로 반환
+
+        Args:
+            requests: (종목코드, 시작일, 종료일) 튜플 목록
+
+        Yields:
+            FetchResult
+        """
+        requests = list(requests)
+        self.metrics = FetchMetrics(total=len(requests))
+        if not requests:
+            return
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(self._fetch_one, code, start, end)
+                       for code, start, end in requests]
+            for future in as_completed(futures):
+                result = future.result()
+                self._record(result)
+                yield result
+
+    def fetch_range(self, codes: Iterable[str], start, end) -> Iterator[FetchResult]:
+        """모든 종목을 같은 기간으로 수집"""
+        return self.fetch((code, start, end) for code in codes)
+
+    def fetch_batches(
+        self,
+        requests: Iterable[Tuple[str, object, object]],
+        batch_rows: int = DEFAULT_BATCH_ROWS,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        수집 결과를 prices 형식 DataFrame 배치로 묶어 반환
+
+        Yields:
+            DataFrame (code, date, open, high, low, close, volume), 약 batch_rows 행 단위
+        """
+        pending: List[pd.DataFrame] = []
+        pending_rows = 0
+
+        for result in self.fetch(requests):
+            if not result.ok:
+                continue
+            pending.append(prices_frame_from_fdr(result.code, result.data))
+            pending_rows += len(result.data)
+            if pending_rows >= batch_rows:
+                yield pd.concat(pending, ignore_index=True)
+                pending, pending_rows = [], 0
+
+        if pending:
+            yield pd.concat(pending, ignore_index=True)
+
+    def run(
+        self,
+        requests: Iterable[Tuple[str, object, object]],
+        writer: Callable[[pd.DataFrame], object],
+        batch_rows: int = DEFAULT_BATCH_ROWS,
+    ) -> FetchMetrics:
+        """
+        수집 후 배치 단위로 writer(DataFrame)에 전달
+
+        Args:
+            requests: (종목코드, 시작일, 종료일) 튜플 목록
+            writer: 배치 DataFrame을 받아 저장하는 함수 (예: db_utils.bulk_upsert_prices)
+            batch_rows: 배치 크기 (행 수)
+
+        Returns:
+            FetchMetrics
+        """
+        for batch in self.fetch_batches(requests, batch_rows=batch_rows):
+            writer(batch)
+        return self.metrics
+
+
+def _as_date(value) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return pd.Timestamp(value).date()
+
+
+def _has_business_day(start: date, end: date) -> bool:
+    return start <= end and len(pd.bdate_range(start, end)) > 0
+
+
+def plan_sync_requests(
+    codes: Iterable[str],
+    end_date,
+    last_dates: Dict[str, date],
+    gaps: Optional[Dict[str, Tuple[date, date]]] = None,
+    initial_days: int = DEFAULT_INITIAL_DAYS,
+    partial: Optional[Dict[str, Tuple[date, date]]] = None,
+) -> List[Tuple[str, date, date]]:
+    """
+    증분 동기화 요청 계획
+
+    종목별 마지막 저장일 이후의 누락 구간(tail)과 중간 누락 구간(gap)만 요청합니다.
+    두 구간이 가까우면 한 번의 요청으로 합치고,
+    이미 최신인 종목(마지막 저장일 이후 영업일이 없는 종목)은 건너뜁니다.
+    장중 업데이트로 저장된 미완성 행(open이 NULL, 종가 미확정)은 누락 구간으로 보고 다시 요청합니다.
+
+    Args:
+        codes: 대상 종목 코드
+        end_date: 동기화 기준일 (보통 오늘)
+        last_dates: {code: MAX(date)} (db_utils.get_latest_price_dates)
+        gaps: {code: (누락 시작일, 누락 종료일)} (db_utils.find_price_gaps)
+        initial_days: 가격 이력이 없는 종목의 초기 수집 기간
+        partial: {code: (미완성 행 시작일, 종료일)} (db_utils.find_partial_prices)
+
+    Returns:
+        [(code, start, end), ...] - PriceFetcher.fetch/run 입력 형식
+    """
+    end = _as_date(end_date)
+    gaps = gaps or {}
+    partial = partial or {}
+    requests = []
+
+    for code in codes:
+        last = last_dates.get(code)
+        tail_start = end - timedelta(days=initial_days) if last is None else _as_date(last) + timedelta(days=1)
+        tail = (tail_start, end) if _has_business_day(tail_start, end) else None
+
+        gap = gaps.get(code)
+        if gap is not None:
+            gap = (_as_date(gap[0]), _as_date(gap[1]))
+        if code in partial:
+            rows = (_as_date(partial[code][0]), _as_date(partial[code][1]))
+            gap = rows if gap is None else (min(gap[0], rows[0]), max(gap[1], rows[1]))
+
+        if tail and gap and gap[1] + timedelta(days=MERGE_GAP_DAYS) >= tail[0]:
+            requests.append((code, min(gap[0], tail[0]), end))
+            continue
+        if gap:
+            requests.append((code, gap[0], gap[1]))
+        if tail:
+            requests.append((code, tail[0], tail[1]))
+
+    return requests
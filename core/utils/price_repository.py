@@ -0,0 +1,120 @@
+"""
+가격 조회 저장소 (PriceRepository)
+
+종목마다 pd.read_sql을 반복하던 조회를 종목 묶음 단위의 배치 조회로 대체한다.
+모든 메서드는 종목 수와 관계없이 한 번의 조회(code = ANY)로 끝나며
+결과를 날짜 x 종목 wide frame(또는 종목별 Series)으로 반환한다.
+
+기간 조회(closes, ohlcv_panel)는 로컬 가격 저장소(price_store)를 거치고,
+최신가(latest_close)는 항상 PostgreSQL에서 직접 읽는다.
+"""
+
+from __future__ import annotations
+
+import threading
+from datetime import date, timedelta
+from typing import Optional, Sequence
+
+import pandas as pd
+
+from core.utils.db_utils import db_connection
+from core.utils.price_store import PRICE_FIELDS, PriceStore, get_price_store
+
+
+class PriceRepository:
+    """
+    배치 가격 조회
+
+    Example:
+        repo = get_price_repository()
+        closes = repo.closes(['005930', '000660'], lookback=252)
+        latest = repo.latest_close(['005930', '000660'])
+    """
+
+    def __init__(self, store: Optional[PriceStore] = None):
+        self.store = store or get_price_store()
+
+    def closes(self, codes: Sequence[str], lookback: int = 252, end=None, min_periods: int = 1) -> pd.DataFrame:
+        """
+        최근 lookback 거래일 종가 (날짜 x 종목)
+
+        Args:
+            codes: 종목 코드 리스트
+            lookback: 거래일 수
+            end: 기준일 (None이면 오늘)
+            min_periods: 이보다 데이터가 적은 종목은 제외
+
+        Returns:
+            DataFrame (index: date, columns: code)
+        """
+        if len(codes) == 0:
+            return pd.DataFrame()
+
+        end_d = pd.Timestamp(end).date() if end is not None else date.today()
+        # 거래일 lookback개를 덮는 달력 기간 (주말/공휴일 여유 포함)
+        start_d = end_d - timedelta(days=int(lookback * 1.6) + 10)
+        panel = self.store.load_panel(codes, start_d, end_d, "close")
+        if panel.empty:
+            return panel
+
+        panel = panel.tail(lookback)
+        return panel.loc[:, panel.count() >= min_periods]
+
+    def returns(self, codes: Sequence[str], lookback: int = 252, end=None, min_periods: int = 10) -> pd.DataFrame:
+        """최근 lookback 거래일 일간 수익률 (날짜 x 종목, 첫 행 제외)"""
+        closes = self.closes(codes, lookback, end, min_periods=min_periods)
+        if closes.empty:
+            return closes
+        return closes.pct_change(fill_method=None).iloc[1:]
+
+    def ohlcv_panel(self, codes: Sequence[str], start=None, end=None,
+                    fields: Sequence[str] = PRICE_FIELDS) -> pd.DataFrame:
+        """
+        OHLCV 패널
+
+        Returns:
+            DataFrame (index: date, columns: (field, code) MultiIndex)
+        """
+        if len(codes) == 0:
+            return pd.DataFrame()
+        return self.store.load_panel(codes, start, end, list(fields))
+
+    def latest_close(self, codes: Sequence[str]) -> pd.Series:
+        """
+        종목별 최신 종가 (PostgreSQL 직접 조회)
+
+        Returns:
+            Series (index: code, values: close) - 가격 없는 종목은 제외
+        """
+        if len(codes) == 0:
+            return pd.Series(dtype=float, name="close")
+
+        query = """
+            SELECT DISTINCT ON (code) code, close
+            FROM prices
+            WHERE code = ANY(%s)
+            ORDER BY code, date DESC
+        """
+        with db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(query, (list(codes),))
+                rows = cur.fetchall()
+
+        series = pd.Series({code: float(close) for code, close in rows if close is not None},
+                           dtype=float, name="close")
+        series.index.name = "code"
+        return series
+
+
+_repository: Optional[PriceRepository] = None
+_repository_lock = threading.Lock()
+
+
+def get_price_repository() -> PriceRepository:
+    """프로세스 공용 PriceRepository"""
+    global _repository
+    if _repository is None:
+        with _repository_lock:
+            if _repository is None:
+                _repository = PriceRepository()
+    return _repository
@@ -0,0 +1,475 @@
+"""
+로컬 컬럼형 가격 저장소 (Arrow IPC)
+
+prices 테이블을 연도별 Arrow IPC 파일로 복제해 두고,
+분석 모듈이 긴 기간의 가격을 읽을 때 PostgreSQL 대신 사용하는 read-through 캐시.
+
+- 파일 구성: {root}/year={YYYY}.arrow, 파일 내부는 (code, date) 정렬
+- 파일 메타데이터에 종목별 행 구간(offset, length)을 저장하여 (code, year)로 바로 접근
+- memory-map으로 열고 행 구간만 slice하므로 필요한 종목만 복사 없이 읽음
+- 연도별 지문(행 수/마지막 날짜/합계)을 DB와 비교해 바뀐 연도만 다시 씀
+- 동기화는 프로세스 간 파일 잠금 안에서 수행하고, 파일은 고유한 임시 파일을 거쳐 교체
+
+pyarrow가 없거나 PRICE_STORE_ENABLED=0이면 같은 API로 PostgreSQL에서 직접 읽습니다.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import os
+import threading
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.ipc as pa_ipc
+except ImportError:  # pragma: no cover - runtime 설치 안 된 경우 대비
+    pa = None
+    pc = None
+    pa_ipc = None
+
+from core.utils.atomic_file import atomic_write, file_lock
+from core.utils.db_utils import db_connection
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+DEFAULT_STORE_DIR = Path(os.getenv("PRICE_STORE_DIR", PROJECT_ROOT / "data" / "price_store"))
+STORE_ENABLED = os.getenv("PRICE_STORE_ENABLED", "1") != "0"
+# 최신 연도 파일을 DB와 다시 비교하기 전까지의 간격 (초)
+FRESHNESS_CHECK_SEC = float(os.getenv("PRICE_STORE_CHECK_SEC", "300"))
+
+PRICE_FIELDS = ["open", "high", "low", "close", "volume"]
+MANIFEST_FILE = "manifest.json"
+
+
+def _as_date(value) -> date:
+    if value is None:
+        return date.today()
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return pd.Timestamp(value).date()
+
+
+def _normalize_fields(fields: Union[str, Sequence[str]]) -> List[str]:
+    names = [fields] if isinstance(fields, str) else list(fields)
+    unknown = set(names) - set(PRICE_FIELDS)
+    if unknown:
+        raise ValueError(f"지원하지 않는 필드: {sorted(unknown)}")
+    return names
+
+
+def _to_panel(df: pd.DataFrame, fields: Union[str, Sequence[str]]) -> pd.DataFrame:
+    """tidy(code, date, fields...) → 날짜 x 종목 wide frame (numpy scatter)"""
+    names = _normalize_fields(fields)
+    if df.empty:
+        return pd.DataFrame()
+
+    codes = df["code"].astype("category")
+    code_idx = codes.cat.codes.to_numpy()
+    used = np.bincount(code_idx, minlength=len(codes.cat.categories)) > 0
+    if not used.all():
+        code_idx = (np.cumsum(used) - 1)[code_idx]
+    date_idx, dates = pd.factorize(df["date"].to_numpy(), sort=True)
+    index = pd.DatetimeIndex(dates, name="date").as_unit("ns")
+    columns = pd.Index(codes.cat.categories[used].astype(str), name="code")
+
+    frames = {}
+    for field in names:
+        matrix = np.full((len(index), len(columns)), np.nan)
+        matrix[date_idx, code_idx] = df[field].to_numpy(dtype=float)
+        frames[field] = pd.DataFrame(matrix, index=index, columns=columns)
+
+    if isinstance(fields, str):
+        return frames[fields]
+    return pd.concat(frames, axis=1, names=[None, "code"])
+
+
+def _query_prices(codes: Optional[List[str]], start: date, end: date, fields: List[str]) -> pd.DataFrame:
+    """PostgreSQL에서 tidy 가격 조회 (code = ANY 한 번)"""
+    columns = ", ".join(["code", "date"] + fields)
+    query = f"SELECT {columns} FROM prices WHERE date BETWEEN %s AND %s"
+    params: list = [start, end]
+    if codes is not None:
+        query += " AND code = ANY(%s)"
+        params.append(list(codes))
+    query += " ORDER BY code, date"
+
+    with db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(query, params)
+            rows = cur.fetchall()
+
+    df = pd.DataFrame(rows, columns=["code", "date"] + fields)
+    for field in fields:
+        df[field] = pd.to_numeric(df[field], errors="coerce").astype(float)
+    return df
+
+
+class PriceStore:
+    """
+    연도별 Arrow 파일 기반 가격 저장소
+
+    Example:
+        store = get_price_store()
+        store.sync()                                  # prices 테이블과 동기화
+        closes = store.load_panel(codes, "2015-01-01", "2024-12-31", "close")
+    """
+
+    def __init__(self, root: Union[str, Path] = DEFAULT_STORE_DIR, enabled: bool = STORE_ENABLED):
+        self.root = Path(root)
+        self.enabled = enabled and pa is not None
+        self._lock = threading.RLock()
+        self._tables: Dict[int, tuple] = {}
+        self._last_check = 0.0
+        self._manifest = self._read_manifest() if self.enabled else {}
+
+    # ------------------------------------------------------------------
+    # manifest / 파일 관리
+    # ------------------------------------------------------------------
+    def _manifest_path(self) -> Path:
+        return self.root / MANIFEST_FILE
+
+    def _year_path(self, year: int) -> Path:
+        return self.root / f"year={year}.arrow"
+
+    def _read_manifest(self) -> Dict[int, Dict]:
+        path = self._manifest_path()
+        if not path.exists():
+            return {}
+        with open(path, "r", encoding="utf-8") as f:
+            return {int(year): info for year, info in json.load(f).items()}
+
+    def _write_manifest(self):
+        with atomic_write(self._manifest_path()) as f:
+            json.dump({str(year): info for year, info in sorted(self._manifest.items())}, f, indent=2)
+
+    def _reload_manifest(self):
+        """다른 프로세스가 동기화한 결과 반영 (바뀐 연도의 열린 파일 캐시 무효화)"""
+        manifest = self._read_manifest()
+        for year in set(manifest) | set(self._manifest):
+            if manifest.get(year) != self._manifest.get(year):
+                self._tables.pop(year, None)
+        self._manifest = manifest
+
+    # ------------------------------------------------------------------
+    # 동기화
+    # ------------------------------------------------------------------
+    def _db_fingerprints(self, years: Optional[Iterable[int]] = None) -> Dict[int, Dict]:
+        """연도별 지문: 행 수, 마지막 날짜, 필드별 합계 (과거 연도 보정/백필 감지)"""
+        query = """
+            SELECT EXTRACT(YEAR FROM date)::INT AS year,
+                   COUNT(*), MAX(date), COALESCE(SUM(close), 0), COALESCE(SUM(volume), 0),
+                   COALESCE(SUM(open), 0), COUNT(open), COALESCE(SUM(high), 0), COALESCE(SUM(low), 0)
+            FROM prices
+        """
+        params = None
+        if years is not None:
+            years = sorted(set(years))
+            # 연속 연도 구간별 date 범위 (인덱스 사용, 사이 연도 스캔 없음)
+            runs = []
+            for year in years:
+                if runs and runs[-1][1] == year:
+                    runs[-1][1] = year + 1
+                else:
+                    runs.append([year, year + 1])
+            query += " WHERE " + " OR ".join(["(date >= %s AND date < %s)"] * len(runs))
+            params = [date(y, 1, 1) for run in runs for y in run]
+        query += " GROUP BY 1"
+
+        with db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(query, params)
+                rows = cur.fetchall()
+
+        return {
+            int(year): {
+                "rows": int(count),
+                "max_date": max_date.isoformat(),
+                "sum_close": str(sum_close),
+                "sum_volume": str(sum_volume),
+                "sum_open": str(sum_open),
+                "open_rows": int(open_rows),
+                "sum_high": str(sum_high),
+                "sum_low": str(sum_low),
+            }
+            for year, count, max_date, sum_close, sum_volume, sum_open, open_rows, sum_high, sum_low in rows
+            if years is None or int(year) in years
+        }
+
+    def _export_year(self, year: int) -> pd.DataFrame:
+        """연도 전체를 COPY TO로 내려받기"""
+        buffer = io.StringIO()
+        with db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.copy_expert(
+                    f"""
+                    COPY (
+                        SELECT code, date, open, high, low, close, volume
+                        FROM prices
+                        WHERE date >= '{year}-01-01' AND date < '{year + 1}-01-01'
+                        ORDER BY code, date
+                    ) TO STDOUT WITH (FORMAT csv)
+                    """,
+                    buffer
+                )
+        buffer.seek(0)
+        return pd.read_csv(
+            buffer,
+            names=["code", "date"] + PRICE_FIELDS,
+            dtype={"code": str, "open": float, "high": float, "low": float, "close": float, "volume": float},
+            parse_dates=["date"],
+        )
+
+    def _write_year(self, year: int, df: pd.DataFrame):
+        """연도 파일 쓰기 (종목별 행 구간을 메타데이터로 저장)"""
+        df = df.sort_values(["code", "date"], kind="mergesort").reset_index(drop=True)
+        codes = df["code"].to_numpy()
+        boundaries = np.flatnonzero(codes[1:] != codes[:-1]) + 1 if len(codes) else np.array([], dtype=int)
+        starts = np.concatenate([[0], boundaries]) if len(codes) else np.array([], dtype=int)
+        lengths = np.diff(np.concatenate([starts, [len(codes)]])) if len(codes) else np.array([], dtype=int)
+        index = {str(codes[s]): [int(s), int(n)] for s, n in zip(starts, lengths)}
+
+        table = pa.Table.from_pandas(
+            pd.DataFrame({
+                "code": df["code"].astype(str),
+                "date": df["date"].dt.date,
+                **{field: df[field].astype(float) for field in PRICE_FIELDS},
+            }),
+            preserve_index=False,
+        ).replace_schema_metadata({"code_index": json.dumps(index)})
+
+        with atomic_write(self._year_path(year), "wb") as sink:
+            with pa_ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        self._tables.pop(year, None)
+
+    def sync(self, years: Optional[Iterable[int]] = None, force: bool = False) -> Dict[int, int]:
+        """
+        prices 테이블과 동기화 (지문이 바뀐 연도만 다시 씀)
+
+        여러 프로세스가 같은 저장소를 동기화할 수 있으므로 파일 잠금을 잡고
+        디스크의 manifest를 다시 읽은 뒤 비교합니다.
+
+        Args:
+            years: 대상 연도 (None이면 전체)
+            force: 지문과 관계없이 다시 쓰기
+
+        Returns:
+            dict: {다시 쓴 연도: 행 수}
+        """
+        if not self.enabled:
+            return {}
+
+        with self._lock, file_lock(self._manifest_path()):
+            self._reload_manifest()
+            fingerprints = self._db_fingerprints(years)
+            rewritten = {}
+
+            for year, fingerprint in sorted(fingerprints.items()):
+                current = self._manifest.get(year, {})
+                unchanged = all(current.get(k) == v for k, v in fingerprint.items())
+                if unchanged and not force and self._year_path(year).exists():
+                    continue
+
+                df = self._export_year(year)
+                self._write_year(year, df)
+                self._manifest[year] = {**fingerprint, "synced_at": datetime.now().isoformat()}
+                rewritten[year] = len(df)
+
+            # 데이터가 없는 연도는 빈 연도로 기록 (매번 다시 조회하지 않도록)
+            target_years = set(years) if years is not None else set(self._manifest)
+            for year in target_years - set(fingerprints):
+                self._year_path(year).unlink(missing_ok=True)
+                self._tables.pop(year, None)
+                self._manifest[year] = {"rows": 0, "synced_at": datetime.now().isoformat()}
+
+            self._write_manifest()
+            self._last_check = time.monotonic()
+            return rewritten
+
+    def _dirty_years(self, years: Iterable[int]) -> set:
+        """
+        지문 재확인 대상 연도: 올해, 최신 저장 연도, 0행으로 기록된 연도
+
+        (연초 0행으로 기록된 올해나 나중에 백필된 빈 연도도 다시 확인)
+        """
+        stored = [year for year, info in self._manifest.items() if info.get("rows")]
+        candidates = {date.today().year}
+        if stored:
+            candidates.add(max(stored))
+        return {
+            year for year in years
+            if year in candidates or not self._manifest.get(year, {}).get("rows")
+        }
+
+    def _ensure_years(self, start: date, end: date):
+        """요청 구간의 연도 파일 준비 (read-through)"""
+        years = set(range(start.year, end.year + 1))
+        missing = {year for year in years if year not in self._manifest}
+
+        # 새 가격이 들어올 수 있는 연도는 주기적으로 지문 비교
+        # (그 외 과거 연도 보정은 일간 수집의 전체 sync가 반영)
+        dirty = set()
+        if time.monotonic() - self._last_check > FRESHNESS_CHECK_SEC:
+            dirty = self._dirty_years(years)
+        if missing or dirty:
+            self.sync(years=missing | dirty)
+
+    # ------------------------------------------------------------------
+    # 읽기
+    # ------------------------------------------------------------------
+    def _open_year(self, year: int):
+        """memory-map으로 연도 파일 열기 (table, code_index) 캐시"""
+        cached = self._tables.get(year)
+        if cached is not None:
+            return cached
+
+        path = self._year_path(year)
+        if not path.exists():
+            return None
+
+        source = pa.memory_map(str(path), "r")
+        table = pa_ipc.open_file(source).read_all()
+        index = json.loads(table.schema.metadata[b"code_index"])
+        self._tables[year] = (table, index)
+        return self._tables[year]
+
+    def _read(self, codes: Optional[List[str]], start: date, end: date, fields: List[str]) -> pd.DataFrame:
+        """연도 파일에서 필요한 종목 행 구간만 읽어 tidy frame 구성"""
+        self._ensure_years(start, end)
+
+        pieces = []
+        for year in range(start.year, end.year + 1):
+            opened = self._open_year(year)
+            if opened is None:
+                continue
+            table, index = opened
+            table = table.select(["code", "date"] + fields)
+
+            if codes is None:
+                pieces.append(table)
+            elif len(codes) * 4 < len(index):
+                # 일부 종목만: (code, year) 행 구간 slice (zero-copy)
+                pieces.extend(table.slice(*index[code]) for code in codes if code in index)
+            else:
+                # 대부분의 종목: 한 번에 필터
+                pieces.append(table.filter(pc.is_in(table["code"], value_set=pa.array(codes))))
+
+        if not pieces:
+            return pd.DataFrame(columns=["code", "date"] + fields)
+
+        combined = pa.concat_tables(pieces)
+        in_range = pc.and_(
+            pc.greater_equal(combined["date"], pa.scalar(start, pa.date32())),
+            pc.less_equal(combined["date"], pa.scalar(end, pa.date32())),
+        )
+        return combined.filter(in_range).to_pandas(date_as_object=False, strings_to_categorical=True)
+
+    def _load_tidy(self, codes, start, end, names: List[str]) -> pd.DataFrame:
+        codes = None if codes is None else [str(c) for c in codes]
+        start_d, end_d = _as_date(start or "1990-01-01"), _as_date(end)
+
+        if self.enabled:
+            with self._lock:
+                return self._read(codes, start_d, end_d, names)
+        return _query_prices(codes, start_d, end_d, names)
+
+    def load_prices(
+        self,
+        codes: Optional[Sequence[str]],
+        start=None,
+        end=None,
+        fields: Union[str, Sequence[str]] = PRICE_FIELDS,
+    ) -> pd.DataFrame:
+        """
+        tidy 가격 조회
+
+        Returns:
+            DataFrame: code, date, fields... (code, date 정렬)
+        """
+        df = self._load_tidy(codes, start, end, _normalize_fields(fields))
+        df["code"] = df["code"].astype(str)
+        df["date"] = pd.to_datetime(df["date"]).astype("datetime64[ns]")
+        return df
+
+    def load_panel(
+        self,
+        codes: Optional[Sequence[str]],
+        start=None,
+        end=None,
+        fields: Union[str, Sequence[str]] = "close",
+    ) -> pd.DataFrame:
+        """
+        날짜 x 종목 가격 행렬
+
+        Args:
+            codes: 종목 코드 (None이면 전체)
+            start: 시작일 (None이면 전체 이력)
+            end: 종료일 (None이면 오늘)
+            fields: 'close' 등 단일 필드면 날짜 x 종목,
+                    리스트면 (field, code) MultiIndex 컬럼
+
+        Returns:
+            DataFrame (index: date)
+        """
+        df = self._load_tidy(codes, start, end, _normalize_fields(fields))
+        return _to_panel(df, fields)
+
+    def load_history(self, code: str, start=None, end=None) -> pd.DataFrame:
+        """단일 종목 OHLCV (date, open, high, low, close, volume)"""
+        df = self.load_prices([code], start, end, PRICE_FIELDS)
+        return df.drop(columns="code").reset_index(drop=True)
+
+    def load_recent(self, code: str, rows: int, end=None) -> pd.DataFrame:
+        """단일 종목의 최근 rows개 거래일 OHLCV ('ORDER BY date DESC LIMIT rows' 대응)"""
+        end_d = _as_date(end)
+        # 영업일 rows개를 덮는 달력 기간 (주말/공휴일 여유 포함)
+        start_d = end_d - timedelta(days=int(rows * 1.6) + 10)
+        return self.load_history(code, start_d, end_d).tail(rows).reset_index(drop=True)
+
+
+_store: Optional[PriceStore] = None
+_store_lock = threading.Lock()
+
+
+def get_price_store() -> PriceStore:
+    """프로세스 공용 가격 저장소"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = PriceStore()
+    return _store
+
+
+def load_panel(codes, start=None, end=None, fields: Union[str, Sequence[str]] = "close") -> pd.DataFrame:
+    """get_price_store().load_panel 단축 함수"""
+    return get_price_store().load_panel(codes, start, end, fields)
+
+
+def recent_window_start(days: int) -> date:
+    """'CURRENT_DATE - INTERVAL days' 와 같은 시작일"""
+    return date.today() - timedelta(days=days)
+
+
+if __name__ == "__main__":
+    """스크립트 직접 실행 시 전체 동기화"""
+    store = get_price_store()
+    if not store.enabled:
+        print("✗ pyarrow 미설치 또는 PRICE_STORE_ENABLED=0 - 저장소를 사용하지 않습니다")
+    else:
+        started = time.monotonic()
+        rewritten = store.sync()
+        print(f"✓ 가격 저장소 동기화 완료: {len(rewritten)}개 연도 갱신 ({time.monotonic() - started:.1f}초)")
+        for year, rows in rewritten.items():
+            print(f"  {year}: {rows:,} rows")
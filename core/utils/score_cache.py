@@ -0,0 +1,140 @@
+"""
+계산 결과 캐시 (프로세스 내 LRU + 파일)
+
+시장 전체를 훑는 점수 계산처럼 비싼 결과를 {code: score} 형태로 보관한다.
+키에는 계산 설정과 데이터 버전(db_utils.get_price_version, get_price_checksum,
+get_financials_version)을 넣어 새 가격/보정/재무가 적재되면 자동으로 다른 키가 되도록 한다.
+
+- 1단계: 프로세스 내 LRU (OrderedDict)
+- 2단계: data/score_cache/{namespace}/ 아래 JSON 파일 (프로세스/실행 간 공유)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, is_dataclass
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+import logging
+
+from core.utils.atomic_file import atomic_write, file_lock
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+DEFAULT_CACHE_DIR = Path(os.getenv("SCORE_CACHE_DIR", PROJECT_ROOT / "data" / "score_cache"))
+CACHE_ENABLED = os.getenv("SCORE_CACHE_ENABLED", "1") != "0"
+DEFAULT_LRU_SIZE = 16
+
+
+def config_fingerprint(config) -> str:
+    """설정 객체(dataclass/dict) 해시 (12자)"""
+    if is_dataclass(config):
+        config = asdict(config)
+    payload = json.dumps(config, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:12]
+
+
+class ScoreCache:
+    """
+    {code: score} 결과 캐시
+
+    키는 (group, version) 튜플이다. group은 시장/설정처럼 결과의 종류를,
+    version은 가격 데이터 버전처럼 결과의 최신 여부를 나타낸다.
+    같은 group의 새 version이 저장되면 이전 version 파일은 삭제된다.
+
+    Example:
+        cache = ScoreCache("leadership")
+        key = ("KOSPI-3f2a9c1b0d4e", "2024-06-28:2450")
+        scores = cache.get(key)
+        if scores is None:
+            scores = compute()
+            cache.put(key, scores)
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        root: Union[str, Path] = DEFAULT_CACHE_DIR,
+        maxsize: int = DEFAULT_LRU_SIZE,
+        persistent: bool = CACHE_ENABLED,
+    ):
+        self.namespace = namespace
+        self.dir = Path(root) / namespace
+        self.maxsize = max(1, maxsize)
+        self.persistent = persistent
+        self._lru: "OrderedDict[Tuple[str, str], Dict[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _safe(value: str) -> str:
+        return "".join(ch if ch.isalnum() or ch in "-_." else "_" for ch in str(value))
+
+    def _path(self, key: Tuple[str, str]) -> Path:
+        group, version = key
+        return self.dir / f"{self._safe(group)}__{self._safe(version)}.json"
+
+    def _remember(self, key: Tuple[str, str], scores: Dict[str, float]):
+        with self._lock:
+            # 같은 group의 이전 version은 더 이상 쓰지 않음
+            for old in [k for k in self._lru if k[0] == key[0] and k != key]:
+                del self._lru[old]
+            self._lru[key] = scores
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.maxsize:
+                self._lru.popitem(last=False)
+
+    def get(self, key: Tuple[str, str]) -> Optional[Dict[str, float]]:
+        """캐시 조회 (LRU → 파일 순), 없으면 None"""
+        with self._lock:
+            scores = self._lru.get(key)
+            if scores is not None:
+                self._lru.move_to_end(key)
+                return scores
+
+        if not self.persistent:
+            return None
+
+        path = self._path(key)
+        if not path.exists():
+            return None
+        try:
+            scores = json.loads(path.read_text(encoding="utf-8"))["scores"]
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"캐시 파일 읽기 실패 ({path.name}): {e}")
+            return None
+
+        self._remember(key, scores)
+        return scores
+
+    def put(self, key: Tuple[str, str], scores: Dict[str, float]):
+        """캐시 저장 (같은 group의 이전 version 파일 정리)"""
+        scores = {str(code): float(score) for code, score in scores.items()}
+        self._remember(key, scores)
+
+        if not self.persistent:
+            return
+
+        try:
+            path = self._path(key)
+            with file_lock(self.dir / self._safe(key[0])):
+                for old in self.dir.glob(f"{self._safe(key[0])}__*.json"):
+                    if old != path:
+                        old.unlink(missing_ok=True)
+                with atomic_write(path) as f:
+                    json.dump({"group": key[0], "version": key[1], "scores": scores}, f)
+        except OSError as e:
+            logger.warning(f"캐시 파일 저장 실패 ({self.namespace}): {e}")
+
+    def clear(self):
+        """LRU와 파일 캐시 모두 삭제"""
+        with self._lock:
+            self._lru.clear()
+        if self.persistent and self.dir.exists():
+            for path in self.dir.glob("*.json"):
+                path.unlink(missing_ok=True)
@@ -49,6 +49,26 @@ CREATE TABLE IF NOT EXISTS news_summary (
     FOREIGN KEY (code) REFERENCES stocks(code) ON DELETE SET NULL
 );
 
+-- 종목별 리스크 지표 (야간 일괄 계산, core.modules.risk_analysis.refresh_risk_metrics)
+CREATE TABLE IF NOT EXISTS risk_metrics (
+    code VARCHAR(10) PRIMARY KEY REFERENCES stocks(code) ON DELETE CASCADE,
+    as_of DATE NOT NULL,
+    period_days INT,
+    volatility FLOAT,
+    max_drawdown FLOAT,
+    var_95 FLOAT,
+    sharpe_ratio FLOAT,
+    downside_deviation FLOAT,
+    sortino_ratio FLOAT,
+    win_rate FLOAT,
+    beta FLOAT,
+    risk_score FLOAT,
+    risk_grade VARCHAR(20),
+    peak_date DATE,
+    trough_date DATE,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
 -- 인덱스 생성
 CREATE INDEX IF NOT EXISTS idx_prices_date ON prices(date);
 CREATE INDEX IF NOT EXISTS idx_prices_code_date ON prices(code, date DESC);
@@ -124,6 +144,6 @@ ON CONFLICT (code) DO NOTHING;
 DO $$
 BEGIN
     RAISE NOTICE '데이터베이스 초기화 완료!';
-    RAISE NOTICE '테이블: stocks, prices, financials, news_summary';
+    RAISE NOTICE '테이블: stocks, prices, financials, news_summary, risk_metrics';
     RAISE NOTICE '뷰: latest_financials, stocks_with_latest_price';
 END $$;
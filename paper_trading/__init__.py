@@ -8,7 +8,9 @@ from .paper_trading import (
     update_portfolio_values,
     execute_buy,
     execute_sell,
-    get_latest_price
+    submit_orders,
+    get_latest_price,
+    get_latest_prices
 )
 
 __all__ = [
@@ -16,5 +18,7 @@ __all__ = [
     'update_portfolio_values',
     'execute_buy',
     'execute_sell',
-    'get_latest_price'
+    'submit_orders',
+    'get_latest_price',
+    'get_latest_prices'
 ]
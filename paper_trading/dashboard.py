@@ -4,6 +4,7 @@ Paper Trading 실시간 모니터링 대시보드
 Dash (Plotly) 기반 웹 대시보드
 """
 
+import os
 import sys
 from pathlib import Path
 from datetime import datetime
@@ -35,7 +36,7 @@ app = dash.Dash(
 )
 
 # 전역 설정
-ACCOUNT_ID = 1
+ACCOUNT_ID = int(os.getenv("PAPER_TRADING_ACCOUNT_ID", "1"))  # 전략별 계좌는 대시보드 인스턴스별로 지정
 REFRESH_INTERVAL = 30000  # 30초 (밀리초 단위)
 DEFAULT_RANGE_DAYS = 30
 BENCHMARK_CHOICES = [
@@ -0,0 +1,282 @@
+"""
+장중 손절/익절 이벤트 모니터
+
+포지션별 손절/익절 발동 가격을 종목별 힙으로 색인해 두고, 가격 업데이트가 들어올 때
+해당 가격이 넘어선 트리거만 꺼냅니다. 틱당 비용은 O(log n) (발동 건수만큼 추가)이며
+portfolio_manager.check_stop_loss_take_profit처럼 전체 포트폴리오를 다시 훑지 않습니다.
+
+- 손절: 가격 <= 평균가 * (1 + stop_loss_pct / 100)  (종목별 최대 힙)
+- 익절: 가격 >= 평균가 * (1 + take_profit_pct / 100)  (종목별 최소 힙)
+
+포지션이 바뀌면 세대 번호를 올려 이전 힙 항목을 무효화하고(지연 삭제),
+발동된 청산은 계좌별 submit_orders 한 번으로 일괄 매도합니다.
+알림만 보낸 트리거(매도 안 함)는 포지션(수량/평균가)이 바뀔 때까지 다시 색인하지 않습니다.
+"""
+
+import sys
+import heapq
+import itertools
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# 프로젝트 루트 경로 추가
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from core.utils.db_utils import get_db_connection
+
+# 같은 디렉토리의 paper_trading 모듈 import를 위해 현재 디렉토리 추가
+sys.path.insert(0, str(Path(__file__).parent))
+
+import paper_trading as pt
+
+
+class ExitMonitor:
+    """포지션별 손절/익절 트리거 색인 (종목별 힙, 스레드 안전)"""
+
+    def __init__(self, stop_loss_pct: float = -10.0, take_profit_pct: float = 20.0,
+                 thresholds: Optional[Dict[int, Tuple[float, float]]] = None):
+        """
+        Args:
+            stop_loss_pct: 기본 손절 기준 (%)
+            take_profit_pct: 기본 익절 기준 (%)
+            thresholds: 계좌별 기준 {계좌 ID: (손절 %, 익절 %)}
+        """
+        self.stop_loss_pct = stop_loss_pct
+        self.take_profit_pct = take_profit_pct
+        self.thresholds = dict(thresholds or {})
+        self._positions: Dict[Tuple[int, str], Dict] = {}
+        # 종목 코드 -> [(-손절가, 세대, 계좌 ID)] / [(익절가, 세대, 계좌 ID)]
+        self._stops: Dict[str, List[Tuple[float, int, int]]] = {}
+        self._takes: Dict[str, List[Tuple[float, int, int]]] = {}
+        # 알림만 보낸 포지션 (계좌 ID, 종목 코드) -> 발동 당시 (수량, 평균가)
+        self._notified: Dict[Tuple[int, str], Tuple[int, float]] = {}
+        self._generation = itertools.count()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def _limits(self, account_id: int) -> Tuple[float, float]:
+        return self.thresholds.get(account_id, (self.stop_loss_pct, self.take_profit_pct))
+
+    def set_position(self, account_id: int, code: str, quantity: int,
+                     avg_price: float, name: Optional[str] = None) -> None:
+        """포지션 등록/변경 (수량 0이면 제거, 알림 기록 초기화) - O(log n)"""
+        with self._lock:
+            self._notified.pop((account_id, code), None)
+            self._set_position(account_id, code, quantity, avg_price, name)
+
+    def _set_position(self, account_id, code, quantity, avg_price, name):
+        key = (account_id, code)
+        if quantity <= 0 or avg_price <= 0:
+            self._positions.pop(key, None)
+            return
+
+        stop_loss_pct, take_profit_pct = self._limits(account_id)
+        generation = next(self._generation)
+        stop_price = avg_price * (1 + stop_loss_pct / 100)
+        take_price = avg_price * (1 + take_profit_pct / 100)
+
+        self._positions[key] = {
+            'quantity': int(quantity),
+            'avg_price': float(avg_price),
+            'name': name or self._positions.get(key, {}).get('name') or code,
+            'generation': generation,
+        }
+        heapq.heappush(self._stops.setdefault(code, []), (-stop_price, generation, account_id))
+        heapq.heappush(self._takes.setdefault(code, []), (take_price, generation, account_id))
+
+    def remove_position(self, account_id: int, code: str) -> None:
+        """포지션 제거 (힙 항목은 다음 조회 때 지연 삭제)"""
+        with self._lock:
+            self._positions.pop((account_id, code), None)
+            self._notified.pop((account_id, code), None)
+
+    def sync_positions(self, account_ids: Optional[List[int]] = None) -> int:
+        """
+        DB 보유 포지션과 색인 동기화 (1회 조회, 바뀐 포지션만 힙에 반영)
+
+        알림만 보낸 포지션은 수량/평균가가 그대로면 다시 색인하지 않습니다.
+
+        Args:
+            account_ids: 대상 계좌 ID 리스트 (None이면 전체 계좌)
+
+        Returns:
+            int: 추적 중인 포지션 수
+        """
+        conn = get_db_connection()
+        cur = conn.cursor()
+
+        try:
+            cur.execute("""
+                SELECT p.account_id, p.code, s.name, p.quantity, p.avg_price
+                FROM virtual_portfolio p
+                LEFT JOIN stocks s ON s.code = p.code
+                WHERE p.quantity > 0
+                  AND (%(account_ids)s::int[] IS NULL OR p.account_id = ANY(%(account_ids)s::int[]))
+            """, {'account_ids': account_ids})
+            rows = cur.fetchall()
+        finally:
+            cur.close()
+            conn.close()
+
+        with self._lock:
+            seen = set()
+            for account_id, code, name, quantity, avg_price in rows:
+                key = (account_id, code)
+                seen.add(key)
+                notified = self._notified.get(key)
+                if notified is not None:
+                    if notified == (quantity, float(avg_price)):
+                        continue
+                    del self._notified[key]
+                current = self._positions.get(key)
+                if current and current['quantity'] == quantity and current['avg_price'] == float(avg_price):
+                    continue
+                self._set_position(account_id, code, int(quantity), float(avg_price), name)
+
+            for tracked in (self._positions, self._notified):
+                for key in list(tracked):
+                    if key not in seen and (account_ids is None or key[0] in account_ids):
+                        del tracked[key]
+
+            self._compact()
+            return len(self._positions)
+
+    def _compact(self) -> None:
+        """무효 항목이 절반 이상인 힙 재구성"""
+        for heaps in (self._stops, self._takes):
+            for code, heap in list(heaps.items()):
+                live = [entry for entry in heap if self._is_live(code, entry)]
+                if not live:
+                    del heaps[code]
+                elif len(live) * 2 <= len(heap):
+                    heapq.heapify(live)
+                    heaps[code] = live
+
+    def _is_live(self, code: str, entry: Tuple[float, int, int]) -> bool:
+        position = self._positions.get((entry[2], code))
+        return position is not None and position['generation'] == entry[1]
+
+    def on_price(self, code: str, price: float) -> List[Dict]:
+        """
+        가격 틱 반영 - 넘어선 트리거만 발동 (발동 포지션은 색인에서 제거)
+
+        Args:
+            code: 종목 코드
+            price: 현재가
+
+        Returns:
+            List[Dict]: 청산 대상 (check_stop_loss_take_profit 결과 + account_id, price)
+        """
+        fired = []
+        with self._lock:
+            stops = self._stops.get(code)
+            while stops and (not self._is_live(code, stops[0]) or -stops[0][0] >= price):
+                entry = heapq.heappop(stops)
+                if self._is_live(code, entry):
+                    fired.append(self._fire(entry[2], code, price, 'stop_loss'))
+
+            takes = self._takes.get(code)
+            while takes and (not self._is_live(code, takes[0]) or takes[0][0] <= price):
+                entry = heapq.heappop(takes)
+                if self._is_live(code, entry):
+                    fired.append(self._fire(entry[2], code, price, 'take_profit'))
+
+        return fired
+
+    def on_prices(self, prices: Dict) -> List[Dict]:
+        """
+        여러 종목 가격 반영
+
+        Args:
+            prices: {종목코드: 현재가} 또는 price_updater.fetch_price_data 결과 ({종목코드: {'close': ...}})
+
+        Returns:
+            List[Dict]: 청산 대상
+        """
+        fired = []
+        for code, value in prices.items():
+            price = value['close'] if isinstance(value, dict) else value
+            fired.extend(self.on_price(code, float(price)))
+        return fired
+
+    def _fire(self, account_id: int, code: str, price: float, reason: str) -> Dict:
+        position = self._positions.pop((account_id, code))
+        stop_loss_pct, take_profit_pct = self._limits(account_id)
+        profit_loss_pct = (price - position['avg_price']) / position['avg_price'] * 100
+
+        if reason == 'stop_loss':
+            message = f"손절 기준 도달 ({profit_loss_pct:.2f}% ≤ {stop_loss_pct}%)"
+        else:
+            message = f"익절 기준 도달 ({profit_loss_pct:.2f}% ≥ {take_profit_pct}%)"
+
+        return {
+            'account_id': account_id,
+            'code': code,
+            'name': position['name'],
+            'quantity': position['quantity'],
+            'avg_price': position['avg_price'],
+            'price': price,
+            'profit_loss_pct': profit_loss_pct,
+            'reason': reason,
+            'message': message
+        }
+
+    def execute_exits(self, exits: Iterable[Dict]) -> Dict:
+        """
+        발동된 청산 일괄 매도 (계좌별 submit_orders 1회)
+
+        Args:
+            exits: on_price/on_prices 결과
+
+        Returns:
+            Dict: executed / rejected (계좌 ID 포함)
+        """
+        by_account: Dict[int, List[Dict]] = {}
+        for exit_ in exits:
+            by_account.setdefault(exit_['account_id'], []).append({
+                'action': 'sell',
+                'code': exit_['code'],
+                'quantity': exit_['quantity'],
+                'price': exit_['price'],
+                'reason': f"{exit_['reason']}: {exit_['message']}"
+            })
+
+        executed, rejected = [], []
+        for account_id, orders in by_account.items():
+            try:
+                result = pt.submit_orders(account_id, orders)
+            except Exception as e:
+                rejected.extend({'account_id': account_id, **order, 'error': str(e)} for order in orders)
+                continue
+            executed.extend({'account_id': account_id, **trade} for trade in result['executed'])
+            rejected.extend({'account_id': account_id, **order} for order in result['rejected'])
+
+        return {'executed': executed, 'rejected': rejected}
+
+    def process(self, prices: Dict, execute: bool = False) -> Dict:
+        """
+        가격 업데이트 처리 (트리거 확인 + 선택적 일괄 매도)
+
+        execute=False면 발동 포지션을 알림 완료로 기록해 다음 sync_positions에서
+        포지션이 바뀌기 전까지 같은 알림이 반복되지 않게 합니다.
+
+        Args:
+            prices: on_prices와 같은 형식
+            execute: 발동 청산 실제 매도 여부
+
+        Returns:
+            Dict: exits (발동 목록), executed, rejected
+        """
+        exits = self.on_prices(prices)
+        result = {'exits': exits, 'executed': [], 'rejected': []}
+        if execute and exits:
+            result.update(self.execute_exits(exits))
+        elif exits:
+            with self._lock:
+                for exit_ in exits:
+                    self._notified[(exit_['account_id'], exit_['code'])] = (exit_['quantity'], exit_['avg_price'])
+        return result
@@ -96,20 +96,13 @@ def cmd_check(args):
 
 def cmd_init_db(args):
     """데이터베이스 테이블 초기화"""
-    import os
-    import psycopg2
+    from core.utils.db_utils import get_db_connection
 
     print("\n⚠️  제외 종목 테이블을 초기화합니다...")
     print("   기존 데이터는 유지되며, 테이블이 없는 경우에만 생성됩니다.\n")
 
     try:
-        conn = psycopg2.connect(
-            host=os.getenv("DB_HOST", "localhost"),
-            port=os.getenv("DB_PORT", "5432"),
-            database=os.getenv("DB_NAME", "investment_db"),
-            user=os.getenv("DB_USER", "invest_user"),
-            password=os.getenv("DB_PASSWORD")
-        )
+        conn = get_db_connection()
 
         # schema_exclusion.sql 실행
         schema_file = Path(__file__).parent / "schema_exclusion.sql"
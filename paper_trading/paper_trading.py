@@ -6,10 +6,12 @@
 
 import sys
 from pathlib import Path
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 from decimal import Decimal
 from datetime import datetime
 
+from psycopg2.extras import execute_values
+
 # 프로젝트 루트 경로 추가
 project_root = Path(__file__).parent.parent
 sys.path.append(str(project_root))
@@ -66,6 +68,43 @@ def get_latest_price(code: str) -> Optional[float]:
         conn.close()
 
 
+def get_latest_prices(codes: List[str]) -> Dict[str, float]:
+    """
+    여러 종목의 최신 종가 일괄 조회 (1회 쿼리)
+
+    Args:
+        codes: 종목 코드 리스트
+
+    Returns:
+        Dict[str, float]: {종목코드: 최신 종가} (가격 없는 종목 제외)
+    """
+    codes = list(dict.fromkeys(codes))
+    if not codes:
+        return {}
+
+    conn = get_db_connection()
+    cur = conn.cursor()
+
+    try:
+        cur.execute("""
+            SELECT c.code, lp.close
+            FROM unnest(%s::varchar[]) AS c(code)
+            JOIN LATERAL (
+                SELECT close
+                FROM prices
+                WHERE prices.code = c.code
+                ORDER BY date DESC
+                LIMIT 1
+            ) lp ON TRUE
+        """, (codes,))
+
+        return {code: float(close) for code, close in cur.fetchall()}
+
+    finally:
+        cur.close()
+        conn.close()
+
+
 def get_current_balance(account_id: int) -> Decimal:
     """
     계좌의 현재 현금 잔고 조회
@@ -136,11 +175,61 @@ def get_position(account_id: int, code: str) -> Optional[Dict]:
         conn.close()
 
 
+def _lock_account(cur, account_id: int, code: str) -> Tuple[Decimal, Optional[int], Optional[float], Optional[float]]:
+    """
+    주문 트랜잭션 시작: 계좌 행 잠금 + 잔고/포지션/최신 종가 조회 (1회 왕복)
+
+    같은 계좌의 주문은 계좌 행 잠금(FOR UPDATE)으로 직렬화되므로,
+    잠금 이후 읽은 잔고와 보유 수량은 커밋 전까지 다른 주문이 바꿀 수 없습니다.
+
+    Returns:
+        (현재 잔고, 보유 수량, 평균 매입가, 최신 종가) - 포지션/가격 없으면 None
+    """
+    cur.execute("""
+        SELECT a.current_balance,
+               p.quantity,
+               p.avg_price,
+               (SELECT close FROM prices WHERE code = %s ORDER BY date DESC LIMIT 1)
+        FROM virtual_accounts a
+        LEFT JOIN virtual_portfolio p ON p.account_id = a.account_id AND p.code = %s
+        WHERE a.account_id = %s
+        FOR UPDATE OF a
+    """, (code, code, account_id))
+
+    row = cur.fetchone()
+    if not row:
+        raise ValueError(f"계좌 ID {account_id}를 찾을 수 없습니다")
+
+    balance, quantity, avg_price, latest_price = row
+    return (
+        balance,
+        int(quantity) if quantity is not None else None,
+        float(avg_price) if avg_price is not None else None,
+        float(latest_price) if latest_price is not None else None
+    )
+
+
+def _resolve_price(code: str, price: Optional[float], latest_price: Optional[float]) -> float:
+    """주문 가격 결정 (지정가 없으면 최신 종가) 및 검증"""
+    if price is None:
+        price = latest_price
+        if price is None:
+            raise InvalidPriceError(f"종목 {code}의 가격 정보를 찾을 수 없습니다")
+
+    if price <= 0:
+        raise InvalidPriceError(f"유효하지 않은 가격: {price}")
+
+    return price
+
+
 def execute_buy(account_id: int, code: str, quantity: int,
                 price: Optional[float] = None, reason: str = "") -> Dict:
     """
     매수 주문 실행
 
+    한 연결의 단일 트랜잭션에서 계좌 잠금/잔고 확인 후 거래 기록, 잔고 차감,
+    포지션 upsert를 한 문장으로 처리합니다 (잠금 조회 + 쓰기 + 커밋 3회 왕복).
+
     Args:
         account_id: 계좌 ID
         code: 종목 코드
@@ -156,6 +245,8 @@ def execute_buy(account_id: int, code: str, quantity: int,
             - price: 가격
             - total_amount: 총 금액 (수수료 포함)
             - commission: 수수료
+            - position_quantity: 매수 후 보유 수량
+            - avg_price: 매수 후 평균 매입가
 
     Raises:
         InsufficientFundsError: 잔고 부족
@@ -164,79 +255,62 @@ def execute_buy(account_id: int, code: str, quantity: int,
     if quantity <= 0:
         raise ValueError(f"수량은 양수여야 합니다: {quantity}")
 
-    # 가격 결정 (지정가 없으면 최신 종가)
-    if price is None:
-        price = get_latest_price(code)
-        if price is None:
-            raise InvalidPriceError(f"종목 {code}의 가격 정보를 찾을 수 없습니다")
-
-    if price <= 0:
-        raise InvalidPriceError(f"유효하지 않은 가격: {price}")
-
-    # 매수 금액 계산 (수수료 포함)
-    stock_amount = price * quantity
-    commission = stock_amount * COMMISSION_RATE
-    total_amount = stock_amount + commission
-
     conn = get_db_connection()
     cur = conn.cursor()
 
     try:
-        # 잔고 확인
-        current_balance = get_current_balance(account_id)
+        current_balance, _, _, latest_price = _lock_account(cur, account_id, code)
+        price = _resolve_price(code, price, latest_price)
+
+        # 매수 금액 계산 (수수료 포함)
+        stock_amount = price * quantity
+        commission = stock_amount * COMMISSION_RATE
+        total_amount = stock_amount + commission
+
+        # 잔고 확인 (계좌 잠금 이후이므로 커밋까지 유효)
         if current_balance < total_amount:
             raise InsufficientFundsError(
                 f"잔고 부족: 필요 금액 {total_amount:,.0f}원, 현재 잔고 {current_balance:,.0f}원"
             )
 
-        # 1. 거래 기록
+        # 거래 기록 + 잔고 차감 + 포지션 upsert (기존 포지션이면 평균가 재계산)
         cur.execute("""
-            INSERT INTO virtual_trades (
-                account_id, code, trade_type, quantity, price, total_amount, commission, reason
-            )
-            VALUES (%s, %s, 'buy', %s, %s, %s, %s, %s)
-            RETURNING trade_id, trade_date
-        """, (account_id, code, quantity, price, total_amount, commission, reason))
-
-        trade_row = cur.fetchone()
-        trade_id = trade_row[0]
-        trade_date = trade_row[1]
-
-        # 2. 잔고 차감
-        new_balance = current_balance - Decimal(str(total_amount))
-        cur.execute("""
-            UPDATE virtual_accounts
-            SET current_balance = %s
-            WHERE account_id = %s
-        """, (new_balance, account_id))
-
-        # 3. 포지션 업데이트
-        position = get_position(account_id, code)
-
-        if position:
-            # 기존 포지션이 있으면 평균가 계산
-            old_quantity = position['quantity']
-            old_avg_price = position['avg_price']
-
-            new_quantity = old_quantity + quantity
-            new_avg_price = (old_avg_price * old_quantity + price * quantity) / new_quantity
-
-            cur.execute("""
-                UPDATE virtual_portfolio
-                SET quantity = %s,
-                    avg_price = %s,
-                    updated_at = CURRENT_TIMESTAMP
-                WHERE account_id = %s AND code = %s
-            """, (new_quantity, new_avg_price, account_id, code))
-        else:
-            # 새 포지션 생성
-            cur.execute("""
+            WITH trade AS (
+                INSERT INTO virtual_trades (
+                    account_id, code, trade_type, quantity, price, total_amount, commission, reason
+                )
+                VALUES (%(account_id)s, %(code)s, 'buy', %(quantity)s, %(price)s,
+                        %(total_amount)s, %(commission)s, %(reason)s)
+                RETURNING trade_id, trade_date
+            ), account AS (
+                UPDATE virtual_accounts
+                SET current_balance = current_balance - %(balance_delta)s
+                WHERE account_id = %(account_id)s
+                RETURNING current_balance
+            ), holding AS (
                 INSERT INTO virtual_portfolio (
                     account_id, code, quantity, avg_price, first_buy_date
                 )
-                VALUES (%s, %s, %s, %s, %s)
-            """, (account_id, code, quantity, price, trade_date))
-
+                SELECT %(account_id)s, %(code)s, %(quantity)s, %(price)s, trade_date
+                FROM trade
+                ON CONFLICT (account_id, code) DO UPDATE
+                SET avg_price = (virtual_portfolio.avg_price * virtual_portfolio.quantity
+                                 + EXCLUDED.avg_price * EXCLUDED.quantity)
+                                / (virtual_portfolio.quantity + EXCLUDED.quantity),
+                    quantity = virtual_portfolio.quantity + EXCLUDED.quantity,
+                    updated_at = CURRENT_TIMESTAMP
+                RETURNING quantity, avg_price
+            )
+            SELECT trade.trade_id, trade.trade_date, account.current_balance,
+                   holding.quantity, holding.avg_price
+            FROM trade, account, holding
+        """, {
+            'account_id': account_id, 'code': code, 'quantity': quantity, 'price': price,
+            'total_amount': total_amount, 'commission': commission, 'reason': reason,
+            'balance_delta': Decimal(str(total_amount))
+        })
+
+        trade_id, trade_date, new_balance, position_quantity, avg_price = cur.fetchone()
         conn.commit()
 
         return {
@@ -247,10 +321,12 @@ def execute_buy(account_id: int, code: str, quantity: int,
             'price': price,
             'total_amount': total_amount,
             'commission': commission,
-            'new_balance': float(new_balance)
+            'new_balance': float(new_balance),
+            'position_quantity': int(position_quantity),
+            'avg_price': float(avg_price)
         }
 
-    except Exception as e:
+    except Exception:
         conn.rollback()
         raise
     finally:
@@ -263,6 +339,9 @@ def execute_sell(account_id: int, code: str, quantity: int,
     """
     매도 주문 실행
 
+    한 연결의 단일 트랜잭션에서 계좌 잠금/보유 수량 확인 후 거래 기록, 잔고 증가,
+    포지션 감소(전량 매도 시 삭제)를 한 문장으로 처리합니다.
+
     Args:
         account_id: 계좌 ID
         code: 종목 코드
@@ -287,79 +366,72 @@ def execute_sell(account_id: int, code: str, quantity: int,
     if quantity <= 0:
         raise ValueError(f"수량은 양수여야 합니다: {quantity}")
 
-    # 가격 결정
-    if price is None:
-        price = get_latest_price(code)
-        if price is None:
-            raise InvalidPriceError(f"종목 {code}의 가격 정보를 찾을 수 없습니다")
-
-    if price <= 0:
-        raise InvalidPriceError(f"유효하지 않은 가격: {price}")
-
-    # 보유 수량 확인
-    position = get_position(account_id, code)
-    if not position:
-        raise InsufficientSharesError(f"종목 {code}를 보유하고 있지 않습니다")
-
-    if position['quantity'] < quantity:
-        raise InsufficientSharesError(
-            f"보유 수량 부족: 필요 {quantity}주, 보유 {position['quantity']}주"
-        )
-
-    # 매도 금액 계산 (수수료 차감)
-    stock_amount = price * quantity
-    commission = stock_amount * COMMISSION_RATE
-    total_amount = stock_amount - commission
-
-    # 실현 손익 계산
-    avg_price = position['avg_price']
-    profit_loss = (price - avg_price) * quantity
-
     conn = get_db_connection()
     cur = conn.cursor()
 
     try:
-        # 1. 거래 기록
-        cur.execute("""
-            INSERT INTO virtual_trades (
-                account_id, code, trade_type, quantity, price, total_amount, commission, reason
-            )
-            VALUES (%s, %s, 'sell', %s, %s, %s, %s, %s)
-            RETURNING trade_id, trade_date
-        """, (account_id, code, quantity, price, total_amount, commission, reason))
+        _, held_quantity, avg_price, latest_price = _lock_account(cur, account_id, code)
+        price = _resolve_price(code, price, latest_price)
 
-        trade_row = cur.fetchone()
-        trade_id = trade_row[0]
-        trade_date = trade_row[1]
+        # 보유 수량 확인
+        if not held_quantity:
+            raise InsufficientSharesError(f"종목 {code}를 보유하고 있지 않습니다")
 
-        # 2. 잔고 증가
-        current_balance = get_current_balance(account_id)
-        new_balance = current_balance + Decimal(str(total_amount))
+        if held_quantity < quantity:
+            raise InsufficientSharesError(
+                f"보유 수량 부족: 필요 {quantity}주, 보유 {held_quantity}주"
+            )
 
-        cur.execute("""
-            UPDATE virtual_accounts
-            SET current_balance = %s
-            WHERE account_id = %s
-        """, (new_balance, account_id))
+        # 매도 금액 계산 (수수료 차감)
+        stock_amount = price * quantity
+        commission = stock_amount * COMMISSION_RATE
+        total_amount = stock_amount - commission
 
-        # 3. 포지션 업데이트
-        new_quantity = position['quantity'] - quantity
+        # 실현 손익 계산
+        profit_loss = (price - avg_price) * quantity
+        new_quantity = held_quantity - quantity
 
         if new_quantity > 0:
             # 일부 매도 - 수량만 감소
-            cur.execute("""
+            position_sql = """
                 UPDATE virtual_portfolio
-                SET quantity = %s,
+                SET quantity = quantity - %(quantity)s,
                     updated_at = CURRENT_TIMESTAMP
-                WHERE account_id = %s AND code = %s
-            """, (new_quantity, account_id, code))
+                WHERE account_id = %(account_id)s AND code = %(code)s
+                RETURNING quantity
+            """
         else:
             # 전량 매도 - 포지션 삭제
-            cur.execute("""
+            position_sql = """
                 DELETE FROM virtual_portfolio
-                WHERE account_id = %s AND code = %s
-            """, (account_id, code))
-
+                WHERE account_id = %(account_id)s AND code = %(code)s
+                RETURNING 0 AS quantity
+            """
+
+        # 거래 기록 + 잔고 증가 + 포지션 감소/삭제
+        cur.execute(f"""
+            WITH trade AS (
+                INSERT INTO virtual_trades (
+                    account_id, code, trade_type, quantity, price, total_amount, commission, reason
+                )
+                VALUES (%(account_id)s, %(code)s, 'sell', %(quantity)s, %(price)s,
+                        %(total_amount)s, %(commission)s, %(reason)s)
+                RETURNING trade_id, trade_date
+            ), account AS (
+                UPDATE virtual_accounts
+                SET current_balance = current_balance + %(balance_delta)s
+                WHERE account_id = %(account_id)s
+                RETURNING current_balance
+            ), holding AS ({position_sql})
+            SELECT trade.trade_id, trade.trade_date, account.current_balance, holding.quantity
+            FROM trade, account, holding
+        """, {
+            'account_id': account_id, 'code': code, 'quantity': quantity, 'price': price,
+            'total_amount': total_amount, 'commission': commission, 'reason': reason,
+            'balance_delta': Decimal(str(total_amount))
+        })
+
+        trade_id, trade_date, new_balance, remaining_quantity = cur.fetchone()
         conn.commit()
 
         return {
@@ -374,10 +446,10 @@ def execute_sell(account_id: int, code: str, quantity: int,
             'profit_loss': profit_loss,
             'profit_loss_pct': (profit_loss / (avg_price * quantity)) * 100,
             'new_balance': float(new_balance),
-            'remaining_quantity': new_quantity
+            'remaining_quantity': int(remaining_quantity)
         }
 
-    except Exception as e:
+    except Exception:
         conn.rollback()
         raise
     finally:
@@ -385,71 +457,318 @@ def execute_sell(account_id: int, code: str, quantity: int,
         conn.close()
 
 
-def update_portfolio_values(account_id: int) -> Dict:
+def submit_orders(account_id: int, orders: List[Dict], dry_run: bool = False) -> Dict:
     """
-    포트폴리오 전체의 현재가 및 평가 손익 업데이트
+    여러 주문 일괄 실행 (리밸런싱/초기 포트폴리오 구성용)
+
+    한 트랜잭션에서 계좌를 잠그고 대상 종목의 보유 포지션과 최신 종가를 한 번에 읽은 뒤,
+    매도를 먼저 반영해 바스켓 전체 현금을 검증하고 거래 기록/잔고/포지션을
+    다중 행 문장으로 씁니다. 주문 수와 관계없이 DB 왕복 횟수가 일정합니다.
+
+    검증에 실패한 주문(가격 없음, 보유 수량/잔고 부족)은 rejected로 돌려주고
+    나머지 주문은 그대로 체결합니다 (execute_buy/execute_sell 순차 호출과 같은 동작).
 
     Args:
         account_id: 계좌 ID
+        orders: 주문 리스트
+            - action: 'buy' 또는 'sell'
+            - code: 종목 코드
+            - quantity: 수량
+            - price: 가격 (없으면 최신 종가)
+            - reason: 사유 (선택)
+        dry_run: True면 검증/체결 예상 결과만 계산하고 기록하지 않음
 
     Returns:
-        Dict: 업데이트 결과
-            - updated_count: 업데이트된 포지션 수
-            - total_value: 총 평가액
-            - total_profit_loss: 총 평가 손익
+        Dict: 실행 결과
+            - executed: 체결 리스트 (execute_buy/execute_sell 결과 + action, 매도 먼저)
+                        (dry_run이면 trade_id/trade_date 없음)
+            - rejected: 거부 리스트 (action, code, quantity, error)
+            - new_balance: 체결 후 잔고 (dry_run이면 예상 잔고)
+            - dry_run: dry_run 여부
     """
+    executed = []
+    rejected = []
+
+    def reject(order, error):
+        rejected.append({
+            'action': order.get('action'),
+            'code': order.get('code'),
+            'quantity': order.get('quantity'),
+            'error': str(error)
+        })
+
+    # 매도 먼저 (매도 대금으로 매수 현금 확보)
+    valid_orders = []
+    for order in orders:
+        if order.get('action') not in ('buy', 'sell'):
+            reject(order, f"알 수 없는 주문 유형: {order.get('action')}")
+        elif not order.get('quantity') or order['quantity'] <= 0:
+            reject(order, f"수량은 양수여야 합니다: {order.get('quantity')}")
+        else:
+            valid_orders.append(order)
+    valid_orders.sort(key=lambda order: order['action'] != 'sell')
+
     conn = get_db_connection()
     cur = conn.cursor()
 
     try:
-        # 모든 포지션 조회
         cur.execute("""
-            SELECT code, quantity, avg_price
-            FROM virtual_portfolio
-            WHERE account_id = %s AND quantity > 0
+            SELECT current_balance
+            FROM virtual_accounts
+            WHERE account_id = %s
+            FOR UPDATE
         """, (account_id,))
 
-        positions = cur.fetchall()
-
-        updated_count = 0
-        total_value = 0
-        total_profit_loss = 0
+        row = cur.fetchone()
+        if not row:
+            raise ValueError(f"계좌 ID {account_id}를 찾을 수 없습니다")
+        balance = row[0]
 
-        for code, quantity, avg_price in positions:
-            # 최신 가격 조회
-            current_price = get_latest_price(code)
-            if current_price is None:
+        # 대상 종목 포지션 + 최신 종가 (1회 조회)
+        codes = list(dict.fromkeys(order['code'] for order in valid_orders))
+        cur.execute("""
+            SELECT c.code, p.quantity, p.avg_price, lp.close
+            FROM unnest(%s::varchar[]) AS c(code)
+            LEFT JOIN virtual_portfolio p ON p.account_id = %s AND p.code = c.code
+            LEFT JOIN LATERAL (
+                SELECT close
+                FROM prices
+                WHERE prices.code = c.code
+                ORDER BY date DESC
+                LIMIT 1
+            ) lp ON TRUE
+        """, (codes, account_id))
+
+        holdings = {}
+        latest_prices = {}
+        for code, quantity, avg_price, close in cur.fetchall():
+            if quantity:
+                holdings[code] = {'quantity': int(quantity), 'avg_price': float(avg_price)}
+            if close is not None:
+                latest_prices[code] = float(close)
+
+        # 바스켓 검증 (현금/보유 수량을 주문 순서대로 차감)
+        cash = Decimal(balance)
+        touched = set()
+        closed = set()
+        trade_rows = []
+        for order in valid_orders:
+            action, code, quantity = order['action'], order['code'], int(order['quantity'])
+            try:
+                price = _resolve_price(code, order.get('price'), latest_prices.get(code))
+            except InvalidPriceError as e:
+                reject(order, e)
                 continue
 
-            # 평가액 및 손익 계산
-            current_value = current_price * quantity
-            cost = float(avg_price) * quantity
-            profit_loss = current_value - cost
-            profit_loss_pct = (profit_loss / cost) * 100 if cost > 0 else 0
+            stock_amount = price * quantity
+            commission = stock_amount * COMMISSION_RATE
+            holding = holdings.get(code)
+
+            if action == 'buy':
+                total_amount = stock_amount + commission
+                if cash < Decimal(str(total_amount)):
+                    reject(order, InsufficientFundsError(
+                        f"잔고 부족: 필요 금액 {total_amount:,.0f}원, 현재 잔고 {cash:,.0f}원"
+                    ))
+                    continue
+
+                cash -= Decimal(str(total_amount))
+                if holding:
+                    new_quantity = holding['quantity'] + quantity
+                    holding['avg_price'] = (holding['avg_price'] * holding['quantity'] + price * quantity) / new_quantity
+                    holding['quantity'] = new_quantity
+                else:
+                    holding = holdings[code] = {'quantity': quantity, 'avg_price': price}
+
+                result = {'position_quantity': holding['quantity'], 'avg_price': holding['avg_price']}
+
+            else:
+                if not holding:
+                    reject(order, InsufficientSharesError(f"종목 {code}를 보유하고 있지 않습니다"))
+                    continue
+                if holding['quantity'] < quantity:
+                    reject(order, InsufficientSharesError(
+                        f"보유 수량 부족: 필요 {quantity}주, 보유 {holding['quantity']}주"
+                    ))
+                    continue
+
+                total_amount = stock_amount - commission
+                cash += Decimal(str(total_amount))
+                avg_price = holding['avg_price']
+                profit_loss = (price - avg_price) * quantity
+                holding['quantity'] -= quantity
+                if holding['quantity'] == 0:
+                    del holdings[code]
+                    closed.add(code)
+
+                result = {
+                    'avg_price': avg_price,
+                    'profit_loss': profit_loss,
+                    'profit_loss_pct': (profit_loss / (avg_price * quantity)) * 100,
+                    'remaining_quantity': holding['quantity']
+                }
+
+            touched.add(code)
+            trade_rows.append((account_id, code, action, quantity, price, total_amount, commission,
+                               order.get('reason', "")))
+            executed.append({
+                'action': action,
+                'code': code,
+                'quantity': quantity,
+                'price': price,
+                'total_amount': total_amount,
+                'commission': commission,
+                **result
+            })
+
+        if dry_run or not trade_rows:
+            conn.rollback()
+            for trade in executed:
+                trade['new_balance'] = float(cash)
+            return {'executed': executed, 'rejected': rejected, 'new_balance': float(cash), 'dry_run': dry_run}
+
+        # 1. 거래 기록 (다중 행, trade_id는 입력 순서대로 증가)
+        trades = execute_values(cur, """
+            INSERT INTO virtual_trades (
+                account_id, code, trade_type, quantity, price, total_amount, commission, reason
+            )
+            VALUES %s
+            RETURNING trade_id, trade_date
+        """, trade_rows, fetch=True)
+        for trade, (trade_id, trade_date) in zip(executed, sorted(trades)):
+            trade['trade_id'] = trade_id
+            trade['trade_date'] = trade_date
+
+        # 2. 잔고 변경 (순증감 1회)
+        cur.execute("""
+            UPDATE virtual_accounts
+            SET current_balance = current_balance + %s
+            WHERE account_id = %s
+            RETURNING current_balance
+        """, (cash - balance, account_id))
+        new_balance = cur.fetchone()[0]
 
-            # 포지션 업데이트
+        # 3. 전량 매도 종목 삭제 후 포지션 upsert (최종 수량/평균가, 재매수 종목은 새 포지션)
+        if closed:
             cur.execute("""
-                UPDATE virtual_portfolio
-                SET current_price = %s,
-                    current_value = %s,
-                    profit_loss = %s,
-                    profit_loss_pct = %s,
+                DELETE FROM virtual_portfolio
+                WHERE account_id = %s AND code = ANY(%s)
+            """, (account_id, list(closed)))
+
+        upserts = [(account_id, code, holdings[code]['quantity'], holdings[code]['avg_price'])
+                   for code in touched if code in holdings]
+        if upserts:
+            execute_values(cur, """
+                INSERT INTO virtual_portfolio (
+                    account_id, code, quantity, avg_price, first_buy_date
+                )
+                VALUES %s
+                ON CONFLICT (account_id, code) DO UPDATE
+                SET quantity = EXCLUDED.quantity,
+                    avg_price = EXCLUDED.avg_price,
                     updated_at = CURRENT_TIMESTAMP
-                WHERE account_id = %s AND code = %s
-            """, (current_price, current_value, profit_loss, profit_loss_pct, account_id, code))
+            """, upserts, template="(%s, %s, %s, %s, CURRENT_TIMESTAMP)")
+
+        conn.commit()
 
-            updated_count += 1
-            total_value += current_value
-            total_profit_loss += profit_loss
+        for trade in executed:
+            trade['new_balance'] = float(new_balance)
+
+        return {
+            'executed': executed,
+            'rejected': rejected,
+            'new_balance': float(new_balance),
+            'dry_run': False
+        }
+
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+        conn.close()
+
+
+def update_portfolio_values(account_id: Optional[int] = None) -> Dict:
+    """
+    포트폴리오 전체의 현재가 및 평가 손익 업데이트 (집합 기반)
+
+    보유 종목의 최신 종가를 CTE로 한 번 구해 UPDATE ... FROM 한 문장으로
+    모든 포지션을 재평가하므로, 보유 종목/계좌 수와 관계없이 왕복 횟수가 일정합니다.
+
+    Args:
+        account_id: 계좌 ID (None이면 전체 계좌)
+
+    Returns:
+        Dict: 업데이트 결과
+            - updated_count: 업데이트된 포지션 수
+            - total_value: 총 평가액
+            - total_profit_loss: 총 평가 손익
+            - accounts: {계좌 ID: {updated_count, total_value, total_profit_loss}}
+    """
+    params = {'account_id': account_id}
+    account_filter = "(%(account_id)s::int IS NULL OR {alias}account_id = %(account_id)s::int)"
+
+    conn = get_db_connection()
+    cur = conn.cursor()
+
+    try:
+        cur.execute(f"""
+            WITH held AS (
+                SELECT DISTINCT code
+                FROM virtual_portfolio
+                WHERE quantity > 0 AND {account_filter.format(alias='')}
+            ), latest AS (
+                SELECT h.code, lp.close
+                FROM held h
+                JOIN LATERAL (
+                    SELECT close
+                    FROM prices
+                    WHERE prices.code = h.code
+                    ORDER BY date DESC
+                    LIMIT 1
+                ) lp ON TRUE
+            ), revalued AS (
+                UPDATE virtual_portfolio vp
+                SET current_price = latest.close,
+                    current_value = latest.close * vp.quantity,
+                    profit_loss = (latest.close - vp.avg_price) * vp.quantity,
+                    profit_loss_pct = CASE WHEN vp.avg_price > 0
+                                           THEN (latest.close - vp.avg_price) / vp.avg_price * 100
+                                           ELSE 0 END,
+                    updated_at = CURRENT_TIMESTAMP
+                FROM latest
+                WHERE vp.code = latest.code
+                  AND vp.quantity > 0
+                  AND {account_filter.format(alias='vp.')}
+                RETURNING vp.account_id, vp.current_value, vp.profit_loss
+            )
+            SELECT account_id, COUNT(*), SUM(current_value), SUM(profit_loss)
+            FROM revalued
+            GROUP BY account_id
+        """, params)
+
+        accounts = {
+            row_account: {
+                'updated_count': count,
+                'total_value': float(value),
+                'total_profit_loss': float(profit_loss)
+            }
+            for row_account, count, value, profit_loss in cur.fetchall()
+        }
 
         conn.commit()
 
         return {
-            'updated_count': updated_count,
-            'total_value': total_value,
-            'total_profit_loss': total_profit_loss
+            'updated_count': sum(a['updated_count'] for a in accounts.values()),
+            'total_value': sum(a['total_value'] for a in accounts.values()),
+            'total_profit_loss': sum(a['total_profit_loss'] for a in accounts.values()),
+            'accounts': accounts
         }
 
+    except Exception:
+        conn.rollback()
+        raise
     finally:
         cur.close()
         conn.close()
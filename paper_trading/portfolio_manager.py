@@ -15,6 +15,7 @@ project_root = Path(__file__).parent.parent
 sys.path.append(str(project_root))
 
 from core.utils.db_utils import get_db_connection
+from core.modules.monte_carlo import simulate_portfolio_risk
 
 # 같은 디렉토리의 paper_trading 모듈 import를 위해 현재 디렉토리 추가
 sys.path.insert(0, str(Path(__file__).parent))
@@ -25,50 +26,71 @@ get_portfolio = pt.get_portfolio
 update_portfolio_values = pt.update_portfolio_values
 execute_buy = pt.execute_buy
 execute_sell = pt.execute_sell
+submit_orders = pt.submit_orders
 get_latest_price = pt.get_latest_price
+get_latest_prices = pt.get_latest_prices
 
 
-def save_daily_snapshot(account_id: int) -> Dict:
+def get_active_accounts() -> List[Dict]:
     """
-    일일 포트폴리오 스냅샷 저장
-
-    Args:
-        account_id: 계좌 ID
+    운용 중인 계좌 목록
 
     Returns:
-        Dict: 스냅샷 정보
+        List[Dict]: account_id, account_name, strategy
     """
-    # 먼저 포트폴리오 값 업데이트
-    update_portfolio_values(account_id)
-
     conn = get_db_connection()
     cur = conn.cursor()
 
     try:
-        # 계좌 요약 정보 조회
         cur.execute("""
-            SELECT
-                initial_balance,
-                cash_balance,
-                stock_value,
-                total_value,
-                return_pct
-            FROM v_account_summary
-            WHERE account_id = %s
-        """, (account_id,))
+            SELECT account_id, account_name, strategy
+            FROM virtual_accounts
+            WHERE status = 'active'
+            ORDER BY account_id
+        """)
 
-        row = cur.fetchone()
-        if not row:
-            raise ValueError(f"계좌 ID {account_id}를 찾을 수 없습니다")
+        return [
+            {'account_id': account_id, 'account_name': name, 'strategy': strategy}
+            for account_id, name, strategy in cur.fetchall()
+        ]
 
-        initial_balance, cash_balance, stock_value, total_value, return_pct = row
+    finally:
+        cur.close()
+        conn.close()
+
+
+def save_daily_snapshots(account_ids: Optional[List[int]] = None, revalue: bool = True) -> Dict[int, Dict]:
+    """
+    여러 계좌의 일일 포트폴리오 스냅샷 일괄 저장
+
+    보유 포지션을 한 번에 재평가한 뒤 v_account_summary에서 INSERT ... SELECT
+    한 문장으로 모든 계좌의 스냅샷을 저장합니다.
+    (크루 실행과 장 마감 가격 업데이트가 모두 이 함수로 스냅샷을 저장)
+
+    Args:
+        account_ids: 계좌 ID 리스트 (None이면 운용 중인 전체 계좌)
+        revalue: 스냅샷 전 포지션 재평가 여부 (호출자가 방금 재평가했으면 False)
 
-        # 스냅샷 저장
+    Returns:
+        Dict[int, Dict]: {계좌 ID: 스냅샷 정보}
+    """
+    # 먼저 포트폴리오 값 업데이트 (단일 계좌면 해당 계좌만)
+    if revalue:
+        single = account_ids[0] if account_ids is not None and len(account_ids) == 1 else None
+        update_portfolio_values(single)
+
+    conn = get_db_connection()
+    cur = conn.cursor()
+
+    try:
         cur.execute("""
             INSERT INTO virtual_portfolio_history (
                 account_id, snapshot_date, total_value, cash_balance, stock_value, return_pct
             )
-            VALUES (%s, %s, %s, %s, %s, %s)
+            SELECT account_id, %(snapshot_date)s, total_value, cash_balance, stock_value, return_pct
+            FROM v_account_summary
+            WHERE CASE WHEN %(account_ids)s::int[] IS NULL THEN status = 'active'
+                       ELSE account_id = ANY(%(account_ids)s::int[]) END
             ON CONFLICT (account_id, snapshot_date)
             DO UPDATE SET
                 total_value = EXCLUDED.total_value,
@@ -76,23 +98,48 @@ def save_daily_snapshot(account_id: int) -> Dict:
                 stock_value = EXCLUDED.stock_value,
                 return_pct = EXCLUDED.return_pct,
                 created_at = CURRENT_TIMESTAMP
-        """, (account_id, date.today(), total_value, cash_balance, stock_value, return_pct))
+            RETURNING account_id, total_value, cash_balance, stock_value, return_pct
+        """, {'snapshot_date': date.today(), 'account_ids': account_ids})
 
+        rows = cur.fetchall()
         conn.commit()
 
         return {
-            'snapshot_date': date.today().isoformat(),
-            'total_value': float(total_value),
-            'cash_balance': float(cash_balance),
-            'stock_value': float(stock_value),
-            'return_pct': float(return_pct) if return_pct else 0.0
+            account_id: {
+                'snapshot_date': date.today().isoformat(),
+                'total_value': float(total_value),
+                'cash_balance': float(cash_balance),
+                'stock_value': float(stock_value),
+                'return_pct': float(return_pct) if return_pct else 0.0
+            }
+            for account_id, total_value, cash_balance, stock_value, return_pct in rows
         }
 
+    except Exception:
+        conn.rollback()
+        raise
     finally:
         cur.close()
         conn.close()
 
 
+def save_daily_snapshot(account_id: int) -> Dict:
+    """
+    일일 포트폴리오 스냅샷 저장
+
+    Args:
+        account_id: 계좌 ID
+
+    Returns:
+        Dict: 스냅샷 정보
+    """
+    snapshots = save_daily_snapshots([account_id])
+    if account_id not in snapshots:
+        raise ValueError(f"계좌 ID {account_id}를 찾을 수 없습니다")
+
+    return snapshots[account_id]
+
+
 def get_portfolio_history(account_id: int, days: int = 30) -> List[Dict]:
     """
     포트폴리오 히스토리 조회
@@ -186,6 +233,46 @@ def check_stop_loss_take_profit(account_id: int,
     return recommendations
 
 
+def simulate_stop_loss_take_profit(account_id: int,
+                                   stop_loss_pct: float = -10.0,
+                                   take_profit_pct: float = 20.0,
+                                   horizon_days: int = 252,
+                                   n_paths: int = 10000) -> Dict:
+    """
+    보유 종목의 손절/익절 도달 확률 시뮬레이션 (몬테카를로)
+
+    check_stop_loss_take_profit과 같은 기준(평균 매입가 대비 손익률)으로,
+    앞으로 horizon_days 동안 각 종목이 손절/익절 기준에 먼저 도달할 확률과
+    포트폴리오 VaR/CVaR, 낙폭 분포를 계산합니다.
+
+    Args:
+        account_id: 계좌 ID
+        stop_loss_pct: 손절 기준 (%, 기본값: -10%)
+        take_profit_pct: 익절 기준 (%, 기본값: +20%)
+        horizon_days: 시뮬레이션 기간 (거래일)
+        n_paths: 경로 수
+
+    Returns:
+        Dict: run_monte_carlo 결과 (비중은 총 평가액 대비, 현금 포함)
+    """
+    portfolio = get_portfolio(account_id)
+    positions = [p for p in portfolio['positions'] if p['current_value'] > 0]
+    if not positions or portfolio['total_value'] <= 0:
+        return {'status': 'error', 'message': '보유 종목 없음'}
+
+    weights = {p['code']: p['current_value'] / portfolio['total_value'] for p in positions}
+    current_pnl = {p['code']: p['profit_loss_pct'] for p in positions}
+
+    return simulate_portfolio_risk(
+        list(weights), weights,
+        n_paths=n_paths,
+        horizon=horizon_days,
+        stop_loss_pct=stop_loss_pct,
+        take_profit_pct=take_profit_pct,
+        current_pnl_pct=current_pnl
+    )
+
+
 def execute_rebalancing(account_id: int, target_weights: Dict[str, float],
                        max_trade_pct: float = 0.05) -> Dict:
     """
@@ -206,30 +293,30 @@ def execute_rebalancing(account_id: int, target_weights: Dict[str, float],
     portfolio = get_portfolio(account_id)
     total_value = portfolio['total_value']
 
-    executed_trades = []
-    total_amount = 0
-
     # 현재 비중 계산
     current_weights = {}
     for position in portfolio['positions']:
         current_weights[position['code']] = position['current_value'] / total_value
 
-    # 각 종목별로 리밸런싱 필요 여부 확인
-    for code, target_weight in target_weights.items():
+    # 리밸런싱 대상 종목 현재가 (1회 조회)
+    rebalance_codes = [
+        code for code, target_weight in target_weights.items()
+        if abs(target_weight - current_weights.get(code, 0)) >= max_trade_pct
+    ]
+    prices = get_latest_prices(rebalance_codes)
+
+    # 각 종목별 주문 생성 (비중 차이가 max_trade_pct 이상인 종목)
+    orders = []
+    for code in rebalance_codes:
+        target_weight = target_weights[code]
         current_weight = current_weights.get(code, 0)
-        weight_diff = target_weight - current_weight
-
-        # 비중 차이가 max_trade_pct 이상이면 리밸런싱
-        if abs(weight_diff) < max_trade_pct:
-            continue
 
         # 목표 평가액 계산
         target_value = total_value * target_weight
         current_value = total_value * current_weight
         trade_value = target_value - current_value
 
-        # 현재가 조회
-        current_price = get_latest_price(code)
+        current_price = prices.get(code)
         if current_price is None:
             continue
 
@@ -238,45 +325,42 @@ def execute_rebalancing(account_id: int, target_weights: Dict[str, float],
         if quantity == 0:
             continue
 
-        try:
-            if trade_value > 0:
-                # 매수
-                result = execute_buy(
-                    account_id, code, quantity,
-                    reason=f"리밸런싱: 비중 {current_weight*100:.1f}% → {target_weight*100:.1f}%"
-                )
-                executed_trades.append({
-                    'action': 'buy',
-                    'code': code,
-                    'quantity': quantity,
-                    'price': result['price'],
-                    'amount': result['total_amount']
-                })
-                total_amount += result['total_amount']
+        orders.append({
+            'action': 'buy' if trade_value > 0 else 'sell',
+            'code': code,
+            'quantity': quantity,
+            'price': current_price,
+            'reason': f"리밸런싱: 비중 {current_weight*100:.1f}% → {target_weight*100:.1f}%"
+        })
 
-            else:
-                # 매도
-                result = execute_sell(
-                    account_id, code, quantity,
-                    reason=f"리밸런싱: 비중 {current_weight*100:.1f}% → {target_weight*100:.1f}%"
-                )
-                executed_trades.append({
-                    'action': 'sell',
-                    'code': code,
-                    'quantity': quantity,
-                    'price': result['price'],
-                    'amount': result['total_amount']
-                })
-                total_amount += result['total_amount']
-
-        except Exception as e:
-            print(f"⚠️  {code} 리밸런싱 실패: {e}")
-            continue
+    if not orders:
+        return {'executed_trades': [], 'total_trades': 0, 'total_amount': 0}
+
+    # 매도 먼저, 전체 주문을 한 트랜잭션으로 체결
+    try:
+        result = submit_orders(account_id, orders)
+    except Exception as e:
+        print(f"⚠️  리밸런싱 실패: {e}")
+        return {'executed_trades': [], 'total_trades': 0, 'total_amount': 0}
+
+    for rejected in result['rejected']:
+        print(f"⚠️  {rejected['code']} 리밸런싱 실패: {rejected['error']}")
+
+    executed_trades = [
+        {
+            'action': trade['action'],
+            'code': trade['code'],
+            'quantity': trade['quantity'],
+            'price': trade['price'],
+            'amount': trade['total_amount']
+        }
+        for trade in result['executed']
+    ]
 
     return {
         'executed_trades': executed_trades,
         'total_trades': len(executed_trades),
-        'total_amount': total_amount
+        'total_amount': sum(trade['amount'] for trade in executed_trades)
     }
 
 
@@ -5,6 +5,7 @@ APScheduler를 이용하여 정기적으로 가격 데이터를 수집합니다.
 매일 장 마감 후(15:40) 자동으로 가격을 업데이트합니다.
 """
 
+import os
 import sys
 from pathlib import Path
 from datetime import datetime
@@ -22,6 +23,7 @@ from apscheduler.triggers.cron import CronTrigger
 sys.path.insert(0, str(Path(__file__).parent))
 
 import price_updater
+from exit_monitor import ExitMonitor
 
 # 로깅 설정
 logging.basicConfig(
@@ -40,6 +42,12 @@ class PriceUpdateScheduler:
 
     def __init__(self):
         self.scheduler = BackgroundScheduler(daemon=True)
+        # 손절/익절 트리거 색인 (EXIT_MONITOR_AUTO_SELL=true이면 발동 즉시 일괄 매도, 아니면 로그만)
+        self.exit_monitor = ExitMonitor(
+            stop_loss_pct=float(os.getenv("EXIT_MONITOR_STOP_LOSS_PCT", "-10")),
+            take_profit_pct=float(os.getenv("EXIT_MONITOR_TAKE_PROFIT_PCT", "20"))
+        )
+        self.auto_sell = os.getenv("EXIT_MONITOR_AUTO_SELL", "false").lower() == "true"
         logger.info("가격 업데이트 스케줄러 초기화 완료")
 
     def schedule_daily_update(self):
@@ -94,13 +102,27 @@ class PriceUpdateScheduler:
             logger.info("가격 업데이트 작업 시작")
             logger.info("=" * 60)
 
-            result = price_updater.run_price_update(account_id=1)
+            try:
+                self.exit_monitor.sync_positions()
+            except Exception as e:
+                logger.warning(f"손절/익절 포지션 동기화 실패: {e}")
+
+            result = price_updater.run_price_update(
+                account_id=None, monitor=self.exit_monitor, execute_exits=self.auto_sell
+            )
 
             if result.get('status') == 'success':
                 logger.info(f"✓ 가격 업데이트 성공")
                 logger.info(f"  - 업데이트 종목: {result.get('updated_count', 0)}개")
                 logger.info(f"  - 포트폴리오 가치: ₩{result.get('stock_value', 0):,.0f}")
                 logger.info(f"  - 평가 손익: ₩{result.get('total_profit_loss', 0):,.0f}")
+                for code, values in result.get('indicators', {}).items():
+                    logger.info(f"  - {code}: RSI {values['rsi']:.1f}, MACD {values['macd']:.2f}, "
+                                f"SMA20 {values['sma_20']:,.0f}")
+                exits = result.get('exits') or {}
+                if exits.get('exits'):
+                    logger.info(f"  - 손절/익절 발동: {len(exits['exits'])}건, "
+                                f"매도 {len(exits['executed'])}건, 거부 {len(exits['rejected'])}건")
             else:
                 logger.warning(f"⚠️  가격 업데이트 부분 완료 또는 실패")
                 logger.warning(f"  상태: {result.get('status', 'unknown')}")
@@ -15,7 +15,16 @@ import logging
 project_root = Path(__file__).parent.parent
 sys.path.append(str(project_root))
 
+from psycopg2.extras import execute_values
+
 from core.utils.db_utils import get_db_connection
+from core.utils.price_fetcher import PriceFetcher
+from core.modules.indicator_state import update_intraday_indicators
+
+# 같은 디렉토리의 paper_trading 모듈 import를 위해 현재 디렉토리 추가
+sys.path.insert(0, str(Path(__file__).parent))
+import paper_trading as pt
+import portfolio_manager as pm
 
 # 로깅 설정
 logging.basicConfig(
@@ -29,12 +38,12 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def get_portfolio_stocks(account_id: int = 1) -> List[str]:
+def get_portfolio_stocks(account_id: Optional[int] = 1) -> List[str]:
     """
     포트폴리오에 보유 중인 종목 코드 조회
 
     Args:
-        account_id: 계좌 ID
+        account_id: 계좌 ID (None이면 전체 계좌의 보유 종목 합집합)
 
     Returns:
         List[str]: 종목 코드 리스트
@@ -46,9 +55,10 @@ def get_portfolio_stocks(account_id: int = 1) -> List[str]:
         cur.execute("""
             SELECT DISTINCT code
             FROM virtual_portfolio
-            WHERE account_id = %s AND quantity > 0
+            WHERE quantity > 0
+              AND (%(account_id)s::int IS NULL OR account_id = %(account_id)s::int)
             ORDER BY code
-        """, (account_id,))
+        """, {'account_id': account_id})
 
         return [row[0] for row in cur.fetchall()]
 
@@ -61,105 +71,91 @@ def get_portfolio_stocks(account_id: int = 1) -> List[str]:
         conn.close()
 
 
-def fetch_price_data(codes: List[str]) -> dict:
+def fetch_price_data(codes: List[str], max_workers: int = 8) -> dict:
     """
     FinanceDataReader에서 주가 데이터 수집
 
     Args:
         codes: 종목 코드 리스트
+        max_workers: 동시 수집 스레드 수
 
     Returns:
         dict: {코드: {'date': date, 'close': float, 'volume': int, 'high': float, 'low': float}}
     """
-    try:
-        import FinanceDataReader as fdr
-    except ImportError:
-        logger.error("FinanceDataReader 설치 필요: pip install FinanceDatareader")
-        return {}
-
     price_data = {}
+    today = date.today()
 
-    for code in codes:
-        try:
-            # 코드 포맷: KOSPI는 숫자만 (005930), KOSDAQ는 Q+숫자 (A005380)
-            ticker = code if code.startswith('Q') else code
-
-            # 최근 1일 데이터 수집
-            df = fdr.DataReader(ticker, start=date.today(), end=date.today())
+    def log_progress(result, metrics):
+        if result.error is not None:
+            logger.warning(f"✗ {result.code}: 수집 실패 - {result.error[:100]}")
+        elif not result.ok:
+            logger.warning(f"✗ {result.code}: 데이터 없음 (장 마감 전 또는 거래정지)")
 
-            if df is not None and not df.empty:
-                latest = df.iloc[-1]
-
-                price_data[code] = {
-                    'date': df.index[-1].date() if hasattr(df.index[-1], 'date') else date.today(),
-                    'close': float(latest['Close']),
-                    'high': float(latest['High']),
-                    'low': float(latest['Low']),
-                    'volume': int(latest['Volume']) if 'Volume' in latest else 0,
-                }
-                logger.info(f"✓ {code}: {price_data[code]['close']:,.0f}원")
-
-            else:
-                logger.warning(f"✗ {code}: 데이터 없음 (장 마감 전 또는 거래정지)")
+    # 보유 종목을 동시에 수집 (요청 제한/재시도 포함)
+    try:
+        fetcher = PriceFetcher(max_workers=max_workers, progress_callback=log_progress)
+    except RuntimeError as e:
+        logger.error(str(e))
+        return {}
 
-        except Exception as e:
-            logger.warning(f"✗ {code}: 수집 실패 - {str(e)[:100]}")
+    for result in fetcher.fetch((code, today, today) for code in codes):
+        if not result.ok:
             continue
 
+        df = result.data
+        latest = df.iloc[-1]
+        price_data[result.code] = {
+            'date': df.index[-1].date() if hasattr(df.index[-1], 'date') else today,
+            'close': float(latest['Close']),
+            'high': float(latest['High']),
+            'low': float(latest['Low']),
+            'volume': int(latest['Volume']) if 'Volume' in latest else 0,
+        }
+        logger.info(f"✓ {result.code}: {price_data[result.code]['close']:,.0f}원")
+
+    logger.info(f"가격 수집 지표: {fetcher.metrics.to_dict()}")
     return price_data
 
 
-def update_price_to_db(price_data: dict, account_id: int = 1) -> int:
+def update_price_to_db(price_data: dict) -> int:
     """
-    수집한 가격 데이터를 데이터베이스에 저장
+    수집한 가격 데이터를 데이터베이스에 저장 (다중 행 upsert 1회)
+
+    포지션 현재가는 update_portfolio_values의 집합 기반 재평가에서 함께 갱신됩니다.
 
     Args:
         price_data: 가격 데이터 딕셔너리
-        account_id: 계좌 ID
 
     Returns:
-        int: 업데이트된 행 수
+        int: 업데이트된 행 수 (stocks에 없는 종목 제외)
     """
+    rows = [
+        (code, data['date'], data['close'], data['high'], data['low'], data['volume'])
+        for code, data in price_data.items()
+    ]
+    if not rows:
+        return 0
+
     conn = get_db_connection()
     cur = conn.cursor()
-    updated_count = 0
 
     try:
-        for code, data in price_data.items():
-            try:
-                # prices 테이블에 저장
-                cur.execute("""
-                    INSERT INTO prices (code, date, close, high, low, volume)
-                    VALUES (%s, %s, %s, %s, %s, %s)
-                    ON CONFLICT (code, date) DO UPDATE SET
-                        close = EXCLUDED.close,
-                        high = EXCLUDED.high,
-                        low = EXCLUDED.low,
-                        volume = EXCLUDED.volume
-                """, (
-                    code,
-                    data['date'],
-                    data['close'],
-                    data['high'],
-                    data['low'],
-                    data['volume']
-                ))
-
-                # virtual_portfolio의 current_price 업데이트
-                cur.execute("""
-                    UPDATE virtual_portfolio
-                    SET current_price = %s, updated_at = CURRENT_TIMESTAMP
-                    WHERE account_id = %s AND code = %s
-                """, (data['close'], account_id, code))
-
-                updated_count += 1
-
-            except Exception as e:
-                logger.error(f"DB 저장 실패 ({code}): {e}")
-                continue
-
+        execute_values(cur, """
+            INSERT INTO prices (code, date, close, high, low, volume)
+            SELECT v.code, v.date, v.close, v.high, v.low, v.volume
+            FROM (VALUES %s) AS v(code, date, close, high, low, volume)
+            JOIN stocks s ON s.code = v.code
+            ON CONFLICT (code, date) DO UPDATE SET
+                close = EXCLUDED.close,
+                high = EXCLUDED.high,
+                low = EXCLUDED.low,
+                volume = EXCLUDED.volume
+        """, rows, page_size=len(rows))
+
+        updated_count = cur.rowcount
         conn.commit()
         logger.info(f"데이터베이스 업데이트 완료: {updated_count}개 종목")
+        return updated_count
 
     except Exception as e:
         conn.rollback()
@@ -170,100 +166,48 @@ def update_price_to_db(price_data: dict, account_id: int = 1) -> int:
         cur.close()
         conn.close()
 
-    return updated_count
-
 
-def update_portfolio_values(account_id: int = 1) -> dict:
+def update_portfolio_values(account_id: Optional[int] = 1) -> dict:
     """
-    포트폴리오 평가액 및 손익 업데이트
+    포트폴리오 평가액 및 손익 업데이트 (paper_trading.update_portfolio_values + 일일 스냅샷)
+
+    스냅샷은 portfolio_manager.save_daily_snapshots로 저장합니다 (None이면 운용 중인 계좌만).
 
     Args:
-        account_id: 계좌 ID
+        account_id: 계좌 ID (None이면 전체 계좌)
 
     Returns:
         dict: 업데이트 결과 요약
     """
-    conn = get_db_connection()
-    cur = conn.cursor()
-
     try:
-        # virtual_portfolio의 평가액, 손익 계산
-        cur.execute("""
-            UPDATE virtual_portfolio
-            SET
-                current_value = quantity * current_price,
-                profit_loss = (quantity * current_price) - (quantity * avg_price),
-                profit_loss_pct = CASE WHEN avg_price > 0 THEN ((current_price - avg_price) / avg_price * 100) ELSE 0 END,
-                updated_at = CURRENT_TIMESTAMP
-            WHERE account_id = %s AND quantity > 0
-        """, (account_id,))
-
-        affected_rows = cur.rowcount
-
-        # 포트폴리오 전체 평가액 업데이트
-        cur.execute("""
-            SELECT
-                COALESCE(SUM(current_value), 0) as stock_value,
-                COALESCE(SUM(profit_loss), 0) as total_profit_loss
-            FROM virtual_portfolio
-            WHERE account_id = %s AND quantity > 0
-        """, (account_id,))
-
-        stock_value, total_profit_loss = cur.fetchone()
-
-        # 계좌 정보 업데이트 (기존 컬럼만 사용)
-        # 주석: virtual_accounts 테이블에는 stock_value, total_value, total_return 등의 컬럼이 없으므로
-        # virtual_portfolio_history에 스냅샷을 저장하는 방식으로 대체
-        try:
-            cur.execute("""
-                INSERT INTO virtual_portfolio_history
-                    (account_id, snapshot_date, total_value, cash_balance, stock_value, return_pct)
-                SELECT
-                    a.account_id,
-                    CURRENT_DATE,
-                    a.current_balance + %s,
-                    a.current_balance,
-                    %s,
-                    ((a.current_balance + %s - a.initial_balance) / a.initial_balance * 100)
-                FROM virtual_accounts a
-                WHERE a.account_id = %s
-                ON CONFLICT (account_id, snapshot_date) DO UPDATE SET
-                    total_value = EXCLUDED.total_value,
-                    cash_balance = EXCLUDED.cash_balance,
-                    stock_value = EXCLUDED.stock_value,
-                    return_pct = EXCLUDED.return_pct,
-                    created_at = CURRENT_TIMESTAMP
-            """, (stock_value, stock_value, stock_value, account_id))
-        except Exception as e:
-            logger.warning(f"포트폴리오 히스토리 저장 실패: {e}")
-
-        conn.commit()
-
-        logger.info(f"포트폴리오 평가액 업데이트: {affected_rows}개 종목")
-        logger.info(f"총 주식 평가액: {stock_value:,.0f}원, 평가 손익: {total_profit_loss:,.0f}원")
-
-        return {
-            'updated_positions': affected_rows,
-            'stock_value': float(stock_value),
-            'total_profit_loss': float(total_profit_loss)
-        }
-
+        result = pt.update_portfolio_values(account_id)
+        pm.save_daily_snapshots(None if account_id is None else [account_id], revalue=False)
     except Exception as e:
-        conn.rollback()
         logger.error(f"포트폴리오 업데이트 실패: {e}")
         return {'updated_positions': 0, 'stock_value': 0, 'total_profit_loss': 0}
 
-    finally:
-        cur.close()
-        conn.close()
+    logger.info(f"포트폴리오 평가액 업데이트: {result['updated_count']}개 종목")
+    logger.info(f"총 주식 평가액: {result['total_value']:,.0f}원, 평가 손익: {result['total_profit_loss']:,.0f}원")
+
+    return {
+        'updated_positions': result['updated_count'],
+        'stock_value': result['total_value'],
+        'total_profit_loss': result['total_profit_loss']
+    }
 
 
-def run_price_update(account_id: int = 1) -> dict:
+def run_price_update(account_id: Optional[int] = 1, monitor=None,
+                     execute_exits: bool = False) -> dict:
     """
     주가 업데이트 메인 함수
 
+    account_id가 None이면 전체 계좌 보유 종목의 합집합을 한 번만 수집/저장하고
+    모든 계좌를 한 번에 재평가합니다 (계좌 수와 관계없이 수집/DB 작업 1회).
+
     Args:
-        account_id: 계좌 ID
+        account_id: 계좌 ID (None이면 전체 계좌)
+        monitor: exit_monitor.ExitMonitor (지정시 수집 가격으로 손절/익절 트리거 확인)
+        execute_exits: 발동된 손절/익절 실제 매도 여부
 
     Returns:
         dict: 업데이트 결과 요약
@@ -287,11 +231,28 @@ def run_price_update(account_id: int = 1) -> dict:
         return {'status': 'no_data', 'updated_count': 0}
 
     # 3. 데이터베이스 업데이트
-    updated_count = update_price_to_db(price_data, account_id)
+    updated_count = update_price_to_db(price_data)
 
     # 4. 포트폴리오 평가액 업데이트
     portfolio_result = update_portfolio_values(account_id)
 
+    # 5. 보유 종목 기술적 지표 증분 갱신 (저장된 상태에 현재가만 반영)
+    try:
+        indicators = update_intraday_indicators(price_data)
+    except Exception as e:
+        logger.warning(f"기술적 지표 갱신 실패: {e}")
+        indicators = {}
+
+    # 6. 손절/익절 트리거 확인 (넘어선 트리거만 발동, 매도는 계좌별 일괄 처리)
+    exits = {}
+    if monitor is not None:
+        try:
+            exits = monitor.process(price_data, execute=execute_exits)
+            for exit_ in exits['exits']:
+                logger.info(f"[계좌 {exit_['account_id']}] {exit_['name']}({exit_['code']}): {exit_['message']}")
+        except Exception as e:
+            logger.warning(f"손절/익절 확인 실패: {e}")
+
     logger.info("=" * 60)
     logger.info(f"가격 업데이트 완료: {updated_count}개 종목")
     logger.info("=" * 60)
@@ -299,11 +260,19 @@ def run_price_update(account_id: int = 1) -> dict:
     return {
         'status': 'success',
         'updated_count': updated_count,
+        'indicators': indicators,
+        'exits': exits,
         **portfolio_result
     }
 
 
 if __name__ == "__main__":
-    # 직접 실행 시
-    result = run_price_update(account_id=1)
+    # 직접 실행 시 (--account-id 미지정이면 전체 계좌)
+    import argparse
+
+    parser = argparse.ArgumentParser(description="보유 종목 가격 업데이트")
+    parser.add_argument("--account-id", type=int, default=None, help="계좌 ID (미지정시 전체 계좌)")
+    args = parser.parse_args()
+
+    result = run_price_update(account_id=args.account_id)
     print(f"\n업데이트 결과: {result}")
@@ -10,6 +10,8 @@ import json
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+import time
 
 # 프로젝트 루트 경로 추가
 project_root = Path(__file__).parent.parent
@@ -27,13 +29,20 @@ import ai_analysis_storage as ai_storage
 # 함수들 가져오기
 execute_buy = pt.execute_buy
 execute_sell = pt.execute_sell
+submit_orders = pt.submit_orders
 get_portfolio = pt.get_portfolio
 update_portfolio_values = pt.update_portfolio_values
 get_latest_price = pt.get_latest_price
+get_latest_prices = pt.get_latest_prices
 save_daily_snapshot = pm.save_daily_snapshot
+save_daily_snapshots = pm.save_daily_snapshots
+get_active_accounts = pm.get_active_accounts
 check_stop_loss_take_profit = pm.check_stop_loss_take_profit
 calculate_portfolio_metrics = pm.calculate_portfolio_metrics
 
+# 지원 투자 전략
+STRATEGIES = ["ai", "sector", "hybrid", "ai-sector", "leader"]
+
 
 def parse_portfolio_recommendations(crew_output: str) -> List[Dict]:
     """
@@ -171,6 +180,9 @@ def calculate_purchase_quantities(account_id: int, recommendations: List[Dict],
 
     purchase_plans = []
 
+    # 추천 종목 현재가 (1회 조회)
+    prices = get_latest_prices([rec['code'] for rec in recommendations])
+
     for rec in recommendations:
         code = rec['code']
         weight = rec['weight']
@@ -178,8 +190,7 @@ def calculate_purchase_quantities(account_id: int, recommendations: List[Dict],
         # 목표 투자 금액
         target_amount = investable_cash * weight
 
-        # 현재가 조회
-        current_price = get_latest_price(code)
+        current_price = prices.get(code)
         if current_price is None:
             print(f"⚠️  {code}: 가격 정보 없음, 건너뜀")
             continue
@@ -233,47 +244,59 @@ def execute_initial_portfolio(account_id: int, recommendations: List[Dict],
     print(f"{'='*60}")
     print(f"총 {len(purchase_plans)}개 종목 매수 예정\n")
 
-    executed_trades = []
-    failed_trades = []
-    total_invested = 0
-
     for plan in purchase_plans:
-        code = plan['code']
-        quantity = plan['quantity']
         price = plan['current_price']
+        print(f"📊 {plan['code']}: {plan['quantity']:,}주 @ {price:,.0f}원 = {plan['quantity']*price:,.0f}원")
 
-        print(f"📊 {code}: {quantity:,}주 @ {price:,.0f}원 = {quantity*price:,.0f}원")
-
-        if dry_run:
-            print(f"   [DRY RUN] 실제 매수 건너뜀\n")
-            continue
-
-        try:
-            result = execute_buy(
-                account_id=account_id,
-                code=code,
-                quantity=quantity,
-                price=price,
-                reason=plan['reason']
-            )
-
-            executed_trades.append({
-                'code': code,
-                'quantity': quantity,
-                'price': result['price'],
-                'amount': result['total_amount']
-            })
-
-            total_invested += result['total_amount']
-            print(f"   ✅ 매수 체결: {result['total_amount']:,.0f}원\n")
+    if dry_run:
+        print(f"   [DRY RUN] 실제 매수 건너뜀\n")
+        return {
+            'executed_trades': [],
+            'failed_trades': [],
+            'total_invested': 0,
+            'success_rate': 0
+        }
 
-        except Exception as e:
-            failed_trades.append({
-                'code': code,
-                'quantity': quantity,
-                'error': str(e)
-            })
-            print(f"   ❌ 매수 실패: {e}\n")
+    # 전체 매수를 한 트랜잭션으로 체결
+    try:
+        result = submit_orders(account_id, [
+            {
+                'action': 'buy',
+                'code': plan['code'],
+                'quantity': plan['quantity'],
+                'price': plan['current_price'],
+                'reason': plan['reason']
+            }
+            for plan in purchase_plans
+        ])
+        executed, rejected = result['executed'], result['rejected']
+    except Exception as e:
+        executed = []
+        rejected = [
+            {'code': plan['code'], 'quantity': plan['quantity'], 'error': str(e)}
+            for plan in purchase_plans
+        ]
+
+    executed_trades = [
+        {
+            'code': trade['code'],
+            'quantity': trade['quantity'],
+            'price': trade['price'],
+            'amount': trade['total_amount']
+        }
+        for trade in executed
+    ]
+    failed_trades = [
+        {'code': order['code'], 'quantity': order['quantity'], 'error': order['error']}
+        for order in rejected
+    ]
+    total_invested = sum(trade['amount'] for trade in executed_trades)
+
+    for trade in executed_trades:
+        print(f"   ✅ {trade['code']} 매수 체결: {trade['amount']:,.0f}원")
+    for order in failed_trades:
+        print(f"   ❌ {order['code']} 매수 실패: {order['error']}")
+    print()
 
     print(f"{'='*60}")
     print(f"매수 완료: {len(executed_trades)}/{len(purchase_plans)}건")
@@ -288,71 +311,20 @@ def execute_initial_portfolio(account_id: int, recommendations: List[Dict],
     }
 
 
-def run_daily_trading_workflow(account_id: int = 1,
-                               market: str = "KOSPI",
-                               limit: int = 20,
-                               top_n: int = 10,
-                               cash_reserve_pct: float = 0.2,
-                               stop_loss_pct: float = -10.0,
-                               take_profit_pct: float = 20.0,
-                               execute_trades: bool = False,
-                               strategy: str = "ai") -> Dict:
+def run_exit_check(account_id: int, stop_loss_pct: float = -10.0,
+                   take_profit_pct: float = 20.0, execute_trades: bool = False) -> Dict:
     """
-    일일 자동 매매 워크플로
-
-    1. 포트폴리오 업데이트 및 손절/익절 체크
-    2. AI 분석 OR 업종별 대장주 OR 주도주 전략 실행
-    3. 매매 의사결정 및 실행
-    4. 일일 스냅샷 저장
+    손절/익절 체크 및 매도 실행 (매도 대상은 한 트랜잭션으로 일괄 체결)
 
     Args:
         account_id: 계좌 ID
-        market: 시장 (KOSPI/KOSDAQ)
-        limit: 분석 종목 수 (AI 전략용)
-        top_n: 선정 종목 수 (AI/주도주 전략용)
-        cash_reserve_pct: 현금 보유 비율
         stop_loss_pct: 손절 기준
         take_profit_pct: 익절 기준
-        execute_trades: 실제 매매 실행 여부 (False면 분석만)
-        strategy: 투자 전략
-                - ai: AI 기반 분석
-                - sector: 업종별 대장주
-                - hybrid: AI 50% + 대장주 50% 혼합
-                - ai-sector: AI 기반 대장주 (거래량 중심)
-                - leader: 팩터 스크리닝 기반 주도주 (리더십 점수 포함)
+        execute_trades: 실제 매도 실행 여부
 
     Returns:
-        Dict: 워크플로 결과
+        Dict: 단계 결과 (status, recommendations 또는 error)
     """
-    print("\n" + "="*80)
-    print(f"📅 일일 자동 매매 워크플로 - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print("="*80)
-
-    workflow_result = {
-        'timestamp': datetime.now().isoformat(),
-        'account_id': account_id,
-        'steps': {}
-    }
-
-    # Step 1: 포트폴리오 업데이트
-    print("\n[Step 1] 포트폴리오 업데이트")
-    print("-"*60)
-    try:
-        update_result = update_portfolio_values(account_id)
-        print(f"✅ {update_result['updated_count']}개 종목 업데이트 완료")
-        print(f"   총 평가액: {update_result['total_value']:,.0f}원")
-        workflow_result['steps']['portfolio_update'] = {
-            'status': 'success',
-            'data': update_result
-        }
-    except Exception as e:
-        print(f"❌ 포트폴리오 업데이트 실패: {e}")
-        workflow_result['steps']['portfolio_update'] = {
-            'status': 'failed',
-            'error': str(e)
-        }
-
-    # Step 2: 손절/익절 체크
     print("\n[Step 2] 손절/익절 체크")
     print("-"*60)
     try:
@@ -368,42 +340,65 @@ def run_daily_trading_workflow(account_id: int = 1,
             # 실제 매도 실행
             if execute_trades:
                 print("\n   매도 실행 중...")
-                for rec in exit_recommendations:
-                    try:
-                        result = execute_sell(
-                            account_id=account_id,
-                            code=rec['code'],
-                            quantity=rec['quantity'],
-                            reason=f"{rec['reason']}: {rec['message']}"
-                        )
-                        print(f"   ✅ {rec['name']} 매도: {result['profit_loss']:+,.0f}원")
-                    except Exception as e:
-                        print(f"   ❌ {rec['name']} 매도 실패: {e}")
+                names = {rec['code']: rec['name'] for rec in exit_recommendations}
+                try:
+                    result = submit_orders(account_id, [
+                        {
+                            'action': 'sell',
+                            'code': rec['code'],
+                            'quantity': rec['quantity'],
+                            'reason': f"{rec['reason']}: {rec['message']}"
+                        }
+                        for rec in exit_recommendations
+                    ])
+                    for trade in result['executed']:
+                        print(f"   ✅ {names[trade['code']]} 매도: {trade['profit_loss']:+,.0f}원")
+                    for order in result['rejected']:
+                        print(f"   ❌ {names.get(order['code'], order['code'])} 매도 실패: {order['error']}")
+                except Exception as e:
+                    print(f"   ❌ 매도 실패: {e}")
             else:
                 print("   [DRY RUN] 실제 매도 건너뜀")
 
-            workflow_result['steps']['exit_check'] = {
+            exit_step = {
                 'status': 'action_needed',
                 'recommendations': exit_recommendations
             }
         else:
             print("✅ 손절/익절 대상 없음")
-            workflow_result['steps']['exit_check'] = {
+            exit_step = {
                 'status': 'success',
                 'recommendations': []
             }
     except Exception as e:
         print(f"❌ 손절/익절 체크 실패: {e}")
-        workflow_result['steps']['exit_check'] = {
+        exit_step = {
             'status': 'failed',
             'error': str(e)
         }
 
-    # Step 3: 투자 전략 선택 및 실행
+    return exit_step
+
+
+def get_strategy_recommendations(strategy: str = "ai", market: str = "KOSPI",
+                                 limit: int = 20, top_n: int = 10) -> Tuple[List[Dict], Dict]:
+    """
+    전략별 추천 종목 산출 (제외 종목 필터링 포함, 계좌와 무관)
+
+    Args:
+        strategy: 투자 전략 (STRATEGIES 중 하나)
+        market: 시장 (KOSPI/KOSDAQ)
+        limit: 분석 종목 수 (AI 전략용)
+        top_n: 선정 종목 수 (AI/주도주 전략용)
+
+    Returns:
+        Tuple[List[Dict], Dict]: (추천 종목 리스트, 단계 결과)
+    """
     print(f"\n[Step 3] 투자 분석 (전략: {strategy.upper()})")
     print("-"*60)
 
     recommendations = []
+    strategy_step = {'status': 'skipped'}
 
     # 전략에 따라 분기
     if strategy == "sector":
@@ -415,14 +410,14 @@ def run_daily_trading_workflow(account_id: int = 1,
                 num_sectors=5,
                 leaders_per_sector=2
             )
-            workflow_result['steps']['strategy'] = {
+            strategy_step = {
                 'status': 'success',
                 'type': 'sector_leader',
                 'recommendations': recommendations
             }
         except Exception as e:
             print(f"❌ 업종별 대장주 전략 실패: {e}")
-            workflow_result['steps']['strategy'] = {
+            strategy_step = {
                 'status': 'failed',
                 'error': str(e)
             }
@@ -438,7 +433,7 @@ def run_daily_trading_workflow(account_id: int = 1,
                 leaders_per_sector=1,
                 min_volume_amount=50_000_000_000  # 500억원
             )
-            workflow_result['steps']['strategy'] = {
+            strategy_step = {
                 'status': 'success',
                 'type': 'ai_sector_leader',
                 'recommendations': recommendations
@@ -447,7 +442,7 @@ def run_daily_trading_workflow(account_id: int = 1,
             print(f"❌ AI 기반 대장주 전략 실패: {e}")
             import traceback
             traceback.print_exc()
-            workflow_result['steps']['strategy'] = {
+            strategy_step = {
                 'status': 'failed',
                 'error': str(e)
             }
@@ -462,7 +457,7 @@ def run_daily_trading_workflow(account_id: int = 1,
                 top_n=top_n,
                 weights=None  # 기본 가중치 사용 (value/growth/profitability 각 20%, momentum 15%, stability 10%, leadership 15%)
             )
-            workflow_result['steps']['strategy'] = {
+            strategy_step = {
                 'status': 'success',
                 'type': 'leader',
                 'recommendations': recommendations
@@ -471,7 +466,7 @@ def run_daily_trading_workflow(account_id: int = 1,
             print(f"❌ 주도주 전략 실패: {e}")
             import traceback
             traceback.print_exc()
-            workflow_result['steps']['strategy'] = {
+            strategy_step = {
                 'status': 'failed',
                 'error': str(e)
             }
@@ -505,7 +500,7 @@ def run_daily_trading_workflow(account_id: int = 1,
 
             recommendations = ai_recommendations + sector_recommendations
 
-            workflow_result['steps']['strategy'] = {
+            strategy_step = {
                 'status': 'success',
                 'type': 'hybrid',
                 'ai_count': len(ai_recommendations),
@@ -515,7 +510,7 @@ def run_daily_trading_workflow(account_id: int = 1,
 
         except Exception as e:
             print(f"❌ 하이브리드 전략 실패: {e}")
-            workflow_result['steps']['strategy'] = {
+            strategy_step = {
                 'status': 'failed',
                 'error': str(e)
             }
@@ -535,7 +530,7 @@ def run_daily_trading_workflow(account_id: int = 1,
             # 결과 파싱
             recommendations = parse_portfolio_recommendations(str(crew_result))
 
-            workflow_result['steps']['strategy'] = {
+            strategy_step = {
                 'status': 'success',
                 'type': 'ai',
                 'recommendations': recommendations
@@ -543,7 +538,7 @@ def run_daily_trading_workflow(account_id: int = 1,
 
         except Exception as e:
             print(f"❌ AI 분석 실패: {e}")
-            workflow_result['steps']['strategy'] = {
+            strategy_step = {
                 'status': 'failed',
                 'error': str(e)
             }
@@ -572,7 +567,23 @@ def run_daily_trading_workflow(account_id: int = 1,
     else:
         print("⚠️  추천 종목이 없습니다")
 
-    # Step 4: 매수 실행 (새 추천이 있는 경우)
+    return recommendations, strategy_step
+
+
+def run_buy_step(account_id: int, recommendations: List[Dict],
+                 cash_reserve_pct: float = 0.2, execute_trades: bool = False) -> Optional[Dict]:
+    """
+    추천 종목 매수 실행
+
+    Args:
+        account_id: 계좌 ID
+        recommendations: 추천 종목 리스트
+        cash_reserve_pct: 현금 보유 비율
+        execute_trades: 실제 매수 실행 여부
+
+    Returns:
+        Optional[Dict]: 단계 결과 (추천 종목 없으면 None)
+    """
     if recommendations and execute_trades:
         print("\n[Step 4] 매수 실행")
         print("-"*60)
@@ -585,14 +596,13 @@ def run_daily_trading_workflow(account_id: int = 1,
                 dry_run=False
             )
 
-            workflow_result['steps']['buy_execution'] = {
+            return {
                 'status': 'success',
                 'data': trade_result
             }
-
         except Exception as e:
             print(f"❌ 매수 실행 실패: {e}")
-            workflow_result['steps']['buy_execution'] = {
+            return {
                 'status': 'failed',
                 'error': str(e)
             }
@@ -600,11 +610,93 @@ def run_daily_trading_workflow(account_id: int = 1,
         print("\n[Step 4] 매수 실행")
         print("-"*60)
         print("ℹ️  [DRY RUN] 실제 매수 건너뜀")
-        workflow_result['steps']['buy_execution'] = {
+        return {
             'status': 'skipped',
             'reason': 'dry_run'
         }
 
+    return None
+
+
+def run_daily_trading_workflow(account_id: int = 1,
+                               market: str = "KOSPI",
+                               limit: int = 20,
+                               top_n: int = 10,
+                               cash_reserve_pct: float = 0.2,
+                               stop_loss_pct: float = -10.0,
+                               take_profit_pct: float = 20.0,
+                               execute_trades: bool = False,
+                               strategy: str = "ai") -> Dict:
+    """
+    일일 자동 매매 워크플로
+
+    1. 포트폴리오 업데이트 및 손절/익절 체크
+    2. AI 분석 OR 업종별 대장주 OR 주도주 전략 실행
+    3. 매매 의사결정 및 실행
+    4. 일일 스냅샷 저장
+
+    Args:
+        account_id: 계좌 ID
+        market: 시장 (KOSPI/KOSDAQ)
+        limit: 분석 종목 수 (AI 전략용)
+        top_n: 선정 종목 수 (AI/주도주 전략용)
+        cash_reserve_pct: 현금 보유 비율
+        stop_loss_pct: 손절 기준
+        take_profit_pct: 익절 기준
+        execute_trades: 실제 매매 실행 여부 (False면 분석만)
+        strategy: 투자 전략
+                - ai: AI 기반 분석
+                - sector: 업종별 대장주
+                - hybrid: AI 50% + 대장주 50% 혼합
+                - ai-sector: AI 기반 대장주 (거래량 중심)
+                - leader: 팩터 스크리닝 기반 주도주 (리더십 점수 포함)
+
+    Returns:
+        Dict: 워크플로 결과
+    """
+    print("\n" + "="*80)
+    print(f"📅 일일 자동 매매 워크플로 - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print("="*80)
+
+    workflow_result = {
+        'timestamp': datetime.now().isoformat(),
+        'account_id': account_id,
+        'steps': {}
+    }
+
+    # Step 1: 포트폴리오 업데이트
+    print("\n[Step 1] 포트폴리오 업데이트")
+    print("-"*60)
+    try:
+        update_result = update_portfolio_values(account_id)
+        print(f"✅ {update_result['updated_count']}개 종목 업데이트 완료")
+        print(f"   총 평가액: {update_result['total_value']:,.0f}원")
+        workflow_result['steps']['portfolio_update'] = {
+            'status': 'success',
+            'data': update_result
+        }
+    except Exception as e:
+        print(f"❌ 포트폴리오 업데이트 실패: {e}")
+        workflow_result['steps']['portfolio_update'] = {
+            'status': 'failed',
+            'error': str(e)
+        }
+
+    # Step 2: 손절/익절 체크
+    workflow_result['steps']['exit_check'] = run_exit_check(
+        account_id, stop_loss_pct, take_profit_pct, execute_trades
+    )
+
+    # Step 3: 투자 전략 선택 및 실행
+    recommendations, workflow_result['steps']['strategy'] = get_strategy_recommendations(
+        strategy, market, limit, top_n
+    )
+
+    # Step 4: 매수 실행 (새 추천이 있는 경우)
+    buy_step = run_buy_step(account_id, recommendations, cash_reserve_pct, execute_trades)
+    if buy_step is not None:
+        workflow_result['steps']['buy_execution'] = buy_step
+
     # Step 5: 일일 스냅샷 저장
     print("\n[Step 5] 일일 스냅샷 저장")
     print("-"*60)
@@ -645,6 +737,125 @@ def run_daily_trading_workflow(account_id: int = 1,
     return workflow_result
 
 
+def run_multi_account_workflow(accounts: Optional[List[Dict]] = None,
+                               market: str = "KOSPI",
+                               limit: int = 20,
+                               top_n: int = 10,
+                               cash_reserve_pct: float = 0.2,
+                               stop_loss_pct: float = -10.0,
+                               take_profit_pct: float = 20.0,
+                               execute_trades: bool = False,
+                               strategy: str = "ai",
+                               max_workers: int = 8) -> Dict:
+    """
+    여러 계좌(전략 변형)의 일일 워크플로 동시 실행
+
+    계좌 공통 작업은 한 번만 수행하고 계좌별 의사결정만 병렬로 실행합니다.
+    1. 전체 계좌 포지션 재평가 (집합 기반 UPDATE 1회)
+    2. 서로 다른 전략별 추천 종목 산출 (전략당 1회, 같은 전략 계좌는 결과 공유)
+    3. 계좌별 손절/익절 체크 및 매수 (ThreadPoolExecutor, 계좌 행 잠금으로 주문 직렬화)
+    4. 전체 계좌 일일 스냅샷 일괄 저장 (INSERT ... SELECT 1회)
+
+    Args:
+        accounts: 계좌 설정 리스트 (None이면 운용 중인 전체 계좌)
+                  - account_id: 계좌 ID (필수)
+                  - strategy, cash_reserve_pct, stop_loss_pct, take_profit_pct: 계좌별 설정 (없으면 공통 인자)
+        market, limit, top_n: 추천 종목 산출 설정
+        cash_reserve_pct, stop_loss_pct, take_profit_pct: 기본 계좌 설정
+        execute_trades: 실제 매매 실행 여부
+        strategy: 기본 전략 (계좌 strategy가 STRATEGIES에 없을 때 사용)
+        max_workers: 계좌 동시 실행 스레드 수
+
+    Returns:
+        Dict: {timestamp, accounts: {계좌 ID: {strategy, steps}}, strategies, snapshots, elapsed}
+    """
+    started = time.perf_counter()
+    if accounts is None:
+        accounts = get_active_accounts()
+
+    configs = []
+    for account in accounts:
+        account_strategy = account.get('strategy')
+        configs.append({
+            'account_id': account['account_id'],
+            'strategy': account_strategy if account_strategy in STRATEGIES else strategy,
+            'cash_reserve_pct': account.get('cash_reserve_pct', cash_reserve_pct),
+            'stop_loss_pct': account.get('stop_loss_pct', stop_loss_pct),
+            'take_profit_pct': account.get('take_profit_pct', take_profit_pct),
+        })
+
+    print("\n" + "="*80)
+    print(f"📅 다계좌 일일 워크플로 - {len(configs)}개 계좌 ({datetime.now().strftime('%Y-%m-%d %H:%M:%S')})")
+    print("="*80)
+
+    result = {
+        'timestamp': datetime.now().isoformat(),
+        'accounts': {},
+        'strategies': {},
+        'snapshots': {}
+    }
+    if not configs:
+        print("⚠️  운용 중인 계좌가 없습니다")
+        result['elapsed'] = time.perf_counter() - started
+        return result
+
+    # 1. 전체 계좌 재평가 (1회)
+    try:
+        update_result = update_portfolio_values(None)
+        print(f"✅ 전체 계좌 {update_result['updated_count']}개 포지션 재평가")
+    except Exception as e:
+        print(f"❌ 포트폴리오 업데이트 실패: {e}")
+
+    # 2. 전략별 추천 종목 (전략당 1회)
+    recommendations_by_strategy = {}
+    for name in dict.fromkeys(config['strategy'] for config in configs):
+        recommendations, step = get_strategy_recommendations(name, market, limit, top_n)
+        recommendations_by_strategy[name] = recommendations
+        result['strategies'][name] = step
+
+    # 3. 계좌별 의사결정 (동시 실행)
+    def run_account(config: Dict) -> Dict:
+        account_id = config['account_id']
+        steps = {
+            'exit_check': run_exit_check(
+                account_id, config['stop_loss_pct'], config['take_profit_pct'], execute_trades
+            )
+        }
+        # 계좌마다 추천 리스트 사본 사용 (다른 계좌 실행과 공유하지 않음)
+        recommendations = [dict(rec) for rec in recommendations_by_strategy[config['strategy']]]
+        buy_step = run_buy_step(account_id, recommendations, config['cash_reserve_pct'], execute_trades)
+        if buy_step is not None:
+            steps['buy_execution'] = buy_step
+        return {'strategy': config['strategy'], 'steps': steps}
+
+    workers = max(1, min(max_workers, len(configs)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {config['account_id']: executor.submit(run_account, config) for config in configs}
+        for account_id, future in futures.items():
+            try:
+                result['accounts'][account_id] = future.result()
+            except Exception as e:
+                print(f"❌ 계좌 {account_id} 워크플로 실패: {e}")
+                result['accounts'][account_id] = {'status': 'failed', 'error': str(e)}
+
+    # 4. 전체 계좌 스냅샷 (1회)
+    try:
+        result['snapshots'] = save_daily_snapshots([config['account_id'] for config in configs])
+    except Exception as e:
+        print(f"❌ 스냅샷 저장 실패: {e}")
+
+    result['elapsed'] = time.perf_counter() - started
+
+    print("\n" + "="*80)
+    print(f"✅ 다계좌 워크플로 완료: {len(configs)}개 계좌, {result['elapsed']:.1f}초")
+    print("="*80)
+    for account_id, snapshot in sorted(result['snapshots'].items()):
+        print(f"   계좌 {account_id}: 총 자산 {snapshot['total_value']:,.0f}원 ({snapshot['return_pct']:+.2f}%)")
+    print()
+
+    return result
+
+
 if __name__ == "__main__":
     """메인 실행"""
     import argparse
@@ -657,25 +868,51 @@ if __name__ == "__main__":
     parser.add_argument("--cash-reserve", type=float, default=0.2, help="현금 보유 비율 (0-1)")
     parser.add_argument("--stop-loss", type=float, default=-10.0, help="손절 기준 (%)")
     parser.add_argument("--take-profit", type=float, default=20.0, help="익절 기준 (%)")
-    parser.add_argument("--strategy", choices=["ai", "sector", "hybrid", "ai-sector", "leader"], default="ai",
+    parser.add_argument("--strategy", choices=STRATEGIES, default="ai",
                        help="투자 전략 (ai=AI분석, sector=업종별대장주, hybrid=혼합, ai-sector=AI기반대장주, leader=주도주)")
     parser.add_argument("--execute", action="store_true", help="실제 매매 실행 (미지정시 분석만)")
     parser.add_argument("--save-log", action="store_true", help="결과 로그 저장")
+    parser.add_argument("--account-ids", help="여러 계좌 동시 실행 (쉼표 구분, 예: 1,2,3 - 계좌별 strategy 사용)")
+    parser.add_argument("--all-accounts", action="store_true",
+                       help="운용 중인 전체 계좌 동시 실행 (계좌별 strategy 사용)")
+    parser.add_argument("--max-workers", type=int, default=8, help="다계좌 실행 시 동시 스레드 수")
 
     args = parser.parse_args()
 
     # 워크플로 실행
-    result = run_daily_trading_workflow(
-        account_id=args.account_id,
-        market=args.market,
-        limit=args.limit,
-        top_n=args.top_n,
-        cash_reserve_pct=args.cash_reserve,
-        stop_loss_pct=args.stop_loss,
-        take_profit_pct=args.take_profit,
-        execute_trades=args.execute,
-        strategy=args.strategy
-    )
+    if args.account_ids or args.all_accounts:
+        accounts = None
+        if args.account_ids:
+            # --all-accounts와 같은 계좌 설정(계좌별 strategy) 사용
+            requested = [int(a) for a in args.account_ids.split(',') if a.strip()]
+            accounts = [account for account in get_active_accounts() if account['account_id'] in requested]
+            missing = sorted(set(requested) - {account['account_id'] for account in accounts})
+            if missing:
+                print(f"⚠️  운용 중인 계좌가 아니어서 제외: {missing}")
+        result = run_multi_account_workflow(
+            accounts=accounts,
+            market=args.market,
+            limit=args.limit,
+            top_n=args.top_n,
+            cash_reserve_pct=args.cash_reserve,
+            stop_loss_pct=args.stop_loss,
+            take_profit_pct=args.take_profit,
+            execute_trades=args.execute,
+            strategy=args.strategy,
+            max_workers=args.max_workers
+        )
+    else:
+        result = run_daily_trading_workflow(
+            account_id=args.account_id,
+            market=args.market,
+            limit=args.limit,
+            top_n=args.top_n,
+            cash_reserve_pct=args.cash_reserve,
+            stop_loss_pct=args.stop_loss,
+            take_profit_pct=args.take_profit,
+            execute_trades=args.execute,
+            strategy=args.strategy
+        )
 
     # 로그 저장
     if args.save_log:
@@ -81,6 +81,29 @@ else
     EXIT_CODE=1
 fi
 
+# 가격 저장소 동기화 / 팩터 점수 저장 / 리스크 지표 갱신 (새 거래일 기준 - 장중 조회는 저장된 결과 사용)
+if [ ${EXIT_CODE} -eq 0 ]; then
+    # 로컬 Arrow 가격 저장소 (연도별 지문 비교 - 과거 연도 보정/백필 포함)
+    if (cd "${PROJECT_ROOT}" && python -m core.utils.price_store) >> "${LOG_FILE}" 2>&1; then
+        log "✓ 가격 저장소 동기화 완료"
+    else
+        log "⚠️  가격 저장소 동기화 실패 (분석은 조회 시 연도별 동기화로 동작)"
+    fi
+
+    if (cd "${PROJECT_ROOT}" && python -m core.modules.factor_store) >> "${LOG_FILE}" 2>&1; then
+        log "✓ 팩터 점수 저장 완료"
+    else
+        log "⚠️  팩터 점수 저장 실패 (스크리닝은 직접 계산으로 동작)"
+    fi
+
+    # 리스크 지표 테이블 갱신 (조회 시 종목별 계산 대신 사용)
+    if (cd "${PROJECT_ROOT}" && python -m core.modules.risk_analysis --refresh) >> "${LOG_FILE}" 2>&1; then
+        log "✓ 리스크 지표 갱신 완료"
+    else
+        log "⚠️  리스크 지표 갱신 실패 (리스크 분석은 직접 계산으로 동작)"
+    fi
+fi
+
 # 4. 결과 확인
 log ""
 log "4. 데이터베이스 확인"
@@ -0,0 +1,174 @@
+"""
+장중 손절/익절 모니터 테스트
+
+DB 없이 ExitMonitor에 포지션을 직접 등록하고, 무작위 가격 틱에서
+발동 결과가 매 틱 전체 포지션을 다시 훑는 방식과 같은지 검증합니다.
+"""
+
+import sys
+import time
+import random
+from decimal import Decimal
+from pathlib import Path
+
+# 프로젝트 루트 경로 추가
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+import paper_trading.exit_monitor as monitor_module
+from paper_trading.exit_monitor import ExitMonitor
+
+
+def rescan(positions, code, price, stop_loss_pct=-10.0, take_profit_pct=20.0):
+    """기준 구현: 종목의 모든 포지션을 매번 확인"""
+    fired = set()
+    for (account_id, pos_code), avg_price in list(positions.items()):
+        if pos_code != code:
+            continue
+        if price <= avg_price * (1 + stop_loss_pct / 100):
+            fired.add((account_id, code, 'stop_loss'))
+        elif price >= avg_price * (1 + take_profit_pct / 100):
+            fired.add((account_id, code, 'take_profit'))
+        else:
+            continue
+        del positions[(account_id, pos_code)]
+    return fired
+
+
+def test_matches_rescan():
+    """무작위 틱/포지션 변경에서 전체 재확인과 동일"""
+    print("\n[1] 힙 색인 vs 전체 재확인")
+    rng = random.Random(0)
+    codes = [f"{i:06d}" for i in range(20)]
+    monitor = ExitMonitor()
+    positions = {}
+
+    for account_id in range(1, 51):
+        for code in rng.sample(codes, 8):
+            avg_price = rng.uniform(5000, 50000)
+            monitor.set_position(account_id, code, rng.randint(1, 100), avg_price)
+            positions[(account_id, code)] = avg_price
+
+    prices = {code: 27500.0 for code in codes}
+    fired_total = 0
+    for tick in range(5000):
+        code = rng.choice(codes)
+        prices[code] *= rng.uniform(0.97, 1.03)
+        fired = monitor.on_price(code, prices[code])
+        assert {(e['account_id'], e['code'], e['reason']) for e in fired} == rescan(positions, code, prices[code])
+        fired_total += len(fired)
+
+        # 추가 매수/신규 진입으로 평균가 변경 (이전 트리거 무효화)
+        if tick % 10 == 0:
+            account_id = rng.randint(1, 50)
+            avg_price = prices[code] * rng.uniform(0.9, 1.1)
+            monitor.set_position(account_id, code, 10, avg_price, name="종목")
+            positions[(account_id, code)] = avg_price
+        if tick % 37 == 0 and positions:
+            key = rng.choice(sorted(positions))
+            monitor.remove_position(*key)
+            del positions[key]
+
+    assert fired_total > 100 and len(monitor) == len(positions)
+    print(f"  ✓ 5,000틱, 발동 {fired_total}건 일치")
+
+
+def test_exit_fields_and_speed():
+    """발동 결과 형식, 계좌별 기준, 틱 처리 시간"""
+    print("\n[2] 결과 형식 / 실행 시간")
+    monitor = ExitMonitor(thresholds={2: (-5.0, 10.0)})
+    monitor.set_position(1, "005930", 10, 70000, name="삼성전자")
+    monitor.set_position(2, "005930", 5, 70000, name="삼성전자")
+
+    assert monitor.on_prices({"005930": 67000}) == []
+    exits = monitor.process({"005930": {'close': 66000}})['exits']
+    assert [(e['account_id'], e['reason'], e['quantity']) for e in exits] == [(2, 'stop_loss', 5)]
+    assert round(exits[0]['profit_loss_pct'], 2) == -5.71 and "손절" in exits[0]['message']
+    assert monitor.on_price("005930", 66000) == [] and len(monitor) == 1
+    assert monitor.on_price("005930", 85000)[0]['reason'] == 'take_profit' and len(monitor) == 0
+
+    # 종목당 1만 포지션 - 트리거 밖의 틱은 포지션 수와 무관하게 처리
+    monitor = ExitMonitor()
+    for account_id in range(10000):
+        monitor.set_position(account_id, "000660", 1, 100000 + account_id)
+    started = time.perf_counter()
+    for i in range(100000):
+        monitor.on_price("000660", 100000 + i % 1000)
+    elapsed = time.perf_counter() - started
+    assert len(monitor) == 10000 and elapsed < 2.0, f"{elapsed:.2f}s"
+    print(f"  ✓ 10만 틱 {elapsed * 1000:.0f}ms")
+
+
+class FakeConnection:
+    """sync_positions 조회 결과만 돌려주는 연결 대역"""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def cursor(self):
+        return self
+
+    def execute(self, query, params=None):
+        pass
+
+    def fetchall(self):
+        return list(self.rows)
+
+    def close(self):
+        pass
+
+
+def test_alert_only_not_repeated():
+    """알림만 보낸 트리거는 포지션이 바뀔 때까지 sync_positions 후에도 재발동하지 않음"""
+    print("\n[3] 알림 중복 방지")
+    rows = [(1, "005930", "삼성전자", 10, Decimal("70000")), (2, "005930", "삼성전자", 5, Decimal("50000"))]
+    original = monitor_module.get_db_connection
+    monitor_module.get_db_connection = lambda: FakeConnection(rows)
+    try:
+        monitor = ExitMonitor()
+        assert monitor.sync_positions() == 2
+
+        exits = monitor.process({"005930": 60000})['exits']
+        assert [(e['account_id'], e['reason']) for e in exits] == [(1, 'stop_loss'), (2, 'take_profit')]
+        for _ in range(3):
+            assert monitor.sync_positions() == 0
+            assert monitor.process({"005930": 60000})['exits'] == []
+
+        # 추가 매수로 평균가 변경 → 다시 추적
+        rows[0] = (1, "005930", "삼성전자", 20, Decimal("65000"))
+        assert monitor.sync_positions() == 1
+        assert [e['account_id'] for e in monitor.process({"005930": 58000})['exits']] == [1]
+
+        # 매도로 포지션이 사라졌다가 같은 조건으로 재진입 → 새 포지션으로 추적
+        del rows[1]
+        monitor.sync_positions()
+        rows.append((2, "005930", "삼성전자", 5, Decimal("50000")))
+        assert monitor.sync_positions() == 1
+        assert [e['account_id'] for e in monitor.process({"005930": 60000})['exits']] == [2]
+    finally:
+        monitor_module.get_db_connection = original
+    print("  ✓ 알림 1회, 포지션 변경 시 재추적")
+
+
+def main():
+    tests = [
+        ("힙 색인 vs 전체 재확인", test_matches_rescan),
+        ("결과 형식 / 실행 시간", test_exit_fields_and_speed),
+        ("알림 중복 방지", test_alert_only_not_repeated),
+    ]
+
+    failed = 0
+    for name, test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {name} 실패: {e}")
+
+    print("\n" + "=" * 60)
+    print(f"전체: {len(tests) - failed}/{len(tests)} 통과")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
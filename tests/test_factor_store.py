@@ -0,0 +1,154 @@
+"""
+팩터 점수 저장소 테스트
+
+DB 없이 합성 재무/가격 데이터와 임시 디렉터리로 날짜 단위 저장/교체, 이력 조회,
+저장된 스냅샷 재채점이 직접 계산과 같은지 검증합니다.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# 프로젝트 루트 경로 추가
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from core.modules.factor_scoring import FactorScorer, price_snapshot_factors, score_snapshot
+import core.modules.factor_store as factor_store_module
+from core.modules.factor_store import FactorStore, compute_factor_scores, current_factor_snapshot
+from core.modules.financials_index import FinancialsIndex
+
+
+def make_data(n_codes=300, seed=0):
+    """합성 분기 재무 (2022~2024) + 종가 행렬 (2023-06 ~ 2024-12)"""
+    rng = np.random.default_rng(seed)
+    codes = [f"{i:06d}" for i in range(n_codes)]
+    keys = pd.MultiIndex.from_product([codes, [2022, 2023, 2024], range(1, 5)], names=['code', 'year', 'quarter'])
+    financials = keys.to_frame(index=False)
+    n = len(financials)
+    financials['name'] = financials['code']
+    financials['sector'] = "S" + (financials['code'].astype(int) % 7).astype(str)
+    financials['revenue'] = rng.uniform(500, 1500, n)
+    financials['operating_profit'] = financials['revenue'] * rng.uniform(-0.05, 0.3, n)
+    financials['net_profit'] = financials['operating_profit'] * 0.8
+    financials['total_equity'] = rng.uniform(500, 2000, n)
+    financials['total_debt'] = financials['total_equity'] * rng.uniform(0.1, 3.0, n)
+    financials['total_assets'] = financials['total_equity'] + financials['total_debt']
+
+    dates = pd.bdate_range("2023-06-01", "2024-12-30")
+    close = pd.DataFrame(
+        1000 * np.exp(np.cumsum(rng.normal(0, 0.02, (len(dates), n_codes)), axis=0)),
+        index=dates, columns=codes
+    )
+    return FinancialsIndex(financials), close
+
+
+def test_write_and_history():
+    """날짜 단위 upsert, 연도 경계, 이력 조회"""
+    print("\n[1] 저장 / 이력 조회")
+    financials, close = make_data()
+    days = close.index[-30:]
+
+    with tempfile.TemporaryDirectory() as root:
+        store = FactorStore(root, enabled=True)
+        scores = compute_factor_scores(financials, close, days[:-1])
+        store.write(scores, {'price_version': ["2024-12-27", 300]})
+        assert len(store.dates()) == 29 and store.info(days[0])['rows'] == 300
+
+        # 같은 날짜 다시 쓰면 교체
+        store.write(compute_factor_scores(financials, close, days[-2:]))
+        reopened = FactorStore(root, enabled=True)
+        assert len(reopened.dates()) == 30
+        assert (reopened.load().groupby('date').size() == 300).all()
+
+        history = reopened.history('momentum_score', start="2024-12-01")
+        assert history.shape == (len(days[days >= "2024-12-01"]), 300)
+        expected = scores.loc[scores['date'] == days[-5]].set_index('code')['momentum_score']
+        np.testing.assert_allclose(history.loc[days[-5]], expected)
+
+        # 연도 경계 (2024 → 2025 파일 없음)
+        assert len(reopened.load("2024-12-20", "2025-01-10", codes=["000001"])) == 7
+    print(f"  ✓ {len(days)}일 x 300종목")
+
+
+def test_snapshot_rescoring():
+    """저장된 스냅샷 재채점 = 직접 계산 (필터에 따른 단면 정규화 포함)"""
+    print("\n[2] 스냅샷 재채점")
+    financials, close = make_data()
+    date = close.index[-1]
+    scorer = FactorScorer()
+
+    with tempfile.TemporaryDirectory() as root:
+        store = FactorStore(root, enabled=True)
+        store.write(compute_factor_scores(financials, close, [date]))
+        snapshot = store.snapshot(date)
+        assert store.snapshot(date) is snapshot
+
+        from_store = score_snapshot(snapshot, None, scorer, min_roe=5, max_debt_ratio=150, leadership=False)
+
+    factors = price_snapshot_factors(
+        close.loc[date - pd.Timedelta(days=200):], volatility_start=date - pd.Timedelta(days=60)
+    )
+    direct = score_snapshot(financials.asof(date), factors, scorer, min_roe=5, max_debt_ratio=150, leadership=False)
+
+    left = scorer.rank_stocks(from_store, 20)
+    right = scorer.rank_stocks(direct, 20)
+    assert list(left['code']) == list(right['code'])
+    np.testing.assert_allclose(left['composite_score'], right['composite_score'])
+    print(f"  ✓ 상위 20개 일치 (1위 {left['code'].iloc[0]})")
+
+
+def test_current_snapshot_keyed_on_complete_day():
+    """최신 스냅샷은 마지막 완성 거래일 버전이 같을 때만 재사용"""
+    print("\n[3] 완성 거래일 기준 스냅샷")
+    financials, close = make_data(n_codes=50)
+    day = close.index[-2]
+    versions = {'price_date': day.date(), 'price_rows': 50}
+
+    original = (factor_store_module.get_factor_store, factor_store_module.get_price_version,
+                factor_store_module.get_financials_version)
+    with tempfile.TemporaryDirectory() as root:
+        store = FactorStore(root, enabled=True)
+        factor_store_module.get_factor_store = lambda: store
+        factor_store_module.get_price_version = lambda: (versions['price_date'], versions['price_rows'])
+        factor_store_module.get_financials_version = lambda: (20244, 600)
+        try:
+            store.write(compute_factor_scores(financials, close, [day]), factor_store_module.current_versions())
+            snapshot = current_factor_snapshot()
+            assert snapshot is not None and len(snapshot) == 50
+            assert current_factor_snapshot() is snapshot
+
+            # 새 완성 거래일 적재 → 저장된 스냅샷 없음
+            versions['price_date'] = close.index[-1].date()
+            assert current_factor_snapshot() is None
+        finally:
+            (factor_store_module.get_factor_store, factor_store_module.get_price_version,
+             factor_store_module.get_financials_version) = original
+    print("  ✓ 같은 버전 재사용, 새 거래일은 다시 계산")
+
+
+def main():
+    tests = [
+        ("저장 / 이력 조회", test_write_and_history),
+        ("스냅샷 재채점", test_snapshot_rescoring),
+        ("완성 거래일 기준 스냅샷", test_current_snapshot_keyed_on_complete_day),
+    ]
+
+    failed = 0
+    for name, test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {name} 실패: {e}")
+
+    print("\n" + "=" * 60)
+    print(f"전체: {len(tests) - failed}/{len(tests)} 통과")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+"""
+시점 기준 재무 인덱스 테스트
+
+DB 없이 합성 분기 재무 데이터로 as-of 조회가 merge_asof와 같은지, 성장률 사전 계산을 검증합니다.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# 프로젝트 루트 경로 추가
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from core.modules.financials_index import FinancialsIndex
+
+
+def make_financials(n_codes=2000, seed=0):
+    """종목별 상장 연도가 다른 분기 재무 데이터 (2018~2024)"""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for i in range(n_codes):
+        first_year = 2018 + i % 5
+        for year in range(first_year, 2025):
+            for quarter in range(1, 5):
+                rows.append((f"{i:06d}", year, quarter))
+    df = pd.DataFrame(rows, columns=['code', 'year', 'quarter'])
+    n = len(df)
+    df['revenue'] = rng.uniform(500, 1500, n)
+    df['operating_profit'] = df['revenue'] * 0.1
+    df['net_profit'] = rng.uniform(-50, 150, n)
+    df['total_equity'] = rng.uniform(500, 2000, n)
+    df['total_debt'] = df['total_equity'] * 0.5
+    df['total_assets'] = df['total_equity'] + df['total_debt']
+    # DB 조회 순서와 무관해야 함
+    return df.sample(frac=1.0, random_state=seed).reset_index(drop=True)
+
+
+def test_asof_matches_merge_asof():
+    """날짜 x 종목 격자 조회 = merge_asof(backward)"""
+    print("\n[1] as-of 조회")
+    index = FinancialsIndex(make_financials())
+    dates = pd.bdate_range("2019-01-01", "2024-12-31", freq="5B")
+
+    started = time.perf_counter()
+    result = index.asof_many(dates)
+    elapsed = time.perf_counter() - started
+
+    grid = pd.DataFrame({
+        'asof_date': np.repeat(dates.values, len(index.codes)),
+        'code': np.tile(index.codes, len(dates)),
+    })
+    expected = pd.merge_asof(
+        grid, index.frame.sort_values('available_date'),
+        left_on='asof_date', right_on='available_date', by='code', direction='backward'
+    ).dropna(subset=['available_date']).reset_index(drop=True)
+
+    pd.testing.assert_frame_equal(result[expected.columns], expected, check_dtype=False)
+    assert (result['available_date'] <= result['asof_date']).all()
+
+    # 4분기 보고서는 분기 종료 90일 후(2024년은 3월 30일)부터 사용 가능
+    snapshot = index.asof("2024-03-29", codes=["000000"]).iloc[0]
+    assert (snapshot['year'], snapshot['quarter']) == (2023, 3)
+    snapshot = index.asof(pd.Timestamp("2024-03-30 15:30"), codes=["000000"]).iloc[0]
+    assert (snapshot['year'], snapshot['quarter']) == (2023, 4)
+    print(f"  ✓ {len(dates)}일 x {len(index.codes)}종목 {elapsed * 1000:.0f}ms")
+
+
+def test_precomputed_growth():
+    """YoY/QoQ 성장률, 최신 분기, 종목 선택"""
+    print("\n[2] 성장률 / 최신 분기")
+    raw = make_financials(n_codes=20)
+    index = FinancialsIndex(raw)
+
+    frame = index.frame.set_index(['code', 'year', 'quarter'])
+    base = raw.set_index(['code', 'year', 'quarter'])
+    now, prev_q, prev_y = ("000003", 2022, 1), ("000003", 2021, 4), ("000003", 2021, 1)
+    assert np.isclose(frame.loc[now, 'revenue_growth'], (base.loc[now, 'revenue'] / base.loc[prev_y, 'revenue'] - 1) * 100)
+    assert np.isclose(frame.loc[now, 'revenue_qoq_growth'], (base.loc[now, 'revenue'] / base.loc[prev_q, 'revenue'] - 1) * 100)
+
+    latest = index.latest()
+    assert latest['code'].is_unique and len(latest) == 20
+    assert ((latest['year'] == 2024) & (latest['quarter'] == 4)).all()
+
+    subset = index.select(["000001", "000002"])
+    pd.testing.assert_frame_equal(
+        subset.asof_many(["2022-06-30"]),
+        index.asof_many(["2022-06-30"], codes=["000001", "000002"])
+    )
+    print("  ✓ 성장률 사전 계산")
+
+
+def main():
+    tests = [
+        ("as-of 조회", test_asof_matches_merge_asof),
+        ("성장률 / 최신 분기", test_precomputed_growth),
+    ]
+
+    failed = 0
+    for name, test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {name} 실패: {e}")
+
+    print("\n" + "=" * 60)
+    print(f"전체: {len(tests) - failed}/{len(tests)} 통과")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
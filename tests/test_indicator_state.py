@@ -0,0 +1,158 @@
+"""
+증분 기술적 지표 상태 테스트
+
+IndicatorSet을 봉 하나씩 갱신한 값이 배치 계산(calculate_indicator_panel)과
+같은지, 직렬화/복원 후에도 같은 상태로 이어지는지, 장중 갱신이 DB 확정 종가로
+정리되는지(가격 저장소 대역 사용) 검증합니다.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# 프로젝트 루트 경로 추가
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+import core.modules.indicator_state as indicator_state_module
+from core.modules.indicator_state import IndicatorSet, IndicatorStateStore, update_intraday_indicators
+from core.modules.technical_indicators import INDICATOR_COLUMNS, calculate_indicator_panel
+
+
+def assert_close(actual, expected, label, rtol=1e-8):
+    if np.isnan(expected):
+        assert np.isnan(actual), f"{label}: {actual} != NaN"
+    else:
+        assert abs(actual - expected) <= rtol * max(1.0, abs(expected)), f"{label}: {actual} != {expected}"
+
+
+def make_closes(num_days=300, seed=11):
+    """횡보 구간이 포함된 종가"""
+    rng = np.random.default_rng(seed)
+    closes = np.exp(np.cumsum(rng.normal(0, 0.015, num_days))) * 30000
+    closes[100:125] = closes[99]
+    return pd.Series(closes, index=pd.bdate_range("2023-01-02", periods=num_days))
+
+
+def test_incremental_matches_batch():
+    """봉 단위 갱신 == 배치 계산, preview == update"""
+    print("\n[1] 증분 vs 배치")
+    closes = make_closes()
+    panel = calculate_indicator_panel(closes.to_frame("A"))
+
+    state = IndicatorSet()
+    for i, (bar_date, close) in enumerate(closes.items()):
+        preview = state.preview(close)
+        values = state.update(close, bar_date)
+        for name in INDICATOR_COLUMNS:
+            assert_close(values[name], panel[name]["A"].iloc[i], f"{i} {name}")
+            assert_close(preview[name], values[name], f"{i} {name} preview", rtol=1e-9)
+    print(f"  ✓ {len(closes)}봉 x 지표 {len(INDICATOR_COLUMNS)}개 일치")
+
+
+def test_serialize_and_observe():
+    """직렬화 복원 + 장중 observe 날짜 전환"""
+    print("\n[2] 직렬화 / 장중 갱신")
+    closes = make_closes()
+    history, intraday = closes.iloc[:-2], closes.iloc[-2:]
+    state = IndicatorSet.from_closes(history.to_numpy(), history.index)
+
+    restored = IndicatorSet.from_json(state.to_json())
+    assert restored.last_date == history.index[-1].date()
+
+    # 형성 중인 봉: 여러 번 관측해도 확정되지 않음
+    day1, day2 = intraday.index
+    restored.observe(day1, intraday.iloc[0] * 0.99)
+    restored.observe(day1, intraday.iloc[0])
+    assert restored.last_date == history.index[-1].date()
+
+    # 다음 날 첫 가격이 들어오면 직전 봉 확정
+    values = restored.observe(day2, intraday.iloc[1])
+    assert restored.last_date == day1.date()
+
+    panel = calculate_indicator_panel(closes.to_frame("A"))
+    for name in INDICATOR_COLUMNS:
+        assert_close(values[name], panel[name]["A"].iloc[-1], name)
+    print(f"  ✓ JSON {len(state.to_json()):,} bytes")
+
+
+def test_intraday_settles_to_db_closes():
+    """날짜 전환 시 마지막 장중 가격 대신 DB 확정 종가 사용, 누락/공백은 DB 이력으로 재구성"""
+    print("\n[3] DB 확정 종가 정리")
+    closes = make_closes().iloc[:80]      # 전체 이력이 초기화 기간(120일) 안에 들어오도록
+    panel = calculate_indicator_panel(closes.to_frame("A"))
+    days = closes.index
+    db = {'until': 49, 'partial': {}}
+
+    def fake_load_panel(codes, start, end, fields):
+        rows = closes.iloc[:db['until'] + 1]
+        close = rows.to_frame("A")
+        opened = close.copy()
+        for i, price in db['partial'].items():          # 장중 저장 행 (open 없음)
+            close.loc[days[i], "A"], opened.loc[days[i], "A"] = price, np.nan
+        close, opened = close.sort_index(), opened.sort_index()
+        mask = (close.index >= pd.Timestamp(start)) & (close.index <= pd.Timestamp(end))
+        return pd.concat({'open': opened[mask], 'close': close[mask]}, axis=1)
+
+    def tick(i, price):
+        return update_intraday_indicators({"A": {'date': days[i], 'close': price}}, store)["A"]
+
+    def assert_matches(values, i):
+        for name in INDICATOR_COLUMNS:
+            assert_close(values[name], panel[name]["A"].iloc[i], f"{i} {name}")
+
+    original = indicator_state_module.load_panel
+    indicator_state_module.load_panel = fake_load_panel
+    try:
+        with tempfile.TemporaryDirectory() as root:
+            store = IndicatorStateStore(Path(root) / "states.json")
+
+            # 50일 장중 → 마지막 틱은 종가와 다름, 야간 수집 후 51일
+            tick(50, closes.iloc[50] * 0.97)
+            tick(50, closes.iloc[50] * 1.01)
+            db['until'] = 50
+            assert_matches(tick(51, closes.iloc[51]), 51)
+            assert store.load()["A"].confirmed_date == days[50].date()
+
+            # 51일 야간 수집 누락 (장중 행만 있음) → 52일 잠정 확정 → 수집 후 재구성
+            db['partial'] = {51: closes.iloc[51] * 1.02}
+            tick(51, closes.iloc[51] * 1.02)
+            tick(52, closes.iloc[52])
+            assert store.load()["A"].confirmed_date == days[50].date()
+            db['until'], db['partial'] = 52, {}
+            assert_matches(tick(53, closes.iloc[53]), 53)
+
+            # 여러 거래일 관측 없음 → DB 이력으로 재구성
+            db['until'] = 59
+            assert_matches(tick(60, closes.iloc[60]), 60)
+            assert store.load()["A"].confirmed_date == days[59].date()
+    finally:
+        indicator_state_module.load_panel = original
+    print("  ✓ 확정 종가 교체 / 잠정 봉 재구성 / 공백 재구성")
+
+
+def main():
+    tests = [
+        ("증분 vs 배치", test_incremental_matches_batch),
+        ("직렬화 / 장중 갱신", test_serialize_and_observe),
+        ("DB 확정 종가 정리", test_intraday_settles_to_db_closes),
+    ]
+
+    failed = 0
+    for name, test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {name} 실패: {e}")
+
+    print("\n" + "=" * 60)
+    print(f"전체: {len(tests) - failed}/{len(tests)} 통과")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
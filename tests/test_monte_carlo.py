@@ -0,0 +1,85 @@
+"""
+몬테카를로 리스크 시뮬레이션 테스트
+
+DB 없이 합성 수익률 패널로 경로 집계, 손절/익절 도달, 청크 분할 결과를 검증합니다.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# 프로젝트 루트 경로 추가
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from core.modules.monte_carlo import run_monte_carlo
+
+
+def test_deterministic_paths():
+    """수익률이 일정한 패널 - 결과를 해석적으로 계산 가능"""
+    print("\n[1] 고정 수익률 경로")
+    dates = pd.bdate_range("2022-01-03", periods=100)
+    returns = pd.DataFrame({"000001": 0.01, "000002": -0.01}, index=dates)
+
+    result = run_monte_carlo(returns, {"000001": 0.5, "000002": 0.3}, n_paths=200, horizon=60,
+                             current_pnl_pct={"000002": -5.0}, seed=0)
+    assert result['status'] == 'success'
+
+    expected = 0.5 * 1.01 ** 60 + 0.3 * 0.99 ** 60 + 0.2 - 1
+    assert np.isclose(result['horizon_return']['mean'], round(expected * 100, 2))
+    assert result['var']['horizon']['95']['var'] == result['horizon_return']['median']
+
+    up, down = result['stocks']['000001'], result['stocks']['000002']
+    # +20% 도달: 1.01^19 >= 1.2, -10% 도달: 0.95 x 0.99^n <= 0.9 → n = 6
+    assert up['take_profit_prob'] == 100.0 and up['avg_days_to_take_profit'] == 19
+    assert down['stop_loss_prob'] == 100.0 and down['avg_days_to_stop_loss'] == 6
+    print(f"  ✓ 60일 수익률 {result['horizon_return']['mean']:.2f}%")
+
+
+def test_chunking_and_speed():
+    """청크 크기와 관계없이 같은 결과, 10k 경로 x 1년 x 30종목 실행 시간"""
+    print("\n[2] 청크 분할 / 실행 시간")
+    rng = np.random.default_rng(0)
+    codes = [f"{i:06d}" for i in range(30)]
+    returns = pd.DataFrame(rng.normal(0.0004, 0.02, (756, 30)),
+                           index=pd.bdate_range("2021-01-01", periods=756), columns=codes)
+    weights = {code: 1 / 30 for code in codes}
+
+    for method in ["bootstrap", "normal"]:
+        small = run_monte_carlo(returns, weights, n_paths=500, method=method, seed=7, memory_budget=2_000_000)
+        large = run_monte_carlo(returns, weights, n_paths=500, method=method, seed=7)
+        assert small == large, method
+
+    started = time.perf_counter()
+    result = run_monte_carlo(returns, weights, n_paths=10_000, horizon=252, seed=1)
+    elapsed = time.perf_counter() - started
+
+    assert result['var']['daily']['99']['cvar'] <= result['var']['daily']['99']['var'] < 0
+    assert result['drawdown']['p95'] <= result['drawdown']['median'] <= 0
+    print(f"  ✓ 10,000 경로 {elapsed:.2f}s, 1년 VaR95 {result['var']['horizon']['95']['var']:.2f}%")
+
+
+def main():
+    tests = [
+        ("고정 수익률 경로", test_deterministic_paths),
+        ("청크 분할 / 실행 시간", test_chunking_and_speed),
+    ]
+
+    failed = 0
+    for name, test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {name} 실패: {e}")
+
+    print("\n" + "=" * 60)
+    print(f"전체: {len(tests) - failed}/{len(tests)} 통과")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+"""
+공분산 기반 포트폴리오 최적화 테스트
+
+합성 팩터 수익률 패널로 축소 공분산, 제약 최적화, 위험 균형(ERC)을 검증합니다.
+"""
+
+import sys
+import time
+import logging
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# 프로젝트 루트 경로 추가
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from core.modules.optimizers import (
+    PortfolioConstraints,
+    _clean,
+    _weight_rows,
+    ledoit_wolf_covariance,
+    min_variance_weights,
+    optimize_portfolio,
+    solve_qp
+)
+
+
+def make_returns(n_assets=200, n_days=252, seed=0):
+    """5개 공통 팩터 + 개별 잡음 일간 수익률"""
+    rng = np.random.default_rng(seed)
+    factors = rng.normal(0, 0.01, (n_days, 5))
+    loadings = rng.normal(1, 0.5, (5, n_assets)) / 3
+    drift = rng.normal(0.0005, 0.0005, n_assets)
+    values = factors @ loadings + rng.normal(0, 0.015, (n_days, n_assets)) + drift
+    return pd.DataFrame(values, columns=[f"{i:06d}" for i in range(n_assets)])
+
+
+def test_covariance_and_min_variance():
+    """축소 공분산 성질, 제약 없는 최소분산 = 해석해"""
+    print("\n[1] 축소 공분산 / 최소분산")
+    returns = make_returns()
+    cov, shrinkage = ledoit_wolf_covariance(returns)
+
+    assert 0 < shrinkage < 1
+    assert np.allclose(cov, cov.T) and np.linalg.eigvalsh(cov).min() > 0
+
+    inverse = np.linalg.solve(cov, np.ones(len(cov)))
+    expected = inverse / inverse.sum()
+    weights = min_variance_weights(cov, PortfolioConstraints(min_weight=-1.0, max_weight=1.0))
+    assert np.abs(weights - expected).max() < 1e-6
+    print(f"  ✓ 축소 강도 {shrinkage:.3f}")
+
+
+def test_constrained_methods():
+    """비중/섹터 제약 준수, Sharpe 순서, ERC 위험 기여도"""
+    print("\n[2] 제약 최적화 / ERC")
+    returns = make_returns()
+    sectors = {code: f"S{i % 8}" for i, code in enumerate(returns.columns)}
+    constraints = PortfolioConstraints(max_weight=0.04, max_sector_weight=0.2, sector_limits={"S0": 0.05})
+
+    results = {}
+    for method in ["min_variance", "mean_variance", "max_sharpe", "erc"]:
+        started = time.perf_counter()
+        results[method] = optimize_portfolio(returns, method, constraints, sectors)
+        elapsed = (time.perf_counter() - started) * 1000
+        assert results[method]['status'] == 'success', method
+        assert elapsed < 500, f"{method} {elapsed:.0f}ms"
+        print(f"  - {method}: {elapsed:.1f}ms, Sharpe {results[method]['sharpe_ratio']:.2f}")
+
+    for method in ["min_variance", "mean_variance", "max_sharpe"]:
+        weights = pd.Series(results[method]['weights'])
+        by_sector = weights.groupby(weights.index.map(sectors)).sum()
+        assert np.isclose(weights.sum(), 1.0)
+        assert weights.max() <= 0.04 + 1e-6, method
+        assert by_sector.max() <= 0.2 + 1e-6 and by_sector.get("S0", 0) <= 0.05 + 1e-6, method
+
+    assert results['max_sharpe']['sharpe_ratio'] >= results['min_variance']['sharpe_ratio']
+    assert results['min_variance']['volatility'] <= results['max_sharpe']['volatility']
+
+    contributions = np.array(list(results['erc']['risk_contributions'].values()))
+    assert np.allclose(contributions, 1 / len(contributions), atol=1e-4)
+    print(f"  ✓ 제약 준수, ERC 기여도 {contributions.min():.4f}~{contributions.max():.4f}")
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__(logging.WARNING)
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def test_convergence_and_projection():
+    """미수렴 잔차 보고, 정리 단계의 상한 유지 사영"""
+    print("\n[3] 수렴 정보 / 상한 사영")
+    cov, _ = ledoit_wolf_covariance(make_returns(n_assets=50))
+    constraints = PortfolioConstraints(max_weight=0.05)
+    A, lower, upper = _weight_rows(len(cov), constraints, {})
+    q = np.zeros(len(cov))
+
+    _, info = solve_qp(cov, q, A, lower, upper, return_info=True)
+    assert info['converged'] and info['iterations'] < 4000
+
+    handler = ListHandler()
+    logger = logging.getLogger("core.modules.optimizers")
+    logger.addHandler(handler)
+    try:
+        _, info = solve_qp(cov, q, A, lower, upper, max_iter=3, return_info=True)
+    finally:
+        logger.removeHandler(handler)
+    assert not info['converged'] and info['iterations'] == 3
+    assert info['primal_residual'] > 0 and info['dual_residual'] > 0
+    assert len(handler.messages) == 1 and "미수렴" in handler.messages[0]
+
+    # 클립 후 재정규화는 상한을 다시 넘김: [0.5, 0.3, 0.2] → [0.444, 0.333, 0.222]
+    weights = _clean(np.array([0.5, 0.3, 0.2]), PortfolioConstraints(max_weight=0.4))
+    assert np.allclose(weights, [0.4, 0.35, 0.25]) and np.isclose(weights.sum(), 1.0)
+
+    # 미수렴 해도 정리 후에는 합계 1, 상한 이내, 잔여 비중 0
+    rng = np.random.default_rng(1)
+    raw = np.where(rng.random(50) < 0.5, rng.normal(0, 1e-9, 50), rng.uniform(0.03, 0.1, 50))
+    weights = _clean(raw, constraints)
+    assert np.isclose(weights.sum(), 1.0) and weights.max() <= 0.05 + 1e-12 and weights.min() >= 0
+    assert np.all(weights[np.abs(raw) < 1e-8] == 0)
+    print(f"  ✓ 미수렴 잔차 primal {info['primal_residual']:.1e}, 정리 후 최대 비중 {weights.max():.4f}")
+
+
+def main():
+    tests = [
+        ("축소 공분산 / 최소분산", test_covariance_and_min_variance),
+        ("제약 최적화 / ERC", test_constrained_methods),
+        ("수렴 정보 / 상한 사영", test_convergence_and_projection),
+    ]
+
+    failed = 0
+    for name, test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {name} 실패: {e}")
+
+    print("\n" + "=" * 60)
+    print(f"전체: {len(tests) - failed}/{len(tests)} 통과")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,197 @@
+"""
+다종목 가격 동시 수집 엔진 테스트
+
+네트워크 없이 로컬 stub 데이터 소스로 PriceFetcher를 검증합니다.
+"""
+
+import sys
+import threading
+import time
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# 프로젝트 루트 경로 추가
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from core.utils.price_fetcher import PriceFetcher, plan_sync_requests
+
+
+def make_stub_reader(fail_times=None, empty_codes=(), delay=0.0):
+    """종목별 실패 횟수/빈 응답을 흉내내는 stub reader"""
+    fail_times = dict(fail_times or {})
+    calls = {}
+    lock = threading.Lock()
+
+    def reader(code, start, end):
+        with lock:
+            calls[code] = calls.get(code, 0) + 1
+            attempt = calls[code]
+        if delay:
+            time.sleep(delay)
+        if attempt <= fail_times.get(code, 0):
+            raise ConnectionError(f"stub failure {code}#{attempt}")
+        if code in empty_codes:
+            return pd.DataFrame()
+        index = pd.date_range("2024-01-02", periods=5, freq="B")
+        close = np.arange(1, 6, dtype=float) * 1000
+        return pd.DataFrame({
+            "Open": close, "High": close, "Low": close, "Close": close,
+            "Volume": np.full(5, 100)
+        }, index=index)
+
+    reader.calls = calls
+    return reader
+
+
+def test_fetch_with_retry_and_empty():
+    """재시도/빈 응답/실패 집계"""
+    print("\n[1] 재시도 및 지표 집계")
+    reader = make_stub_reader(fail_times={"B": 1, "C": 10}, empty_codes={"D"})
+    progress = []
+    fetcher = PriceFetcher(
+        reader=reader, source="stub-1", max_workers=4, rate_per_sec=0,
+        max_retries=2, backoff_sec=0, progress_callback=lambda r, m: progress.append(r.code)
+    )
+
+    results = {r.code: r for r in fetcher.fetch_range(["A", "B", "C", "D"], None, None)}
+    metrics = fetcher.metrics
+
+    assert results["A"].ok and results["A"].attempts == 1
+    assert results["B"].ok and results["B"].attempts == 2
+    assert results["C"].error is not None and results["C"].attempts == 3
+    assert not results["D"].ok and results["D"].error is None
+    assert (metrics.succeeded, metrics.failed, metrics.empty) == (2, 1, 1)
+    assert metrics.rows == 10
+    assert sorted(progress) == ["A", "B", "C", "D"]
+    print(f"  ✓ 지표: {metrics.to_dict()}")
+
+
+def test_run_hands_batches_to_writer():
+    """writer에 prices 형식 배치로 전달"""
+    print("\n[2] 배치 writer 전달")
+    reader = make_stub_reader()
+    batches = []
+    fetcher = PriceFetcher(reader=reader, source="stub-2", max_workers=8, rate_per_sec=0)
+
+    codes = [f"{i:06d}" for i in range(20)]
+    metrics = fetcher.run([(code, None, None) for code in codes], writer=batches.append, batch_rows=30)
+
+    merged = pd.concat(batches, ignore_index=True)
+    assert list(merged.columns) == ["code", "date", "open", "high", "low", "close", "volume"]
+    assert len(merged) == 100 and merged["code"].nunique() == 20
+    assert all(len(batch) >= 30 for batch in batches[:-1])
+    assert metrics.succeeded == 20
+    print(f"  ✓ 배치 {len(batches)}개, 총 {len(merged)} rows")
+
+
+def test_concurrency_and_rate_limit():
+    """동시 실행으로 대기 시간이 겹치고, 요청 제한은 지켜지는지"""
+    print("\n[3] 동시성 / 요청 제한")
+    reader = make_stub_reader(delay=0.05)
+    fetcher = PriceFetcher(reader=reader, source="stub-3", max_workers=10, rate_per_sec=0)
+
+    started = time.monotonic()
+    list(fetcher.fetch_range([str(i) for i in range(20)], None, None))
+    elapsed = time.monotonic() - started
+    assert elapsed < 0.05 * 20 / 2, f"동시 실행이 아님: {elapsed:.2f}s"
+    print(f"  ✓ 20건 x 50ms → {elapsed:.2f}s")
+
+    limited = PriceFetcher(reader=make_stub_reader(), source="stub-4", max_workers=10, rate_per_sec=20)
+    started = time.monotonic()
+    list(limited.fetch_range([str(i) for i in range(40)], None, None))
+    elapsed = time.monotonic() - started
+    # 버스트 20건 이후 나머지 20건은 초당 20건으로 제한
+    assert elapsed >= 0.9, f"요청 제한 미적용: {elapsed:.2f}s"
+    print(f"  ✓ 초당 20건 제한, 40건 → {elapsed:.2f}s")
+
+
+def test_plan_sync_requests():
+    """증분 동기화 계획: 최신 종목 건너뛰기, tail/gap 요청"""
+    print("\n[4] 증분 동기화 계획")
+    end = date(2024, 3, 11)  # 월요일
+    last_dates = {
+        "CURRENT": date(2024, 3, 11),
+        "WEEKEND": date(2024, 3, 8),   # 금요일까지 저장, 토/일은 영업일 아님
+        "STALE": date(2024, 3, 5),
+        "GAPPED": date(2024, 3, 11),
+        "GAP_TAIL": date(2024, 3, 6),
+    }
+    gaps = {
+        "GAPPED": (date(2024, 2, 20), date(2024, 2, 22)),
+        "GAP_TAIL": (date(2024, 3, 4), date(2024, 3, 5)),
+    }
+    codes = list(last_dates) + ["NEW"]
+
+    requests = plan_sync_requests(codes, date(2024, 3, 10), last_dates, gaps, initial_days=30)
+    by_code = {code: (start, stop) for code, start, stop in requests}
+    assert "CURRENT" not in by_code and "WEEKEND" not in by_code
+
+    requests = plan_sync_requests(codes, end, last_dates, gaps, initial_days=30)
+    by_code = {}
+    for code, start, stop in requests:
+        by_code.setdefault(code, []).append((start, stop))
+
+    assert "CURRENT" not in by_code
+    assert by_code["WEEKEND"] == [(date(2024, 3, 9), end)]
+    assert by_code["STALE"] == [(date(2024, 3, 6), end)]
+    assert by_code["GAPPED"] == [(date(2024, 2, 20), date(2024, 2, 22))]
+    assert by_code["GAP_TAIL"] == [(date(2024, 3, 4), end)]
+    assert by_code["NEW"] == [(date(2024, 2, 10), end)]
+    print(f"  ✓ 요청 {len(requests)}건 / 종목 {len(codes)}개")
+
+
+def test_plan_refetches_partial_rows():
+    """장중 미완성 행(open NULL)은 최신 종목이어도 다시 요청"""
+    print("\n[5] 장중 미완성 행 재수집")
+    end = date(2024, 3, 11)
+    last_dates = {"INTRADAY": end, "YESTERDAY": date(2024, 3, 8), "DONE": end, "OLD": end}
+    gaps = {"OLD": (date(2024, 2, 20), date(2024, 2, 20))}
+    partial = {
+        "INTRADAY": (end, end),                            # 당일 장중 저장
+        "YESTERDAY": (date(2024, 3, 8), date(2024, 3, 8)),  # 전 거래일 장중 저장 후 야간 수집 누락
+        "OLD": (date(2024, 2, 26), date(2024, 2, 27)),
+    }
+
+    requests = plan_sync_requests(list(last_dates), end, last_dates, gaps, initial_days=30, partial=partial)
+    by_code = {}
+    for code, start, stop in requests:
+        by_code.setdefault(code, []).append((start, stop))
+
+    assert "DONE" not in by_code
+    assert by_code["INTRADAY"] == [(end, end)]
+    assert by_code["YESTERDAY"] == [(date(2024, 3, 8), end)]
+    assert by_code["OLD"] == [(date(2024, 2, 20), date(2024, 2, 27))]
+
+    # partial 없이 호출하면 기존 계획과 동일
+    assert plan_sync_requests(["INTRADAY"], end, last_dates) == []
+    print(f"  ✓ 요청 {len(requests)}건")
+
+
+def main():
+    tests = [
+        ("재시도 및 지표 집계", test_fetch_with_retry_and_empty),
+        ("배치 writer 전달", test_run_hands_batches_to_writer),
+        ("동시성 / 요청 제한", test_concurrency_and_rate_limit),
+        ("증분 동기화 계획", test_plan_sync_requests),
+        ("장중 미완성 행 재수집", test_plan_refetches_partial_rows),
+    ]
+
+    failed = 0
+    for name, test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {name} 실패: {e}")
+
+    print("\n" + "=" * 60)
+    print(f"전체: {len(tests) - failed}/{len(tests)} 통과")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,230 @@
+"""
+로컬 가격 저장소 테스트
+
+DB 없이 연도 파일을 직접 써서 PriceStore의 패널/이력 조회를 검증하고,
+메모리 가격 테이블(FakePrices)로 연도별 지문 동기화를 검증합니다.
+"""
+
+import sys
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# 프로젝트 루트 경로 추가
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from core.utils.price_store import PriceStore, PRICE_FIELDS
+from core.utils.price_repository import PriceRepository
+
+
+def build_store(root, codes, start="2021-01-01", end="2023-12-31"):
+    """연도 파일을 직접 기록한 저장소 (DB 동기화 생략)"""
+    store = PriceStore(root=root)
+    dates = pd.bdate_range(start, end)
+    frames = {}
+    for year in sorted(set(dates.year)):
+        year_dates = dates[dates.year == year]
+        df = pd.DataFrame({
+            "code": np.repeat(codes, len(year_dates)),
+            "date": np.tile(year_dates, len(codes)),
+        })
+        for i, field in enumerate(PRICE_FIELDS):
+            df[field] = np.arange(len(df), dtype=float) + i
+        # 한 종목은 일부 날짜 누락
+        df = df[~((df["code"] == codes[-1]) & (df["date"].dt.day == 15))]
+        store._write_year(year, df)
+        store._manifest[year] = {"rows": len(df)}
+        frames[year] = df
+    store._write_manifest()
+    store._last_check = time.monotonic()
+    return store, pd.concat(frames.values(), ignore_index=True)
+
+
+class FakePrices:
+    """prices 테이블 대역 - PriceStore의 지문/연도 내보내기 조회를 메모리에서 수행"""
+
+    def __init__(self, df):
+        self.df = df.copy()
+        self.exported = []
+        self.fingerprint_calls = 0
+
+    def attach(self, store):
+        store._db_fingerprints = self.fingerprints
+        store._export_year = self.export_year
+        return store
+
+    def fingerprints(self, years=None):
+        self.fingerprint_calls += 1
+        result = {}
+        for year, group in self.df.groupby(self.df["date"].dt.year):
+            if years is not None and year not in set(years):
+                continue
+            result[int(year)] = {
+                "rows": len(group),
+                "max_date": group["date"].max().date().isoformat(),
+                **{f"sum_{field}": str(group[field].sum()) for field in PRICE_FIELDS},
+            }
+        return result
+
+    def export_year(self, year):
+        self.exported.append(year)
+        return self.df[self.df["date"].dt.year == year].reset_index(drop=True)
+
+
+def make_prices(codes, start, end):
+    dates = pd.bdate_range(start, end)
+    df = pd.DataFrame({"code": np.repeat(codes, len(dates)), "date": np.tile(dates, len(codes))})
+    for i, field in enumerate(PRICE_FIELDS):
+        df[field] = np.arange(len(df), dtype=float) + i
+    return df
+
+
+def test_load_panel_matches_pivot():
+    """load_panel 결과가 tidy 데이터 pivot과 같은지"""
+    print("\n[1] load_panel vs pivot")
+    codes = [f"{i:06d}" for i in range(50)]
+    with tempfile.TemporaryDirectory() as root:
+        store, tidy = build_store(root, codes)
+
+        wanted = ["000003", "000049", "999999"]
+        panel = store.load_panel(wanted, "2021-06-01", "2023-02-15", "close")
+
+        mask = tidy["code"].isin(wanted) & tidy["date"].between("2021-06-01", "2023-02-15")
+        expected = tidy[mask].pivot(index="date", columns="code", values="close")
+
+        assert list(panel.columns) == ["000003", "000049"]
+        assert panel.index.min() >= pd.Timestamp("2021-06-01")
+        assert panel.index.max() <= pd.Timestamp("2023-02-15")
+        pd.testing.assert_frame_equal(panel, expected, check_names=False, check_freq=False)
+        print(f"  ✓ {panel.shape}")
+
+
+def test_multi_field_and_history():
+    """복수 필드 패널과 단일 종목 이력"""
+    print("\n[2] 복수 필드 / 단일 종목 이력")
+    codes = [f"{i:06d}" for i in range(10)]
+    with tempfile.TemporaryDirectory() as root:
+        store, tidy = build_store(root, codes)
+
+        panel = store.load_panel(None, "2022-01-01", "2022-12-31", ["close", "volume"])
+        assert set(panel.columns.get_level_values(0)) == {"close", "volume"}
+        assert panel["close"].shape[1] == len(codes)
+
+        history = store.load_history("000002", "2023-12-01", "2023-12-31")
+        assert list(history.columns) == ["date"] + PRICE_FIELDS
+        assert history["date"].is_monotonic_increasing
+
+        recent = store.load_recent("000002", 20, end="2023-12-31")
+        assert len(recent) == 20 and recent["date"].iloc[-1] == pd.Timestamp("2023-12-29")
+        print(f"  ✓ 패널 {panel.shape}, 이력 {len(history)}행")
+
+
+def test_repository_closes_and_returns():
+    """PriceRepository 최근 N 거래일 종가/수익률"""
+    print("\n[3] PriceRepository closes / returns")
+    codes = [f"{i:06d}" for i in range(10)]
+    with tempfile.TemporaryDirectory() as root:
+        store, tidy = build_store(root, codes)
+        repo = PriceRepository(store=store)
+
+        closes = repo.closes(["000001", "000009", "999999"], lookback=60, end="2023-12-31")
+        assert list(closes.columns) == ["000001", "000009"]
+        assert len(closes) == 60 and closes.index[-1] == pd.Timestamp("2023-12-29")
+
+        returns = repo.returns(["000001", "000009"], lookback=60, end="2023-12-31")
+        assert len(returns) == 59
+        expected = closes["000001"].pct_change().iloc[1:]
+        pd.testing.assert_series_equal(returns["000001"], expected, check_freq=False)
+        print(f"  ✓ closes {closes.shape}, returns {returns.shape}")
+
+
+def test_incremental_sync():
+    """바뀐 연도만 다시 쓰기 (새 거래일, 과거 연도 보정/백필)"""
+    print("\n[4] 증분 동기화")
+    codes = [f"{i:06d}" for i in range(5)]
+    with tempfile.TemporaryDirectory() as root:
+        db = FakePrices(make_prices(codes, "2021-01-01", "2023-12-28"))
+        store = db.attach(PriceStore(root=root))
+
+        assert sorted(store.sync()) == [2021, 2022, 2023]
+        assert store.sync() == {}
+
+        # 새 거래일 → 2023만
+        db.df = pd.concat([db.df, make_prices(codes, "2023-12-29", "2023-12-29")], ignore_index=True)
+        assert list(store.sync()) == [2023]
+
+        # 과거 연도 종가 보정 (행 수/마지막 날짜 동일) → 2021만
+        fix = (db.df["code"] == "000001") & (db.df["date"] == pd.Timestamp("2021-03-02"))
+        db.df.loc[fix, "close"] = -1.0
+        assert list(store.sync()) == [2021]
+        panel = store.load_panel(["000001"], "2021-03-01", "2021-03-03", "close")
+        assert panel.loc["2021-03-02", "000001"] == -1.0
+
+        # 새 프로세스도 manifest로 변경 없음을 인식
+        reopened = db.attach(PriceStore(root=root))
+        assert reopened.sync() == {}
+        print(f"  ✓ 다시 쓴 연도만 갱신 (내보내기 {db.exported})")
+
+
+def test_year_rollover():
+    """0행으로 기록된 연도(연초 올해, 빈 과거 연도)도 다음 확인 때 동기화"""
+    print("\n[5] 연도 전환")
+    this_year = date.today().year
+    codes = ["000001", "000002"]
+    with tempfile.TemporaryDirectory() as root:
+        db = FakePrices(make_prices(codes, f"{this_year - 1}-06-01", f"{this_year - 1}-12-31"))
+        store = db.attach(PriceStore(root=root))
+
+        before = store.load_panel(codes, f"{this_year - 2}-01-01", f"{this_year}-12-31")
+        assert store._manifest[this_year]["rows"] == 0 and store._manifest[this_year - 2]["rows"] == 0
+        assert before.index.max().year == this_year - 1
+
+        # 올해 첫 거래일 + 빈 과거 연도 백필
+        db.df = pd.concat([
+            db.df,
+            make_prices(codes, f"{this_year}-01-02", f"{this_year}-01-02"),
+            make_prices(codes, f"{this_year - 2}-12-01", f"{this_year - 2}-12-31"),
+        ], ignore_index=True)
+
+        # 확인 주기 안에서는 DB 조회 없음
+        calls = db.fingerprint_calls
+        store.load_panel(codes, f"{this_year - 2}-01-01", f"{this_year}-12-31")
+        assert db.fingerprint_calls == calls
+
+        store._last_check = 0.0
+        after = store.load_panel(codes, f"{this_year - 2}-01-01", f"{this_year}-12-31")
+        assert after.index.max() == pd.Timestamp(f"{this_year}-01-02")
+        assert after.index.min().year == this_year - 2
+        assert store._manifest[this_year]["rows"] == 2
+        print(f"  ✓ {this_year}년 0행 → {store._manifest[this_year]['rows']}행")
+
+
+def main():
+    tests = [
+        ("load_panel vs pivot", test_load_panel_matches_pivot),
+        ("복수 필드 / 단일 종목 이력", test_multi_field_and_history),
+        ("PriceRepository closes / returns", test_repository_closes_and_returns),
+        ("증분 동기화", test_incremental_sync),
+        ("연도 전환", test_year_rollover),
+    ]
+
+    failed = 0
+    for name, test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {name} 실패: {e}")
+
+    print("\n" + "=" * 60)
+    print(f"전체: {len(tests) - failed}/{len(tests)} 통과")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
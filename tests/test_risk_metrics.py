@@ -0,0 +1,160 @@
+"""
+리스크 지표 일괄 계산 테스트
+
+DB 없이 합성 가격 패널로 risk_metrics_table이 종목별 스칼라 함수
+(변동성, MDD, VaR, Sharpe, Sortino, 하방 편차, 승률, 베타)와 같은지 검증합니다.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# 프로젝트 루트 경로 추가
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+import core.modules.risk_analysis as risk_module
+from core.modules.risk_analysis import (
+    analyze_portfolio_risk,
+    calculate_beta,
+    calculate_downside_deviation,
+    calculate_max_drawdown,
+    calculate_sharpe_ratio,
+    calculate_sortino_ratio,
+    calculate_var,
+    calculate_volatility,
+    calculate_win_rate,
+    risk_metrics_table,
+    risk_score_and_grade,
+)
+
+
+def make_panel(n_codes=300, n_days=400, seed=0):
+    """시장 요인 + 개별 요인 가격 패널 (거래정지/신규상장 포함)"""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(end="2024-12-30", periods=n_days)
+    codes = [f"{i:06d}" for i in range(n_codes)]
+    market_returns = rng.normal(0.0003, 0.01, n_days)
+    betas = rng.uniform(0.3, 1.8, n_codes)
+    returns = market_returns[:, None] * betas + rng.normal(0, 0.02, (n_days, n_codes))
+    close = pd.DataFrame(10000 * np.exp(np.cumsum(returns, axis=0)), index=dates, columns=codes)
+    benchmark = pd.Series(2500 * np.exp(np.cumsum(market_returns)), index=dates)
+
+    close.iloc[-100:-80, 1] = np.nan        # 거래정지
+    close.iloc[:-60, 2] = np.nan            # 상장 60거래일
+    close.iloc[:-8, 3] = np.nan             # 상장 8거래일 - 데이터 부족
+    close.iloc[-252:, 4] = np.linspace(1000, 2000, 252)   # 단조 상승 (MDD 0)
+    benchmark.iloc[-30:-25] = np.nan        # 지수 누락일
+    return close, benchmark
+
+
+def test_table_matches_scalar():
+    """일괄 계산 = 종목별 스칼라 함수"""
+    print("\n[1] 일괄 vs 종목별")
+    close, benchmark = make_panel(n_codes=40)
+    table = risk_metrics_table(close, benchmark, days=252).set_index('code')
+    assert "000003" not in table.index and len(table) == 39
+
+    market = benchmark.dropna().tail(252).pct_change().dropna()
+    for code in table.index:
+        prices = close[code].dropna().tail(252)
+        returns = prices.pct_change().dropna()
+        mdd = calculate_max_drawdown(prices)
+        expected = {
+            'period_days': len(prices),
+            'volatility': round(calculate_volatility(returns), 2),
+            'max_drawdown': round(mdd['max_drawdown'], 2),
+            'var_95': round(calculate_var(returns), 2),
+            'sharpe_ratio': round(calculate_sharpe_ratio(returns), 3),
+            'downside_deviation': round(calculate_downside_deviation(returns), 2),
+            'sortino_ratio': round(calculate_sortino_ratio(returns), 3),
+            'win_rate': round(calculate_win_rate(returns), 2),
+            'beta': round(calculate_beta(returns, market), 3),
+            'peak_date': mdd['peak_date'].date(),
+            'trough_date': mdd['trough_date'].date(),
+        }
+        row = table.loc[code]
+        for key, value in expected.items():
+            if isinstance(value, float):
+                assert np.isclose(row[key], value, atol=1e-9), (code, key, row[key], value)
+            else:
+                assert row[key] == value, (code, key, row[key], value)
+
+    assert table.loc["000004", 'max_drawdown'] == 0
+    score, grade = risk_score_and_grade([10, 30, 60], [-5, -20, -60], [-2, -6, -40])
+    assert list(grade) == ['낮음', '보통', '매우 높음'] and np.isclose(score[0], 0.3 * 2 + 0.4 * 1 + 0.3 * 2 / 3)
+    print(f"  ✓ {len(table)}개 종목 일치")
+
+
+def test_speed_and_no_benchmark():
+    """시장 전체 실행 시간, 벤치마크 없는 경우"""
+    print("\n[2] 실행 시간 / 벤치마크 없음")
+    close, benchmark = make_panel(n_codes=2500)
+
+    started = time.perf_counter()
+    table = risk_metrics_table(close, benchmark)
+    elapsed = time.perf_counter() - started
+    assert len(table) == 2499 and table['risk_score'].between(0, 10).all()
+    assert table['beta'].notna().all()
+    assert elapsed < 2.0, f"{elapsed:.2f}s"
+
+    without = risk_metrics_table(close.iloc[:, :10])
+    assert without['beta'].isna().all()
+    pd.testing.assert_frame_equal(without.drop(columns='beta'), table.head(9).drop(columns='beta'))
+    print(f"  ✓ 2,500종목 {elapsed * 1000:.0f}ms")
+
+
+def test_portfolio_weights_aligned():
+    """중복 종목 비중 합산, 데이터 없는 종목 제외 후 비중 재조정"""
+    print("\n[3] 포트폴리오 비중 정렬")
+    close, _ = make_panel(n_codes=5)
+    returns = close.iloc[-120:, [0, 4]].pct_change().dropna()
+
+    class FakeRepository:
+        def returns(self, codes, lookback, min_periods):
+            assert len(codes) == len(set(codes))
+            return returns[[code for code in codes if code in returns.columns]]
+
+    original = risk_module.get_price_repository
+    risk_module.get_price_repository = lambda: FakeRepository()
+    try:
+        # 000000 두 번 (0.2 + 0.3), 999999는 데이터 없음 (0.25)
+        result = analyze_portfolio_risk(["000000", "000004", "999999", "000000"], [0.2, 0.25, 0.25, 0.3])
+        expected = analyze_portfolio_risk(["000000", "000004"], [0.5 / 0.75, 0.25 / 0.75])
+    finally:
+        risk_module.get_price_repository = original
+
+    assert result['status'] == 'success', result
+    assert result['stocks'] == ["000000", "000004"] and result['weights'] == [0.6667, 0.3333]
+    for key in ['portfolio_volatility', 'portfolio_var_95', 'portfolio_max_drawdown', 'portfolio_sharpe_ratio']:
+        assert result[key] == expected[key], key
+    portfolio = returns @ np.array([2 / 3, 1 / 3])
+    assert np.isclose(result['portfolio_volatility'], round(calculate_volatility(portfolio), 2))
+    print(f"  ✓ 변동성 {result['portfolio_volatility']}%")
+
+
+def main():
+    tests = [
+        ("일괄 vs 종목별", test_table_matches_scalar),
+        ("실행 시간 / 벤치마크 없음", test_speed_and_no_benchmark),
+        ("포트폴리오 비중 정렬", test_portfolio_weights_aligned),
+    ]
+
+    failed = 0
+    for name, test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {name} 실패: {e}")
+
+    print("\n" + "=" * 60)
+    print(f"전체: {len(tests) - failed}/{len(tests)} 통과")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
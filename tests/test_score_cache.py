@@ -0,0 +1,148 @@
+"""
+점수 캐시 테스트
+
+DB 없이 임시 디렉터리의 ScoreCache와 데이터 버전 함수 대역으로
+LRU/파일 적중, 이전 버전 정리, get_leadership_scores 키 무효화를 검증합니다.
+"""
+
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from pathlib import Path
+
+# 프로젝트 루트 경로 추가
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+import core.modules.sector_leader_detector as detector_module
+from core.modules.sector_leader_detector import SectorLeaderConfig, get_leadership_scores
+from core.utils.score_cache import ScoreCache
+
+
+def test_lru_and_file_cache():
+    """LRU/파일 적중, 같은 group의 이전 version 정리, 손상 파일"""
+    print("\n[1] LRU / 파일 캐시")
+    with tempfile.TemporaryDirectory() as root:
+        cache = ScoreCache("leadership", root=root, maxsize=2)
+        key = ("KOSPI-abc", "2024-06-28-v1")
+        assert cache.get(key) is None
+
+        cache.put(key, {"005930": 91.5})
+        assert cache.get(key) == {"005930": 91.5}
+
+        # 다른 프로세스: 파일에서 적중
+        other = ScoreCache("leadership", root=root)
+        assert other.get(key) == {"005930": 91.5}
+
+        # 새 version 저장 → 이전 version은 LRU/파일 모두 제거
+        new_key = ("KOSPI-abc", "2024-07-01-v2")
+        cache.put(new_key, {"000660": 88.0})
+        assert ScoreCache("leadership", root=root).get(key) is None
+        assert len(list(Path(root, "leadership").glob("*.json"))) == 1
+
+        # LRU 크기 제한 (파일은 유지)
+        cache.put(("KOSDAQ-abc", "v1"), {"1": 1.0})
+        cache.put(("KOSPI-def", "v1"), {"2": 2.0})
+        assert new_key not in cache._lru and cache.get(new_key) == {"000660": 88.0}
+
+        # 손상 파일은 미스로 처리
+        cache._path(("BROKEN", "v1")).write_text("{", encoding="utf-8")
+        assert cache.get(("BROKEN", "v1")) is None
+    print("  ✓ 적중 / 미스 / 이전 버전 정리")
+
+
+def test_leadership_key_invalidation():
+    """가격 버전, 과거 가격 보정, 재무 버전, 설정이 바뀌면 다시 계산"""
+    print("\n[2] 주도주 점수 캐시 무효화")
+    versions = {
+        'price': (date(2024, 6, 28), 2450),
+        'checksum': (120_000, 9_876_543, 1_000_000),
+        'financials': (20241, 8000),
+    }
+    calls = []
+
+    def fake_detect(self, market="KOSPI", batch=True):
+        calls.append(market)
+        return {"반도체": [{'code': "005930", 'total_score': 90.0 + len(calls)}]}
+
+    original = (detector_module._leadership_cache, detector_module.get_price_version,
+                detector_module.get_price_checksum, detector_module.get_financials_version,
+                detector_module.SectorLeaderDetector.detect_leaders)
+    with tempfile.TemporaryDirectory() as root:
+        detector_module._leadership_cache = ScoreCache("leadership", root=root)
+        detector_module.get_price_version = lambda: versions['price']
+        detector_module.get_price_checksum = lambda since: versions['checksum']
+        detector_module.get_financials_version = lambda: versions['financials']
+        detector_module.SectorLeaderDetector.detect_leaders = fake_detect
+        try:
+            first = get_leadership_scores("KOSPI")
+            assert get_leadership_scores("KOSPI") == first and len(calls) == 1
+
+            expected = 1
+            for name, value in [
+                ('price', (date(2024, 7, 1), 2450)),              # 새 거래일
+                ('checksum', (120_000, 9_876_000, 1_000_000)),    # 과거 날짜 종가 보정
+                ('financials', (20241, 8001)),                    # 재무 적재
+            ]:
+                versions[name] = value
+                get_leadership_scores("KOSPI")
+                get_leadership_scores("KOSPI")
+                expected += 1
+                assert len(calls) == expected, name
+
+            get_leadership_scores("KOSPI", SectorLeaderConfig(analysis_days=90))
+            get_leadership_scores("KOSDAQ")
+            get_leadership_scores("KOSPI", refresh=True)
+            assert len(calls) == expected + 3
+        finally:
+            (detector_module._leadership_cache, detector_module.get_price_version,
+             detector_module.get_price_checksum, detector_module.get_financials_version,
+             detector_module.SectorLeaderDetector.detect_leaders) = original
+    print(f"  ✓ 탐지 실행 {len(calls)}회")
+
+
+def _put_many(root, worker):
+    cache = ScoreCache("leadership", root=root)
+    for i in range(30):
+        cache.put(("KOSPI-abc", f"v{worker}-{i}"), {f"{code:06d}": float(worker) for code in range(2000)})
+
+
+def test_concurrent_writers():
+    """여러 프로세스가 같은 group에 동시에 써도 온전한 파일 하나만 남음"""
+    print("\n[3] 프로세스 동시 쓰기")
+    with tempfile.TemporaryDirectory() as root:
+        with ProcessPoolExecutor(max_workers=4) as pool:
+            list(pool.map(_put_many, [root] * 4, range(4)))
+
+        files = list(Path(root, "leadership").glob("*.json"))
+        leftovers = list(Path(root, "leadership").glob(".*.tmp"))
+        assert len(files) == 1 and leftovers == [], (files, leftovers)
+        version = files[0].stem.split("__")[1]
+        scores = ScoreCache("leadership", root=root).get(("KOSPI-abc", version))
+        assert len(scores) == 2000 and len(set(scores.values())) == 1
+    print(f"  ✓ 최종 버전 {version}")
+
+
+def main():
+    tests = [
+        ("LRU / 파일 캐시", test_lru_and_file_cache),
+        ("주도주 점수 캐시 무효화", test_leadership_key_invalidation),
+        ("프로세스 동시 쓰기", test_concurrent_writers),
+    ]
+
+    failed = 0
+    for name, test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {name} 실패: {e}")
+
+    print("\n" + "=" * 60)
+    print(f"전체: {len(tests) - failed}/{len(tests)} 통과")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
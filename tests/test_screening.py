@@ -0,0 +1,119 @@
+"""
+종목 스크리닝 파이프라인 테스트
+
+DB 없이 합성 재무/가격 데이터로 가격 팩터 행렬 계산과 1회 병합 점수 계산을 검증합니다.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# 프로젝트 루트 경로 추가
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from core.modules.factor_scoring import FactorScorer, price_snapshot_factors, score_snapshot
+from core.modules.financials_index import FinancialsIndex
+
+
+def make_market(n_codes=2500, n_days=140, seed=0):
+    """합성 재무 (2년 x 4분기) + 종가 행렬 (일부 종목은 상장 직후라 이력 부족)"""
+    rng = np.random.default_rng(seed)
+    codes = [f"{i:06d}" for i in range(n_codes)]
+
+    keys = pd.MultiIndex.from_product([codes, [2023, 2024], range(1, 5)], names=['code', 'year', 'quarter'])
+    financials = keys.to_frame(index=False)
+    n = len(financials)
+    financials['name'] = financials['code']
+    financials['sector'] = "S" + (financials['code'].astype(int) % 10).astype(str)
+    financials['revenue'] = rng.uniform(500, 1500, n)
+    financials['operating_profit'] = financials['revenue'] * rng.uniform(-0.05, 0.3, n)
+    financials['net_profit'] = financials['operating_profit'] * 0.8
+    financials['total_equity'] = rng.uniform(500, 2000, n)
+    financials['total_debt'] = financials['total_equity'] * rng.uniform(0.1, 3.0, n)
+    financials['total_assets'] = financials['total_equity'] + financials['total_debt']
+
+    dates = pd.bdate_range(end="2024-12-30", periods=n_days)
+    close = pd.DataFrame(
+        1000 * np.exp(np.cumsum(rng.normal(0, 0.02, (n_days, n_codes)), axis=0)),
+        index=dates, columns=codes
+    )
+    close.iloc[:100, :50] = np.nan
+    return financials, close
+
+
+def test_price_factors_match_long_format():
+    """가격 행렬 팩터 = 기존 long 포맷 종목별 계산"""
+    print("\n[1] 가격 팩터")
+    financials, close = make_market(n_codes=60)
+    volatility_start = close.index[-40]
+    factors = price_snapshot_factors(close, volatility_start=volatility_start)
+
+    long = close.stack().rename('close').reset_index()
+    long.columns = ['date', 'code', 'close']
+    long = long.sort_values(['code', 'date'])
+    expected = FactorScorer().calculate_momentum_score(long).groupby('code').tail(1).set_index('code')
+
+    for period in [20, 60]:
+        np.testing.assert_allclose(factors[f'return_{period}d'], expected[f'return_{period}d'])
+    # 이력 40일 종목은 120일 수익률 없음
+    assert factors['return_120d'].iloc[:50].isna().all() and factors['return_120d'].iloc[50:].notna().all()
+
+    recent = close[close.index >= volatility_start]
+    np.testing.assert_allclose(factors['volatility'], recent.pct_change().std() * np.sqrt(252) * 100)
+    print(f"  ✓ {len(factors)}개 종목")
+
+
+def test_score_snapshot():
+    """필터/점수/병합 결과와 시장 전체 스크리닝 시간"""
+    print("\n[2] 스냅샷 점수")
+    financials, close = make_market()
+    scorer = FactorScorer()
+
+    started = time.perf_counter()
+    metrics = FinancialsIndex(financials).latest()
+    factors = price_snapshot_factors(close, volatility_start=close.index[-40])
+    scored = score_snapshot(metrics, factors, scorer, min_roe=5, max_debt_ratio=150, leadership=False)
+    result = scorer.rank_stocks(scored, top_n=20)
+    elapsed = time.perf_counter() - started
+
+    assert len(metrics) == 2500 and metrics['code'].is_unique
+    assert scored['code'].is_unique and len(scored) == ((metrics['roe'] >= 5) & (metrics['debt_ratio'] <= 150)).sum()
+    assert (scored['roe'] >= 5).all() and (scored['debt_ratio'] <= 150).all()
+
+    latest = financials.groupby('code').tail(1).set_index('code')
+    year_ago = financials.groupby('code').nth(-5).set_index('code')
+    row = scored.set_index('code').iloc[0]
+    assert np.isclose(row['revenue_growth'], (latest.loc[row.name, 'revenue'] / year_ago.loc[row.name, 'revenue'] - 1) * 100)
+    assert np.isclose(row['close'], close[row.name].iloc[-1])
+
+    assert list(result['rank']) == list(range(1, 21))
+    assert result['composite_score'].is_monotonic_decreasing
+    assert elapsed < 1.0, f"{elapsed:.2f}s"
+    print(f"  ✓ {len(scored)}개 종목 점수 {elapsed * 1000:.0f}ms")
+
+
+def main():
+    tests = [
+        ("가격 팩터", test_price_factors_match_long_format),
+        ("스냅샷 점수", test_score_snapshot),
+    ]
+
+    failed = 0
+    for name, test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {name} 실패: {e}")
+
+    print("\n" + "=" * 60)
+    print(f"전체: {len(tests) - failed}/{len(tests)} 통과")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+"""
+섹터 주도주 일괄 계산 테스트
+
+DB 없이 합성 패널로 벡터 연산 점수가 종목별 계산 방식과 같은지 검증합니다.
+"""
+
+import sys
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# 프로젝트 루트 경로 추가
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+import core.modules.sector_leader_detector as detector_module
+from core.modules.sector_leader_detector import (
+    SectorLeaderConfig,
+    SectorLeaderDetector,
+    stability_scores,
+    trading_amount_scores,
+)
+
+
+def make_market(num_stocks=200, num_days=60, seed=0):
+    """거래정지(NaN)가 섞인 합성 시장 데이터"""
+    rng = np.random.default_rng(seed)
+    codes = [f"{i:06d}" for i in range(num_stocks)]
+    dates = pd.bdate_range(end="2024-06-28", periods=num_days)
+
+    close = np.exp(np.cumsum(rng.normal(0, 0.02, (num_days, num_stocks)), axis=0)) * 10000
+    close[rng.integers(0, num_days, 300), rng.integers(0, num_stocks, 300)] = np.nan
+    volume = rng.integers(100_000, 50_000_000, (num_days, num_stocks)).astype(float)
+    volume[np.isnan(close)] = np.nan
+
+    close = pd.DataFrame(close, index=dates, columns=codes)
+    volume = pd.DataFrame(volume, index=dates, columns=codes)
+    stocks = pd.DataFrame({
+        'code': codes,
+        'name': codes,
+        'sector': rng.choice(['반도체', '금융', '화학', '자동차'], num_stocks),
+        'market': 'KOSPI',
+        'market_cap': rng.uniform(1e11, 5e14, num_stocks),
+    })
+    return close, volume, stocks
+
+
+def test_scores_match_per_stock_formulas():
+    """거래대금/안정성 점수가 종목별 numpy 계산과 동일한지"""
+    print("\n[1] 벡터 점수 vs 종목별 계산")
+    close, volume, _ = make_market()
+    amount = trading_amount_scores(close, volume)
+    stability = stability_scores(close)
+
+    for code in close.columns[:30]:
+        prices = close[code].dropna().values
+        amounts = prices * volume[code].dropna().values
+        avg = np.mean(amounts)
+        expected = max(min(avg / 1e11 * 100, 100) - min(np.std(amounts) / avg * 10, 20), 0)
+        assert abs(amount.loc[code, 'trading_amount_score'] - expected) < 1e-9
+
+        returns = np.diff(prices) / prices[:-1]
+        vol = np.std(returns) * np.sqrt(252) * 100
+        peak = np.maximum.accumulate(prices)
+        mdd = np.min((prices - peak) / peak * 100)
+        expected = 50 + (20 if vol < 15 else 10 if vol < 25 else 0 if vol < 35 else -10) \
+            + (15 if mdd > -10 else 10 if mdd > -15 else 5 if mdd > -25 else 0)
+        assert stability[code] == min(max(expected, 0), 100)
+    print("  ✓ 30개 종목 일치")
+
+
+def test_score_market_ranks_within_sector():
+    """섹터 내 순위와 detect_leaders 결과"""
+    print("\n[2] 섹터 내 순위")
+    close, volume, stocks = make_market()
+    panel = pd.concat({'close': close, 'volume': volume}, axis=1)
+
+    original = (detector_module.load_panel, detector_module.get_financial_data_from_db)
+    detector_module.load_panel = lambda *args, **kwargs: panel
+    detector_module.get_financial_data_from_db = lambda codes: pd.DataFrame()
+    try:
+        detector = SectorLeaderDetector(SectorLeaderConfig(leaders_per_sector=3, min_trading_amount=1e9))
+        detector._get_market_stocks = lambda market: stocks
+        scored = detector.score_market("KOSPI", as_of=date(2024, 6, 28))
+    finally:
+        detector_module.load_panel, detector_module.get_financial_data_from_db = original
+
+    assert len(scored) == len(stocks)
+    assert (scored['financial_score'] == 50.0).all()
+    leaders = scored[scored['is_leader']]
+    assert leaders.groupby('sector').size().max() <= 3
+    for sector, group in scored[scored['eligible']].groupby('sector'):
+        top = group.nlargest(3, 'total_score')['code']
+        assert set(top) == set(leaders[leaders['sector'] == sector]['code'])
+    print(f"  ✓ 주도주 {len(leaders)}개 / 섹터 {leaders['sector'].nunique()}개")
+
+
+def main():
+    tests = [
+        ("벡터 점수 vs 종목별 계산", test_scores_match_per_stock_formulas),
+        ("섹터 내 순위", test_score_market_ranks_within_sector),
+    ]
+
+    failed = 0
+    for name, test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {name} 실패: {e}")
+
+    print("\n" + "=" * 60)
+    print(f"전체: {len(tests) - failed}/{len(tests)} 통과")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
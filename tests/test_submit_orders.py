@@ -0,0 +1,241 @@
+"""
+일괄 주문(submit_orders) 테스트
+
+DB 없이 메모리 테이블을 쓰는 연결 대역(FakeConnection)으로 바스켓 체결 결과를 검증합니다.
+(같은 종목 전량 매도 후 재매수, 추가 매수 평균가, 일부 주문 거부, dry_run)
+"""
+
+import sys
+import copy
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+
+# 프로젝트 루트 경로 추가
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+import paper_trading.paper_trading as pt_module
+from paper_trading.paper_trading import COMMISSION_RATE, submit_orders
+
+OLD_BUY_DATE = datetime(2024, 1, 2)
+NOW = datetime(2024, 6, 28, 10, 0)
+
+
+class FakeDB:
+    """virtual_accounts / virtual_portfolio / virtual_trades / prices 메모리 테이블"""
+
+    def __init__(self, balance, positions, prices):
+        self.state = {
+            'balance': Decimal(balance),
+            'positions': {code: dict(pos, first_buy_date=OLD_BUY_DATE) for code, pos in positions.items()},
+            'trades': [],
+        }
+        self.prices = prices
+        self.commits = 0
+
+    def connect(self):
+        return FakeConnection(self)
+
+
+class FakeConnection:
+    def __init__(self, db):
+        self.db = db
+        self.work = copy.deepcopy(db.state)
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.db.state = copy.deepcopy(self.work)
+        self.db.commits += 1
+
+    def rollback(self):
+        self.work = copy.deepcopy(self.db.state)
+
+    def close(self):
+        pass
+
+
+class FakeCursor:
+    """submit_orders가 쓰는 문장만 해석"""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.rows = []
+
+    def execute(self, query, params=None):
+        work = self.conn.work
+        if "FROM virtual_accounts" in query and "FOR UPDATE" in query:
+            self.rows = [(work['balance'],)]
+        elif "unnest" in query:
+            codes, _ = params
+            self.rows = [
+                (code,
+                 work['positions'].get(code, {}).get('quantity'),
+                 work['positions'].get(code, {}).get('avg_price'),
+                 self.conn.db.prices.get(code))
+                for code in codes
+            ]
+        elif query.strip().startswith("UPDATE virtual_accounts"):
+            work['balance'] += params[0]
+            self.rows = [(work['balance'],)]
+        elif query.strip().startswith("DELETE FROM virtual_portfolio"):
+            for code in params[1]:
+                work['positions'].pop(code, None)
+        else:
+            raise AssertionError(f"예상하지 못한 쿼리: {query}")
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+    def fetchall(self):
+        return self.rows
+
+    def close(self):
+        pass
+
+
+def fake_execute_values(cur, query, rows, template=None, fetch=False):
+    work = cur.conn.work
+    if "INSERT INTO virtual_trades" in query:
+        returned = []
+        for row in rows:
+            work['trades'].append(row)
+            returned.append((len(work['trades']), NOW))
+        return returned[::-1]   # RETURNING 순서는 보장되지 않음
+    if "INSERT INTO virtual_portfolio" in query:
+        for _, code, quantity, avg_price in rows:
+            existing = work['positions'].get(code)
+            first_buy_date = existing['first_buy_date'] if existing else NOW
+            work['positions'][code] = {'quantity': quantity, 'avg_price': avg_price, 'first_buy_date': first_buy_date}
+        return None
+    raise AssertionError(f"예상하지 못한 쿼리: {query}")
+
+
+def run_with(db, *args, **kwargs):
+    original = (pt_module.get_db_connection, pt_module.execute_values)
+    pt_module.get_db_connection = db.connect
+    pt_module.execute_values = fake_execute_values
+    try:
+        return submit_orders(*args, **kwargs)
+    finally:
+        pt_module.get_db_connection, pt_module.execute_values = original
+
+
+def cash_flow(action, quantity, price):
+    amount = quantity * price
+    commission = amount * COMMISSION_RATE
+    return Decimal(str(amount - commission)) if action == 'sell' else -Decimal(str(amount + commission))
+
+
+def test_rebuy_and_average_price():
+    """전량 매도 후 재매수는 새 포지션, 추가 매수는 가중 평균가"""
+    print("\n[1] 재매수 / 평균가")
+    db = FakeDB("1000000", {"A": {'quantity': 10, 'avg_price': 1000.0},
+                            "B": {'quantity': 5, 'avg_price': 2000.0}}, {"A": 1100.0, "B": 3000.0})
+    orders = [
+        {'action': 'buy', 'code': "A", 'quantity': 3, 'price': 1100.0},   # 매수가 먼저 와도 매도 먼저 처리
+        {'action': 'sell', 'code': "A", 'quantity': 10, 'price': 1100.0},
+        {'action': 'buy', 'code': "B", 'quantity': 5},                    # 가격 없으면 최신 종가
+    ]
+    result = run_with(db, 1, orders)
+
+    assert result['rejected'] == [] and result['dry_run'] is False
+    assert [(t['action'], t['code']) for t in result['executed']] == [('sell', "A"), ('buy', "A"), ('buy', "B")]
+    assert [t['trade_id'] for t in result['executed']] == [1, 2, 3]
+    assert result['executed'][0]['remaining_quantity'] == 0 and result['executed'][0]['profit_loss'] == 1000.0
+
+    positions = db.state['positions']
+    assert positions["A"] == {'quantity': 3, 'avg_price': 1100.0, 'first_buy_date': NOW}
+    assert positions["B"]['quantity'] == 10 and positions["B"]['avg_price'] == 2500.0
+    assert positions["B"]['first_buy_date'] == OLD_BUY_DATE
+
+    expected = Decimal("1000000") + cash_flow('sell', 10, 1100.0) + cash_flow('buy', 3, 1100.0) + cash_flow('buy', 5, 3000.0)
+    assert db.state['balance'] == expected and result['new_balance'] == float(expected)
+    assert [row[2] for row in db.state['trades']] == ['sell', 'buy', 'buy'] and db.commits == 1
+    print(f"  ✓ 잔고 {result['new_balance']:,.0f}원, B 평균가 {positions['B']['avg_price']:,.0f}원")
+
+
+def test_rejections_keep_basket_consistent():
+    """거부 주문(잔고/수량 부족, 미보유, 가격 없음)은 건너뛰고 나머지는 일관되게 체결"""
+    print("\n[2] 일부 주문 거부")
+    db = FakeDB("100000", {"A": {'quantity': 10, 'avg_price': 1000.0}}, {"A": 1000.0, "B": 5000.0})
+    orders = [
+        {'action': 'sell', 'code': "A", 'quantity': 20},                  # 보유 수량 부족
+        {'action': 'sell', 'code': "C", 'quantity': 1, 'price': 100.0},   # 미보유
+        {'action': 'buy', 'code': "D", 'quantity': 1},                    # 가격 없음
+        {'action': 'buy', 'code': "B", 'quantity': 15},                   # 75,000원
+        {'action': 'buy', 'code': "B", 'quantity': 10},                   # 잔고 부족 (앞 주문 차감 후)
+        {'action': 'sell', 'code': "A", 'quantity': 4},
+        {'action': 'hold', 'code': "A", 'quantity': 1},
+        {'action': 'buy', 'code': "A", 'quantity': 0},
+    ]
+    result = run_with(db, 1, orders)
+
+    rejected = {(r['action'], r['code'], r['quantity']) for r in result['rejected']}
+    assert rejected == {('sell', "A", 20), ('sell', "C", 1), ('buy', "D", 1), ('buy', "B", 10),
+                        ('hold', "A", 1), ('buy', "A", 0)}
+    assert any("잔고 부족" in r['error'] for r in result['rejected'])
+    assert [(t['action'], t['code'], t['quantity']) for t in result['executed']] == [('sell', "A", 4), ('buy', "B", 15)]
+
+    positions = db.state['positions']
+    assert positions["A"]['quantity'] == 6 and positions["B"]['quantity'] == 15 and "D" not in positions
+    expected = Decimal("100000") + cash_flow('sell', 4, 1000.0) + cash_flow('buy', 15, 5000.0)
+    assert db.state['balance'] == expected and len(db.state['trades']) == 2
+
+    # 전부 거부되면 기록 없이 잔고 그대로
+    before = copy.deepcopy(db.state)
+    result = run_with(db, 1, [{'action': 'sell', 'code': "C", 'quantity': 1}])
+    assert result['executed'] == [] and result['new_balance'] == float(before['balance'])
+    assert db.state == before
+    print(f"  ✓ 체결 2건, 거부 {len(rejected)}건")
+
+
+def test_dry_run():
+    """dry_run은 실제 체결과 같은 결과를 돌려주고 아무것도 기록하지 않음"""
+    print("\n[3] dry_run")
+    positions = {"A": {'quantity': 10, 'avg_price': 1000.0}}
+    orders = [
+        {'action': 'sell', 'code': "A", 'quantity': 10},
+        {'action': 'buy', 'code': "B", 'quantity': 20},
+        {'action': 'buy', 'code': "B", 'quantity': 100},
+    ]
+    dry_db = FakeDB("50000", positions, {"A": 1200.0, "B": 2500.0})
+    before = copy.deepcopy(dry_db.state)
+    preview = run_with(dry_db, 1, orders, dry_run=True)
+
+    real_db = FakeDB("50000", positions, {"A": 1200.0, "B": 2500.0})
+    actual = run_with(real_db, 1, orders)
+
+    assert preview['dry_run'] is True and dry_db.state == before and dry_db.commits == 0
+    assert preview['new_balance'] == actual['new_balance']
+    assert preview['rejected'] == actual['rejected'] and len(preview['rejected']) == 1
+    strip = lambda trades: [{k: v for k, v in t.items() if k not in ('trade_id', 'trade_date')} for t in trades]
+    assert strip(preview['executed']) == strip(actual['executed'])
+    assert all('trade_id' not in t for t in preview['executed'])
+    print(f"  ✓ 예상 잔고 {preview['new_balance']:,.0f}원 (기록 없음)")
+
+
+def main():
+    tests = [
+        ("재매수 / 평균가", test_rebuy_and_average_price),
+        ("일부 주문 거부", test_rejections_keep_basket_consistent),
+        ("dry_run", test_dry_run),
+    ]
+
+    failed = 0
+    for name, test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {name} 실패: {e}")
+
+    print("\n" + "=" * 60)
+    print(f"전체: {len(tests) - failed}/{len(tests)} 통과")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+"""
+기술적 지표 일괄 계산 엔진 테스트
+
+DB 없이 합성 종가 패널로 calculate_indicator_panel이
+종목별 지표 함수와 같은 값을 내는지 검증합니다.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# 프로젝트 루트 경로 추가
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from core.modules.technical_indicators import (
+    INDICATOR_COLUMNS,
+    calculate_bollinger_bands,
+    calculate_ema,
+    calculate_indicator_panel,
+    calculate_macd,
+    calculate_momentum,
+    calculate_rate_of_change,
+    calculate_rsi,
+    calculate_sma,
+    calculate_volatility,
+    latest_indicator_snapshot,
+)
+
+
+def make_close_panel(num_days=90, num_stocks=300, seed=7):
+    """거래정지(NaN), 짧은 이력, 가격 없는 종목이 섞인 종가 패널"""
+    rng = np.random.default_rng(seed)
+    values = np.exp(np.cumsum(rng.normal(0, 0.02, (num_days, num_stocks)), axis=0)) * 20000
+    values[rng.integers(0, num_days, 500), rng.integers(0, num_stocks, 500)] = np.nan
+    values[:60, 1] = np.nan  # 상장 30일
+    values[:, 2] = np.nan    # 가격 없음
+    dates = pd.bdate_range(end="2024-06-28", periods=num_days)
+    return pd.DataFrame(values, index=dates, columns=[f"{i:06d}" for i in range(num_stocks)])
+
+
+def per_stock_indicators(close: pd.Series) -> pd.DataFrame:
+    """analyze_technical_indicators와 같은 방식의 종목별 계산"""
+    df = pd.DataFrame({'close': close.dropna()})
+    df['sma_20'] = calculate_sma(df, 'close', 20)
+    df['sma_60'] = calculate_sma(df, 'close', 60)
+    df['ema_20'] = calculate_ema(df, 'close', 20)
+    df['rsi'] = calculate_rsi(df, 'close', 14)
+    df['macd'], df['macd_signal'], df['macd_histogram'] = calculate_macd(df)
+    df['bb_upper'], df['bb_middle'], df['bb_lower'] = calculate_bollinger_bands(df)
+    df['momentum'] = calculate_momentum(df, 'close', 10)
+    df['roc'] = calculate_rate_of_change(df, 'close', 10)
+    df['volatility'] = calculate_volatility(df, 'close', 20)
+    return df
+
+
+def test_panel_matches_per_stock():
+    """패널 계산 == 종목별 계산"""
+    print("\n[1] 패널 vs 종목별 계산")
+    close = make_close_panel()
+    panel = calculate_indicator_panel(close)
+
+    for code in close.columns[:25]:
+        if close[code].isna().all():
+            continue
+        expected = per_stock_indicators(close[code])
+        for name in INDICATOR_COLUMNS:
+            actual = panel[name][code].dropna()
+            np.testing.assert_allclose(
+                actual.to_numpy(), expected[name].dropna().reindex(actual.index).to_numpy(),
+                rtol=1e-9, atol=1e-9, err_msg=f"{code} {name}"
+            )
+            assert len(actual) == expected[name].notna().sum(), f"{code} {name} 길이"
+    print(f"  ✓ 지표 {len(INDICATOR_COLUMNS)}개 일치")
+
+
+def test_latest_snapshot():
+    """최신 스냅샷: 종목별 마지막 거래일 기준"""
+    print("\n[2] 최신 스냅샷")
+    close = make_close_panel()
+    close.iloc[-3:, 3] = np.nan  # 최근 3일 거래정지
+    snapshot = latest_indicator_snapshot(calculate_indicator_panel(close)).set_index('code')
+
+    assert "000002" not in snapshot.index
+    assert snapshot.loc["000003", 'date'] == close.index[-4]
+    assert snapshot.loc["000003", 'close'] == close.iloc[-4, 3]
+    assert pd.isna(snapshot.loc["000001", 'sma_60']) and pd.notna(snapshot.loc["000001", 'sma_20'])
+    assert all(isinstance(signals, list) for signals in snapshot['signals'])
+    print(f"  ✓ 스냅샷 {snapshot.shape}")
+
+
+def main():
+    tests = [
+        ("패널 vs 종목별 계산", test_panel_matches_per_stock),
+        ("최신 스냅샷", test_latest_snapshot),
+    ]
+
+    failed = 0
+    for name, test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {name} 실패: {e}")
+
+    print("\n" + "=" * 60)
+    print(f"전체: {len(tests) - failed}/{len(tests)} 통과")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+"""
+거래량 분석 배치 모드 테스트
+
+DB 없이 합성 가격 패널로 배치 지표(volume_metrics)가 종목별 analyze_volume과 같은지 검증합니다.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# 프로젝트 루트 경로 추가
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from core.modules.volume_analysis import VolumeAnalyzer, volume_metrics, volume_scores
+
+
+class PanelVolumeAnalyzer(VolumeAnalyzer):
+    """DB 대신 메모리 패널에서 종목별 가격을 읽는 분석기 (종목별 경로 비교용)"""
+
+    def __init__(self, close, volume):
+        super().__init__()
+        self.close, self.volume = close, volume
+
+    def get_price_data(self, stock_code, days=60):
+        df = pd.DataFrame({'close': self.close[stock_code], 'volume': self.volume[stock_code]}).dropna()
+        return df.tail(days).rename_axis('date').reset_index()
+
+
+def make_panel(n_codes=300, n_days=90, seed=0):
+    """종목별 거래대금 규모가 다른 패널 (거래정지/신규상장 포함)"""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(end="2024-12-30", periods=n_days)
+    codes = [f"{i:06d}" for i in range(n_codes)]
+    close = pd.DataFrame(10000 * np.exp(np.cumsum(rng.normal(0, 0.02, (n_days, n_codes)), axis=0)),
+                         index=dates, columns=codes)
+    scale = 10 ** rng.uniform(4, 7.5, n_codes)
+    trend = np.linspace(0.5, 1.5, n_days)[:, None] ** rng.normal(0, 1, n_codes)
+    volume = pd.DataFrame(np.round(scale * trend * rng.lognormal(0, 0.5, (n_days, n_codes))),
+                          index=dates, columns=codes)
+    close.iloc[50:60, 1] = np.nan           # 거래정지
+    close.iloc[:60, 2] = np.nan             # 상장 30거래일
+    close.iloc[:75, 3] = np.nan             # 상장 15거래일 - 데이터 부족
+    volume.iloc[-5:, 4] *= 5                # 최근 급증
+    return close, volume
+
+
+def test_batch_matches_per_stock():
+    """배치 지표 = 종목별 analyze_volume"""
+    print("\n[1] 배치 vs 종목별")
+    close, volume = make_panel(n_codes=60)
+    batch = volume_metrics(close, volume).set_index('code')
+    analyzer = PanelVolumeAnalyzer(close, volume)
+
+    assert "000003" not in batch.index and len(batch) == 59
+    assert bool(batch.loc["000004", 'recent_volume_surge'])
+    for code in batch.index:
+        expected = analyzer.analyze_volume(code)
+        row = batch.loc[code]
+        for key, value in expected.items():
+            if key == 'code':
+                continue
+            if isinstance(value, float):
+                assert np.isclose(row[key], value), (code, key, row[key], value)
+            else:
+                assert row[key] == value, (code, key, row[key], value)
+    print(f"  ✓ {len(batch)}개 종목 일치")
+
+
+def test_scores_and_speed():
+    """벡터 점수 = calculate_volume_score, 시장 전체 배치 실행 시간"""
+    print("\n[2] 점수 / 실행 시간")
+    analyzer = VolumeAnalyzer()
+    amounts = [0, 1e10, 2e10, 5e10, 1e11, 2e11, np.nan]
+    changes = [-20, -10, 0, 5, 15, 25, 40]
+    cvs = [0.1, 0.3, 0.5, 0.8, 1.0, 2.0, np.nan]
+    for surge in [False, True]:
+        vectorized = volume_scores(amounts, changes, cvs, [surge] * 7)
+        expected = [analyzer.calculate_volume_score(a, c, v, surge) for a, c, v in zip(amounts, changes, cvs)]
+        assert list(vectorized) == expected
+
+    close, volume = make_panel(n_codes=2500)
+    started = time.perf_counter()
+    result = volume_metrics(close, volume)
+    elapsed = time.perf_counter() - started
+    assert len(result) == 2499 and result['volume_score'].between(0, 100).all()
+    assert elapsed < 0.5, f"{elapsed:.2f}s"
+    print(f"  ✓ 2,500종목 {elapsed * 1000:.0f}ms")
+
+
+def main():
+    tests = [
+        ("배치 vs 종목별", test_batch_matches_per_stock),
+        ("점수 / 실행 시간", test_scores_and_speed),
+    ]
+
+    failed = 0
+    for name, test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {name} 실패: {e}")
+
+    print("\n" + "=" * 60)
+    print(f"전체: {len(tests) - failed}/{len(tests)} 통과")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,227 @@
+"""
+워크포워드 백테스트 엔진 테스트
+
+DB 없이 합성 재무/가격 데이터로 리밸런싱 시뮬레이션, 시점 기준 재무 데이터 사용,
+파라미터 스윕, 거래 비용 모델을 검증합니다.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# 프로젝트 루트 경로 추가
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from core.modules.walk_forward import (
+    WalkForwardData,
+    prepare_financials,
+    price_factors,
+    price_returns,
+    run_walk_forward,
+    simulate_rebalanced_portfolio
+)
+from core.modules.backtesting import (
+    TransactionCostModel,
+    apply_transaction_costs,
+    average_trading_amount,
+    calculate_portfolio_returns,
+    run_parameter_sweep
+)
+
+
+def reference_nav(returns, schedule):
+    """일 단위로 보유 수량을 갱신하는 단순 구현"""
+    dates = sorted(schedule)
+    values = returns.fillna(0.0)
+    nav = {}
+    holdings = None
+    value = 1.0
+    for date in values.index[values.index >= dates[0]]:
+        if holdings is not None:
+            holdings = holdings * (1 + values.loc[date, holdings.index])
+            value = holdings.sum() + cash
+        if date in schedule:
+            target = schedule[date]
+            holdings = target * value
+            cash = value * (1 - target.sum())
+        nav[date] = value
+    return pd.Series(nav)
+
+
+def make_financials(codes, years, roe_by_code):
+    """분기별 재무 데이터 (ROE = net_profit / total_equity)"""
+    rows = []
+    for code in codes:
+        for year in years:
+            for quarter in range(1, 5):
+                roe = roe_by_code(code, year, quarter)
+                rows.append({
+                    'code': code, 'year': year, 'quarter': quarter,
+                    'revenue': 1000.0, 'operating_profit': 100.0,
+                    'net_profit': roe, 'total_assets': 200.0,
+                    'total_equity': 100.0, 'total_debt': 50.0,
+                })
+    return pd.DataFrame(rows)
+
+
+def test_simulation_matches_reference():
+    """행렬 연산 drift 시뮬레이션 vs 일 단위 구현"""
+    print("\n[1] 리밸런싱 시뮬레이션")
+    rng = np.random.default_rng(0)
+    dates = pd.bdate_range("2022-01-03", periods=250)
+    codes = [f"{i:06d}" for i in range(30)]
+    returns = pd.DataFrame(rng.normal(0, 0.02, (250, 30)), index=dates, columns=codes)
+    returns.iloc[0] = np.nan
+    returns.iloc[40:45, 3] = np.nan  # 거래정지
+
+    schedule = {}
+    for k, date in enumerate(dates[::21]):
+        picked = rng.choice(codes, 8, replace=False)
+        weights = pd.Series(rng.random(8), index=picked)
+        schedule[date] = weights / weights.sum() * (0.9 if k % 3 == 0 else 1.0)
+
+    result = simulate_rebalanced_portfolio(returns, schedule)
+    expected = reference_nav(returns, schedule)
+    np.testing.assert_allclose(result['nav'].to_numpy(), expected.to_numpy(), rtol=1e-10)
+    assert result['turnover'].iloc[0] == schedule[dates[0]].sum()
+    assert (result['turnover'] <= 1.0 + 1e-9).all()
+    print(f"  ✓ {len(schedule)}회 리밸런싱, 최종 NAV {result['nav'].iloc[-1]:.4f}")
+
+
+def test_price_gap_returns():
+    """가격 누락(거래정지/데이터 공백) 구간의 변동은 재개일 수익률에 반영"""
+    print("\n[2] 가격 누락 구간 수익률")
+    dates = pd.bdate_range("2023-01-02", periods=5)
+    close = pd.DataFrame({"A": [100, 100, np.nan, 120, 120], "B": [50, 50, 50, 50, 50]},
+                         index=dates, dtype=float)
+
+    walk = simulate_rebalanced_portfolio(price_returns(close), {dates[0]: pd.Series({"A": 1.0})})
+    assert np.allclose(walk['nav'].to_numpy(), [1.0, 1.0, 1.0, 1.2, 1.2])
+
+    nav = calculate_portfolio_returns(close, {"A": 0.5, "B": 0.5})
+    assert np.isclose(nav.iloc[-1], 1.1), nav.iloc[-1]
+
+    # 변동성 팩터도 재개일 수익률 포함
+    volatility = price_factors(close, dates[-1:])['volatility']
+    assert volatility.loc[dates[-1], "A"] > 0 and volatility.loc[dates[-1], "B"] == 0
+    print(f"  ✓ NAV {walk['nav'].iloc[-1]:.2f}")
+
+
+def make_data(n_codes=40):
+    """합성 워크포워드 데이터 (000000은 2022년 4분기 보고서 - 공시 2023-03-31 - 부터 ROE 급등)"""
+    codes = [f"{i:06d}" for i in range(n_codes)]
+
+    def roe(code, year, quarter):
+        if code == "000000":
+            return 50.0 if (year, quarter) >= (2022, 4) else 1.0
+        return 12.0 + int(code) * 0.1
+
+    financials = prepare_financials(make_financials(codes, [2020, 2021, 2022, 2023], roe))
+    dates = pd.bdate_range("2021-01-01", "2023-12-29")
+    rng = np.random.default_rng(1)
+    close = pd.DataFrame(
+        100 * np.exp(np.cumsum(rng.normal(0, 0.01, (len(dates), len(codes))), axis=0)),
+        index=dates, columns=codes
+    )
+    return WalkForwardData(financials=financials, close=close)
+
+
+def test_point_in_time_selection():
+    """공시 이전의 재무 데이터는 선정에 쓰이지 않는지"""
+    print("\n[3] 시점 기준 종목 선정")
+    data = make_data()
+
+    started = time.perf_counter()
+    result = run_walk_forward("2022-01-01", "2023-12-29", top_n=5, rebalance_months=1, data=data)
+    elapsed = time.perf_counter() - started
+
+    assert result['status'] == 'success'
+    held = {r['date']: r['stocks'] for r in result['rebalances']}
+    assert len(held) == 24
+    assert all("000000" not in stocks for date, stocks in held.items() if date < "2023-03-31")
+    assert all("000000" in stocks for date, stocks in held.items() if date >= "2023-04-01")
+    assert result['nav'].index[0] == pd.Timestamp("2022-01-03")
+    print(f"  ✓ {len(held)}회 리밸런싱 {elapsed:.2f}s")
+
+
+def test_parameter_sweep():
+    """병렬 파라미터 스윕 결과가 순차 실행과 같은지"""
+    print("\n[4] 파라미터 스윕")
+    data = make_data()
+    grid = {'strategy': ["equal_weight", "risk_parity"], 'top_n': [3, 5], 'rebalance_months': [1, 3]}
+    benchmark = pd.Series(dtype=float)
+
+    serial = run_parameter_sweep("2022-01-01", "2023-12-29", grid, max_workers=1,
+                                 data=data, benchmark_returns=benchmark)
+    parallel = run_parameter_sweep("2022-01-01", "2023-12-29", grid, max_workers=2,
+                                   data=data, benchmark_returns=benchmark)
+
+    assert len(parallel) == 8 and (parallel['status'] == 'success').all()
+    pd.testing.assert_frame_equal(serial, parallel)
+    assert set(parallel.loc[parallel['rebalance_months'] == 3, 'rebalance_count']) == {8}
+    print(f"  ✓ {len(parallel)}개 조합, 최고 Sharpe {parallel['sharpe_ratio'].max():.2f}")
+
+
+def test_transaction_costs():
+    """수수료/거래세/슬리피지 계산과 순 가치 반영"""
+    print("\n[5] 거래 비용")
+    dates = pd.bdate_range("2023-01-02", periods=60)
+    codes = ["000001", "000002"]
+    close = pd.DataFrame(10000.0, index=dates, columns=codes)
+    volume = pd.DataFrame({"000001": 1e6, "000002": 10.0}, index=dates)  # 000002는 거래대금 10만원
+
+    rebalances = dates[[0, 30]]
+    trades = pd.DataFrame([[1.0, 0.0], [-0.5, 0.5]], index=rebalances, columns=codes)
+    gross = pd.Series(1.0, index=dates)
+    model = TransactionCostModel(capital=1e7)
+
+    amount = average_trading_amount(close, volume, rebalances)
+    assert amount.loc[rebalances[1], "000001"] == 1e10
+    costs = model.rebalance_costs(trades, gross, amount)
+
+    assert np.isclose(costs['commission'].iloc[0], 1.0 * model.commission_rate)
+    assert costs['tax'].iloc[0] == 0 and np.isclose(costs['tax'].iloc[1], 0.5 * model.sell_tax_rate)
+    # 슬리피지 = 스프레드 + 계수 x sqrt(주문금액 / 거래대금), 거래대금보다 큰 주문은 상한
+    assert np.isclose(costs['slippage'].iloc[0],
+                      model.half_spread_rate + model.impact_coefficient * np.sqrt(1e7 / 1e10))
+    assert np.isclose(costs['slippage'].iloc[1],
+                      0.5 * (model.half_spread_rate + model.impact_coefficient * np.sqrt(5e6 / 1e10))
+                      + 0.5 * model.max_slippage_rate)
+
+    net = apply_transaction_costs(gross, trades, model, amount)['nav']
+    expected = (1 - costs['total'].iloc[0]) * (1 - costs['total'].iloc[1])
+    assert np.isclose(net.iloc[-1], expected) and np.isclose(net.iloc[29], 1 - costs['total'].iloc[0])
+
+    free = TransactionCostModel(commission_rate=0, sell_tax_rate=0, half_spread_rate=0, impact_coefficient=0)
+    pd.testing.assert_series_equal(apply_transaction_costs(gross, trades, free)['nav'], gross)
+    print(f"  ✓ 비용 {costs['total'].sum() * 100:.3f}%")
+
+
+def main():
+    tests = [
+        ("리밸런싱 시뮬레이션", test_simulation_matches_reference),
+        ("가격 누락 구간 수익률", test_price_gap_returns),
+        ("시점 기준 종목 선정", test_point_in_time_selection),
+        ("파라미터 스윕", test_parameter_sweep),
+        ("거래 비용", test_transaction_costs),
+    ]
+
+    failed = 0
+    for name, test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {name} 실패: {e}")
+
+    print("\n" + "=" * 60)
+    print(f"전체: {len(tests) - failed}/{len(tests)} 통과")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())